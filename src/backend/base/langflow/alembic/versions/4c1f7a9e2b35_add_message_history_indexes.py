@@ -0,0 +1,44 @@
+"""add message history indexes
+
+Revision ID: 4c1f7a9e2b35
+Revises: 182e5471b900
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1f7a9e2b35'
+down_revision: Union[str, None] = '182e5471b900'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    'ix_message_flow_id_session_id_timestamp': ['flow_id', 'session_id', 'timestamp'],
+    'ix_message_session_id_timestamp': ['session_id', 'timestamp'],
+}
+
+
+def upgrade() -> None:
+    # Skip indexes that already exist (e.g. tables created from the models)
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing = {index['name'] for index in inspector.get_indexes('message')}
+
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, 'message', columns, unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing = {index['name'] for index in inspector.get_indexes('message')}
+
+    for name in INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name='message')
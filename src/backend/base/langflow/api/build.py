@@ -47,6 +47,7 @@ from langflow.schema.message import ErrorMessage
 from langflow.schema.schema import OutputValue
 from langflow.services.database.models.flow.model import Flow
 from langflow.services.deps import get_chat_service, get_telemetry_service, session_scope
+from langflow.services.job_queue.redis_backend import RemoteJobTask
 from langflow.services.job_queue.service import JobQueueNotFoundError, JobQueueService
 from langflow.services.telemetry.schema import ComponentInputsPayload, ComponentPayload, PlaygroundPayload
 def _log_component_input_telemetry(
@@ -118,6 +119,8 @@ async def start_flow_build(
             current_user=current_user,
             flow_name=flow_name,
         )
+        # 注意：先登记再启动；否则很快结束的作业写入的最终状态会被登记时的 `running` 覆盖。
+        await queue_service.register_job(job_id)
         queue_service.start_job(job_id, task_coro)
     except Exception as e:
         await logger.aexception("Failed to create queue and start task")
@@ -149,7 +152,7 @@ async def get_flow_events_response(
     排障入口：日志关键字 `Job not found` / `Unexpected error processing flow events`。
     """
     try:
-        main_queue, event_manager, event_task, _ = queue_service.get_queue_data(job_id)
+        main_queue, event_manager, event_task, _ = await queue_service.aget_queue_data(job_id)
         if event_delivery in (EventDeliveryType.STREAMING, EventDeliveryType.DIRECT):
             if event_task is None:
                 await logger.aerror(f"No event task found for job {job_id}")
@@ -162,26 +165,20 @@ async def get_flow_events_response(
 
         try:
             events: list = []
-            while not main_queue.empty():
-                _, value, _ = await main_queue.get()
+            # 注意：队列为空时阻塞等待首个事件，之后取完已到达的事件；
+            # Redis 后端一次读入一批事件到本地缓冲，必须在本次响应中取完。
+            item = await main_queue.get() if main_queue.empty() else None
+            while item is not None or not main_queue.empty():
+                _, value, _ = item if item is not None else main_queue.get_nowait()
+                item = None
                 if value is None:
                     if event_task is not None:
                         event_task.cancel()
                     event_manager.on_end(data={})
-                    events.append(None)
                     break
                 events.append(value.decode("utf-8"))
 
-            if not events:
-                _, value, _ = await main_queue.get()
-                if value is None:
-                    if event_task is not None:
-                        event_task.cancel()
-                    event_manager.on_end(data={})
-                else:
-                    events.append(value.decode("utf-8"))
-
-            content = "\n".join([event for event in events if event is not None])
+            content = "\n".join(events)
             return Response(content=content, media_type="application/x-ndjson")
         except asyncio.CancelledError as exc:
             await logger.ainfo(f"Event polling was cancelled for job {job_id}")
@@ -210,7 +207,8 @@ async def create_flow_response(
     契约：
     - 输入：`queue` 元素为 `(event_id, payload, put_time)`，其中 `payload=None` 表示流结束。
     - 输出：`DisconnectHandlerStreamingResponse`，`media_type=application/x-ndjson`。
-    - 副作用：客户端断开时取消 `event_task` 并触发 `event_manager.on_end`。
+    - 副作用：客户端断开时取消本进程的 `event_task` 并触发 `event_manager.on_end`；
+      其他 worker 上的作业（`RemoteJobTask`）只结束本地推流，不取消作业也不写结束标记。
     失败语义：消费队列异常时中止流并记录日志 `Error consuming event`。
     """
 
@@ -228,6 +226,10 @@ async def create_flow_response(
                 break
 
     def on_disconnect() -> None:
+        if isinstance(event_task, RemoteJobTask):
+            # 注意：远端作业可能仍有其他消费者；断开后本地推流由响应自行结束，作业继续运行。
+            logger.debug("Client disconnected from remote job stream")
+            return
         logger.debug("Client disconnected, closing tasks")
         event_task.cancel()
         event_manager.on_end(data={})
@@ -436,6 +438,8 @@ async def generate_flow_events(
 
             result_data_response.message = artifacts
 
+            # 注意：`delta` 检查点模式下每个顶点只写增量，整图基线已在启动构建时写入。
+            checkpointed = graph.checkpoint_vertex(vertex_id)
             if not vertex.will_stream and log_builds:
                 background_tasks.add_task(
                     log_vertex_build,
@@ -446,7 +450,7 @@ async def generate_flow_events(
                     data=result_data_response,
                     artifacts=artifacts,
                 )
-            else:
+            elif not checkpointed:
                 await chat_service.set_cache(flow_id_str, graph)
 
             timedelta = time.perf_counter() - start_time
@@ -594,6 +598,7 @@ async def generate_flow_events(
 
     event_manager.on_end(data={})
     await graph.end_all_traces()
+    await graph.clear_checkpoints()
     await event_manager.queue.put((None, None, time.time()))
 
 
@@ -604,7 +609,7 @@ async def cancel_flow_build(
 ) -> bool:
     """取消构建任务并验证取消状态。
 
-    契约：返回 `True` 表示已取消或无需取消；返回 `False` 表示任务仍在运行。
+    契约：返回 `True` 表示已取消、无需取消或已向其他 worker 上的作业发出取消请求；返回 `False` 表示任务仍在运行。
     副作用：调用队列清理，触发任务取消。
     关键路径（三步）：
     1) 读取事件任务并检查是否已完成。
@@ -613,7 +618,7 @@ async def cancel_flow_build(
     失败语义：`cleanup_job` 抛 `CancelledError` 时会根据任务状态决定是否继续抛出。
     排障入口：日志关键字 `Failed to cancel flow build` / `Successfully cancelled flow build`。
     """
-    _, _, event_task, _ = queue_service.get_queue_data(job_id)
+    _, _, event_task, _ = await queue_service.aget_queue_data(job_id)
 
     if event_task is None:
         await logger.awarning(f"No event task found for job_id {job_id}")
@@ -623,6 +628,12 @@ async def cancel_flow_build(
         await logger.ainfo(f"Task for job_id {job_id} is already completed")
         return True
 
+    if isinstance(event_task, RemoteJobTask):
+        # 注意：作业在其他 worker 上运行，只能写入取消请求，由所属 worker 在下一个轮询周期内取消。
+        await event_task.request_cancel()
+        await logger.ainfo(f"Cancellation requested for flow build job_id {job_id} running on another worker")
+        return True
+
     task_before_cleanup = event_task
 
     try:
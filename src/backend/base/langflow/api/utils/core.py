@@ -15,6 +15,7 @@ from lfx.utils.validate_cloud import raise_error_if_astra_cloud_disable_componen
 from sqlalchemy import delete
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from langflow.processing.graph_cache import invalidate_compiled_flow
 from langflow.services.auth.utils import get_current_active_user, get_current_active_user_mcp
 from langflow.services.database.models.flow.model import Flow
 from langflow.services.database.models.message.model import MessageTable
@@ -331,6 +332,7 @@ async def cascade_delete_flow(session: AsyncSession, flow_id: uuid.UUID) -> None
     except Exception as e:
         msg = f"Unable to cascade delete flow: {flow_id}"
         raise RuntimeError(msg, e) from e
+    invalidate_compiled_flow(flow_id)
 
 
 def custom_params(
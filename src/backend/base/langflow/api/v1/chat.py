@@ -302,6 +302,8 @@ async def build_vertex(
     start_time = time.perf_counter()
     error_message = None
     run_id = None
+    # 注意：`delta` 检查点模式下只有缓存中已有整图基线时才写增量，否则本次需整图写入作为基线。
+    base_cached = False
     try:
         graph: Graph = await chat_service.get_cache(flow_id_str)
     except KeyError as exc:
@@ -323,8 +325,11 @@ async def build_vertex(
             graph.set_run_id(run_id)
         else:
             graph = cache.get("result")
+            # 注意：`delta` 检查点模式下缓存中的整图只是基线，需回放其后的增量。
+            await graph.restore_checkpoints(chat_service.get_cache)
             await graph.initialize_run()
             run_id = graph.run_id
+            base_cached = True
         vertex = graph.get_vertex(vertex_id)
 
         try:
@@ -363,6 +368,7 @@ async def build_vertex(
             # If there's an error building the vertex
             # we need to clear the cache
             await chat_service.clear_cache(flow_id_str)
+            base_cached = False
 
         result_data_response.message = artifacts
 
@@ -395,7 +401,8 @@ async def build_vertex(
         graph.reset_inactivated_vertices()
         graph.reset_activated_vertices()
 
-        await chat_service.set_cache(flow_id_str, graph)
+        if not (base_cached and graph.checkpoint_vertex(vertex_id)):
+            await chat_service.set_cache(flow_id_str, graph)
 
         # graph.stop_vertex tells us if the user asked
         # to stop the build of the graph at a certain vertex
@@ -406,6 +413,7 @@ async def build_vertex(
 
         if not graph.run_manager.vertices_being_run and not next_runnable_vertices:
             background_tasks.add_task(graph.end_all_traces_in_context())
+            background_tasks.add_task(graph.clear_checkpoints)
 
         build_response = VertexBuildResponse(
             inactivated_vertices=list(set(inactivated_vertices)),
@@ -476,6 +484,7 @@ async def _stream_vertex(flow_id: str, vertex_id: str, chat_service: ChatService
             return
         else:
             graph = cache.get("result")
+            await graph.restore_checkpoints(chat_service.get_cache)
 
         try:
             vertex: InterfaceVertex = graph.get_vertex(vertex_id)
@@ -535,7 +544,7 @@ async def _stream_vertex(flow_id: str, vertex_id: str, chat_service: ChatService
             return
     finally:
         await logger.adebug("Closing stream")
-        if graph:
+        if graph and not graph.checkpoint_vertex(vertex_id):
             await chat_service.set_cache(flow_id, graph)
         yield str(StreamData(event="close", data={"message": "Stream closed"}))
 
@@ -31,6 +31,7 @@ from lfx.custom.utils import (
     get_instance_name,
     update_component_build_config,
 )
+from lfx.events.event_manager import token_flush_options
 from lfx.graph.graph.base import Graph
 from lfx.graph.schema import RunOutputs
 from lfx.log.logger import logger
@@ -54,6 +55,7 @@ from langflow.exceptions.api import APIException, InvalidChatInputError
 from langflow.exceptions.serialization import SerializationError
 from langflow.helpers.flow import get_flow_by_id_or_endpoint_name
 from langflow.interface.initialize.loading import update_params_with_load_from_db_fields
+from langflow.processing.graph_cache import build_graph_for_run
 from langflow.processing.process import process_tweaks, run_graph_internal
 from langflow.schema.graph import Tweaks
 from langflow.services.auth.utils import api_key_security, get_current_active_user, get_webhook_user
@@ -63,7 +65,7 @@ from langflow.services.database.models.flow.utils import get_all_webhook_compone
 from langflow.services.database.models.user.model import User, UserRead
 from langflow.services.deps import get_session_service, get_settings_service, get_telemetry_service
 from langflow.services.telemetry.schema import RunPayload
-from langflow.utils.compression import compress_response
+from langflow.utils.compression import PrecompressedJSON, precompress_json, precompressed_response
 from langflow.utils.version import get_version_info
 
 if TYPE_CHECKING:
@@ -95,18 +97,44 @@ async def parse_input_request_from_body(http_request: Request) -> SimplifiedAPIR
         return SimplifiedAPIRequest()
 
 
+# 注意：`(组件字典, 版本, 预压缩结果)`；组件字典重建或原地修改（`component_cache.version` 递增）后失效。
+_catalog_payload: tuple[dict, int, PrecompressedJSON] | None = None
+_catalog_lock = asyncio.Lock()
+
+
+async def _get_catalog_payload(all_types: dict) -> PrecompressedJSON:
+    """返回组件目录的预压缩负载，只在组件字典变化后重新序列化与压缩。"""
+    global _catalog_payload  # noqa: PLW0603
+    from lfx.interface.components import component_cache
+
+    cached = _catalog_payload
+    if cached is not None and cached[0] is all_types and cached[1] == component_cache.version:
+        return cached[2]
+    async with _catalog_lock:
+        cached = _catalog_payload
+        version = component_cache.version
+        if cached is not None and cached[0] is all_types and cached[1] == version:
+            return cached[2]
+        # 性能：约 4 MB 的序列化与压缩放到线程中，避免阻塞事件循环。
+        payload = await asyncio.to_thread(precompress_json, all_types)
+        _catalog_payload = (all_types, version, payload)
+        return payload
+
+
 @router.get("/all", dependencies=[Depends(get_current_active_user)])
-async def get_all():
+async def get_all(request: Request):
     """Retrieve all component types with compression for better performance.
 
-    Returns a compressed response containing all available component types.
+    Returns a precompressed response containing all available component types. The catalog is
+    serialized and compressed once per component cache version and served with a strong ETag;
+    requests carrying a matching ``If-None-Match`` header get a 304.
     """
     from langflow.interface.components import get_and_cache_all_types_dict
 
     try:
         all_types = await get_and_cache_all_types_dict(settings_service=get_settings_service())
-        # Return compressed response using our utility function
-        return compress_response(all_types)
+        payload = await _get_catalog_payload(all_types)
+        return precompressed_response(payload, request, cache_control="private, no-cache")
 
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
@@ -170,14 +198,8 @@ async def simple_run_flow(
         task_result: list[RunOutputs] = []
         user_id = api_key_user.id if api_key_user else None
         flow_id_str = str(flow.id)
-        if flow.data is None:
-            msg = f"Flow {flow_id_str} has no data"
-            raise ValueError(msg)
-        graph_data = flow.data.copy()
-        graph_data = process_tweaks(graph_data, input_request.tweaks or {}, stream=stream)
-        graph = Graph.from_payload(
-            graph_data, flow_id=flow_id_str, user_id=str(user_id), flow_name=flow.name, context=context
-        )
+        # 性能：热点 flow 命中编译图缓存，跳过 tweaks 应用与组件代码编译（见 `processing/graph_cache.py`）。
+        graph = build_graph_for_run(flow, input_request.tweaks, stream=stream, user_id=str(user_id), context=context)
         if run_id is None:
             run_id = str(uuid4())
         graph.set_run_id(run_id)
@@ -428,7 +450,9 @@ async def _run_flow_internal(
     if stream:
         asyncio_queue: asyncio.Queue = asyncio.Queue()
         asyncio_queue_client_consumed: asyncio.Queue = asyncio.Queue()
-        event_manager = create_stream_tokens_event_manager(queue=asyncio_queue)
+        event_manager = create_stream_tokens_event_manager(
+            queue=asyncio_queue, **token_flush_options(get_settings_service().settings)
+        )
         main_task = asyncio.create_task(
             run_flow_generator(
                 flow=flow,
@@ -37,6 +37,7 @@ from langflow.api.utils import CurrentActiveUser, DbSession, cascade_delete_flow
 from langflow.api.v1.schemas import FlowListCreate
 from langflow.helpers.user import get_user_by_flow_id_or_endpoint_name
 from langflow.initial_setup.constants import STARTER_FOLDER_NAME
+from langflow.processing.graph_cache import invalidate_compiled_flow
 from langflow.services.auth.utils import get_current_active_user
 from langflow.services.database.models.flow.model import (
     AccessTypeEnum,
@@ -275,6 +276,7 @@ async def create_flow(
         await session.flush()
         await session.refresh(db_flow)
         await _save_flow_to_fs(db_flow, current_user.id, storage_service)
+        invalidate_compiled_flow(db_flow.id)
 
         # Convert to FlowRead while session is still active to avoid detached instance errors
         flow_read = FlowRead.model_validate(db_flow, from_attributes=True)
@@ -479,6 +481,7 @@ async def update_flow(
         await session.flush()
         await session.refresh(db_flow)
         await _save_flow_to_fs(db_flow, current_user.id, storage_service)
+        invalidate_compiled_flow(db_flow.id)
 
         # Convert to FlowRead while session is still active to avoid detached instance errors
         flow_read = FlowRead.model_validate(db_flow, from_attributes=True)
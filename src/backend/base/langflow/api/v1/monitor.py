@@ -4,7 +4,7 @@
 本模块提供构建记录、消息记录与交易日志的查询与维护能力。
 主要功能：
 - 查询/删除顶点构建记录
-- 查询/更新/删除消息记录与会话
+- 查询/更新/删除消息记录与会话（消息与会话列表支持游标分页）
 - 分页获取交易日志
 设计背景：为运维与排障提供统一的监控入口。
 注意事项：接口需鉴权，异常统一转为 500。
@@ -13,7 +13,7 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from fastapi_pagination import Page, Params
 from fastapi_pagination.ext.sqlmodel import apaginate
 from sqlalchemy import delete
@@ -23,6 +23,11 @@ from langflow.api.utils import DbSession, custom_params
 from langflow.schema.message import MessageResponse
 from langflow.services.auth.utils import get_current_active_user
 from langflow.services.database.models.flow.model import Flow
+from langflow.services.database.models.message.crud import (
+    apply_message_cursor,
+    decode_message_cursor,
+    encode_message_cursor,
+)
 from langflow.services.database.models.message.model import MessageRead, MessageTable, MessageUpdate
 from langflow.services.database.models.transactions.crud import transform_transaction_table_for_logs
 from langflow.services.database.models.transactions.model import TransactionLogsResponse, TransactionTable
@@ -35,6 +40,10 @@ from langflow.services.database.models.vertex_builds.model import VertexBuildMap
 
 router = APIRouter(prefix="/monitor", tags=["Monitor"])
 
+# 注意：分页请求的下一页游标通过响应头返回，响应体保持列表形态以兼容现有客户端。
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 1000
+
 
 @router.get("/builds", dependencies=[Depends(get_current_active_user)])
 async def get_vertex_builds(flow_id: Annotated[UUID, Query()], session: DbSession) -> VertexBuildMapModel:
@@ -59,9 +68,16 @@ async def delete_vertex_builds(flow_id: Annotated[UUID, Query()], session: DbSes
 async def get_message_sessions(
     session: DbSession,
     current_user: Annotated[User, Depends(get_current_active_user)],
+    response: Response,
     flow_id: Annotated[UUID | None, Query()] = None,
+    limit: Annotated[int | None, Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: Annotated[str | None, Query()] = None,
 ) -> list[str]:
-    """获取当前用户的消息会话 ID 列表。"""
+    """获取当前用户的消息会话 ID 列表。
+
+    契约：传入 `limit` 时按 `session_id` 升序分页，`cursor` 为上一页最后一个会话 ID；
+    还有下一页时在 `X-Next-Cursor` 响应头返回游标。
+    """
     try:
         # 性能：使用 JOIN 替代子查询。
         stmt = select(MessageTable.session_id).distinct()
@@ -71,24 +87,48 @@ async def get_message_sessions(
 
         if flow_id:
             stmt = stmt.where(MessageTable.flow_id == flow_id)
-
-        session_ids = await session.exec(stmt)
-        return list(session_ids)
+        if cursor:
+            stmt = stmt.where(MessageTable.session_id > cursor)
+        if limit:
+            stmt = stmt.order_by(MessageTable.session_id).limit(limit + 1)
+
+        session_ids = list(await session.exec(stmt))
+        if limit and len(session_ids) > limit:
+            session_ids = session_ids[:limit]
+            response.headers[NEXT_CURSOR_HEADER] = session_ids[-1]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
+    else:
+        return session_ids
 
 
 @router.get("/messages")
 async def get_messages(
     session: DbSession,
     current_user: Annotated[User, Depends(get_current_active_user)],
+    response: Response,
     flow_id: Annotated[UUID | None, Query()] = None,
     session_id: Annotated[str | None, Query()] = None,
     sender: Annotated[str | None, Query()] = None,
     sender_name: Annotated[str | None, Query()] = None,
     order_by: Annotated[str | None, Query()] = "timestamp",
+    limit: Annotated[int | None, Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: Annotated[str | None, Query()] = None,
 ) -> list[MessageResponse]:
-    """按条件查询消息列表。"""
+    """按条件查询消息列表。
+
+    契约：传入 `limit` 时按 `(timestamp, id)` 键集分页，`cursor` 取自上一页的 `X-Next-Cursor` 响应头；
+    不传 `limit` 时返回全部匹配消息（兼容旧行为）。
+    失败语义：分页参数配合非 `timestamp` 排序或游标不合法时返回 400。
+    """
+    paginated = limit is not None or cursor is not None
+    if paginated and order_by != "timestamp":
+        raise HTTPException(status_code=400, detail="Cursor pagination requires order_by=timestamp")
+    if cursor is not None:
+        try:
+            decode_message_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
     try:
         # 性能：使用 JOIN 替代子查询。
         stmt = select(MessageTable)
@@ -106,10 +146,17 @@ async def get_messages(
             stmt = stmt.where(MessageTable.sender == sender)
         if sender_name:
             stmt = stmt.where(MessageTable.sender_name == sender_name)
-        if order_by:
+        if paginated:
+            stmt = apply_message_cursor(stmt, cursor, descending=False)
+            if limit:
+                stmt = stmt.limit(limit + 1)
+        elif order_by:
             order_col = getattr(MessageTable, order_by).asc()
             stmt = stmt.order_by(order_col)
-        messages = await session.exec(stmt)
+        messages = list(await session.exec(stmt))
+        if limit and len(messages) > limit:
+            messages = messages[:limit]
+            response.headers[NEXT_CURSOR_HEADER] = encode_message_cursor(messages[-1])
         return [MessageResponse.model_validate(d, from_attributes=True) for d in messages]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
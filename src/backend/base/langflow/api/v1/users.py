@@ -27,6 +27,7 @@ from langflow.services.auth.utils import (
     get_password_hash,
     verify_password,
 )
+from langflow.services.database.models.api_key.cache import invalidate_api_key_user
 from langflow.services.database.models.user.crud import get_user_by_id, update_user
 from langflow.services.database.models.user.model import User, UserCreate, UserRead, UserUpdate
 from langflow.services.deps import get_settings_service
@@ -159,4 +160,5 @@ async def delete_user(
         raise HTTPException(status_code=404, detail="User not found")
 
     await session.delete(user_db)
+    invalidate_api_key_user(user_id)
     return {"detail": "User deleted"}
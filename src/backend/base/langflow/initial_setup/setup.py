@@ -78,13 +78,15 @@ def update_projects_components_with_latest_component_versions(project_data, all_
     失败语义：项目结构不完整时可能抛 `KeyError/TypeError`。
     """
     # 便于按 `node_type` 快速索引组件定义
-    all_types_dict_flat = {}
-    for category in all_types_dict.values():
-        for key, component in category.items():
-            # 注意：`hash_history` 仅用于组件索引追踪，不应写入保存的流程
-            if "metadata" in component and "hash_history" in component["metadata"]:
-                del component["metadata"]["hash_history"]
-            all_types_dict_flat[key] = component
+    # 性能：只按键记录所属类别，命中节点类型时才取模板（懒加载索引下避免解码全部组件）
+    all_types_dict_flat = {key: category for category in all_types_dict.values() for key in category}
+
+    def get_latest_component(node_type):
+        component = all_types_dict_flat[node_type][node_type]
+        # 注意：`hash_history` 仅用于组件索引追踪，不应写入保存的流程
+        if "metadata" in component and "hash_history" in component["metadata"]:
+            del component["metadata"]["hash_history"]
+        return component
 
     node_changes_log = defaultdict(list)
     project_data_copy = deepcopy(project_data)
@@ -94,7 +96,7 @@ def update_projects_components_with_latest_component_versions(project_data, all_
         node_type = node.get("data").get("type")
 
         if node_type in all_types_dict_flat:
-            latest_node = all_types_dict_flat.get(node_type)
+            latest_node = get_latest_component(node_type)
             latest_template = latest_node.get("template")
             node_data["template"]["code"] = latest_template["code"]
             # 注意：跳过需要持久化动态模板值的组件
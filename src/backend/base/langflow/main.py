@@ -219,7 +219,7 @@ def get_lifespan(*, fix_migration=False, version=None):
 
     @asynccontextmanager
     async def lifespan(_app: FastAPI):
-        from lfx.interface.components import get_and_cache_all_types_dict
+        from lfx.interface.components import component_cache, get_and_cache_all_types_dict
 
         configure()
 
@@ -266,6 +266,9 @@ def get_lifespan(*, fix_migration=False, version=None):
             await logger.adebug("Loading bundles")
             temp_dirs, bundles_components_paths = await load_bundles_with_error_handling()
             get_settings_service().settings.components_path.extend(bundles_components_paths)
+            if bundles_components_paths:
+                # 注意：组件字典可能已按旧目录构建，丢弃后按包含 bundle 的目录重新加载。
+                component_cache.invalidate()
             await logger.adebug(f"Bundles loaded in {asyncio.get_event_loop().time() - current_time:.2f}s")
 
             current_time = asyncio.get_event_loop().time()
@@ -12,7 +12,6 @@
 """
 
 import asyncio
-import json
 from collections.abc import Sequence
 from uuid import UUID
 
@@ -20,12 +19,14 @@ from langchain_core.chat_history import BaseChatMessageHistory
 from langchain_core.messages import BaseMessage
 from lfx.log.logger import logger
 from lfx.utils.async_helpers import run_until_complete
-from sqlalchemy import delete
+from sqlalchemy import delete, insert
 from sqlmodel import col, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from langflow.schema.message import Message
+from langflow.services.database.models.message.crud import apply_message_cursor, encode_message_cursor
 from langflow.services.database.models.message.model import MessageRead, MessageTable
+from langflow.services.database.models.message.writer import get_message_writer
 from langflow.services.deps import session_scope
 
 
@@ -38,6 +39,7 @@ def _get_variable_query(
     order: str | None = "DESC",
     flow_id: UUID | None = None,
     limit: int | None = None,
+    cursor: str | None = None,
 ):
     """构建动态消息查询语句
     
@@ -50,9 +52,9 @@ def _get_variable_query(
     关键路径（三步）：
     1) 创建基础查询语句（排除错误消息）
     2) 根据提供的参数添加WHERE条件
-    3) 添加排序和限制条件
+    3) 添加排序和限制条件（按 `timestamp` 排序时追加 `id` 作为稳定次序，并按 `cursor` 键集翻页）
     
-    异常流：无特殊异常处理
+    异常流：`cursor` 配合非 `timestamp` 排序或格式不合法时抛 `ValueError`
     性能瓶颈：查询条件过多可能导致性能下降
     排障入口：无特定日志关键字
     """
@@ -67,7 +69,12 @@ def _get_variable_query(
         stmt = stmt.where(MessageTable.context_id == context_id)
     if flow_id:
         stmt = stmt.where(MessageTable.flow_id == flow_id)
-    if order_by:
+    if cursor and order_by != "timestamp":
+        msg = "Cursor pagination requires order_by='timestamp'"
+        raise ValueError(msg)
+    if order_by == "timestamp":
+        stmt = apply_message_cursor(stmt, cursor, descending=order == "DESC")
+    elif order_by:
         col_attr = getattr(MessageTable, order_by).desc() if order == "DESC" else getattr(MessageTable, order_by).asc()
         stmt = stmt.order_by(col_attr)
     if limit:
@@ -84,6 +91,7 @@ def get_messages(
     order: str | None = "DESC",
     flow_id: UUID | None = None,
     limit: int | None = None,
+    cursor: str | None = None,
 ) -> list[Message]:
     """【已弃用】根据提供的过滤器从监控服务检索消息
     
@@ -98,6 +106,7 @@ def get_messages(
         order (Optional[str]): 检索消息的顺序，默认为"DESC"
         flow_id (Optional[UUID]): 与消息关联的流程ID
         limit (Optional[int]): 检索消息的最大数量
+        cursor (Optional[str]): 上一页返回的游标（`aget_messages_page`），仅支持按`timestamp`排序
     
     返回：
         List[Message]: 表示检索到消息的Message对象列表
@@ -121,6 +130,7 @@ def get_messages(
             order,
             flow_id,
             limit,
+            cursor,
         )
     )
 
@@ -134,6 +144,7 @@ async def aget_messages(
     order: str | None = "DESC",
     flow_id: UUID | None = None,
     limit: int | None = None,
+    cursor: str | None = None,
 ) -> list[Message]:
     """根据提供的过滤器从监控服务检索消息
     
@@ -146,6 +157,7 @@ async def aget_messages(
         order (Optional[str]): 检索消息的顺序，默认为"DESC"
         flow_id (Optional[UUID]): 与消息关联的流程ID
         limit (Optional[int]): 检索消息的最大数量
+        cursor (Optional[str]): 上一页返回的游标（`aget_messages_page`），仅支持按`timestamp`排序
     
     返回：
         List[Message]: 表示检索到消息的Message对象列表
@@ -160,11 +172,43 @@ async def aget_messages(
     排障入口：无特定日志关键字
     """
     async with session_scope() as session:
-        stmt = _get_variable_query(sender, sender_name, session_id, context_id, order_by, order, flow_id, limit)
+        stmt = _get_variable_query(sender, sender_name, session_id, context_id, order_by, order, flow_id, limit, cursor)
         messages = await session.exec(stmt)
         return [await Message.create(**d.model_dump()) for d in messages]
 
 
+async def aget_messages_page(
+    sender: str | None = None,
+    sender_name: str | None = None,
+    session_id: str | UUID | None = None,
+    context_id: str | None = None,
+    order: str | None = "DESC",
+    flow_id: UUID | None = None,
+    *,
+    limit: int,
+    cursor: str | None = None,
+) -> tuple[list[Message], str | None]:
+    """按 `timestamp` 键集分页检索消息，返回 `(messages, next_cursor)`。
+
+    契约：`next_cursor` 为 `None` 表示没有下一页；将其作为下一次调用的 `cursor` 继续翻页。
+    决策：游标由数据库行生成，而非由返回的 `Message` 生成
+    问题：`Message.timestamp` 序列化到秒，用它生成的游标会在同一秒内的消息处漏读或重读
+    方案：多取一行判断是否有下一页，并用该页最后一行 `MessageTable` 的完整时间戳编码游标
+    代价：每页多读一行
+    重评：当 `Message` 保留完整精度时间戳时可由调用方自行生成游标
+    """
+    async with session_scope() as session:
+        stmt = _get_variable_query(
+            sender, sender_name, session_id, context_id, "timestamp", order, flow_id, limit + 1, cursor
+        )
+        rows = list(await session.exec(stmt))
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_message_cursor(rows[-1])
+        return [await Message.create(**d.model_dump()) for d in rows], next_cursor
+
+
 def add_messages(messages: Message | list[Message], flow_id: str | UUID | None = None):
     """【已弃用】向监控服务添加消息
     
@@ -182,8 +226,8 @@ async def aadd_messages(messages: Message | list[Message], flow_id: str | UUID |
     3) 将消息转换为数据库模型并保存
     
     异常流：类型验证失败时抛出ValueError，其他异常被记录并重新抛出
-    性能瓶颈：批量插入大量消息可能影响性能
-    排障入口：类型验证错误日志
+    性能瓶颈：开启 `message_write_coalesce_interval` 时写入最多延迟一个合并窗口
+    排障入口：类型验证错误日志；合并写入计数见 `get_message_writer().stats()`
     """
     if not isinstance(messages, list):
         messages = [messages]
@@ -201,9 +245,14 @@ async def aadd_messages(messages: Message | list[Message], flow_id: str | UUID |
 
     try:
         messages_models = [MessageTable.from_message(msg, flow_id=flow_id) for msg in messages]
-        async with session_scope() as session:
-            messages_models = await aadd_messagetables(messages_models, session)
-        return [await Message.create(**message.model_dump()) for message in messages_models]
+        writer = get_message_writer()
+        if writer is not None:
+            # 性能：并发会话的消息在合并窗口内共用一次多行插入与一次提交。
+            messages_read = await writer.submit(messages_models)
+        else:
+            async with session_scope() as session:
+                messages_read = await aadd_messagetables(messages_models, session)
+        return [await Message.create(**message.model_dump()) for message in messages_read]
     except Exception as e:
         await logger.aexception(e)
         raise
@@ -245,8 +294,47 @@ async def aupdate_messages(messages: Message | list[Message]) -> list[Message]:
         return [MessageRead.model_validate(message, from_attributes=True) for message in updated_messages]
 
 
+def _message_rows(messages: list[MessageTable]) -> list[dict]:
+    """把 `MessageTable` 转为按列名索引的插入参数（绕过 ORM 单元工作）。"""
+    columns = MessageTable.__table__.columns
+    return [{column.key: getattr(message, column.key) for column in columns} for message in messages]
+
+
+def _supports_bulk_returning(session: AsyncSession) -> bool:
+    """当前会话的方言是否支持 `executemany` + `RETURNING`（并保证按参数顺序返回）。"""
+    get_bind = getattr(session, "get_bind", None)
+    if get_bind is None:
+        # 注意：`NoopSession` 没有绑定引擎。
+        return False
+    dialect = get_bind().dialect
+    return bool(
+        getattr(dialect, "insert_executemany_returning", False)
+        and getattr(dialect, "insert_executemany_returning_sort_by_parameter_order", False)
+    )
+
+
+async def _bulk_insert_messagetables(messages: list[MessageTable], session: AsyncSession) -> list[dict]:
+    """以一条多行 `INSERT ... RETURNING` 写入消息并提交，返回落库后的列值。
+
+    性能：SQLAlchemy 的 insertmanyvalues 把整批参数渲染为多行 `VALUES`（超出方言参数上限时自动分段），
+    替代逐条 `add` + `refresh` 的 1 + N 次往返。
+    注意：不支持 `RETURNING` 的方言（或 `NoopSession`）直接返回插入参数；
+    所有列均由客户端生成（`id`/`timestamp` 为默认工厂），两者内容一致。
+    """
+    rows = _message_rows(messages)
+    table = MessageTable.__table__
+    if _supports_bulk_returning(session):
+        stmt = insert(table).returning(*table.columns, sort_by_parameter_order=True)
+        result = await session.exec(stmt, params=rows)  # type: ignore[call-overload]
+        rows = [dict(row) for row in result.mappings()]
+    else:
+        await session.exec(insert(table), params=rows)  # type: ignore[call-overload]
+    await session.commit()
+    return rows
+
+
 async def aadd_messagetables(messages: list[MessageTable], session: AsyncSession, retry_count: int = 0):
-    """使用重试逻辑添加消息到数据库以处理CancelledError
+    """使用重试逻辑批量添加消息到数据库以处理CancelledError
     
     决策：实现CancelledError的重试机制
     问题：在build_public_tmp调用时可能出现CancelledError，但在build_flow中不会
@@ -260,22 +348,21 @@ async def aadd_messagetables(messages: list[MessageTable], session: AsyncSession
         retry_count: 内部重试计数器（最大3次以防止无限循环）
     
     关键路径（三步）：
-    1) 尝试添加消息到数据库并提交事务
+    1) 以一条多行 `INSERT ... RETURNING` 写入全部消息并提交事务
     2) 如果发生CancelledError则回滚并重试（最多3次）
-    3) 刷新消息并处理JSON属性
+    3) 由返回的列值直接构造 `MessageRead`（不再逐条 `refresh`）
     
     异常流：超出重试次数时抛出ValueError，其他异常被记录并重新抛出
     性能瓶颈：重试机制可能增加操作完成时间
     排障入口：重试次数达到上限的警告日志
+    注意：传入的 `MessageTable` 不会加入会话（不进入 identity map），调用方应使用返回值。
     """
+    if not messages:
+        return []
     max_retries = 3
     try:
         try:
-            for message in messages:
-                result = session.add(message)
-                if asyncio.iscoroutine(result):
-                    await result
-            await session.commit()
+            rows = await _bulk_insert_messagetables(messages, session)
             # 这是一个变通方案
             # 我们这样做是因为build_public_tmp会导致CancelledError被抛出
             # 而build_flow不会
@@ -288,8 +375,6 @@ async def aadd_messagetables(messages: list[MessageTable], session: AsyncSession
                 error_msg = "Add Message operation cancelled after multiple retries"
                 raise ValueError(error_msg) from None
             return await aadd_messagetables(messages, session, retry_count + 1)
-        for message in messages:
-            await session.refresh(message)
     except asyncio.CancelledError as e:
         await logger.aexception(e)
         error_msg = "Operation cancelled"
@@ -298,14 +383,9 @@ async def aadd_messagetables(messages: list[MessageTable], session: AsyncSession
         await logger.aexception(e)
         raise
 
-    new_messages = []
-    for msg in messages:
-        msg.properties = json.loads(msg.properties) if isinstance(msg.properties, str) else msg.properties  # type: ignore[arg-type]
-        msg.content_blocks = [json.loads(j) if isinstance(j, str) else j for j in msg.content_blocks]  # type: ignore[arg-type]
-        msg.category = msg.category or ""
-        new_messages.append(msg)
-
-    return [MessageRead.model_validate(message, from_attributes=True) for message in new_messages]
+    for row in rows:
+        row["category"] = row.get("category") or ""
+    return [MessageRead.model_validate(row) for row in rows]
 
 
 def delete_messages(session_id: str | None = None, context_id: str | None = None) -> None:
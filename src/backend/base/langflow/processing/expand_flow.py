@@ -17,6 +17,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 
 from pydantic import BaseModel, Field
@@ -71,7 +72,7 @@ def _get_flat_components(all_types_dict: dict[str, Any]) -> dict[str, Any]:
     return {
         comp_name: comp_data
         for components in all_types_dict.values()
-        if isinstance(components, dict)
+        if isinstance(components, Mapping)
         for comp_name, comp_data in components.items()
     }
 
@@ -0,0 +1,220 @@
+"""
+模块名称：编译图模板缓存
+
+本模块为 `/api/v1/run` 提供进程内的编译图缓存，避免热点 flow 每次请求都重新
+应用 tweaks、解析节点并执行组件代码。主要功能包括：
+- 按 `(flow_id, updated_at, tweaks 指纹, stream)` 缓存不可变的图模板
+- 从模板低成本地生成每次运行独立的 `Graph` 实例
+- LRU 容量淘汰与 flow 保存/删除时的失效
+
+关键组件：
+- `CompiledFlowTemplate`：不可变图模板（payload 字节 + 组件类映射）
+- `CompiledFlowCache`：线程安全的 LRU 缓存
+- `build_graph_for_run`：运行入口使用的“命中复用/未命中编译”封装
+
+设计背景：小型对话 flow 的 `Graph.from_payload` 成本（主要是组件代码 parse/exec）
+高于组件本身执行耗时。
+注意事项：模板从不直接执行；每次运行都得到全新的顶点与组件实例，运行态不共享。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+import orjson
+from lfx.graph.graph.base import Graph
+from lfx.log.logger import logger
+
+from langflow.processing.process import process_tweaks
+from langflow.services.deps import get_settings_service
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from langflow.schema.graph import Tweaks
+    from langflow.services.database.models.flow.model import Flow
+
+CacheKey = tuple[str, str, str, bool]
+
+
+@dataclass(frozen=True)
+class CompiledFlowTemplate:
+    """已应用 tweaks 的不可变图模板。
+
+    契约：`payload` 为 orjson 编码字节，`component_classes` 为只读映射；二者创建后不再修改。
+    注意：模板不持有 `Graph` 实例，避免运行态（顶点结果、组件输出）跨请求泄漏。
+    """
+
+    flow_id: str
+    flow_name: str | None
+    payload: bytes
+    component_classes: Mapping[str, type] = field(default_factory=lambda: MappingProxyType({}))
+
+    def instantiate(self, *, user_id: str | None = None, context: dict | None = None) -> Graph:
+        """生成一次运行专用的 `Graph`。
+
+        性能：`orjson.loads` 复原 payload 比 `deepcopy` 快，且组件类直接复用，跳过代码编译。
+        """
+        return Graph.from_payload(
+            orjson.loads(self.payload),
+            flow_id=self.flow_id,
+            flow_name=self.flow_name,
+            user_id=user_id,
+            context=context,
+            component_classes=dict(self.component_classes),
+        )
+
+
+class CompiledFlowCache:
+    """按 flow 版本与 tweaks 指纹索引的 LRU 模板缓存。
+
+    契约：`max_size<=0` 时关闭缓存，`get` 恒返回 None、`put` 不落盘。
+    并发：内部使用 `threading.Lock`，可被多个事件循环线程共享。
+    排障：`stats()` 返回 `hits/misses/evictions/size`，命中率低时检查 tweaks 是否含随机值。
+    """
+
+    def __init__(self, max_size: int = 128) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[CacheKey, CompiledFlowTemplate] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(flow: Flow, tweaks: Tweaks | dict[str, Any] | None, *, stream: bool) -> CacheKey | None:
+        """计算缓存键；无法稳定指纹化时返回 None（调用方应走非缓存路径）。
+
+        决策：以 `updated_at` 作为版本号，多 worker 下也能在保存后自然失效。
+        """
+        if flow.updated_at is None:
+            return None
+        tweaks_dict = tweaks.model_dump() if tweaks is not None and not isinstance(tweaks, dict) else tweaks or {}
+        try:
+            encoded = orjson.dumps(tweaks_dict, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return None
+        fingerprint = hashlib.sha256(encoded).hexdigest()
+        return (str(flow.id), flow.updated_at.isoformat(), fingerprint, stream)
+
+    def get(self, key: CacheKey) -> CompiledFlowTemplate | None:
+        if self.max_size <= 0:
+            return None
+        with self._lock:
+            template = self._entries.get(key)
+            if template is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return template
+
+    def put(self, key: CacheKey, template: CompiledFlowTemplate) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = template
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, flow_id: str) -> int:
+        """移除某个 flow 的全部模板（任意版本/tweaks），返回移除条数。"""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == flow_id]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+
+_compiled_flow_cache: CompiledFlowCache | None = None
+
+
+def get_compiled_flow_cache() -> CompiledFlowCache:
+    """返回进程级缓存单例；容量取自 `flow_graph_cache_size`，首次调用时确定。"""
+    global _compiled_flow_cache  # noqa: PLW0603
+    if _compiled_flow_cache is None:
+        _compiled_flow_cache = CompiledFlowCache(max_size=get_settings_service().settings.flow_graph_cache_size)
+    return _compiled_flow_cache
+
+
+def invalidate_compiled_flow(flow_id: Any) -> None:
+    """flow 保存或删除后调用，释放该 flow 已缓存的模板。"""
+    if _compiled_flow_cache is None:
+        return
+    removed = _compiled_flow_cache.invalidate(str(flow_id))
+    if removed:
+        logger.debug(f"Invalidated {removed} compiled graph template(s) for flow {flow_id}")
+
+
+def build_graph_for_run(
+    flow: Flow,
+    tweaks: Tweaks | dict[str, Any] | None,
+    *,
+    stream: bool = False,
+    user_id: str | None = None,
+    context: dict | None = None,
+) -> Graph:
+    """返回一次运行专用的 `Graph`，热点 flow 命中模板缓存。
+
+    关键路径（三步）：
+    1) 计算缓存键并尝试命中模板
+    2) 未命中时应用 tweaks 并在构建前序列化 payload
+    3) 构建图后提取各顶点组件类，写入模板
+    失败语义：payload 无法 JSON 编码时仅跳过缓存，构建异常原样上抛。
+    """
+    flow_id_str = str(flow.id)
+    cache = get_compiled_flow_cache()
+    key = CompiledFlowCache.make_key(flow, tweaks, stream=stream) if cache.max_size > 0 else None
+    if key is not None and (template := cache.get(key)) is not None:
+        return template.instantiate(user_id=user_id, context=context)
+
+    if flow.data is None:
+        msg = f"Flow {flow_id_str} has no data"
+        raise ValueError(msg)
+    graph_data = flow.data.copy()
+    graph_data = process_tweaks(graph_data, tweaks or {}, stream=stream)
+    payload: bytes | None = None
+    if key is not None:
+        # 注意：必须在 `from_payload` 之前编码，顶点构建会就地改写节点字典。
+        try:
+            payload = orjson.dumps(graph_data)
+        except TypeError:
+            logger.debug(f"Flow {flow_id_str} payload is not JSON serializable; skipping graph cache")
+
+    graph = Graph.from_payload(graph_data, flow_id=flow_id_str, user_id=user_id, flow_name=flow.name, context=context)
+
+    if key is not None and payload is not None:
+        component_classes = {
+            vertex.id: type(vertex.custom_component) for vertex in graph.vertices if vertex.custom_component is not None
+        }
+        cache.put(
+            key,
+            CompiledFlowTemplate(
+                flow_id=flow_id_str,
+                flow_name=flow.name,
+                payload=payload,
+                component_classes=MappingProxyType(component_classes),
+            ),
+        )
+    return graph
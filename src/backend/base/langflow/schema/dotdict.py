@@ -19,7 +19,6 @@ class dotdict(dict):  # noqa: N801
     契约：仅对可作为属性名的键提供点号访问。
     副作用：访问嵌套字典时会就地替换为 `dotdict`，影响后续读取。
     失败语义：访问不存在键抛 `AttributeError`。
-    """
 
     Note:
         - Only keys that are valid attribute names (e.g., strings that could be variable names) are accessible via dot
@@ -93,6 +93,10 @@ class CacheService(Service, Generic[LockType]):
     def __delitem__(self, key) -> None:
         """下标删除语义，等价于 `delete`。"""
 
+    def stats(self) -> dict[str, int | None]:
+        """返回命中/淘汰等运行指标；不统计指标的实现返回空字典。"""
+        return {}
+
 
 class AsyncBaseCacheService(Service, Generic[AsyncLockType]):
     """异步缓存服务抽象基类。
@@ -129,6 +133,10 @@ class AsyncBaseCacheService(Service, Generic[AsyncLockType]):
     async def contains(self, key) -> bool:
         """判断键是否存在于缓存（异步）。"""
 
+    def stats(self) -> dict[str, int | None]:
+        """返回命中/淘汰等运行指标；不统计指标的实现返回空字典。"""
+        return {}
+
 
 class ExternalAsyncBaseCacheService(AsyncBaseCacheService):
     """外部依赖异步缓存抽象基类。
@@ -9,11 +9,10 @@
 - `AsyncDiskCache`：磁盘缓存实现
 
 设计背景：提供与内存缓存一致的接口，同时允许落盘
-注意事项：磁盘操作在后台线程中执行；异常由 `diskcache`/`pickle` 抛出
+注意事项：磁盘操作在后台线程中执行；值由 `CacheSerializer` 编码，异常由 `diskcache`/序列化器抛出
 """
 
 import asyncio
-import pickle
 import time
 from typing import Generic
 
@@ -22,6 +21,7 @@ from lfx.log.logger import logger
 from lfx.services.cache.utils import CACHE_MISS
 
 from langflow.services.cache.base import AsyncBaseCacheService, AsyncLockType
+from langflow.services.cache.serializer import CacheSerializer
 
 
 class AsyncDiskCache(AsyncBaseCacheService, Generic[AsyncLockType]):
@@ -37,8 +37,11 @@ class AsyncDiskCache(AsyncBaseCacheService, Generic[AsyncLockType]):
     重评：当需要保留历史缓存或提供缓存查询接口时
     """
 
-    def __init__(self, cache_dir, max_size=None, expiration_time=3600) -> None:
+    def __init__(
+        self, cache_dir, max_size=None, expiration_time=3600, serializer: CacheSerializer | None = None
+    ) -> None:
         self.cache = Cache(cache_dir)
+        self.serializer = serializer or CacheSerializer()
         if len(self.cache) > 0:
             self.cache.clear()
         self.lock = asyncio.Lock()
@@ -62,7 +65,7 @@ class AsyncDiskCache(AsyncBaseCacheService, Generic[AsyncLockType]):
         if item:
             if time.time() - item["time"] < self.expiration_time:
                 self.cache.touch(key)
-                return pickle.loads(item["value"]) if isinstance(item["value"], bytes) else item["value"]
+                return self.serializer.loads(item["value"]) if isinstance(item["value"], bytes) else item["value"]
             logger.info(f"Cache item for key '{key}' has expired and will be deleted.")
             self.cache.delete(key)
         return CACHE_MISS
@@ -81,8 +84,11 @@ class AsyncDiskCache(AsyncBaseCacheService, Generic[AsyncLockType]):
     async def _set(self, key, value) -> None:
         if self.max_size and len(self.cache) >= self.max_size:
             await asyncio.to_thread(self.cache.cull)
-        item = {"value": pickle.dumps(value) if not isinstance(value, str | bytes) else value, "time": time.time()}
-        await asyncio.to_thread(self.cache.set, key, item)
+        # 性能：序列化（可能含压缩）与磁盘写入一起放到线程中执行。
+        await asyncio.to_thread(self._write, key, value)
+
+    def _write(self, key, value) -> None:
+        self.cache.set(key, {"value": self.serializer.dumps(value), "time": time.time()})
 
     async def delete(self, key, lock: asyncio.Lock | None = None) -> None:
         """删除缓存项。"""
@@ -122,7 +128,8 @@ class AsyncDiskCache(AsyncBaseCacheService, Generic[AsyncLockType]):
         if existing_value is not CACHE_MISS and isinstance(existing_value, dict) and isinstance(value, dict):
             existing_value.update(value)
             value = existing_value
-        await self.set(key, value)
+        # 注意：调用方已持有锁，直接写入；`set` 会再次获取不可重入的 `asyncio.Lock`。
+        await self._set(key, value)
 
     async def contains(self, key) -> bool:
         """判断键是否存在于缓存。"""
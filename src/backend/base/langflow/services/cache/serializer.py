@@ -0,0 +1,192 @@
+"""
+模块名称：缓存序列化
+
+本模块为 `RedisCache` 与 `AsyncDiskCache` 提供可插拔的值序列化。
+主要功能包括：
+- 纯 JSON 结构（`dict`/`list`/`str`/数值/`None`）走 `orjson`
+- 其余对象走 pickle 协议 5，大缓冲区（如 numpy 数组）以带外方式写入帧，避免复制进 pickle 流
+- pickle 失败时回退到 `dill`（兼容闭包、动态类等）
+- 超过阈值的负载按 `zstd`/`lz4` 压缩（依赖可选）
+
+关键组件：`CacheSerializer`
+设计背景：`RedisCache` 固定使用 `dill.dumps(recurse=True)`、磁盘缓存固定使用 `pickle.dumps`，
+对图与顶点结果既慢又大。
+注意事项：每条记录以 `LFC1` 头部记录编码与压缩方式，读取端按头部解码；
+无头部的旧记录按 `dill`/`pickle` 解码，新旧记录可混合存在。
+"""
+
+from __future__ import annotations
+
+import math
+import pickle
+import struct
+from typing import Any, Literal
+
+import dill
+import orjson
+
+MAGIC = b"LFC1"
+
+CODEC_JSON = b"j"
+CODEC_PICKLE = b"p"
+CODEC_DILL = b"d"
+
+COMPRESSION_NONE = b"0"
+COMPRESSION_ZSTD = b"z"
+COMPRESSION_LZ4 = b"l"
+
+_HEADER_SIZE = len(MAGIC) + 2
+_COUNT = struct.Struct("<I")
+_LENGTH = struct.Struct("<Q")
+_JSON_MAX_DEPTH = 64
+_JSON_MAX_INT = 2**63
+
+CompressionName = Literal["auto", "zstd", "lz4", "none"]
+
+
+def _is_plain_json(value: Any, depth: int = 0) -> bool:
+    """判断值是否能经 JSON 无损往返（不含元组、非字符串键、`datetime` 等会被改写的类型）。"""
+    if depth > _JSON_MAX_DEPTH:
+        return False
+    value_type = type(value)
+    if value_type in (str, bool) or value is None:
+        return True
+    if value_type is float:
+        # 注意：`NaN`/`inf` 经 JSON 会变为 `null`，交给 pickle。
+        return math.isfinite(value)
+    if value_type is int:
+        return -_JSON_MAX_INT <= value < _JSON_MAX_INT
+    if value_type is list:
+        return all(_is_plain_json(item, depth + 1) for item in value)
+    if value_type is dict:
+        return all(type(key) is str and _is_plain_json(item, depth + 1) for key, item in value.items())
+    return False
+
+
+def _zstd():
+    import zstandard
+
+    return zstandard
+
+
+def _lz4():
+    import lz4.frame
+
+    return lz4.frame
+
+
+def _resolve_compression(compression: CompressionName) -> bytes:
+    if compression == "none":
+        return COMPRESSION_NONE
+    candidates = {"auto": ("zstd", "lz4"), "zstd": ("zstd",), "lz4": ("lz4",)}[compression]
+    for name in candidates:
+        try:
+            _zstd() if name == "zstd" else _lz4()
+        except ImportError:
+            continue
+        return COMPRESSION_ZSTD if name == "zstd" else COMPRESSION_LZ4
+    if compression != "auto":
+        package = "zstandard" if compression == "zstd" else "lz4"
+        msg = f"Cache compression '{compression}' requires the '{package}' package"
+        raise ImportError(msg)
+    return COMPRESSION_NONE
+
+
+class CacheSerializer:
+    """带编码头部的缓存值序列化器。
+
+    契约：`dumps` 返回 `bytes`；`loads` 接受本类写出的记录或无头部的旧 pickle/dill 记录。
+    失败语义：pickle 与 dill 均无法序列化时抛 `pickle.PicklingError`；压缩库缺失且显式指定时抛 `ImportError`。
+
+    决策：编码顺序为 JSON → pickle 5 → dill
+    问题：图对象含闭包与动态类，只能用 dill；但多数顶点结果是普通结构，dill 的递归序列化代价高
+    方案：先尝试廉价且紧凑的编码，失败再逐级回退，并在头部记录实际编码
+    代价：不可 pickle 的对象会先尝试一次 pickle
+    重评：当 msgpack 进入依赖后，可为 JSON 路径加入二进制 `bytes` 支持
+    """
+
+    def __init__(
+        self,
+        *,
+        compression: CompressionName = "auto",
+        compression_threshold: int = 64 * 1024,
+        compression_level: int = 3,
+    ) -> None:
+        self.compression = _resolve_compression(compression)
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+
+    def dumps(self, value: Any) -> bytes:
+        codec, chunks = self._encode(value)
+        body_size = sum(len(chunk) for chunk in chunks)
+        compression = COMPRESSION_NONE
+        if self.compression != COMPRESSION_NONE and body_size >= self.compression_threshold:
+            compression = self.compression
+            chunks = [self._compress(b"".join(chunks))]
+        return b"".join([MAGIC, codec, compression, *chunks])
+
+    def loads(self, data: bytes | bytearray | memoryview) -> Any:
+        view = memoryview(data)
+        if view[: len(MAGIC)] != MAGIC:
+            # 注意：旧记录无头部；dill 可解码普通 pickle。
+            return dill.loads(bytes(view))
+        codec = bytes(view[len(MAGIC) : len(MAGIC) + 1])
+        compression = bytes(view[len(MAGIC) + 1 : _HEADER_SIZE])
+        body = view[_HEADER_SIZE:]
+        if compression != COMPRESSION_NONE:
+            body = memoryview(self._decompress(compression, body))
+        if codec == CODEC_JSON:
+            return orjson.loads(body)
+        if codec == CODEC_PICKLE:
+            return self._loads_pickle(body)
+        if codec == CODEC_DILL:
+            return dill.loads(bytes(body))
+        msg = f"Unknown cache codec {codec!r}"
+        raise ValueError(msg)
+
+    def _encode(self, value: Any) -> tuple[bytes, list[bytes | memoryview]]:
+        if _is_plain_json(value):
+            return CODEC_JSON, [orjson.dumps(value)]
+        buffers: list[pickle.PickleBuffer] = []
+        try:
+            payload = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return CODEC_DILL, [dill.dumps(value, recurse=True)]
+        raw = [buffer.raw() for buffer in buffers]
+        # 帧结构：缓冲区数量 | pickle 长度 | 各缓冲区长度 | pickle | 各缓冲区内容
+        header = [_COUNT.pack(len(raw)), _LENGTH.pack(len(payload))]
+        header.extend(_LENGTH.pack(buffer.nbytes) for buffer in raw)
+        return CODEC_PICKLE, [*header, payload, *raw]
+
+    @staticmethod
+    def _loads_pickle(body: memoryview) -> Any:
+        (count,) = _COUNT.unpack_from(body, 0)
+        offset = _COUNT.size
+        (payload_size,) = _LENGTH.unpack_from(body, offset)
+        offset += _LENGTH.size
+        sizes = []
+        for _ in range(count):
+            sizes.append(_LENGTH.unpack_from(body, offset)[0])
+            offset += _LENGTH.size
+        payload = body[offset : offset + payload_size]
+        offset += payload_size
+        buffers = []
+        for size in sizes:
+            # 注意：复制为可写缓冲区，避免反序列化出的数组变为只读。
+            buffers.append(bytearray(body[offset : offset + size]))
+            offset += size
+        return pickle.loads(payload, buffers=buffers)
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.compression == COMPRESSION_ZSTD:
+            return _zstd().ZstdCompressor(level=self.compression_level).compress(data)
+        return _lz4().compress(data)
+
+    @staticmethod
+    def _decompress(compression: bytes, body: memoryview) -> bytes:
+        if compression == COMPRESSION_ZSTD:
+            return _zstd().ZstdDecompressor().decompress(body)
+        if compression == COMPRESSION_LZ4:
+            return _lz4().decompress(body)
+        msg = f"Unknown cache compression {compression!r}"
+        raise ValueError(msg)
@@ -2,7 +2,7 @@
 模块名称：缓存服务实现
 
 本模块提供内存与 `Redis` 缓存的具体实现，主要用于统一缓存行为并提供同步/异步访问。主要功能包括：
-- 基于 `OrderedDict` 的 `LRU` 内存缓存
+- 基于 `OrderedDict` 的 `LRU` 内存缓存（可选按估算字节预算淘汰、后台清理过期项）
 - 基于 `redis.asyncio` 的外部缓存
 - 异步内存缓存实现
 
@@ -12,7 +12,7 @@
 - `AsyncInMemoryCache`：异步内存缓存
 
 设计背景：不同运行模式需要可替换的缓存实现
-注意事项：命中失败使用 `CACHE_MISS` 哨兵；序列化使用 `pickle`/`dill`
+注意事项：命中失败使用 `CACHE_MISS` 哨兵；外部缓存序列化见 `CacheSerializer`
 """
 
 import asyncio
@@ -22,7 +22,6 @@ import time
 from collections import OrderedDict
 from typing import Generic, Union
 
-import dill
 from lfx.log.logger import logger
 from lfx.services.cache.utils import CACHE_MISS
 from typing_extensions import override
@@ -34,26 +33,38 @@ from langflow.services.cache.base import (
     ExternalAsyncBaseCacheService,
     LockType,
 )
+from langflow.services.cache.serializer import CacheSerializer
+from langflow.services.cache.sizing import estimate_size
 
 
 class ThreadingInMemoryCache(CacheService, Generic[LockType]):
     """线程安全的内存缓存实现。
 
-    契约：提供同步缓存接口；命中失败返回 `CACHE_MISS`。
+    契约：提供同步缓存接口；命中失败返回 `CACHE_MISS`；值按引用保存，不做复制或序列化。
     关键路径：使用 `OrderedDict` 实现 `LRU`；以时间戳控制过期。
     失败语义：缓存值为不可反序列化的 `bytes` 时抛 `pickle.UnpicklingError`。
-    注意：`expiration_time=None` 表示不过期。
+    注意：`expiration_time=None` 表示不过期；`max_bytes` 为估算字节预算，
+    单个条目超过预算时仍保留最新写入的一项；`sweep_interval` 开启后台线程定期清理过期项。
     """
 
-    def __init__(self, max_size=None, expiration_time=60 * 60) -> None:
+    def __init__(self, max_size=None, expiration_time=60 * 60, *, max_bytes=None, sweep_interval=None) -> None:
         """初始化内存缓存。
 
-        契约：输入 `max_size`/`expiration_time`；原地初始化缓存与锁。
+        契约：输入 `max_size`/`expiration_time`/`max_bytes`/`sweep_interval`；原地初始化缓存与锁。
         """
         self._cache: OrderedDict = OrderedDict()
         self._lock = threading.RLock()
         self.max_size = max_size
         self.expiration_time = expiration_time
+        self.max_bytes = max_bytes or None
+        self.sweep_interval = sweep_interval
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._sweeper: threading.Thread | None = None
+        self._stop_sweeper = threading.Event()
 
     def get(self, key, lock: Union[threading.Lock, None] = None):  # noqa: UP007
         """读取缓存项。
@@ -66,55 +77,133 @@ class ThreadingInMemoryCache(CacheService, Generic[LockType]):
 
     def _get_without_lock(self, key):
         if item := self._cache.get(key):
-            if self.expiration_time is None or time.time() - item["time"] < self.expiration_time:
+            if not _is_expired(item, self.expiration_time):
                 self._cache.move_to_end(key)
+                self.hits += 1
                 return pickle.loads(item["value"]) if isinstance(item["value"], bytes) else item["value"]
-            self.delete(key)
+            # 注意：清理线程尚未处理的过期项在读取时仍视为未命中。
+            self._remove(key)
+            self.expirations += 1
+        self.misses += 1
         return CACHE_MISS
 
-    def set(self, key, value, lock: Union[threading.Lock, None] = None) -> None:  # noqa: UP007
+    def set(
+        self,
+        key,
+        value,
+        lock: Union[threading.Lock, None] = None,  # noqa: UP007
+        *,
+        size: int | None = None,
+    ) -> None:
         """写入缓存项。
 
-        契约：输入 `key`/`value` 与可选锁；无返回值；容量满时淘汰最久未使用项。
+        契约：输入 `key`/`value` 与可选锁；无返回值；超出条目数或字节预算时淘汰最久未使用项。
+        `size` 为调用方已知的占用字节数，给出时不再遍历估算。
         """
         with lock or self._lock:
-            if key in self._cache:
-                self.delete(key)
-            elif self.max_size and len(self._cache) >= self.max_size:
-                self._cache.popitem(last=False)
-
-            self._cache[key] = {"value": value, "time": time.time()}
-
-    def upsert(self, key, value, lock: Union[threading.Lock, None] = None) -> None:  # noqa: UP007
+            self._set_without_lock(key, value, size)
+        self._ensure_sweeper()
+
+    def _set_without_lock(self, key, value, size: int | None = None) -> None:
+        self._remove(key)
+        if size is None:
+            size = estimate_size(value) if self.max_bytes else 0
+        self._cache[key] = {"value": value, "time": time.time(), "size": size}
+        self._bytes += size
+        while len(self._cache) > 1 and (
+            (self.max_size and len(self._cache) > self.max_size) or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            _, evicted = self._cache.popitem(last=False)
+            self._bytes -= evicted["size"]
+            self.evictions += 1
+
+    def _remove(self, key) -> None:
+        item = self._cache.pop(key, None)
+        if item is not None:
+            self._bytes -= item["size"]
+
+    def upsert(
+        self,
+        key,
+        value,
+        lock: Union[threading.Lock, None] = None,  # noqa: UP007
+        *,
+        size: int | None = None,
+    ) -> None:
         """插入或更新缓存项。
 
-        契约：若旧值与新值均为 `dict`，则合并后写回。
+        契约：若旧值与新值均为 `dict`，则合并后写回；读取与写回在同一次加锁内完成。
+        `size` 语义同 `set`；未给出且合并的是同一批对象时沿用上次估算。
         """
         with lock or self._lock:
             existing_value = self._get_without_lock(key)
-            if existing_value is not CACHE_MISS and isinstance(existing_value, dict) and isinstance(value, dict):
-                existing_value.update(value)
-                value = existing_value
-
-            self.set(key, value)
+            value, size = _merge_for_upsert(existing_value, value, self._cache.get(key), size)
+            self._set_without_lock(key, value, size)
+        self._ensure_sweeper()
 
     def get_or_set(self, key, value, lock: Union[threading.Lock, None] = None):  # noqa: UP007
         """读取缓存项，未命中则写入并返回给定值。"""
         with lock or self._lock:
-            if key in self._cache:
-                return self.get(key)
-            self.set(key, value)
-            return value
+            existing_value = self._get_without_lock(key)
+            if existing_value is not CACHE_MISS:
+                return existing_value
+            self._set_without_lock(key, value)
+        self._ensure_sweeper()
+        return value
 
     def delete(self, key, lock: Union[threading.Lock, None] = None) -> None:  # noqa: UP007
         """删除缓存项。"""
         with lock or self._lock:
-            self._cache.pop(key, None)
+            self._remove(key)
 
     def clear(self, lock: Union[threading.Lock, None] = None) -> None:  # noqa: UP007
         """清空缓存。"""
         with lock or self._lock:
             self._cache.clear()
+            self._bytes = 0
+
+    def sweep(self) -> int:
+        """删除全部过期项，返回删除数量。"""
+        if self.expiration_time is None:
+            return 0
+        with self._lock:
+            expired = [key for key, item in self._cache.items() if _is_expired(item, self.expiration_time)]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+        return len(expired)
+
+    def _ensure_sweeper(self) -> None:
+        if self._sweeper is not None or not self.sweep_interval or self.expiration_time is None:
+            return
+        with self._lock:
+            if self._sweeper is None:
+                self._sweeper = threading.Thread(target=self._sweep_loop, name="cache-sweeper", daemon=True)
+                self._sweeper.start()
+
+    def _sweep_loop(self) -> None:
+        while not self._stop_sweeper.wait(self.sweep_interval):
+            self.sweep()
+
+    def stats(self) -> dict[str, int | None]:
+        """返回命中、淘汰与占用指标。
+
+        排障：`evictions` 快速增长而命中率低时，说明 `max_bytes` 不足以容纳工作集。
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._cache),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    async def teardown(self) -> None:
+        """停止后台清理线程。"""
+        self._stop_sweeper.set()
 
     def contains(self, key) -> bool:
         """判断键是否存在于缓存。"""
@@ -142,20 +231,56 @@ class ThreadingInMemoryCache(CacheService, Generic[LockType]):
 
     def __repr__(self) -> str:
         """返回实例信息字符串。"""
-        return f"InMemoryCache(max_size={self.max_size}, expiration_time={self.expiration_time})"
+        return (
+            f"InMemoryCache(max_size={self.max_size}, expiration_time={self.expiration_time}, "
+            f"max_bytes={self.max_bytes})"
+        )
+
+
+def _is_expired(item: dict, expiration_time) -> bool:
+    return expiration_time is not None and time.time() - item["time"] >= expiration_time
+
+
+def _merge_for_upsert(existing_value, value, item: dict | None, size: int | None) -> tuple[object, int | None]:
+    """合并 `upsert` 的新旧字典，返回 `(写入值, 条目大小)`；大小为 `None` 时由写入方估算。
+
+    决策：合并前后各字段为同一批对象时沿用上次估算的大小
+    问题：整图检查点模式下每个顶点完成都会以同一 Graph 重写同一键，每次都遍历整个对象图
+    方案：`{"result": graph, "type": Graph}` 这类重复写入只比较对象身份，不重新估算
+    代价：同一对象原地增长（如顶点产出累积）不反映到占用中，直到以新对象写入或调用方传入 `size`
+    重评：当 Graph 能自报占用时改为由调用方传入 `size`
+    """
+    if existing_value is CACHE_MISS or not isinstance(existing_value, dict) or not isinstance(value, dict):
+        return value, size
+    unchanged = all(k in existing_value and existing_value[k] is v for k, v in value.items())
+    if size is None and item is not None and unchanged:
+        size = item["size"]
+    existing_value.update(value)
+    return existing_value, size
 
 
 class RedisCache(ExternalAsyncBaseCacheService, Generic[LockType]):
     """基于 `Redis` 的异步缓存实现。
 
-    契约：使用 `dill` 序列化值；未命中返回 `CACHE_MISS`。
+    契约：使用 `CacheSerializer` 序列化值（头部记录编码，兼容旧的 `dill` 记录）；未命中返回 `CACHE_MISS`。
     关键路径：写入使用 `setex`，过期时间由 `expiration_time` 控制。
     失败语义：连接失败在 `is_connected` 返回 `False`；序列化失败抛 `TypeError`。
     注意：该实现标记为实验特性，初始化时会记录告警日志。
     """
 
-    def __init__(self, host="localhost", port=6379, db=0, url=None, expiration_time=60 * 60) -> None:
-        """初始化 `Redis` 缓存客户端。"""
+    def __init__(
+        self,
+        host="localhost",
+        port=6379,
+        db=0,
+        url=None,
+        expiration_time=60 * 60,
+        serializer: CacheSerializer | None = None,
+    ) -> None:
+        """初始化 `Redis` 缓存客户端。
+
+        契约：`serializer` 缺省时使用默认 `CacheSerializer`（按需压缩）。
+        """
         from redis.asyncio import StrictRedis
 
         logger.warning(
@@ -167,6 +292,7 @@ class RedisCache(ExternalAsyncBaseCacheService, Generic[LockType]):
         else:
             self._client = StrictRedis(host=host, port=port, db=db)
         self.expiration_time = expiration_time
+        self.serializer = serializer or CacheSerializer()
 
     async def is_connected(self) -> bool:
         """检查 `Redis` 客户端连通性。"""
@@ -186,13 +312,13 @@ class RedisCache(ExternalAsyncBaseCacheService, Generic[LockType]):
         if key is None:
             return CACHE_MISS
         value = await self._client.get(str(key))
-        return dill.loads(value) if value else CACHE_MISS
+        return self.serializer.loads(value) if value else CACHE_MISS
 
     @override
     async def set(self, key, value, lock=None) -> None:
         """写入缓存值。"""
         try:
-            if pickled := dill.dumps(value, recurse=True):
+            if pickled := self.serializer.dumps(value):
                 result = await self._client.setex(str(key), self.expiration_time, pickled)
                 if not result:
                     msg = "RedisCache could not set the value."
@@ -240,17 +366,26 @@ class RedisCache(ExternalAsyncBaseCacheService, Generic[LockType]):
 class AsyncInMemoryCache(AsyncBaseCacheService, Generic[AsyncLockType]):
     """异步内存缓存实现。
 
-    契约：提供异步缓存接口；命中失败返回 `CACHE_MISS`。
-    关键路径：使用 `OrderedDict` 维护访问顺序并记录时间戳。
+    契约：提供异步缓存接口；命中失败返回 `CACHE_MISS`；值按引用保存，不做复制或序列化。
+    关键路径：使用 `OrderedDict` 维护访问顺序并记录时间戳；`max_size`/`max_bytes` 任一超限即按 `LRU` 淘汰。
     失败语义：缓存值为不可反序列化的 `bytes` 时抛异常。
+    注意：`sweep_interval` 开启后，首次写入时在当前事件循环启动清理任务定期删除过期项。
     """
 
-    def __init__(self, max_size=None, expiration_time=3600) -> None:
+    def __init__(self, max_size=None, expiration_time=3600, *, max_bytes=None, sweep_interval=None) -> None:
         self.cache: OrderedDict = OrderedDict()
 
         self.lock = asyncio.Lock()
         self.max_size = max_size
         self.expiration_time = expiration_time
+        self.max_bytes = max_bytes or None
+        self.sweep_interval = sweep_interval
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._sweeper: asyncio.Task | None = None
 
     async def get(self, key, lock: asyncio.Lock | None = None):
         """读取缓存项。"""
@@ -260,26 +395,39 @@ class AsyncInMemoryCache(AsyncBaseCacheService, Generic[AsyncLockType]):
     async def _get(self, key):
         item = self.cache.get(key, None)
         if item:
-            if time.time() - item["time"] < self.expiration_time:
+            if not _is_expired(item, self.expiration_time):
                 self.cache.move_to_end(key)
+                self.hits += 1
                 return pickle.loads(item["value"]) if isinstance(item["value"], bytes) else item["value"]
-            await logger.ainfo(f"Cache item for key '{key}' has expired and will be deleted.")
-            await self._delete(key)
+            # 注意：清理任务尚未处理的过期项在读取时仍视为未命中。
+            self._remove(key)
+            self.expirations += 1
+        self.misses += 1
         return CACHE_MISS
 
-    async def set(self, key, value, lock: asyncio.Lock | None = None) -> None:
-        """写入缓存项。"""
+    async def set(self, key, value, lock: asyncio.Lock | None = None, *, size: int | None = None) -> None:
+        """写入缓存项；`size` 为调用方已知的占用字节数，给出时不再遍历估算。"""
         async with lock or self.lock:
-            await self._set(
-                key,
-                value,
-            )
-
-    async def _set(self, key, value) -> None:
-        if self.max_size and len(self.cache) >= self.max_size:
-            self.cache.popitem(last=False)
-        self.cache[key] = {"value": value, "time": time.time()}
-        self.cache.move_to_end(key)
+            await self._set(key, value, size)
+
+    async def _set(self, key, value, size: int | None = None) -> None:
+        self._remove(key)
+        if size is None:
+            size = estimate_size(value) if self.max_bytes else 0
+        self.cache[key] = {"value": value, "time": time.time(), "size": size}
+        self._bytes += size
+        while len(self.cache) > 1 and (
+            (self.max_size and len(self.cache) > self.max_size) or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            _, evicted = self.cache.popitem(last=False)
+            self._bytes -= evicted["size"]
+            self.evictions += 1
+        self._ensure_sweeper()
+
+    def _remove(self, key) -> None:
+        item = self.cache.pop(key, None)
+        if item is not None:
+            self._bytes -= item["size"]
 
     async def delete(self, key, lock: asyncio.Lock | None = None) -> None:
         """删除缓存项。"""
@@ -287,8 +435,7 @@ class AsyncInMemoryCache(AsyncBaseCacheService, Generic[AsyncLockType]):
             await self._delete(key)
 
     async def _delete(self, key) -> None:
-        if key in self.cache:
-            del self.cache[key]
+        self._remove(key)
 
     async def clear(self, lock: asyncio.Lock | None = None) -> None:
         """清空缓存。"""
@@ -297,18 +444,66 @@ class AsyncInMemoryCache(AsyncBaseCacheService, Generic[AsyncLockType]):
 
     async def _clear(self) -> None:
         self.cache.clear()
+        self._bytes = 0
 
-    async def upsert(self, key, value, lock: asyncio.Lock | None = None) -> None:
-        """插入或更新缓存项。"""
-        await self._upsert(key, value, lock)
+    async def upsert(self, key, value, lock: asyncio.Lock | None = None, *, size: int | None = None) -> None:
+        """插入或更新缓存项。
 
-    async def _upsert(self, key, value, lock: asyncio.Lock | None = None) -> None:
-        existing_value = await self.get(key, lock)
-        if existing_value is not None and isinstance(existing_value, dict) and isinstance(value, dict):
-            existing_value.update(value)
-            value = existing_value
-        await self.set(key, value, lock)
+        契约：若旧值与新值均为 `dict`，则合并后写回；读取与写回在同一次加锁内完成。
+        `size` 语义同 `set`；未给出且合并的是同一批对象时沿用上次估算。
+        """
+        await self._upsert(key, value, lock, size)
+
+    async def _upsert(self, key, value, lock: asyncio.Lock | None = None, size: int | None = None) -> None:
+        async with lock or self.lock:
+            existing_value = await self._get(key)
+            value, size = _merge_for_upsert(existing_value, value, self.cache.get(key), size)
+            await self._set(key, value, size)
 
     async def contains(self, key) -> bool:
         """判断键是否存在于缓存。"""
         return key in self.cache
+
+    async def sweep(self) -> int:
+        """删除全部过期项，返回删除数量。"""
+        if self.expiration_time is None:
+            return 0
+        async with self.lock:
+            expired = [key for key, item in self.cache.items() if _is_expired(item, self.expiration_time)]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+        if expired:
+            await logger.adebug(f"Swept {len(expired)} expired cache items")
+        return len(expired)
+
+    def _ensure_sweeper(self) -> None:
+        if not self.sweep_interval or self.expiration_time is None:
+            return
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_loop())
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            await self.sweep()
+
+    def stats(self) -> dict[str, int | None]:
+        """返回命中、淘汰与占用指标。
+
+        排障：`evictions` 快速增长而命中率低时，说明 `max_bytes` 不足以容纳工作集。
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": len(self.cache),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    async def teardown(self) -> None:
+        """取消后台清理任务。"""
+        if self._sweeper is not None and not self._sweeper.done():
+            self._sweeper.cancel()
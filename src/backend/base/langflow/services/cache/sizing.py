@@ -0,0 +1,78 @@
+"""
+模块名称：缓存条目大小估算
+
+本模块为按字节预算淘汰的内存缓存估算条目占用。
+主要功能包括：递归累加 `sys.getsizeof`，对共享对象（类、模块、函数、服务与设置实例）不计入也不展开。
+
+关键组件：`estimate_size`
+设计背景：内存缓存按条目数淘汰，一个 Graph 可能数百 MB 而顶点字典只有几 KB，条目数无法约束内存。
+注意事项：结果为估算值；条目之间共享的其他对象会在每个持有者中各计一次，遍历对象数有上限以控制开销。
+"""
+
+from __future__ import annotations
+
+import sys
+import types
+from collections import deque
+from typing import Any
+
+from lfx.services.base import Service as LfxService
+from pydantic_settings import BaseSettings
+
+from langflow.services.base import Service
+
+_ATOMIC_TYPES = (str, bytes, bytearray, int, float, complex, bool, type(None))
+_SHARED_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    types.CodeType,
+    # 注意：服务单例与设置被几乎所有图和组件引用，展开会把整个进程状态计入每个条目。
+    Service,
+    LfxService,
+    BaseSettings,
+)
+
+
+def estimate_size(value: Any, *, max_objects: int = 200_000) -> int:
+    """估算 `value` 及其可达对象占用的字节数。
+
+    契约：`bytes`/`bytearray`/`memoryview` 直接返回长度；其余对象按容器元素、`__dict__` 与 `__slots__` 递归。
+    性能：不做序列化，避免为大对象复制一份；遍历超过 `max_objects` 个对象后停止（结果偏小）。
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, memoryview):
+        return value.nbytes
+
+    total = 0
+    seen: set[int] = set()
+    stack: deque[Any] = deque([value])
+    while stack and len(seen) < max_objects:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED_TYPES):
+            continue
+        seen.add(id(obj))
+        try:
+            total += sys.getsizeof(obj)
+        except TypeError:
+            continue
+        if isinstance(obj, _ATOMIC_TYPES):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        else:
+            attributes = getattr(obj, "__dict__", None)
+            if isinstance(attributes, dict):
+                stack.append(attributes)
+            for cls in type(obj).__mro__:
+                slots = getattr(cls, "__slots__", ())
+                for slot in (slots,) if isinstance(slots, str) else slots:
+                    if slot != "__dict__" and hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+    return total
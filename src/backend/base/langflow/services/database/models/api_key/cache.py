@@ -0,0 +1,240 @@
+"""
+模块名称：`API Key` 鉴权缓存与使用量聚合
+
+本模块为 `check_key` 提供进程内的密钥 → 用户短期缓存，以及使用次数的内存聚合与批量落库。
+主要功能包括：
+- `ApiKeyCache`：按 TTL 缓存密钥对应的用户快照，密钥删除、用户变更时失效
+- `ApiKeyUsageTracker`：按密钥累加使用次数与最近使用时间，周期性以一条 `UPDATE` 写回
+
+关键组件：`get_api_key_cache` / `get_api_key_usage_tracker` / `invalidate_api_key` / `invalidate_api_key_user`
+设计背景：每个 `API Key` 请求都查询一次 `apikey` 并回写 `total_uses`，高 QPS 客户端在同一热点行上读写争用。
+注意事项：缓存只在本进程内失效，其他 worker 上的失效依赖 TTL（`api_key_cache_ttl`）；
+进程异常退出会丢失尚未写回的使用次数。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
+
+from lfx.log.logger import logger
+from sqlalchemy import case, update
+from sqlalchemy.orm import make_transient_to_detached
+
+from langflow.services.database.models.api_key.model import ApiKey
+from langflow.services.database.models.user.model import User
+from langflow.services.deps import get_settings_service, session_scope
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+
+class ApiKeyCache:
+    """密钥 → 用户快照的 TTL + LRU 缓存。
+
+    契约：`get` 命中时返回新的 `User` 实例（游离态，可被会话 `add` 为更新）；未命中或过期返回 `None`。
+    决策：缓存列值快照而非 ORM 实例
+    问题：ORM 实例绑定原会话，跨请求共享会带出会话状态，调用方的修改也会互相可见
+    方案：缓存 `model_dump()` 结果，命中时重建实例并标记为游离态
+    代价：每次命中构造一个 `User` 对象
+    重评：当鉴权结果改为只读的 `UserRead` 时可直接缓存该对象
+    """
+
+    def __init__(self, ttl: float, max_size: int = 10_000) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[UUID, UUID, dict[str, Any], float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, api_key: str) -> tuple[UUID, User] | None:
+        """返回 `(api_key_id, user)`。"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(api_key)
+            if entry is None or entry[3] <= now:
+                if entry is not None:
+                    del self._entries[api_key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(api_key)
+            self.hits += 1
+            api_key_id, _user_id, user_data, _expires = entry
+        user = User(**user_data)
+        make_transient_to_detached(user)
+        return api_key_id, user
+
+    def set(self, api_key: str, api_key_id: UUID, user: User) -> None:
+        entry = (api_key_id, user.id, user.model_dump(), time.monotonic() + self.ttl)
+        with self._lock:
+            self._entries[api_key] = entry
+            self._entries.move_to_end(api_key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, api_key: str) -> None:
+        with self._lock:
+            self._entries.pop(api_key, None)
+
+    def invalidate_key_id(self, api_key_id: UUID) -> None:
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry[0] == api_key_id]:
+                del self._entries[key]
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry[1] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+class ApiKeyUsageTracker:
+    """`API Key` 使用量的内存聚合器。
+
+    契约：`record` 为同步调用，只更新内存计数；后台任务每 `flush_interval` 秒调用一次 `flush`。
+    失败语义：写回失败时计数合并回内存，下次重试；只记录日志，不影响鉴权。
+    性能：一次 `flush` 只执行一条 `UPDATE apikey SET total_uses = total_uses + CASE id ... END`。
+    """
+
+    def __init__(self, flush_interval: float) -> None:
+        self.flush_interval = max(flush_interval, 0.01)
+        self._counts: dict[UUID, int] = {}
+        self._last_used: dict[UUID, datetime] = {}
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._flushed = 0
+        self._failed = 0
+
+    def record(self, api_key_id: UUID) -> None:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            self._counts[api_key_id] = self._counts.get(api_key_id, 0) + 1
+            self._last_used[api_key_id] = now
+        self._ensure_running()
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def _take(self) -> tuple[dict[UUID, int], dict[UUID, datetime]]:
+        with self._lock:
+            counts, self._counts = self._counts, {}
+            last_used, self._last_used = self._last_used, {}
+        return counts, last_used
+
+    async def flush(self) -> int:
+        """写回聚合的使用次数，返回写回的请求数。"""
+        counts, last_used = self._take()
+        if not counts:
+            return 0
+        stmt = (
+            update(ApiKey)
+            .where(ApiKey.id.in_(list(counts)))
+            .values(
+                total_uses=ApiKey.total_uses + case(counts, value=ApiKey.id, else_=0),
+                last_used_at=case(last_used, value=ApiKey.id, else_=ApiKey.last_used_at),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            async with session_scope() as session:
+                await session.exec(stmt)
+        except Exception as exc:  # noqa: BLE001
+            with self._lock:
+                for api_key_id, count in counts.items():
+                    self._counts[api_key_id] = self._counts.get(api_key_id, 0) + count
+                    self._last_used.setdefault(api_key_id, last_used[api_key_id])
+                self._failed += 1
+            await logger.awarning(f"Error flushing API key usage for {len(counts)} keys: {exc!s}")
+            return 0
+        total = sum(counts.values())
+        with self._lock:
+            self._flushed += total
+        return total
+
+    async def stop(self) -> None:
+        """停止后台任务并写回剩余计数。"""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            if task.get_loop() is asyncio.get_running_loop():
+                await asyncio.wait([task])
+        await self.flush()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "pending_keys": len(self._counts),
+                "pending_uses": sum(self._counts.values()),
+                "flushed": self._flushed,
+                "failed_flushes": self._failed,
+            }
+
+
+_api_key_cache: ApiKeyCache | None = None
+_api_key_usage_tracker: ApiKeyUsageTracker | None = None
+
+
+def get_api_key_cache() -> ApiKeyCache | None:
+    """返回进程级缓存单例；`api_key_cache_ttl` 为 `0` 时返回 `None`（关闭缓存）。"""
+    global _api_key_cache  # noqa: PLW0603
+    if _api_key_cache is None:
+        ttl = get_settings_service().settings.api_key_cache_ttl
+        if ttl <= 0:
+            return None
+        _api_key_cache = ApiKeyCache(ttl)
+    return _api_key_cache
+
+
+def get_api_key_usage_tracker() -> ApiKeyUsageTracker | None:
+    """返回进程级使用量聚合器；`api_key_usage_flush_interval` 为 `0` 时返回 `None`（逐请求写回）。"""
+    global _api_key_usage_tracker  # noqa: PLW0603
+    if _api_key_usage_tracker is None:
+        interval = get_settings_service().settings.api_key_usage_flush_interval
+        if interval <= 0:
+            return None
+        _api_key_usage_tracker = ApiKeyUsageTracker(interval)
+    return _api_key_usage_tracker
+
+
+def invalidate_api_key(api_key: str | None = None, *, api_key_id: UUID | None = None) -> None:
+    """密钥删除后调用，移除对应缓存。"""
+    if _api_key_cache is None:
+        return
+    if api_key is not None:
+        _api_key_cache.invalidate(api_key)
+    if api_key_id is not None:
+        _api_key_cache.invalidate_key_id(api_key_id)
+
+
+def invalidate_api_key_user(user_id: UUID) -> None:
+    """用户被修改（停用、降权）或删除后调用，移除该用户全部密钥的缓存。"""
+    if _api_key_cache is not None:
+        _api_key_cache.invalidate_user(user_id)
+
+
+async def flush_api_key_usage() -> None:
+    """停机时写回尚未落库的使用次数。"""
+    if _api_key_usage_tracker is not None:
+        await _api_key_usage_tracker.stop()
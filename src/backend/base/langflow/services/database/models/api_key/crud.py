@@ -7,7 +7,8 @@
 关键组件：`get_api_keys` / `create_api_key` / `check_key`
 设计背景：集中管理密钥生命周期与校验策略，避免逻辑分散。
 使用场景：密钥管理接口、鉴权中间件。
-注意事项：`API_KEY_SOURCE=env` 时优先读取环境变量并回退数据库。
+注意事项：`API_KEY_SOURCE=env` 时优先读取环境变量并回退数据库；
+数据库校验可选启用进程内缓存与使用量批量写回，见 `cache` 模块。
 """
 
 import datetime
@@ -16,10 +17,16 @@ import secrets
 from typing import TYPE_CHECKING
 from uuid import UUID
 
+from sqlalchemy import update
 from sqlalchemy.orm import selectinload
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from langflow.services.database.models.api_key.cache import (
+    get_api_key_cache,
+    get_api_key_usage_tracker,
+    invalidate_api_key,
+)
 from langflow.services.database.models.api_key.model import ApiKey, ApiKeyCreate, ApiKeyRead, UnmaskedApiKeyRead
 from langflow.services.database.models.user.model import User
 from langflow.services.deps import get_settings_service
@@ -118,6 +125,7 @@ async def delete_api_key(session: AsyncSession, api_key_id: UUID, user_id: UUID)
         msg = "API Key not found"
         raise ValueError(msg)
     await session.delete(api_key)
+    invalidate_api_key(api_key.api_key, api_key_id=api_key.id)
 
 
 async def check_key(session: AsyncSession, api_key: str) -> User | None:
@@ -167,22 +175,52 @@ async def _check_key_from_db(session: AsyncSession, api_key: str, settings_servi
 
     决策：仅在未禁用统计时更新使用计数。
     问题：高频鉴权写入会放大数据库压力。
-    方案：支持 `disable_track_apikey_usage` 关闭统计。
-    代价：关闭统计会失去使用审计能力。
-    重评：当引入异步统计管道时可始终记录。
+    方案：支持 `disable_track_apikey_usage` 关闭统计；`api_key_cache_ttl` 启用时命中缓存跳过查询，
+    `api_key_usage_flush_interval` 启用时使用次数在内存聚合后批量写回。
+    代价：缓存期内其他 worker 上的密钥删除、用户停用最多延迟 TTL 生效；批量写回使统计有秒级延迟。
+    重评：当需要跨 worker 即时失效时改为共享缓存并广播失效。
     """
+    track_usage = settings_service.settings.disable_track_apikey_usage is not True
+    cache = get_api_key_cache() if api_key else None
+    if cache is not None and (cached := cache.get(api_key)) is not None:
+        api_key_id, user = cached
+        if track_usage:
+            await _record_usage(session, api_key_id)
+        return user
+
     query: SelectOfScalar = select(ApiKey).options(selectinload(ApiKey.user)).where(ApiKey.api_key == api_key)
     api_key_object: ApiKey | None = (await session.exec(query)).first()
     if api_key_object is not None:
-        if settings_service.settings.disable_track_apikey_usage is not True:
-            api_key_object.total_uses += 1
-            api_key_object.last_used_at = datetime.datetime.now(datetime.timezone.utc)
-            session.add(api_key_object)
-            await session.flush()
+        if track_usage:
+            tracker = get_api_key_usage_tracker()
+            if tracker is not None:
+                tracker.record(api_key_object.id)
+            else:
+                api_key_object.total_uses += 1
+                api_key_object.last_used_at = datetime.datetime.now(datetime.timezone.utc)
+                session.add(api_key_object)
+                await session.flush()
+        if cache is not None and api_key_object.user is not None:
+            cache.set(api_key, api_key_object.id, api_key_object.user)
         return api_key_object.user
     return None
 
 
+async def _record_usage(session: AsyncSession, api_key_id: UUID) -> None:
+    """记录一次缓存命中的使用：有聚合器时只计数，否则直接执行一条自增 `UPDATE`（不再读取该行）。"""
+    tracker = get_api_key_usage_tracker()
+    if tracker is not None:
+        tracker.record(api_key_id)
+        return
+    stmt = (
+        update(ApiKey)
+        .where(ApiKey.id == api_key_id)
+        .values(total_uses=ApiKey.total_uses + 1, last_used_at=datetime.datetime.now(datetime.timezone.utc))
+        .execution_options(synchronize_session=False)
+    )
+    await session.exec(stmt)
+
+
 async def _check_key_from_env(session: AsyncSession, api_key: str, settings_service) -> User | None:
     """在环境变量中校验密钥并返回超级用户。
 
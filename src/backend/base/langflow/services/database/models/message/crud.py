@@ -1,18 +1,23 @@
 """
 模块名称：消息更新操作
 
-本模块提供消息记录的更新入口。
-主要功能包括：异步更新消息与兼容同步调用的包装函数。
+本模块提供消息记录的更新入口与消息历史的游标分页工具。
+主要功能包括：异步更新消息与兼容同步调用的包装函数；按 `(timestamp, id)` 编解码游标并追加键集条件。
 
-关键组件：`_update_message` / `update_message`
+关键组件：`_update_message` / `update_message` / `encode_message_cursor` / `apply_message_cursor`
 设计背景：保留历史同步接口以兼容旧调用路径。
 使用场景：消息编辑、错误标记与属性更新。
 注意事项：`update_message` 为兼容接口，建议使用异步版本。
 """
 
+import base64
+import binascii
+import json
+from datetime import datetime
 from uuid import UUID
 
 from lfx.utils.async_helpers import run_until_complete
+from sqlalchemy import and_, or_
 
 from langflow.services.database.models.message.model import MessageTable, MessageUpdate
 from langflow.services.deps import session_scope
@@ -69,3 +74,58 @@ def update_message(message_id: UUID | str, message: MessageUpdate | dict):
     重评：当所有调用迁移完成后移除该接口。
     """
     return run_until_complete(_update_message(message_id, message))
+
+
+def encode_message_cursor(message) -> str:
+    """以消息的 `(timestamp, id)` 生成不透明游标。
+
+    契约：`message` 需带完整精度的 `timestamp` 与 `id`，通常为 `MessageTable` 行；
+    `Message.timestamp` 只精确到秒，不能用于生成游标。
+    """
+    timestamp = message.timestamp
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    payload = json.dumps([timestamp.isoformat(), str(message.id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_message_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """解析 `encode_message_cursor` 生成的游标。
+
+    失败语义：格式不合法时抛 `ValueError`。
+    """
+    try:
+        timestamp, message_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(timestamp), UUID(message_id)
+    except (binascii.Error, TypeError, ValueError) as e:
+        msg = f"Invalid message cursor: {cursor!r}"
+        raise ValueError(msg) from e
+
+
+def apply_message_cursor(stmt, cursor: str | None, *, descending: bool):
+    """为按 `timestamp` 排序的消息查询追加键集条件与稳定排序。
+
+    契约：返回的语句按 `(timestamp, id)` 排序；给定 `cursor` 时只返回排在游标之后的消息。
+    决策：键集（`WHERE (timestamp, id) > (:ts, :id)`）而非 `OFFSET`
+    问题：`OFFSET` 需要扫描并丢弃前面所有行，翻页越深越慢
+    方案：以上一页最后一条的 `(timestamp, id)` 为起点，配合 `(…, session_id, timestamp)` 索引范围扫描
+    代价：只能顺序翻页，不能跳页；排序字段固定为 `timestamp`
+    重评：当需要按其他字段翻页时为该字段补充游标编码
+    注意：用 `OR` 展开而非行值比较，保证参数按列类型绑定（SQLite 上的 `UUID` 列）。
+    """
+    if cursor:
+        timestamp, message_id = decode_message_cursor(cursor)
+        if descending:
+            after = or_(
+                MessageTable.timestamp < timestamp,
+                and_(MessageTable.timestamp == timestamp, MessageTable.id < message_id),
+            )
+        else:
+            after = or_(
+                MessageTable.timestamp > timestamp,
+                and_(MessageTable.timestamp == timestamp, MessageTable.id > message_id),
+            )
+        stmt = stmt.where(after)
+    if descending:
+        return stmt.order_by(MessageTable.timestamp.desc(), MessageTable.id.desc())
+    return stmt.order_by(MessageTable.timestamp.asc(), MessageTable.id.asc())
@@ -16,7 +16,7 @@ from typing import TYPE_CHECKING, Annotated
 from uuid import UUID, uuid4
 
 from pydantic import ConfigDict, field_serializer, field_validator
-from sqlalchemy import Text
+from sqlalchemy import Index, Text
 from sqlmodel import JSON, Column, Field, SQLModel
 
 from langflow.schema.content_block import ContentBlock
@@ -194,6 +194,11 @@ class MessageTable(MessageBase, table=True):  # type: ignore[call-arg]
     """
     model_config = ConfigDict(validate_assignment=True, arbitrary_types_allowed=True)
     __tablename__ = "message"
+    # 性能：会话历史与监控查询按 `flow_id`/`session_id` 过滤并按 `timestamp` 排序；索引名需与迁移一致。
+    __table_args__ = (
+        Index("ix_message_flow_id_session_id_timestamp", "flow_id", "session_id", "timestamp"),
+        Index("ix_message_session_id_timestamp", "session_id", "timestamp"),
+    )
     id: UUID = Field(default_factory=uuid4, primary_key=True)
 
     flow_id: UUID | None = Field(default=None)
@@ -0,0 +1,205 @@
+"""
+模块名称：消息合并写入
+
+本模块把短时间窗口内多个调用方（通常是并发会话）的消息写入合并为一次多行插入与一次提交（group commit）。
+主要功能包括：按事件循环聚合待写消息、窗口到期或达到条数阈值时批量写入、按请求切分返回结果。
+
+关键组件：`MessageWriteCoalescer` / `get_message_writer`
+设计背景：每条聊天消息单独开会话、插入并提交，突发流量下事务数与消息数相同，提交（`fsync`）成为瓶颈。
+使用场景：`message_write_coalesce_interval > 0` 时由 `aadd_messages` 使用。
+注意事项：与 `WriteBehindBuffer` 不同，调用方会等待写入完成并拿到落库后的 `MessageRead`；
+写入延迟最多增加一个窗口。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from lfx.log.logger import logger
+
+from langflow.services.deps import get_settings_service, session_scope
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from langflow.services.database.models.message.model import MessageRead, MessageTable
+
+    _Request = tuple[list[MessageTable], asyncio.Future[list[MessageRead]]]
+
+
+@dataclass
+class _LoopState:
+    """单个事件循环内的待写请求。"""
+
+    pending: list[_Request] = field(default_factory=list)
+    pending_count: int = 0
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    task: asyncio.Task | None = None
+
+
+class MessageWriteCoalescer:
+    """消息写入合并器。
+
+    契约：
+    - `submit(messages)` 需在事件循环中调用，返回与 `messages` 一一对应的 `MessageRead`。
+    - `write(batch)` 负责在一个事务中写入一批消息并按顺序返回结果。
+    - 失败语义：合并批次写入失败时逐个请求重试，单个请求失败只把异常抛给该请求的调用方。
+
+    关键路径（三步）：
+    1) `submit` 把请求追加到当前事件循环的待写列表，按需启动后台写入任务
+    2) 后台任务等待 `interval` 秒（积压达到 `max_batch_size` 时提前唤醒）
+    3) 按不超过 `max_batch_size` 条消息分批调用 `write`，把结果切片回填到各请求的 future
+
+    决策：按事件循环分别聚合，而非进程级单一队列
+    问题：future 与 `asyncio.Event` 绑定事件循环，工作线程中的 `run_until_complete` 运行在其他循环中
+    方案：以 `WeakKeyDictionary` 按循环保存待写状态，各循环独立合并
+    代价：不同循环之间的写入不会合并
+    重评：当所有执行统一到单一事件循环时去掉按循环分组
+    注意：调用方在等待期间被取消时，已入队的消息仍会写入，只是结果被丢弃。
+    """
+
+    def __init__(
+        self,
+        write: Callable[[list[MessageTable]], Awaitable[list[MessageRead]]],
+        *,
+        interval: float,
+        max_batch_size: int = 200,
+    ) -> None:
+        self._write = write
+        self.interval = max(interval, 0.0)
+        self.max_batch_size = max(max_batch_size, 1)
+        self._states: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._messages = 0
+        self._batches = 0
+        self._retries = 0
+
+    def _state(self, loop: asyncio.AbstractEventLoop) -> _LoopState:
+        with self._lock:
+            state = self._states.get(loop)
+            if state is None:
+                state = self._states[loop] = _LoopState()
+            return state
+
+    async def submit(self, messages: list[MessageTable]) -> list[MessageRead]:
+        """入队一组消息并等待其所在批次写入完成。"""
+        if not messages:
+            return []
+        loop = asyncio.get_running_loop()
+        state = self._state(loop)
+        future: asyncio.Future[list[MessageRead]] = loop.create_future()
+        state.pending.append((messages, future))
+        state.pending_count += len(messages)
+        if state.task is None or state.task.done():
+            state.task = loop.create_task(self._drain(state))
+        elif state.pending_count >= self.max_batch_size:
+            state.wakeup.set()
+        return await future
+
+    def _take(self, state: _LoopState) -> list[_Request]:
+        """取出不超过 `max_batch_size` 条消息的请求（至少一个请求，请求不拆分）。"""
+        batch: list[_Request] = []
+        count = 0
+        while state.pending:
+            size = len(state.pending[0][0])
+            if batch and count + size > self.max_batch_size:
+                break
+            batch.append(state.pending.pop(0))
+            count += size
+        state.pending_count -= count
+        return batch
+
+    async def _drain(self, state: _LoopState) -> None:
+        batch: list[_Request] = []
+        try:
+            if state.pending_count < self.max_batch_size:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(state.wakeup.wait(), timeout=self.interval)
+            # 注意：写入期间到达的请求在下一轮直接写入，不再额外等待窗口。
+            while state.pending:
+                state.wakeup.clear()
+                batch = self._take(state)
+                await self._write_batch(batch)
+                batch = []
+        except asyncio.CancelledError:
+            for _messages, future in [*batch, *state.pending]:
+                future.cancel()
+            state.pending.clear()
+            state.pending_count = 0
+            raise
+
+    async def _write_batch(self, batch: list[_Request]) -> None:
+        tables = [message for messages, _future in batch for message in messages]
+        try:
+            rows = await self._write(tables)
+        # 注意：任意写入异常都原样转交给等待中的调用方 future，此处不吞异常。
+        except Exception as exc:  # noqa: BLE001
+            if len(batch) == 1:
+                future = batch[0][1]
+                if not future.done():
+                    future.set_exception(exc)
+                return
+            # 注意：合并批次失败时逐个请求重试，避免一条坏消息拖垮同批其他会话的写入。
+            with self._lock:
+                self._retries += 1
+            await logger.awarning(
+                f"Coalesced message write of {len(tables)} messages failed, retrying per request: {exc!s}"
+            )
+            for request in batch:
+                await self._write_batch([request])
+            return
+        with self._lock:
+            self._requests += len(batch)
+            self._messages += len(tables)
+            self._batches += 1
+        offset = 0
+        for messages, future in batch:
+            if not future.done():
+                future.set_result(rows[offset : offset + len(messages)])
+            offset += len(messages)
+
+    def stats(self) -> dict[str, int]:
+        """返回写入计数。
+
+        排障：`requests / batches` 接近 1 说明窗口内几乎没有并发写入，合并没有收益；
+        `retries` 增长说明合并批次中存在写入失败的消息，需查看对应告警日志。
+        """
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "messages": self._messages,
+                "batches": self._batches,
+                "retries": self._retries,
+            }
+
+
+async def _write_messagetables(messages: list[MessageTable]) -> list[MessageRead]:
+    # 注意：延迟导入，`langflow.memory` 依赖本模块。
+    from langflow.memory import aadd_messagetables
+
+    async with session_scope() as session:
+        return await aadd_messagetables(messages, session)
+
+
+_message_writer: MessageWriteCoalescer | None = None
+
+
+def get_message_writer() -> MessageWriteCoalescer | None:
+    """返回进程级合并器；`message_write_coalesce_interval` 为 `0` 时返回 `None`（每次调用单独写入）。"""
+    global _message_writer  # noqa: PLW0603
+    if _message_writer is None:
+        settings = get_settings_service().settings
+        if settings.message_write_coalesce_interval <= 0:
+            return None
+        _message_writer = MessageWriteCoalescer(
+            _write_messagetables,
+            interval=settings.message_write_coalesce_interval,
+            max_batch_size=settings.message_write_coalesce_batch_size,
+        )
+    return _message_writer
@@ -4,12 +4,13 @@
 本模块提供交易日志的查询、写入与视图转换。
 主要功能包括：按流程查询、限制日志数量、转换读取与日志视图模型。
 
-关键组件：`log_transaction` / `get_transactions_by_flow_id`
+关键组件：`log_transaction` / `log_transactions` / `prune_transactions` / `get_transactions_by_flow_id`
 设计背景：统一日志存取逻辑，控制数据库增长。
 使用场景：执行日志记录、历史回放与监控视图。
 注意事项：超过上限会删除最旧记录。
 """
 
+from collections.abc import Iterable
 from uuid import UUID
 
 from lfx.log.logger import logger
@@ -106,6 +107,56 @@ async def log_transaction(db: AsyncSession, transaction: TransactionBase) -> Tra
     return table
 
 
+async def log_transactions(db: AsyncSession, transactions: list[TransactionBase]) -> list[TransactionTable]:
+    """批量写入交易日志（不做保留裁剪）。
+
+    契约：
+    - 输入：`db` 与 `transactions`；无 `flow_id` 的记录被忽略。
+    - 输出：写入的 `TransactionTable` 列表。
+    - 副作用：一次多行插入并提交；裁剪由 `prune_transactions` 周期执行。
+    - 失败语义：写入失败时回滚并抛异常。
+    """
+    tables = [TransactionTable(**transaction.model_dump()) for transaction in transactions if transaction.flow_id]
+    if not tables:
+        return []
+    try:
+        db.add_all(tables)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return tables
+
+
+async def prune_transactions(db: AsyncSession, flow_ids: Iterable[UUID], max_entries: int | None = None) -> None:
+    """按流程裁剪交易日志，每个流程保留最新 `max_entries` 条。
+
+    契约：
+    - 输入：`db`、需要裁剪的 `flow_ids`，可选 `max_entries`（缺省读取 `max_transactions_to_keep`）。
+    - 副作用：删除超限旧记录并提交。
+    - 失败语义：删除失败时回滚并抛异常。
+    """
+    if max_entries is None:
+        max_entries = get_settings_service().settings.max_transactions_to_keep
+    try:
+        for flow_id in flow_ids:
+            await db.exec(
+                delete(TransactionTable).where(
+                    TransactionTable.flow_id == flow_id,
+                    col(TransactionTable.id).in_(
+                        select(TransactionTable.id)
+                        .where(TransactionTable.flow_id == flow_id)
+                        .order_by(col(TransactionTable.timestamp).desc())
+                        .offset(max_entries)
+                    ),
+                )
+            )
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+
 def transform_transaction_table(
     transaction: list[TransactionTable] | TransactionTable,
 ) -> list[TransactionReadResponse] | TransactionReadResponse:
@@ -20,6 +20,7 @@ from sqlalchemy.orm.attributes import flag_modified
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from langflow.services.database.models.api_key.cache import invalidate_api_key_user
 from langflow.services.database.models.user.model import User, UserUpdate
 
 
@@ -106,6 +107,8 @@ async def update_user(user_db: User | None, user: UserUpdate, db: AsyncSession)
     except IntegrityError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
 
+    # 注意：停用、降权等变更需立即作用于 `API Key` 鉴权缓存。
+    invalidate_api_key_user(user_db.id)
     return user_db
 
 
@@ -4,12 +4,13 @@
 本模块提供节点构建记录的查询、写入与清理逻辑。
 主要功能包括：按流程查询最新构建、记录构建并控制保留数量。
 
-关键组件：`get_vertex_builds_by_flow_id` / `log_vertex_build`
+关键组件：`get_vertex_builds_by_flow_id` / `log_vertex_build` / `log_vertex_builds` / `prune_vertex_builds`
 设计背景：集中管理构建记录的保留策略，避免表无限增长。
 使用场景：流程执行调试与构建记录展示。
 注意事项：写入时会裁剪超限记录。
 """
 
+from collections.abc import Iterable
 from uuid import UUID
 
 from sqlmodel import col, delete, func, select
@@ -100,30 +101,10 @@ async def log_vertex_build(
         await db.flush()
 
         # 注意：裁剪单节点记录，保留最新 `max_per_vertex` 条。
-        keep_vertex_subq = (
-            select(VertexBuildTable.build_id)
-            .where(
-                VertexBuildTable.flow_id == vertex_build.flow_id,
-                VertexBuildTable.id == vertex_build.id,
-            )
-            .order_by(col(VertexBuildTable.timestamp).desc(), col(VertexBuildTable.build_id).desc())
-            .limit(max_per_vertex)
-        )
-        delete_vertex_older = delete(VertexBuildTable).where(
-            VertexBuildTable.flow_id == vertex_build.flow_id,
-            VertexBuildTable.id == vertex_build.id,
-            col(VertexBuildTable.build_id).not_in(keep_vertex_subq),
-        )
-        await db.exec(delete_vertex_older)
+        await db.exec(_delete_vertex_older(vertex_build.flow_id, vertex_build.id, max_per_vertex))
 
         # 注意：裁剪全局记录，保留最新 `max_global` 条。
-        keep_global_subq = (
-            select(VertexBuildTable.build_id)
-            .order_by(col(VertexBuildTable.timestamp).desc(), col(VertexBuildTable.build_id).desc())
-            .limit(max_global)
-        )
-        delete_global_older = delete(VertexBuildTable).where(col(VertexBuildTable.build_id).not_in(keep_global_subq))
-        await db.exec(delete_global_older)
+        await db.exec(_delete_global_older(max_global))
 
         # 注意：提交事务。
         await db.commit()
@@ -135,6 +116,82 @@ async def log_vertex_build(
     return table
 
 
+def _delete_vertex_older(flow_id: UUID, vertex_id: str, max_per_vertex: int):
+    keep_vertex_subq = (
+        select(VertexBuildTable.build_id)
+        .where(
+            VertexBuildTable.flow_id == flow_id,
+            VertexBuildTable.id == vertex_id,
+        )
+        .order_by(col(VertexBuildTable.timestamp).desc(), col(VertexBuildTable.build_id).desc())
+        .limit(max_per_vertex)
+    )
+    return delete(VertexBuildTable).where(
+        VertexBuildTable.flow_id == flow_id,
+        VertexBuildTable.id == vertex_id,
+        col(VertexBuildTable.build_id).not_in(keep_vertex_subq),
+    )
+
+
+def _delete_global_older(max_global: int):
+    keep_global_subq = (
+        select(VertexBuildTable.build_id)
+        .order_by(col(VertexBuildTable.timestamp).desc(), col(VertexBuildTable.build_id).desc())
+        .limit(max_global)
+    )
+    return delete(VertexBuildTable).where(col(VertexBuildTable.build_id).not_in(keep_global_subq))
+
+
+async def log_vertex_builds(db: AsyncSession, vertex_builds: list[VertexBuildBase]) -> list[VertexBuildTable]:
+    """批量写入构建记录（不做保留裁剪）。
+
+    契约：
+    - 输入：`db` 与 `vertex_builds`。
+    - 输出：写入的 `VertexBuildTable` 列表。
+    - 副作用：一次多行插入并提交；裁剪由 `prune_vertex_builds` 周期执行。
+    - 失败语义：异常时回滚并抛出。
+    """
+    tables = [VertexBuildTable(**vertex_build.model_dump()) for vertex_build in vertex_builds]
+    if not tables:
+        return []
+    try:
+        db.add_all(tables)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return tables
+
+
+async def prune_vertex_builds(
+    db: AsyncSession,
+    vertex_keys: Iterable[tuple[UUID, str]],
+    *,
+    max_builds_to_keep: int | None = None,
+    max_builds_per_vertex: int | None = None,
+) -> None:
+    """裁剪指定节点的超限记录，再执行一次全局裁剪。
+
+    契约：
+    - 输入：`db`、需要裁剪的 `(flow_id, vertex_id)` 集合与可选上限（缺省读取配置）。
+    - 副作用：删除超限记录并提交。
+    - 失败语义：异常时回滚并抛出。
+
+    性能：全局裁剪每次调用只执行一次，而非每条构建记录执行一次。
+    """
+    settings = get_settings_service().settings
+    max_global = max_builds_to_keep or settings.max_vertex_builds_to_keep
+    max_per_vertex = max_builds_per_vertex or settings.max_vertex_builds_per_vertex
+    try:
+        for flow_id, vertex_id in vertex_keys:
+            await db.exec(_delete_vertex_older(flow_id, vertex_id, max_per_vertex))
+        await db.exec(_delete_global_older(max_global))
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+
 async def delete_vertex_builds_by_flow_id(db: AsyncSession, flow_id: UUID) -> None:
     """删除指定流程的所有构建记录。
 
@@ -40,15 +40,22 @@ from tenacity import retry, stop_after_attempt, wait_fixed
 from langflow.initial_setup.constants import STARTER_FOLDER_NAME
 from langflow.services.base import Service
 from langflow.services.database import models
+from langflow.services.database.models.api_key.cache import flush_api_key_usage
 from langflow.services.database.models.user.crud import get_user_by_username
+from langflow.services.database.models.vertex_builds.crud import log_vertex_builds, prune_vertex_builds
 from langflow.services.database.session import NoopSession
 from langflow.services.database.utils import Result, TableResults
+from langflow.services.database.write_behind import WriteBehindBuffer
 from langflow.services.deps import get_settings_service
 from langflow.services.utils import teardown_superuser
 
 if TYPE_CHECKING:
+    from uuid import UUID
+
     from lfx.services.settings.service import SettingsService
 
+    from langflow.services.database.models.vertex_builds.model import VertexBuildBase
+
 
 class DatabaseService(Service):
     """数据库服务核心对象。
@@ -120,6 +127,10 @@ class DatabaseService(Service):
             expire_on_commit=False,
         )
 
+        # 注意：vertex 构建记录的后写缓冲按需创建（见 `enqueue_vertex_build`）。
+        self._vertex_build_buffer: WriteBehindBuffer[VertexBuildBase] | None = None
+        self._touched_vertex_builds: set[tuple[UUID, str]] = set()
+
         # 注意：根据配置决定 `Alembic` 日志输出路径。
         alembic_log_file = self.settings_service.settings.alembic_log_file
         self.alembic_log_to_stdout = self.settings_service.settings.alembic_log_to_stdout
@@ -404,6 +415,44 @@ class DatabaseService(Service):
             async with self.async_session_maker() as session:
                 yield session
 
+    def enqueue_vertex_build(self, vertex_build: VertexBuildBase) -> bool:
+        """把构建记录放入后写缓冲。
+
+        契约：
+        - 输入：`vertex_build`。
+        - 输出：已入队返回 `True`；未开启 `db_write_behind` 或使用空数据库时返回 `False`，由调用方同步写入。
+        - 副作用：首次调用时在当前事件循环启动后台刷写任务。
+        """
+        settings = self.settings_service.settings
+        if not settings.db_write_behind or settings.use_noop_database:
+            return False
+        if self._vertex_build_buffer is None:
+            self._vertex_build_buffer = WriteBehindBuffer(
+                "vertex_builds",
+                self._flush_vertex_builds,
+                prune=self._prune_vertex_builds,
+                flush_interval=settings.db_write_behind_flush_interval,
+                max_batch_size=settings.db_write_behind_batch_size,
+                prune_interval=settings.db_write_behind_prune_interval,
+            )
+        self._vertex_build_buffer.submit(vertex_build)
+        return True
+
+    async def flush_vertex_builds(self) -> None:
+        """立即写入后写缓冲中的全部构建记录（未开启后写时无操作）。"""
+        if self._vertex_build_buffer is not None:
+            await self._vertex_build_buffer.flush()
+
+    async def _flush_vertex_builds(self, vertex_builds: list[VertexBuildBase]) -> None:
+        async with self._with_session() as session:
+            await log_vertex_builds(session, vertex_builds)
+        self._touched_vertex_builds.update((vertex_build.flow_id, vertex_build.id) for vertex_build in vertex_builds)
+
+    async def _prune_vertex_builds(self) -> None:
+        vertex_keys, self._touched_vertex_builds = self._touched_vertex_builds, set()
+        async with self._with_session() as session:
+            await prune_vertex_builds(session, vertex_keys)
+
     async def assign_orphaned_flows_to_superuser(self) -> None:
         """在自动登录启用时将孤儿 `Flow` 分配给超级用户。
 
@@ -905,6 +954,10 @@ class DatabaseService(Service):
         重评：当清理需强一致时改为失败即终止。
         """
         await logger.adebug("Tearing down database")
+        if self._vertex_build_buffer is not None:
+            # 注意：先排空后写缓冲，再释放引擎。
+            await self._vertex_build_buffer.stop()
+        await flush_api_key_usage()
         try:
             settings_service = get_settings_service()
             # 注意：仅在启用自动登录时清理默认超级用户。
@@ -0,0 +1,189 @@
+"""
+模块名称：数据库后写缓冲
+
+本模块提供按时间间隔或条数阈值批量落库的后写（write-behind）缓冲区。
+主要功能包括：非阻塞入队、后台批量刷写、周期性执行保留裁剪、停机时排空。
+
+关键组件：`WriteBehindBuffer`
+设计背景：事务日志与 vertex 构建记录每条都单独开会话、插入并执行裁剪子查询，
+每个 vertex 产生 3~4 次数据库往返。
+使用场景：`db_write_behind=True` 时由 `TransactionService` 与 `DatabaseService` 持有。
+注意事项：进程异常退出会丢失尚未刷写的记录；积压超过 `max_pending` 时丢弃新记录并计数。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from lfx.log.logger import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+T = TypeVar("T")
+
+
+class WriteBehindBuffer(Generic[T]):
+    """后写缓冲区。
+
+    契约：
+    - `submit` 为同步、非阻塞调用，需在事件循环中调用；后台任务按需在当前事件循环启动。
+    - `flush(batch)` 负责写入一批记录（一次会话、一次提交）；`prune()` 负责保留裁剪。
+    - 失败语义：刷写或裁剪异常只记录日志并计数，不重试，避免阻塞主流程。
+
+    关键路径（三步）：
+    1) `submit` 加锁追加记录，达到 `max_batch_size` 时唤醒后台任务
+    2) 后台任务每 `flush_interval` 秒或被唤醒时按 `max_batch_size` 分批调用 `flush`
+    3) 距上次裁剪超过 `prune_interval` 秒时调用一次 `prune`
+
+    决策：记录列表以 `threading.Lock` 保护，而非 `asyncio.Queue`
+    问题：服务为进程级单例，工作线程中的 `run_until_complete` 会在其他事件循环中提交记录
+    方案：唤醒通过 `call_soon_threadsafe` 投递；原事件循环已停止时在当前事件循环重建后台任务
+    代价：每次入队一次线程锁
+    重评：当所有执行统一到单一事件循环时改为 `asyncio.Queue`
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush: Callable[[list[T]], Awaitable[Any]],
+        *,
+        prune: Callable[[], Awaitable[Any]] | None = None,
+        flush_interval: float = 1.0,
+        max_batch_size: int = 200,
+        prune_interval: float = 30.0,
+        max_pending: int = 10_000,
+    ) -> None:
+        self.name = name
+        self._flush = flush
+        self._prune = prune
+        self.flush_interval = max(flush_interval, 0.01)
+        self.max_batch_size = max(max_batch_size, 1)
+        self.prune_interval = prune_interval
+        self.max_pending = max_pending
+        self._items: list[T] = []
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._generation = 0
+        self._last_prune = time.monotonic()
+        self._prune_due = False
+        self._flushed = 0
+        self._batches = 0
+        self._dropped = 0
+        self._failed = 0
+
+    def submit(self, item: T) -> None:
+        """入队一条记录；积压已满时丢弃并计数。"""
+        with self._lock:
+            if len(self._items) >= self.max_pending:
+                self._dropped += 1
+                dropped = self._dropped
+            else:
+                self._items.append(item)
+                dropped = 0
+                self._prune_due = True
+            full = len(self._items) >= self.max_batch_size
+        if dropped:
+            # 注意：只在丢弃数为 2 的幂时告警，避免积压期间刷屏。
+            if dropped & (dropped - 1) == 0:
+                logger.warning(f"Write-behind buffer {self.name} is full, dropped {dropped} records")
+            return
+        self._ensure_running()
+        if full:
+            self._notify()
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._loop is not None and self._loop.is_running():
+            return
+        self._generation += 1
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run(self._generation, self._wakeup))
+
+    def _notify(self) -> None:
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            wakeup.set()
+        else:
+            loop.call_soon_threadsafe(wakeup.set)
+
+    async def _run(self, generation: int, wakeup: asyncio.Event) -> None:
+        while generation == self._generation:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(wakeup.wait(), timeout=self.flush_interval)
+            wakeup.clear()
+            await self.flush()
+            if self._prune is not None and time.monotonic() - self._last_prune >= self.prune_interval:
+                await self.prune()
+
+    async def flush(self) -> int:
+        """立即按批刷写全部积压记录，返回写入条数。"""
+        written = 0
+        while True:
+            with self._lock:
+                batch = self._items[: self.max_batch_size]
+                del self._items[: self.max_batch_size]
+            if not batch:
+                return written
+            try:
+                await self._flush(batch)
+            except Exception as exc:  # noqa: BLE001
+                with self._lock:
+                    self._failed += len(batch)
+                await logger.awarning(f"Error flushing {len(batch)} records from {self.name}: {exc!s}")
+                continue
+            written += len(batch)
+            with self._lock:
+                self._flushed += len(batch)
+                self._batches += 1
+
+    async def prune(self) -> None:
+        """执行一次保留裁剪（自上次裁剪以来无新记录时跳过）。"""
+        self._last_prune = time.monotonic()
+        if self._prune is None or not self._prune_due:
+            return
+        self._prune_due = False
+        try:
+            await self._prune()
+        except Exception as exc:  # noqa: BLE001
+            await logger.awarning(f"Error pruning {self.name}: {exc!s}")
+
+    async def stop(self) -> None:
+        """停止后台任务，排空积压并执行最后一次裁剪。"""
+        self._generation += 1
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            # 注意：唤醒而非取消，避免中断正在写入的批次；任务刷写后发现代次变化即退出。
+            self._notify()
+            if task.get_loop() is asyncio.get_running_loop():
+                await task
+        await self.flush()
+        await self.prune()
+
+    def stats(self) -> dict[str, int]:
+        """返回积压与写入计数。
+
+        排障：`pending` 持续增长说明刷写跟不上写入，可调大 `db_write_behind_batch_size`；
+        `failed` 增长说明批量写入出错，需查看对应告警日志。
+        """
+        with self._lock:
+            return {
+                "pending": len(self._items),
+                "flushed": self._flushed,
+                "batches": self._batches,
+                "dropped": self._dropped,
+                "failed": self._failed,
+            }
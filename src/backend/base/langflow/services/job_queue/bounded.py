@@ -0,0 +1,167 @@
+"""
+模块名称：有界作业事件队列
+
+本模块为进程内作业事件通道提供容量上限与溢出策略。
+主要功能包括：
+- `block`：生产端在 token 路径上等待消费端腾出空间，超时后退化为丢弃 token
+- `drop_tokens`：超出上限时丢弃 `token` 事件，生命周期事件（消息、顶点结束、错误、结束标记）照常入队
+- `spill`：超出上限的事件按顺序写入临时文件，消费时再读回
+
+关键组件：`BoundedEventQueue`
+设计背景：客户端停止轮询 `/build/{job_id}/events` 后，事件在构建期间与 300 秒清理宽限期内持续堆积。
+注意事项：上限按事件条数计；生命周期事件不受上限约束，队列深度可能短暂超过上限。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import tempfile
+from collections import deque
+from typing import IO, Any, Literal
+
+from lfx.log.logger import logger
+
+OverflowPolicy = Literal["block", "drop_tokens", "spill"]
+
+_TOKEN_PREFIX = "token-"  # noqa: S105
+
+
+def _is_token(item: tuple[Any, bytes | None, float]) -> bool:
+    event_id = item[0]
+    return isinstance(event_id, str) and event_id.startswith(_TOKEN_PREFIX)
+
+
+class BoundedEventQueue(asyncio.Queue):
+    """按溢出策略限制深度的事件队列。
+
+    契约：
+    - 元素为 `(event_id, payload_bytes | None, put_time)`，与 `EventManager` 写入格式一致；
+      `event_id` 以 `token-` 开头视为 token 事件。
+    - `put_nowait` 从不抛 `asyncio.QueueFull`；`full()` 恒为 `False`。
+    - `empty`/`qsize`/`get` 同时覆盖内存与落盘部分，顺序与写入顺序一致。
+    - `wait_for_capacity` 供生产端在 `block` 策略下等待空间，其余策略立即返回。
+
+    决策：继承 `asyncio.Queue` 并在 `put_nowait` 上实现策略，而非改造 `EventManager`
+    问题：事件经同步 `put_nowait` 写入，无法在写入点挂起生产者
+    方案：丢弃与落盘在写入点完成；阻塞由生产端在 token 路径上显式 `await wait_for_capacity()`
+    代价：`block` 策略只约束 token 路径，其他事件仍可能使深度略超上限
+    重评：当 `EventManager` 改为异步发送时，阻塞可直接放在写入点
+    """
+
+    def __init__(
+        self,
+        max_events: int,
+        *,
+        policy: OverflowPolicy = "drop_tokens",
+        block_timeout: float = 30.0,
+        spill_dir: str | None = None,
+    ) -> None:
+        super().__init__()
+        self.max_events = max_events
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.spill_dir = spill_dir
+        self._spill_file: IO[bytes] | None = None
+        self._spill_index: deque[tuple[Any, int, int, float]] = deque()
+        self._spill_end = 0
+        self._space = asyncio.Event()
+        self._space.set()
+        self._stalled = False
+        self._dropped = 0
+        self._spilled_total = 0
+        self._max_depth = 0
+
+    def _over_capacity(self) -> bool:
+        return self.max_events > 0 and self.qsize() >= self.max_events
+
+    def full(self) -> bool:
+        return False
+
+    def qsize(self) -> int:
+        return len(self._queue) + len(self._spill_index)
+
+    def empty(self) -> bool:
+        return not self._queue and not self._spill_index
+
+    def put_nowait(self, item: tuple[Any, bytes | None, float]) -> None:
+        if self._over_capacity():
+            self._space.clear()
+            if _is_token(item) and (self.policy == "drop_tokens" or (self.policy == "block" and self._stalled)):
+                self._dropped += 1
+                if self._dropped & (self._dropped - 1) == 0:
+                    logger.warning(f"Event queue is full ({self.max_events} events), dropped {self._dropped} tokens")
+                return
+        super().put_nowait(item)
+
+    def _put(self, item: tuple[Any, bytes | None, float]) -> None:
+        if self.policy == "spill" and (self._spill_index or self._over_capacity()):
+            self._spill(item)
+        else:
+            self._queue.append(item)
+        self._max_depth = max(self._max_depth, self.qsize())
+
+    def _get(self) -> tuple[Any, bytes | None, float]:
+        # 注意：落盘只在内存部分已满后开始，且落盘期间的新事件也落盘，因此先取内存再取文件即保持顺序。
+        item = self._queue.popleft() if self._queue else self._unspill()
+        if not self._over_capacity():
+            self._stalled = False
+            self._space.set()
+        return item
+
+    def _spill(self, item: tuple[Any, bytes | None, float]) -> None:
+        event_id, payload, put_time = item
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(dir=self.spill_dir)  # noqa: SIM115
+        length = -1
+        if payload is not None:
+            self._spill_file.seek(self._spill_end)
+            self._spill_file.write(payload)
+            length = len(payload)
+        self._spill_index.append((event_id, self._spill_end, length, put_time))
+        self._spill_end += max(length, 0)
+        self._spilled_total += 1
+
+    def _unspill(self) -> tuple[Any, bytes | None, float]:
+        event_id, offset, length, put_time = self._spill_index.popleft()
+        payload = None
+        if length >= 0:
+            self._spill_file.seek(offset)
+            payload = self._spill_file.read(length)
+        if not self._spill_index:
+            # 注意：落盘部分读完后截断文件，回收磁盘空间。
+            self._spill_file.seek(0)
+            self._spill_file.truncate()
+            self._spill_end = 0
+        return event_id, payload, put_time
+
+    async def wait_for_capacity(self) -> None:
+        """`block` 策略下等待队列低于上限；超过 `block_timeout` 秒后停止等待并开始丢弃 token。"""
+        if self.policy != "block" or self._stalled or not self._over_capacity():
+            return
+        self._space.clear()
+        try:
+            await asyncio.wait_for(self._space.wait(), timeout=self.block_timeout)
+        except asyncio.TimeoutError:
+            self._stalled = True
+            logger.warning(f"Event consumer did not drain the queue in {self.block_timeout}s, dropping tokens")
+
+    def close(self) -> None:
+        """释放落盘文件。"""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+        self._spill_index.clear()
+        self._spill_end = 0
+
+    def stats(self) -> dict[str, int]:
+        """返回深度与溢出计数。
+
+        排障：`dropped` 增长说明消费端过慢或已断开；`spilled` 持续不为 0 说明积压已落盘。
+        """
+        return {
+            "depth": self.qsize(),
+            "max_depth": self._max_depth,
+            "dropped": self._dropped,
+            "spilled": len(self._spill_index),
+            "spilled_total": self._spilled_total,
+        }
@@ -10,18 +10,26 @@
 
 使用场景：服务注册与依赖注入阶段需要统一实例化入口。
 设计背景：服务层通过工厂模式解耦实例化与调用方。
-注意事项：`create` 每次返回新实例，不做缓存。
+注意事项：`create` 每次返回新实例，不做缓存；`job_queue_backend="redis"` 时需安装 `redis`。
 """
 
-from langflow.services.base import Service
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from lfx.events.event_manager import token_flush_options
+
 from langflow.services.factory import ServiceFactory
 from langflow.services.job_queue.service import JobQueueService
 
+if TYPE_CHECKING:
+    from lfx.services.settings.service import SettingsService
+
 
 class JobQueueServiceFactory(ServiceFactory):
     """作业队列服务工厂。
 
-    契约：`create` 返回新的 `JobQueueService`；无输入参数；失败语义：实例化异常向上抛出。
+    契约：`create` 需要 `SettingsService`，返回新的 `JobQueueService`；失败语义：实例化异常向上抛出。
     关键路径：通过 `create` 生成服务实例并交给服务管理器。
     决策：使用工厂封装服务实例化。
     问题：直接在调用方创建实例导致耦合与测试困难。
@@ -43,15 +51,37 @@ class JobQueueServiceFactory(ServiceFactory):
         """
         super().__init__(JobQueueService)
 
-    def create(self) -> Service:
+    def create(self, settings_service: SettingsService):
         """创建新的作业队列服务实例。
 
-        契约：无输入，返回 `JobQueueService` 实例；副作用：仅分配对象，不启动任务；失败语义：实例化失败会抛出异常给调用方。
-        关键路径：直接调用 `JobQueueService()` 构造。
+        契约：输入 `SettingsService`，返回 `JobQueueService` 实例；副作用：仅分配对象，不启动任务；
+        失败语义：`job_queue_backend="redis"` 而未安装 `redis` 时抛 `ImportError`。
+        关键路径：按 `job_queue_backend` 决定是否创建 Redis 客户端（复用 `redis_*` 连接配置），再构造服务。
         决策：每次 `create` 返回新实例。
         问题：共享单例会引入跨请求状态污染。
         方案：保持无缓存实例化。
         代价：频繁创建可能增加初始化开销。
         重评：当需要复用实例以降低成本时引入缓存。
         """
-        return JobQueueService()
+        settings = settings_service.settings
+        event_manager_options = token_flush_options(settings)
+        if settings.job_queue_backend != "redis":
+            return JobQueueService(
+                event_manager_options=event_manager_options,
+                max_events=settings.job_queue_max_events,
+                overflow_policy=settings.job_queue_overflow_policy,
+                block_timeout=settings.job_queue_block_timeout,
+            )
+
+        from redis.asyncio import StrictRedis
+
+        if settings.redis_url:
+            client = StrictRedis.from_url(settings.redis_url)
+        else:
+            client = StrictRedis(host=settings.redis_host, port=settings.redis_port, db=settings.redis_db)
+        return JobQueueService(
+            client,
+            stream_maxlen=settings.job_queue_stream_maxlen,
+            job_ttl=settings.job_queue_ttl,
+            event_manager_options=event_manager_options,
+        )
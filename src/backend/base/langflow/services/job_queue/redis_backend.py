@@ -0,0 +1,265 @@
+"""
+模块名称：作业队列 Redis Streams 后端
+
+本模块让 `/build/{flow_id}/flow` 与 `/build/{job_id}/events` 可以落在不同 worker 进程上。
+主要功能包括：
+- `RedisEventStream`：以 Redis Stream 承载作业事件，接口对齐 `asyncio.Queue` 的常用子集
+- `RedisJobRegistry`：以 Redis Hash 记录作业状态与取消请求
+- `RemoteJobTask`：其他 worker 上运行的作业在本进程的任务代理
+
+关键组件：键空间 `langflow:job:{job_id}`（状态）、`...:events`（事件流）、`...:cursor`（消费位置）。
+设计背景：进程内 `asyncio.Queue` 要求两次请求命中同一 worker，只能依赖粘性会话。
+注意事项：所有键带 TTL；事件流按 `maxlen` 近似裁剪，消费过慢时最早的事件会被丢弃。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Any
+
+from lfx.log.logger import logger
+
+JOB_KEY_PREFIX = "langflow:job:"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+FINAL_STATUSES = frozenset({STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED})
+
+_WRITE_BATCH_SIZE = 100
+
+
+def job_key(job_id: str) -> str:
+    return f"{JOB_KEY_PREFIX}{job_id}"
+
+
+def _field(fields: dict, name: str) -> Any:
+    # 注意：客户端未开启 `decode_responses` 时字段名为 bytes。
+    value = fields.get(name.encode())
+    return fields.get(name) if value is None else value
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _text(value: Any) -> str | None:
+    if value is None:
+        return None
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+class RedisEventStream:
+    """以 Redis Stream 承载的作业事件通道。
+
+    契约：
+    - 生产端：`put_nowait`/`put` 接受 `(event_id, payload_bytes | None, put_time)`，`payload=None` 表示流结束。
+    - 消费端：`get`/`get_nowait`/`empty` 与 `asyncio.Queue` 语义一致，但只反映本进程已读取的缓冲。
+    - 消费位置保存在 `...:cursor`，轮询请求落在任意 worker 都能接着上次位置读取。
+
+    关键路径（三步）：
+    1) `put_nowait` 追加到本地待写队列，必要时启动写入任务（同步、不阻塞事件发送方）
+    2) 写入任务按批用 pipeline 执行 `XADD MAXLEN ~` 并刷新 TTL，写完即退出
+    3) `get` 在本地缓冲为空时 `XREAD` 一批事件，并把消费位置写回 Redis
+
+    背压：待写事件超过 `max_pending` 时 `put` 等待写入任务追上；`put_nowait` 不阻塞（与 `EventManager` 契约一致）。
+    """
+
+    def __init__(
+        self,
+        client,
+        job_id: str,
+        *,
+        maxlen: int = 10_000,
+        ttl: int = 3600,
+        max_pending: int = 1_000,
+        read_count: int = 100,
+        block_ms: int = 5_000,
+    ) -> None:
+        self._client = client
+        self.job_id = job_id
+        self.stream_key = f"{job_key(job_id)}:events"
+        self.cursor_key = f"{job_key(job_id)}:cursor"
+        self.maxlen = maxlen
+        self.ttl = ttl
+        self.max_pending = max_pending
+        self.read_count = read_count
+        self.block_ms = block_ms
+        self._pending: deque[tuple[Any, bytes | None, float]] = deque()
+        self._progress: asyncio.Event | None = None
+        self._writer: asyncio.Task | None = None
+        self._buffer: deque[tuple[Any, bytes | None, float]] = deque()
+        self._loop: asyncio.AbstractEventLoop | None = _running_loop()
+
+    # 生产端
+    def put_nowait(self, item: tuple[Any, bytes | None, float]) -> None:
+        """追加一条待写事件；可在所属事件循环或工作线程中调用。
+
+        失败语义：从线程调用且尚未绑定事件循环时抛 `RuntimeError`。
+        注意：组件经 `asyncio.to_thread` 发送消息事件，线程中的调用整体转交给所属循环，
+        `_pending` 与写入任务只在循环线程上改动，事件顺序与调用顺序一致。
+        """
+        running = _running_loop()
+        if running is not None and self._loop in (None, running):
+            self._loop = running
+            self._enqueue(item)
+            return
+        if self._loop is None:
+            msg = f"Event stream for job_id {self.job_id} is not bound to an event loop"
+            raise RuntimeError(msg)
+        self._loop.call_soon_threadsafe(self._enqueue, item)
+
+    def _enqueue(self, item: tuple[Any, bytes | None, float]) -> None:
+        self._pending.append(item)
+        if self._writer is None or self._writer.done():
+            self._progress = asyncio.Event()
+            self._writer = self._loop.create_task(self._write_pending())
+
+    async def put(self, item: tuple[Any, bytes | None, float]) -> None:
+        await self.wait_for_capacity()
+        self.put_nowait(item)
+
+    async def wait_for_capacity(self) -> None:
+        """待写事件达到 `max_pending` 时等待写入任务追上。"""
+        while len(self._pending) >= self.max_pending and self._writer is not None and not self._writer.done():
+            self._progress.clear()
+            await self._progress.wait()
+
+    async def flush(self) -> None:
+        """等待本地待写事件全部写入 Redis。"""
+        if self._writer is not None and not self._writer.done():
+            await asyncio.wait([self._writer])
+
+    async def _write_pending(self) -> None:
+        # 注意：写完即退出，下次 `put_nowait` 再按需启动，消费端请求里写入的少量事件不会留下常驻任务。
+        while self._pending:
+            batch = [self._pending.popleft() for _ in range(min(len(self._pending), _WRITE_BATCH_SIZE))]
+            try:
+                pipe = self._client.pipeline(transaction=False)
+                for event_id, payload, put_time in batch:
+                    fields = {"id": str(event_id), "t": repr(put_time)}
+                    if payload is None:
+                        fields["end"] = "1"
+                    else:
+                        fields["data"] = payload
+                    pipe.xadd(self.stream_key, fields, maxlen=self.maxlen, approximate=True)
+                pipe.expire(self.stream_key, self.ttl)
+                await pipe.execute()
+            except Exception as exc:  # noqa: BLE001
+                await logger.aerror(f"Error writing {len(batch)} events for job_id {self.job_id}: {exc}")
+            self._progress.set()
+
+    # 消费端
+    def empty(self) -> bool:
+        return not self._buffer
+
+    def qsize(self) -> int:
+        return len(self._buffer)
+
+    def get_nowait(self) -> tuple[Any, bytes | None, float]:
+        if not self._buffer:
+            raise asyncio.QueueEmpty
+        return self._buffer.popleft()
+
+    async def get(self) -> tuple[Any, bytes | None, float]:
+        while not self._buffer:
+            await self._read()
+        return self._buffer.popleft()
+
+    async def _read(self) -> None:
+        # 注意：每次读取前从 Redis 取消费位置，轮询请求在不同 worker 间交替时不会重复读取。
+        cursor = _text(await self._client.get(self.cursor_key)) or "0-0"
+        response = await self._client.xread({self.stream_key: cursor}, count=self.read_count, block=self.block_ms)
+        for _stream, entries in response or []:
+            for entry_id, fields in entries:
+                cursor = _text(entry_id)
+                payload = None if _field(fields, "end") is not None else _field(fields, "data")
+                put_time = float(_text(_field(fields, "t")) or time.time())
+                self._buffer.append((_text(_field(fields, "id")), payload, put_time))
+        if self._buffer:
+            # 注意：按批记录消费位置；调用方需在请求结束前取完本地缓冲，否则这部分事件不会再被读到。
+            await self._client.set(self.cursor_key, cursor, ex=self.ttl)
+
+
+class RedisJobRegistry:
+    """Redis 中的作业状态表。
+
+    契约：状态为 `running`/`done`/`failed`/`cancelled`；`status` 对未知或已过期的作业返回 `None`。
+    """
+
+    def __init__(self, client, *, ttl: int = 3600) -> None:
+        self.client = client
+        self.ttl = ttl
+
+    async def register(self, job_id: str, owner: str) -> None:
+        key = job_key(job_id)
+        await self.client.hset(key, mapping={"status": STATUS_RUNNING, "owner": owner, "created_at": repr(time.time())})
+        await self.client.expire(key, self.ttl)
+
+    async def set_status(self, job_id: str, status: str) -> None:
+        key = job_key(job_id)
+        await self.client.hset(key, mapping={"status": status})
+        await self.client.expire(key, self.ttl)
+
+    async def status(self, job_id: str) -> str | None:
+        return _text(await self.client.hget(job_key(job_id), "status"))
+
+    async def request_cancel(self, job_id: str) -> None:
+        await self.client.hset(job_key(job_id), mapping={"cancel": "1"})
+
+    async def cancel_requested(self, job_ids: list[str]) -> list[str]:
+        """返回 `job_ids` 中已被请求取消的作业。"""
+        if not job_ids:
+            return []
+        pipe = self.client.pipeline(transaction=False)
+        for job_id in job_ids:
+            pipe.hget(job_key(job_id), "cancel")
+        flags = await pipe.execute()
+        return [job_id for job_id, flag in zip(job_ids, flags, strict=True) if flag is not None]
+
+
+class RemoteJobTask:
+    """其他 worker 上运行的作业在本进程的代理。
+
+    契约：提供 `done`/`cancelled`/`exception`/`cancel` 子集；状态为获取代理时读取的快照。
+    `cancel` 只写入取消请求，作业所在 worker 的取消轮询会在下一个周期内取消任务。
+    """
+
+    def __init__(self, registry: RedisJobRegistry, job_id: str, status: str | None) -> None:
+        self._registry = registry
+        self.job_id = job_id
+        self.status = status
+        self._cancel_requested = False
+        self._cancel_task: asyncio.Task | None = None
+
+    def done(self) -> bool:
+        return self.status in FINAL_STATUSES
+
+    def cancelled(self) -> bool:
+        return self._cancel_requested or self.status == STATUS_CANCELLED
+
+    def exception(self) -> BaseException | None:
+        return None
+
+    def cancel(self) -> bool:
+        if self.done():
+            return False
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        self._cancel_requested = True
+        self._cancel_task = loop.create_task(self._registry.request_cancel(self.job_id))
+        return True
+
+    async def request_cancel(self) -> bool:
+        if self.done():
+            return self.status == STATUS_CANCELLED
+        self._cancel_requested = True
+        await self._registry.request_cancel(self.job_id)
+        return True
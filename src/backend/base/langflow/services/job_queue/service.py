@@ -13,16 +13,33 @@
 使用场景：异步作业需要独立消息队列与事件回调的后台执行流程。
 设计背景：异步执行流需要队列隔离与可控回收，避免任务取消后立即清理导致观测缺失。
 注意事项：清理由 60 秒周期触发，失败任务需等待 300 秒宽限期才会移除。
+`max_events` 大于 0 时进程内队列按溢出策略限制深度，见 `bounded`；
+传入 Redis 客户端时事件通道改为 Redis Stream，作业状态与取消请求写入 Redis，见 `redis_backend`。
 """
 
 from __future__ import annotations
 
 import asyncio
+import os
+import socket
+import time
+from typing import Any
 
 from lfx.log.logger import logger
 
 from langflow.events.event_manager import EventManager
 from langflow.services.base import Service
+from langflow.services.job_queue.bounded import BoundedEventQueue, OverflowPolicy
+from langflow.services.job_queue.redis_backend import (
+    STATUS_CANCELLED,
+    STATUS_DONE,
+    STATUS_FAILED,
+    RedisEventStream,
+    RedisJobRegistry,
+    RemoteJobTask,
+)
+
+CANCEL_POLL_INTERVAL = 1.0
 
 
 class JobQueueNotFoundError(Exception):
@@ -66,10 +83,23 @@ class JobQueueService(Service):
 
     name = "job_queue_service"
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        redis_client: Any = None,
+        *,
+        stream_maxlen: int = 10_000,
+        job_ttl: int = 3600,
+        event_manager_options: dict[str, Any] | None = None,
+        max_events: int = 0,
+        overflow_policy: OverflowPolicy = "drop_tokens",
+        block_timeout: float = 30.0,
+    ) -> None:
         """初始化作业队列注册表与清理策略。
 
-        契约：无输入，返回 `None`；副作用：初始化 `_queues`、清理任务句柄并设置宽限期。
+        契约：`redis_client` 为 `redis.asyncio` 客户端或 `None`（进程内队列）；
+        `event_manager_options` 透传给每个作业的 `EventManager`（如 token 合并配置）；
+        `max_events` 大于 0 时进程内队列按 `overflow_policy` 限制深度（见 `BoundedEventQueue`）；返回 `None`；
+        副作用：初始化 `_queues`、清理任务句柄并设置宽限期。
         关键路径：设置 `_queues`、`_cleanup_task`、`_closed` 与 `CLEANUP_GRACE_PERIOD`。
         决策：默认宽限期设为 300 秒。
         问题：立即清理会影响上游观测与延迟完成的回调。
@@ -82,6 +112,17 @@ class JobQueueService(Service):
         self._closed = False
         self.ready = False
         self.CLEANUP_GRACE_PERIOD = 300
+        self._redis = redis_client
+        self._registry = RedisJobRegistry(redis_client, ttl=job_ttl) if redis_client is not None else None
+        self.stream_maxlen = stream_maxlen
+        self.job_ttl = job_ttl
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._cancel_watch_task: asyncio.Task | None = None
+        self.event_manager_options = event_manager_options or {}
+        self.max_events = max_events
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self._dropped_events = 0
 
     def is_started(self) -> bool:
         """判断后台清理任务是否已创建。
@@ -125,6 +166,8 @@ class JobQueueService(Service):
         """
         self._closed = False
         self._cleanup_task = asyncio.create_task(self._periodic_cleanup())
+        if self._registry is not None:
+            self._cancel_watch_task = asyncio.create_task(self._watch_cancel_requests())
         logger.debug("JobQueueService started: periodic cleanup task initiated.")
 
     async def stop(self) -> None:
@@ -152,9 +195,16 @@ class JobQueueService(Service):
                 exc = self._cleanup_task.exception()
                 if exc is not None:
                     raise exc
+        if self._cancel_watch_task:
+            self._cancel_watch_task.cancel()
+            await asyncio.wait([self._cancel_watch_task])
 
         for job_id in list(self._queues.keys()):
             await self.cleanup_job(job_id)
+        if self._redis is not None:
+            close = getattr(self._redis, "aclose", None) or getattr(self._redis, "close", None)
+            if close is not None:
+                await close()
         await logger.adebug("JobQueueService stopped: all job queues have been cleaned up.")
 
     async def teardown(self) -> None:
@@ -190,7 +240,7 @@ class JobQueueService(Service):
             msg = f"Queue for job_id {job_id} already exists"
             raise ValueError(msg)
 
-        main_queue: asyncio.Queue = asyncio.Queue()
+        main_queue = self._create_queue(job_id)
         event_manager: EventManager = self._create_default_event_manager(main_queue)
 
         # 注意：初始化时不绑定任务，允许先入队再启动消费协程。
@@ -226,10 +276,43 @@ class JobQueueService(Service):
             logger.debug(f"Existing task for job_id {job_id} detected; cancelling it.")
             existing_task.cancel()
 
+        if self._registry is not None:
+            task_coro = self._run_distributed(job_id, main_queue, task_coro)
         task = asyncio.create_task(task_coro)
         self._queues[job_id] = (main_queue, event_manager, task, None)
         logger.debug(f"New task started for job_id {job_id}")
 
+    async def register_job(self, job_id: str) -> None:
+        """在 Redis 中登记作业，使其他 worker 能找到事件流；进程内队列为空操作。
+
+        契约：需在 `start_job` 之前调用：登记写入 `running`，若在作业写入最终状态之后登记会把已结束的作业覆盖为运行中；
+        同时保证 `job_id` 返回给客户端前其他 worker 已能查到作业。
+        """
+        if self._registry is not None:
+            await self._registry.register(job_id, self.worker_id)
+
+    async def _run_distributed(self, job_id: str, stream: RedisEventStream, task_coro) -> Any:
+        """执行作业并把最终状态写入 Redis。
+
+        失败语义：作业失败或取消时补写结束标记，其他 worker 上的消费者不会一直阻塞；异常与取消照常向上传递。
+        """
+        status = STATUS_FAILED
+        try:
+            result = await task_coro
+            status = STATUS_DONE
+        except asyncio.CancelledError:
+            status = STATUS_CANCELLED
+            raise
+        finally:
+            if status != STATUS_DONE:
+                stream.put_nowait((None, None, time.time()))
+            try:
+                await stream.flush()
+                await self._registry.set_status(job_id, status)
+            except Exception as exc:  # noqa: BLE001
+                await logger.aerror(f"Error recording final status for job_id {job_id}: {exc}")
+        return result
+
     def get_queue_data(self, job_id: str) -> tuple[asyncio.Queue, EventManager, asyncio.Task | None, float | None]:
         """获取队列、事件管理器与任务状态。
 
@@ -250,6 +333,24 @@ class JobQueueService(Service):
         except KeyError as exc:
             raise JobQueueNotFoundError(job_id) from exc
 
+    async def aget_queue_data(self, job_id: str) -> tuple[Any, EventManager, Any, float | None]:
+        """获取作业数据，本进程未找到时查询 Redis 中的作业。
+
+        契约：本进程内的作业同 `get_queue_data`；其他 worker 上的作业返回
+        (`RedisEventStream`, `EventManager`, `RemoteJobTask`, `None`)；失败语义同 `get_queue_data`。
+        注意：远端作业的数据不写入 `_queues`，每次请求按 Redis 中的状态重新构建。
+        """
+        try:
+            return self.get_queue_data(job_id)
+        except JobQueueNotFoundError:
+            if self._registry is None:
+                raise
+            status = await self._registry.status(job_id)
+            if status is None:
+                raise
+        stream = self._create_queue(job_id)
+        return stream, self._create_default_event_manager(stream), RemoteJobTask(self._registry, job_id, status), None
+
     async def cleanup_job(self, job_id: str) -> None:
         """清理指定 `job_id` 的队列与任务资源。
 
@@ -292,6 +393,10 @@ class JobQueueService(Service):
             except asyncio.QueueEmpty:
                 break
 
+        if isinstance(main_queue, BoundedEventQueue):
+            self._dropped_events += main_queue.stats()["dropped"]
+            main_queue.close()
+
         await logger.adebug(f"Removed {items_cleared} items from queue for job_id {job_id}")
         self._queues.pop(job_id, None)
         await logger.adebug(f"Cleanup successful for job_id {job_id}: resources have been released.")
@@ -360,6 +465,52 @@ class JobQueueService(Service):
                         await logger.adebug(f"Cleaning up job_id {job_id} after grace period")
                         await self.cleanup_job(job_id)
 
+    async def _watch_cancel_requests(self) -> None:
+        """轮询 Redis 中的取消请求并取消本进程内对应的作业。
+
+        决策：每 `CANCEL_POLL_INTERVAL` 秒批量查询一次，而非订阅 Pub/Sub
+        问题：取消请求可能落在任意 worker 上，但作业任务只能由所属进程取消
+        方案：只查询本进程内仍在运行的作业，一次 pipeline 往返
+        代价：取消最多延迟一个轮询周期
+        重评：当取消时延要求在百毫秒级时改为 Pub/Sub
+        """
+        while not self._closed:
+            try:
+                await asyncio.sleep(CANCEL_POLL_INTERVAL)
+                running = [job_id for job_id, (_, _, task, _) in self._queues.items() if task and not task.done()]
+                for job_id in await self._registry.cancel_requested(running):
+                    _, _, task, _ = self._queues.get(job_id, (None, None, None, None))
+                    if task is not None and not task.done():
+                        await logger.adebug(f"Cancelling job_id {job_id} on remote request")
+                        task.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                await logger.aerror(f"Exception encountered while polling cancel requests: {exc}")
+
+    def stats(self) -> dict[str, int]:
+        """返回作业数、事件积压与丢弃计数（`dropped` 含已清理作业）。
+
+        排障：`depth` 持续增长说明客户端未消费事件；可设置 `job_queue_max_events` 限制单作业积压。
+        """
+        depth = 0
+        dropped = self._dropped_events
+        spilled = 0
+        for queue, _, _, _ in self._queues.values():
+            depth += queue.qsize()
+            if isinstance(queue, BoundedEventQueue):
+                queue_stats = queue.stats()
+                dropped += queue_stats["dropped"]
+                spilled += queue_stats["spilled"]
+        return {"jobs": len(self._queues), "depth": depth, "dropped": dropped, "spilled": spilled}
+
+    def _create_queue(self, job_id: str) -> asyncio.Queue | RedisEventStream:
+        if self._redis is None:
+            if self.max_events > 0:
+                return BoundedEventQueue(self.max_events, policy=self.overflow_policy, block_timeout=self.block_timeout)
+            return asyncio.Queue()
+        return RedisEventStream(self._redis, job_id, maxlen=self.stream_maxlen, ttl=self.job_ttl)
+
     def _create_default_event_manager(self, queue: asyncio.Queue) -> EventManager:
         """构建默认事件管理器并注册事件类型。
 
@@ -371,7 +522,7 @@ class JobQueueService(Service):
         代价：扩展事件需修改代码并重新发布。
         重评：当事件类型频繁变化时引入配置化注册。
         """
-        manager = EventManager(queue)
+        manager = EventManager(queue, **self.event_manager_options)
         event_names_types = [
             ("on_token", "token"),
             ("on_vertices_sorted", "vertices_sorted"),
@@ -9,7 +9,8 @@
 - TransactionService
 
 设计背景：需要保留构建过程的可追溯记录，以支持审计与问题定位。
-注意事项：服务是否启用由 `transactions_storage_enabled` 控制。
+注意事项：服务是否启用由 `transactions_storage_enabled` 控制；
+`db_write_behind=True` 时记录先进入后写缓冲，按批写入并周期裁剪。
 """
 
 from __future__ import annotations
@@ -23,7 +24,10 @@ from lfx.services.interfaces import TransactionServiceProtocol
 
 from langflow.services.base import Service
 from langflow.services.database.models.transactions.crud import log_transaction as crud_log_transaction
+from langflow.services.database.models.transactions.crud import log_transactions as crud_log_transactions
+from langflow.services.database.models.transactions.crud import prune_transactions as crud_prune_transactions
 from langflow.services.database.models.transactions.model import TransactionBase
+from langflow.services.database.write_behind import WriteBehindBuffer
 
 if TYPE_CHECKING:
     from langflow.services.settings.service import SettingsService
@@ -45,6 +49,8 @@ class TransactionService(Service, TransactionServiceProtocol):
         契约：持有 `settings_service` 用于读取启用开关。
         """
         self.settings_service = settings_service
+        self._buffer: WriteBehindBuffer[TransactionBase] | None = None
+        self._touched_flow_ids: set[UUID] = set()
 
     async def log_transaction(
         self,
@@ -81,6 +87,10 @@ class TransactionService(Service, TransactionServiceProtocol):
                 flow_id=flow_uuid,
             )
 
+            if self._write_behind_enabled():
+                self._get_buffer().submit(transaction)
+                return
+
             async with session_scope() as session:
                 await crud_log_transaction(session, transaction)
 
@@ -93,3 +103,40 @@ class TransactionService(Service, TransactionServiceProtocol):
         契约：返回布尔值；缺省时为 `False`。
         """
         return getattr(self.settings_service.settings, "transactions_storage_enabled", False)
+
+    def _write_behind_enabled(self) -> bool:
+        # 注意：显式比较 `True`，避免未配置该项的替身 settings 被当作开启。
+        return getattr(self.settings_service.settings, "db_write_behind", False) is True
+
+    def _get_buffer(self) -> WriteBehindBuffer[TransactionBase]:
+        if self._buffer is None:
+            settings = self.settings_service.settings
+            self._buffer = WriteBehindBuffer(
+                "transactions",
+                self._flush_transactions,
+                prune=self._prune_transactions,
+                flush_interval=settings.db_write_behind_flush_interval,
+                max_batch_size=settings.db_write_behind_batch_size,
+                prune_interval=settings.db_write_behind_prune_interval,
+            )
+        return self._buffer
+
+    async def _flush_transactions(self, transactions: list[TransactionBase]) -> None:
+        async with session_scope() as session:
+            await crud_log_transactions(session, transactions)
+        self._touched_flow_ids.update(transaction.flow_id for transaction in transactions)
+
+    async def _prune_transactions(self) -> None:
+        flow_ids, self._touched_flow_ids = self._touched_flow_ids, set()
+        async with session_scope() as session:
+            await crud_prune_transactions(session, flow_ids)
+
+    async def flush(self) -> None:
+        """立即写入后写缓冲中的全部记录（未开启后写时无操作）。"""
+        if self._buffer is not None:
+            await self._buffer.flush()
+
+    async def teardown(self) -> None:
+        """停机时排空后写缓冲并执行最后一次裁剪。"""
+        if self._buffer is not None:
+            await self._buffer.stop()
@@ -17,6 +17,8 @@
 from __future__ import annotations
 
 import os
+import threading
+import time
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
@@ -46,6 +48,46 @@ class DatabaseVariableService(VariableService, Service):
         失败语义：配置无效时会抛出异常。
         """
         self.settings_service = settings_service
+        self.cache_ttl = max(settings_service.settings.variable_cache_ttl, 0.0)
+        # 用户 -> 变量名 -> (过期时间, 类型, 解密值)
+        self._value_cache: dict[str, dict[str, tuple[float, str | None, str]]] = {}
+        self._cache_lock = threading.Lock()
+
+    def _cache_get(self, user_id: UUID | str, name: str) -> tuple[str | None, str] | None:
+        if not self.cache_ttl:
+            return None
+        with self._cache_lock:
+            entry = self._value_cache.get(str(user_id), {}).get(name)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1], entry[2]
+
+    def _cache_set(self, user_id: UUID | str, values: dict[str, tuple[str | None, str]]) -> None:
+        if not self.cache_ttl or not values:
+            return
+        expires = time.monotonic() + self.cache_ttl
+        with self._cache_lock:
+            user_cache = self._value_cache.setdefault(str(user_id), {})
+            for name, (variable_type, value) in values.items():
+                user_cache[name] = (expires, variable_type, value)
+
+    def invalidate_user_cache(self, user_id: UUID | str) -> None:
+        """变量增删改后调用，清除该用户的解密值缓存。
+
+        注意：只清除本进程；其他 worker 依赖 `variable_cache_ttl` 过期。失效发生在事务提交前，
+        提交窗口内并发读取可能重新缓存旧值，最长保留一个 TTL。
+        """
+        with self._cache_lock:
+            self._value_cache.pop(str(user_id), None)
+
+    @staticmethod
+    def _check_field(name: str, variable_type: str | None, field: str) -> None:
+        if variable_type == CREDENTIAL_TYPE and field == "session_id":
+            msg = (
+                f"variable {name} of type 'Credential' cannot be used in a Session ID field "
+                "because its purpose is to prevent the exposure of values."
+            )
+            raise TypeError(msg)
 
     async def initialize_user_variables(self, user_id: UUID | str, session: AsyncSession) -> None:
         """初始化用户变量。
@@ -205,19 +247,58 @@ class DatabaseVariableService(VariableService, Service):
         副作用：解密变量值。
         失败语义：变量不存在或类型不匹配时抛出异常。
         """
+        cached = self._cache_get(user_id, name)
+        if cached is not None:
+            self._check_field(name, cached[0], field)
+            return cached[1]
+
         # we get the credential from the database
         # credential = session.query(Variable).filter(Variable.user_id == user_id, Variable.name == name).first()
         variable = await self.get_variable_object(user_id, name, session)
-
-        if variable.type == CREDENTIAL_TYPE and field == "session_id":
-            msg = (
-                f"variable {name} of type 'Credential' cannot be used in a Session ID field "
-                "because its purpose is to prevent the exposure of values."
-            )
-            raise TypeError(msg)
+        self._check_field(name, variable.type, field)
 
         # we decrypt the value
-        return auth_utils.decrypt_api_key(variable.value, settings_service=self.settings_service)
+        value = auth_utils.decrypt_api_key(variable.value, settings_service=self.settings_service)
+        self._cache_set(user_id, {name: (variable.type, value)})
+        return value
+
+    async def get_variables_by_names(
+        self,
+        user_id: UUID | str,
+        names: Sequence[str],
+        session: AsyncSession,
+    ) -> dict[str, tuple[str | None, str]]:
+        """批量获取并解密变量。
+
+        契约：返回 `变量名 -> (类型, 解密值)`；不存在、值为空或解密失败的变量不出现在结果中，
+        由调用方逐个 `get_variable` 以得到原有异常。
+        性能：未命中缓存的变量合并为一条 `SELECT ... WHERE name IN (...)`，每个变量只解密一次。
+        """
+        resolved: dict[str, tuple[str | None, str]] = {}
+        missing = []
+        for name in dict.fromkeys(names):
+            cached = self._cache_get(user_id, name)
+            if cached is None:
+                missing.append(name)
+            else:
+                resolved[name] = cached
+        if not missing:
+            return resolved
+
+        stmt = select(Variable).where(Variable.user_id == user_id, Variable.name.in_(missing))
+        fetched: dict[str, tuple[str | None, str]] = {}
+        for variable in (await session.exec(stmt)).all():
+            if not variable.value:
+                continue
+            try:
+                value = auth_utils.decrypt_api_key(variable.value, settings_service=self.settings_service)
+            except Exception as e:  # noqa: BLE001
+                await logger.adebug(f"Decryption failed for variable '{variable.name}' during prefetch: {e}")
+                continue
+            fetched[variable.name] = (variable.type, value)
+        self._cache_set(user_id, fetched)
+        resolved.update(fetched)
+        return resolved
 
     async def get_all(self, user_id: UUID | str, session: AsyncSession) -> list[VariableRead]:
         """获取所有变量。
@@ -302,6 +383,7 @@ class DatabaseVariableService(VariableService, Service):
         session.add(variable)
         await session.flush()
         await session.refresh(variable)
+        self.invalidate_user_cache(user_id)
         return variable
 
     async def update_variable_fields(
@@ -339,6 +421,7 @@ class DatabaseVariableService(VariableService, Service):
         session.add(db_variable)
         await session.flush()
         await session.refresh(db_variable)
+        self.invalidate_user_cache(user_id)
         return db_variable
 
     async def delete_variable(
@@ -359,6 +442,7 @@ class DatabaseVariableService(VariableService, Service):
             msg = f"{name} variable not found."
             raise ValueError(msg)
         await session.delete(variable)
+        self.invalidate_user_cache(user_id)
 
     async def delete_variable_by_id(self, user_id: UUID | str, variable_id: UUID, session: AsyncSession) -> None:
         """通过ID删除变量。
@@ -373,6 +457,7 @@ class DatabaseVariableService(VariableService, Service):
             msg = f"{variable_id} variable not found."
             raise ValueError(msg)
         await session.delete(variable)
+        self.invalidate_user_cache(user_id)
 
     async def create_variable(
         self,
@@ -406,4 +491,5 @@ class DatabaseVariableService(VariableService, Service):
         session.add(variable)
         await session.flush()
         await session.refresh(variable)
+        self.invalidate_user_cache(user_id)
         return variable
@@ -5,18 +5,25 @@
 主要功能包括：
 - 使用gzip算法压缩JSON数据
 - 设置适当的HTTP响应头
+- 预压缩不可变负载（gzip，及可选的 brotli/zstd），按 `Accept-Encoding` 协商并支持 `ETag`/`If-None-Match`
 
 设计背景：在API响应数据较大时，压缩可以显著减少网络传输时间
-注意事项：压缩级别设置为6，在压缩率和性能之间取得平衡
+注意事项：压缩级别设置为6，在压缩率和性能之间取得平衡；brotli 依赖 `brotli` 包，zstd 依赖 `zstandard` 包，缺失时跳过
 """
 
+import contextlib
 import gzip
+import hashlib
 import json
+from dataclasses import dataclass
 from typing import Any
 
-from fastapi import Response
+from fastapi import Request, Response
 from fastapi.encoders import jsonable_encoder
 
+# 注意：协商时的优先顺序；gzip 始终可用，客户端未声明支持任何编码时也回退到 gzip（与 `compress_response` 一致）。
+ENCODING_PREFERENCE = ("br", "zstd", "gzip")
+
 
 def compress_response(data: Any) -> Response:
     """压缩数据并将其作为带有适当头部的FastAPI Response返回。
@@ -39,3 +46,108 @@ def compress_response(data: Any) -> Response:
         media_type="application/json",
         headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding", "Content-Length": str(len(compressed_data))},
     )
+
+
+@dataclass(frozen=True)
+class PrecompressedJSON:
+    """一次序列化、多种编码预压缩的 JSON 负载。
+
+    契约：`digest` 为未压缩内容的哈希，`etag(encoding)` 返回强校验值（含引号）；`bodies` 为编码名 → 压缩后字节。
+    决策：各编码共用同一内容哈希，`ETag` 附加编码后缀
+    问题：强 `ETag` 要求不同字节表示不同标签，但缓存的客户端切换编码时内容并未变化
+    方案：响应标签为 `"<hash>-<encoding>"`，比较 `If-None-Match` 时只比较哈希部分
+    代价：编码切换后命中 304 的客户端仍持有另一编码的缓存，由其自行解码
+    重评：当前端只走单一编码时可去掉编码后缀
+    """
+
+    digest: str
+    bodies: dict[str, bytes]
+
+    def etag(self, encoding: str) -> str:
+        return f'"{self.digest}-{encoding}"'
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """判断 `If-None-Match` 是否命中当前内容（弱比较，忽略 `W/` 前缀与编码后缀）。"""
+        if not if_none_match:
+            return False
+        for raw_tag in if_none_match.split(","):
+            tag = raw_tag.strip()
+            if tag == "*":
+                return True
+            tag = tag.removeprefix("W/").strip('"')
+            if tag.split("-", 1)[0] == self.digest:
+                return True
+        return False
+
+
+def _brotli():
+    import brotli
+
+    return brotli
+
+
+def _zstd():
+    import zstandard
+
+    return zstandard
+
+
+def precompress_json(data: Any) -> PrecompressedJSON:
+    """序列化并预压缩 JSON 负载。
+
+    关键路径（三步）：
+    1) 与 `compress_response` 相同方式序列化为 UTF-8 字节
+    2) 以内容哈希生成 `ETag`
+    3) 依次生成 gzip（必选）与 brotli/zstd（依赖可用时）压缩结果
+
+    性能瓶颈：大负载的序列化与压缩（CPU 密集，调用方应在线程中执行并缓存结果）
+    """
+    json_data = json.dumps(jsonable_encoder(data)).encode("utf-8")
+    digest = hashlib.blake2b(json_data, digest_size=16).hexdigest()
+    bodies = {"gzip": gzip.compress(json_data, compresslevel=6)}
+    with contextlib.suppress(ImportError):
+        bodies["br"] = _brotli().compress(json_data, quality=9)
+    with contextlib.suppress(ImportError):
+        bodies["zstd"] = _zstd().ZstdCompressor(level=9).compress(json_data)
+    return PrecompressedJSON(digest=digest, bodies=bodies)
+
+
+def _accepted_encodings(accept_encoding: str | None) -> set[str]:
+    """解析 `Accept-Encoding`，返回 `q > 0` 的编码名集合。"""
+    accepted: set[str] = set()
+    for part in (accept_encoding or "").split(","):
+        name, *params = (item.strip() for item in part.split(";"))
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if name and quality > 0:
+            accepted.add(name.lower())
+    return accepted
+
+
+def precompressed_response(
+    payload: PrecompressedJSON, request: Request, *, cache_control: str | None = None
+) -> Response:
+    """按 `Accept-Encoding` 选择预压缩结果返回；`If-None-Match` 命中时返回 304。
+
+    契约：响应总是带 `ETag` 与 `Vary: Accept-Encoding`；304 响应不带正文。
+    排障入口：检查响应头 `Content-Encoding` 与 `ETag` 是否随组件变化而变化。
+    """
+    accepted = _accepted_encodings(request.headers.get("accept-encoding"))
+    encoding = next(
+        (name for name in ENCODING_PREFERENCE if name in payload.bodies and (name in accepted or "*" in accepted)),
+        "gzip",
+    )
+    headers = {"ETag": payload.etag(encoding), "Vary": "Accept-Encoding"}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    if payload.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    body = payload.bodies[encoding]
+    headers["Content-Encoding"] = encoding
+    headers["Content-Length"] = str(len(body))
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,7 +1,11 @@
+import hashlib
 import json
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
+from langchain_chroma import Chroma
 from langflow.base.knowledge_bases.knowledge_base_utils import get_knowledge_bases
 from langflow.schema.data import Data
 from langflow.schema.dataframe import DataFrame
@@ -263,6 +267,121 @@ class TestKnowledgeIngestionComponent(ComponentTestBaseWithClient):
         # Should only return one object (second row) since first is duplicate
         assert len(data_objects) == 1
 
+    async def test_convert_df_to_data_objects_keeps_row_wise_ids(self, component_class, default_kwargs):
+        """Test ids and metadata match the previous row-by-row conversion for mixed int/float rows."""
+        default_kwargs["allow_duplicates"] = True
+        component = component_class(**default_kwargs)
+        data_df = DataFrame({"text": [1.5, 2.5], "count": [1, 2]})
+        config_list = [
+            {"column_name": "text", "vectorize": True, "identifier": False},
+            {"column_name": "count", "vectorize": False, "identifier": True},
+        ]
+
+        with patch("langflow.components.knowledge_bases.ingestion.Chroma"):
+            data_objects = await component._convert_df_to_data_objects(data_df, config_list)
+
+        # iterrows() upcasts each all-numeric row to float, so the old ids hashed "1.0" rather than "1"
+        expected = [
+            (str(row["text"]), str(row["count"]), hashlib.sha256(str(row["count"]).encode()).hexdigest())
+            for _, row in data_df.iterrows()
+        ]
+        assert [(obj.data["text"], obj.data["count"], obj.data["_id"]) for obj in data_objects] == expected
+        assert expected[0][1] == "1.0"
+
+    async def test_create_vector_store_streams_batches(self, component_class, default_kwargs):
+        """Test rows are upserted in chunk_size batches and duplicates across batches are skipped."""
+        default_kwargs["allow_duplicates"] = False
+        default_kwargs["chunk_size"] = 2
+        component = component_class(**default_kwargs)
+        data_df = DataFrame(
+            {
+                "text": ["a", "b", "c", "d", "e"],
+                "title": ["t1", "t2", "t3", "t4", "t5"],
+                "category": ["c1", "c2", "c1", "c3", "c4"],
+            }
+        )
+
+        with (
+            patch("langflow.components.knowledge_bases.ingestion.Chroma") as mock_chroma,
+            patch.object(component, "_build_embeddings"),
+        ):
+            mock_chroma_instance = MagicMock()
+            mock_chroma_instance.get.return_value = {"metadatas": []}
+            mock_chroma.return_value = mock_chroma_instance
+
+            await component._create_vector_store(data_df, default_kwargs["column_config"], "model", "key")
+
+        batches = [call.args[0] for call in mock_chroma_instance.add_texts.call_args_list]
+        assert sorted(len(batch) for batch in batches) == [1, 1, 2]
+        texts = sorted(text for batch in batches for text in batch)
+        assert texts == ["a", "b", "d", "e"]
+        # Existing ids are looked up per batch instead of reading the whole collection
+        for call in mock_chroma_instance.get.call_args_list:
+            assert "$in" in call.kwargs["where"]["_id"]
+
+    async def test_create_vector_store_embeds_concurrently_and_writes_serially(self, component_class, default_kwargs):
+        """Test batches are embedded in parallel while collection writes never overlap."""
+        default_kwargs["chunk_size"] = 1
+        default_kwargs["embedding_concurrency"] = 4
+        component = component_class(**default_kwargs)
+        data_df = DataFrame({"text": ["a", "b", "c", "d"], "category": ["c1", "c2", "c3", "c4"]})
+
+        lock = threading.Lock()
+        active = {"embed": 0, "write": 0}
+        peak = {"embed": 0, "write": 0}
+
+        def track(kind):
+            with lock:
+                active[kind] += 1
+                peak[kind] = max(peak[kind], active[kind])
+            time.sleep(0.05)
+            with lock:
+                active[kind] -= 1
+
+        def embed_documents(texts):
+            track("embed")
+            return [[0.0] for _ in texts]
+
+        embedding_function = MagicMock()
+        embedding_function.embed_documents.side_effect = embed_documents
+
+        with (
+            patch("langflow.components.knowledge_bases.ingestion.Chroma") as mock_chroma,
+            patch.object(component, "_build_embeddings", return_value=embedding_function),
+        ):
+            mock_chroma_instance = MagicMock()
+            mock_chroma_instance.get.return_value = {"metadatas": []}
+            mock_chroma_instance.add_texts.side_effect = lambda *_args, **_kwargs: track("write")
+            mock_chroma.return_value = mock_chroma_instance
+
+            await component._create_vector_store(data_df, default_kwargs["column_config"], "model", "key")
+
+        assert mock_chroma_instance.add_texts.call_count == 4
+        assert peak["embed"] > 1
+        assert peak["write"] == 1
+
+    async def test_create_vector_store_writes_precomputed_embeddings(self, component_class, default_kwargs, tmp_path):
+        """Test a real collection stores the embeddings computed outside the write lock."""
+        default_kwargs["chunk_size"] = 1
+        component = component_class(**default_kwargs)
+        data_df = DataFrame({"text": ["a", "bb"], "category": ["c1", "c2"]})
+
+        embedding_function = MagicMock()
+        embedding_function.embed_documents.side_effect = lambda texts: [[float(len(text)), 1.0] for text in texts]
+
+        with (
+            patch.object(component, "_kb_path", return_value=tmp_path / "store"),
+            patch.object(component, "_build_embeddings", return_value=embedding_function),
+        ):
+            await component._create_vector_store(data_df, default_kwargs["column_config"], "model", "key")
+
+        stored = Chroma(persist_directory=str(tmp_path / "store"), collection_name=component.knowledge_base).get(
+            include=["documents", "embeddings", "metadatas"]
+        )
+        by_text = {text: list(vector) for text, vector in zip(stored["documents"], stored["embeddings"], strict=True)}
+        assert by_text == {"a": [1.0, 1.0], "bb": [2.0, 1.0]}
+        assert all(metadata["_id"] for metadata in stored["metadatas"])
+
     def test_is_valid_collection_name(self, component_class, default_kwargs):
         """Test collection name validation."""
         component = component_class(**default_kwargs)
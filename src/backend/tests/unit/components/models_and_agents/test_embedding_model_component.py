@@ -1,4 +1,7 @@
-from unittest.mock import MagicMock, patch
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
 
 import pytest
 from lfx.components.models_and_agents import EmbeddingModelComponent
@@ -45,12 +48,12 @@ class TestEmbeddingModelComponent(ComponentTestBaseWithoutClient):
         """Return the file names mapping for version-specific files."""
         return []
 
-    @patch("lfx.components.models_and_agents.embedding_model.get_api_key_for_provider")
+    @patch("lfx.components.models_and_agents.embedding_model.aget_api_key_for_provider", new_callable=AsyncMock)
     @patch("lfx.components.models_and_agents.embedding_model.get_embedding_classes")
-    def test_build_embeddings_openai(
+    async def test_build_embeddings_openai(
         self, mock_get_embedding_classes, mock_get_api_key, component_class, default_kwargs
     ):
-        # Setup mock for get_api_key_for_provider
+        # Setup mock for aget_api_key_for_provider
         mock_get_api_key.return_value = "test-key"
         # Setup mock
         mock_openai_class = MagicMock()
@@ -73,7 +76,7 @@ class TestEmbeddingModelComponent(ComponentTestBaseWithoutClient):
         component.model_kwargs = None
 
         # Build the embeddings
-        embeddings = component.build_embeddings()
+        embeddings = await component.build_embeddings()
 
         # Verify the embedding class getter was called
         mock_embedding_classes_dict.get.assert_called_once_with("OpenAIEmbeddings")
@@ -88,8 +91,8 @@ class TestEmbeddingModelComponent(ComponentTestBaseWithoutClient):
         )
         assert embeddings == mock_instance
 
-    @patch("lfx.components.models_and_agents.embedding_model.get_api_key_for_provider")
-    def test_build_embeddings_openai_missing_api_key(self, mock_get_api_key, component_class, default_kwargs):
+    @patch("lfx.components.models_and_agents.embedding_model.aget_api_key_for_provider", new_callable=AsyncMock)
+    async def test_build_embeddings_openai_missing_api_key(self, mock_get_api_key, component_class, default_kwargs):
         # Setup mock to return None (no API key)
         mock_get_api_key.return_value = None
 
@@ -98,21 +101,21 @@ class TestEmbeddingModelComponent(ComponentTestBaseWithoutClient):
         component.api_key = None
 
         with pytest.raises(ValueError, match="OpenAI API key is required"):
-            component.build_embeddings()
+            await component.build_embeddings()
 
-    def test_build_embeddings_invalid_model_format(self, component_class, default_kwargs):
+    async def test_build_embeddings_invalid_model_format(self, component_class, default_kwargs):
         component = component_class(**default_kwargs)
         component.model = None
 
         with pytest.raises(ValueError, match="Model must be a non-empty list"):
-            component.build_embeddings()
+            await component.build_embeddings()
 
-    @patch("lfx.components.models_and_agents.embedding_model.get_api_key_for_provider")
+    @patch("lfx.components.models_and_agents.embedding_model.aget_api_key_for_provider", new_callable=AsyncMock)
     @patch("lfx.components.models_and_agents.embedding_model.get_embedding_classes")
-    def test_build_embeddings_unknown_embedding_class(
+    async def test_build_embeddings_unknown_embedding_class(
         self, mock_get_embedding_classes, mock_get_api_key, component_class, default_kwargs
     ):
-        # Setup mock for get_api_key_for_provider
+        # Setup mock for aget_api_key_for_provider
         mock_get_api_key.return_value = "test-key"
         # Setup mock to return None for unknown class
         mock_embedding_classes_dict = MagicMock()
@@ -133,12 +136,12 @@ class TestEmbeddingModelComponent(ComponentTestBaseWithoutClient):
         ]
 
         with pytest.raises(ValueError, match="Unknown embedding class: UnknownEmbeddingClass"):
-            component.build_embeddings()
+            await component.build_embeddings()
 
-    @patch("lfx.components.models_and_agents.embedding_model.get_api_key_for_provider")
+    @patch("lfx.components.models_and_agents.embedding_model.aget_api_key_for_provider", new_callable=AsyncMock)
     @patch("lfx.components.models_and_agents.embedding_model.get_embedding_classes")
-    def test_build_embeddings_google(self, mock_get_embedding_classes, mock_get_api_key, component_class):
-        # Setup mock for get_api_key_for_provider
+    async def test_build_embeddings_google(self, mock_get_embedding_classes, mock_get_api_key, component_class):
+        # Setup mock for aget_api_key_for_provider
         mock_get_api_key.return_value = "test-google-key"
 
         # Setup mock
@@ -178,7 +181,7 @@ class TestEmbeddingModelComponent(ComponentTestBaseWithoutClient):
         component.model_kwargs = None
 
         # Build the embeddings
-        embeddings = component.build_embeddings()
+        embeddings = await component.build_embeddings()
 
         # Verify the embedding class getter was called
         mock_embedding_classes_dict.get.assert_called_once_with("GoogleGenerativeAIEmbeddings")
@@ -189,3 +192,48 @@ class TestEmbeddingModelComponent(ComponentTestBaseWithoutClient):
             google_api_key="test-google-key",
         )
         assert embeddings == mock_instance
+
+    @patch("lfx.components.models_and_agents.embedding_model.get_embedding_classes")
+    async def test_slow_global_api_key_lookup_does_not_block_event_loop(
+        self, mock_get_embedding_classes, component_class, default_kwargs
+    ):
+        mock_embedding_classes_dict = MagicMock()
+        mock_embedding_classes_dict.get.return_value = MagicMock()
+        mock_get_embedding_classes.return_value = mock_embedding_classes_dict
+
+        async def slow_get_variable(**_kwargs):
+            await asyncio.sleep(0.2)
+            return "global-key"
+
+        variable_service = MagicMock()
+        variable_service.get_variable = slow_get_variable
+
+        @asynccontextmanager
+        async def fake_session_scope():
+            yield MagicMock()
+
+        component = component_class(**{**default_kwargs, "api_key": None})
+        component._user_id = uuid4()
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        tick_task = asyncio.create_task(ticker())
+        try:
+            with (
+                patch("lfx.base.models.unified_models.session_scope", fake_session_scope),
+                patch("lfx.base.models.unified_models.get_variable_service", return_value=variable_service),
+            ):
+                await component.build_embeddings()
+        finally:
+            tick_task.cancel()
+
+        embedding_kwargs = mock_embedding_classes_dict.get.return_value.call_args.kwargs
+        assert embedding_kwargs["api_key"] == "global-key"
+        # The lookup yields to the loop instead of blocking it for its whole duration.
+        assert ticks > 5
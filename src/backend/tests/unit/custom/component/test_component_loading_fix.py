@@ -27,6 +27,8 @@ class TestComponentLoadingFix:
         settings_service = MagicMock(spec=SettingsService)
         settings_service.settings = MagicMock()
         settings_service.settings.lazy_load_components = False
+        settings_service.settings.lazy_component_index = False
+        settings_service.settings.component_loader_workers = 0
         settings_service.settings.components_path = []
         return settings_service
 
@@ -0,0 +1,129 @@
+import asyncio
+import time
+
+import pytest
+from langflow.services.base import Service
+from langflow.services.cache import service as cache_service_module
+from langflow.services.cache.service import AsyncInMemoryCache, ThreadingInMemoryCache
+from langflow.services.cache.sizing import estimate_size
+from lfx.services.cache.utils import CACHE_MISS
+
+
+def test_estimate_size_scales_with_content():
+    small = {"a": "x" * 10}
+    large = {"a": "x" * 100_000, "b": [list(range(1000))]}
+
+    assert estimate_size(b"12345") == 5
+    assert estimate_size(large) > estimate_size(small) + 100_000
+
+
+def test_estimate_size_does_not_walk_into_services():
+    class BigService(Service):
+        name = "big_service"
+
+        def __init__(self):
+            self.payload = "x" * 1_000_000
+
+    class Holder:
+        def __init__(self, service):
+            self.service = service
+            self.data = "y" * 100
+
+    assert estimate_size(Holder(BigService())) < 10_000
+
+
+def test_explicit_size_skips_estimation(monkeypatch):
+    monkeypatch.setattr(cache_service_module, "estimate_size", lambda *_args, **_kwargs: pytest.fail("estimated"))
+    cache = ThreadingInMemoryCache(max_bytes=1_000)
+    cache.set("a", "x" * 10_000, size=10)
+
+    assert cache.stats()["bytes"] == 10
+
+
+@pytest.mark.asyncio
+async def test_async_upsert_of_same_objects_reuses_estimate(monkeypatch):
+    calls = []
+
+    def counting_estimate(value, **kwargs):
+        calls.append(value)
+        return estimate_size(value, **kwargs)
+
+    monkeypatch.setattr(cache_service_module, "estimate_size", counting_estimate)
+    cache = AsyncInMemoryCache(max_bytes=1_000_000)
+    graph = {"vertices": list(range(100))}
+    await cache.upsert("flow", {"result": graph, "type": dict})
+    await cache.upsert("flow", {"result": graph, "type": dict})
+    assert len(calls) == 1
+
+    await cache.upsert("flow", {"result": {"other": True}, "type": dict})
+    assert len(calls) == 2
+
+
+def test_threading_cache_evicts_by_byte_budget():
+    cache = ThreadingInMemoryCache(max_bytes=50_000)
+    cache.set("small", "x" * 1_000)
+    cache.set("large", "y" * 45_000)
+    cache.get("small")
+    cache.set("other", "z" * 10_000)
+
+    # "large" was least recently used, so it is evicted first
+    assert "large" not in cache
+    assert cache.get("small") == "x" * 1_000
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= 50_000
+    assert stats["hits"] == 2
+
+
+def test_threading_cache_keeps_single_oversized_entry():
+    cache = ThreadingInMemoryCache(max_bytes=100)
+    cache.set("a", "x" * 1_000)
+
+    assert cache.get("a") == "x" * 1_000
+    assert cache.stats()["size"] == 1
+
+
+def test_threading_cache_sweep_removes_expired_items():
+    cache = ThreadingInMemoryCache(expiration_time=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    time.sleep(0.06)
+    cache.set("c", 3)
+
+    assert cache.sweep() == 2
+    assert len(cache) == 1
+    assert cache.stats()["expirations"] == 2
+
+
+@pytest.mark.asyncio
+async def test_async_cache_upsert_merges_and_counts_misses():
+    cache = AsyncInMemoryCache(max_bytes=1_000_000)
+    await cache.upsert("key", {"a": 1})
+    await cache.upsert("key", {"b": 2})
+
+    assert await cache.get("key") == {"a": 1, "b": 2}
+    assert await cache.get("missing") is CACHE_MISS
+    stats = cache.stats()
+    assert stats["misses"] == 2  # the first upsert and the missing key
+    assert stats["bytes"] > 0
+
+
+@pytest.mark.asyncio
+async def test_async_cache_background_sweeper():
+    cache = AsyncInMemoryCache(expiration_time=0.02, sweep_interval=0.02)
+    await cache.set("a", 1)
+    await asyncio.sleep(0.1)
+
+    assert "a" not in cache.cache
+    assert cache.stats()["expirations"] == 1
+    await cache.teardown()
+
+
+@pytest.mark.asyncio
+async def test_async_cache_evicts_by_max_size():
+    cache = AsyncInMemoryCache(max_size=2)
+    for key in ("a", "b", "c"):
+        await cache.set(key, key)
+
+    assert await cache.get("a") is CACHE_MISS
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,86 @@
+import pickle
+
+import dill
+import pytest
+from langflow.services.cache.disk import AsyncDiskCache
+from langflow.services.cache.serializer import (
+    CODEC_DILL,
+    CODEC_JSON,
+    CODEC_PICKLE,
+    COMPRESSION_NONE,
+    MAGIC,
+    CacheSerializer,
+)
+
+
+def _header(data: bytes) -> tuple[bytes, bytes]:
+    assert data.startswith(MAGIC)
+    return data[len(MAGIC) : len(MAGIC) + 1], data[len(MAGIC) + 1 : len(MAGIC) + 2]
+
+
+@pytest.mark.parametrize(
+    ("value", "codec"),
+    [
+        ({"text": "hello", "items": [1, 2.5, None, True]}, CODEC_JSON),
+        ({"key": (1, 2)}, CODEC_PICKLE),
+        ({1: "non-string key"}, CODEC_PICKLE),
+        (float("nan"), CODEC_PICKLE),
+        (b"raw bytes", CODEC_PICKLE),
+        (lambda x: x + 1, CODEC_DILL),
+    ],
+)
+def test_round_trip_records_codec(value, codec):
+    serializer = CacheSerializer(compression="none")
+    data = serializer.dumps(value)
+
+    assert _header(data) == (codec, COMPRESSION_NONE)
+    restored = serializer.loads(data)
+    if callable(value):
+        assert restored(1) == 2
+    elif value != value:  # noqa: PLR0124
+        assert restored != restored  # noqa: PLR0124
+    else:
+        assert restored == value
+
+
+def test_large_payload_is_compressed():
+    serializer = CacheSerializer(compression_threshold=1024)
+    value = {"text": "x" * 100_000}
+    data = serializer.dumps(value)
+
+    _, compression = _header(data)
+    if serializer.compression != COMPRESSION_NONE:
+        assert compression == serializer.compression
+        assert len(data) < 10_000
+    assert serializer.loads(data) == value
+
+
+def test_out_of_band_buffers_are_writable():
+    np = pytest.importorskip("numpy")
+    serializer = CacheSerializer(compression="none")
+    array = np.arange(1000)
+
+    restored = serializer.loads(serializer.dumps(array))
+    restored[0] = 42
+
+    assert restored[0] == 42
+    assert (restored[1:] == array[1:]).all()
+
+
+def test_reads_legacy_entries_without_header():
+    serializer = CacheSerializer()
+
+    assert serializer.loads(pickle.dumps({"a": 1})) == {"a": 1}
+    assert serializer.loads(dill.dumps((1, 2), recurse=True)) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_round_trips_and_upserts(tmp_path):
+    cache = AsyncDiskCache(cache_dir=tmp_path, serializer=CacheSerializer(compression_threshold=16))
+    await cache.set("text", "plain string")
+    await cache.upsert("data", {"a": 1})
+    await cache.upsert("data", {"b": (1, 2)})
+
+    assert await cache.get("text") == "plain string"
+    assert await cache.get("data") == {"a": 1, "b": (1, 2)}
+    await cache.teardown()
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+from langflow.memory import aadd_messagetables
+from langflow.services.database.models.message.model import MessageTable
+from langflow.services.database.models.message.writer import MessageWriteCoalescer
+from langflow.services.deps import session_scope
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submits_share_one_write():
+    batches: list[list[str]] = []
+
+    async def write(items):
+        batches.append(list(items))
+        return [f"row-{item}" for item in items]
+
+    writer = MessageWriteCoalescer(write, interval=0.05, max_batch_size=100)
+    results = await asyncio.gather(writer.submit(["a"]), writer.submit(["b", "c"]), writer.submit(["d"]))
+
+    assert batches == [["a", "b", "c", "d"]]
+    assert results == [["row-a"], ["row-b", "row-c"], ["row-d"]]
+    assert writer.stats() == {"requests": 3, "messages": 4, "batches": 1, "retries": 0}
+
+
+@pytest.mark.asyncio
+async def test_batches_are_capped_without_splitting_requests():
+    batches: list[list[int]] = []
+
+    async def write(items):
+        batches.append(list(items))
+        return items
+
+    writer = MessageWriteCoalescer(write, interval=60, max_batch_size=3)
+    results = await asyncio.gather(writer.submit([1, 2]), writer.submit([3, 4]), writer.submit([5]))
+
+    # Reaching the batch size wakes the writer instead of waiting for the window
+    assert batches == [[1, 2], [3, 4, 5]]
+    assert results == [[1, 2], [3, 4], [5]]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_per_request():
+    async def write(items):
+        if "bad" in items:
+            msg = "boom"
+            raise RuntimeError(msg)
+        return items
+
+    writer = MessageWriteCoalescer(write, interval=0.05)
+    good, bad = await asyncio.gather(writer.submit(["ok"]), writer.submit(["bad"]), return_exceptions=True)
+
+    assert good == ["ok"]
+    assert isinstance(bad, RuntimeError)
+    assert writer.stats()["retries"] == 1
+
+
+@pytest.mark.usefixtures("client")
+async def test_aadd_messagetables_bulk_insert_returns_rows_in_order():
+    messages = [
+        MessageTable(text=f"bulk {i}", sender="User", sender_name="User", session_id="bulk_session") for i in range(5)
+    ]
+    async with session_scope() as session:
+        created = await aadd_messagetables(messages, session)
+
+    assert [message.text for message in created] == [f"bulk {i}" for i in range(5)]
+    assert [message.id for message in created] == [message.id for message in messages]
@@ -3,7 +3,11 @@ from unittest.mock import patch
 from uuid import uuid4
 
 import pytest
-from langflow.services.database.models.vertex_builds.crud import log_vertex_build
+from langflow.services.database.models.vertex_builds.crud import (
+    log_vertex_build,
+    log_vertex_builds,
+    prune_vertex_builds,
+)
 from langflow.services.database.models.vertex_builds.model import VertexBuildBase, VertexBuildTable
 from lfx.services.settings.base import Settings
 from sqlalchemy import delete, func, select
@@ -314,3 +318,27 @@ async def test_concurrent_log_vertex_build(vertex_build_data, mock_settings):
         async with AsyncSession(engine) as session:
             count = await session.scalar(select(func.count()).select_from(VertexBuildTable))
             assert count <= mock_settings.max_vertex_builds_to_keep
+
+
+@pytest.mark.asyncio
+async def test_log_vertex_builds_batch_then_prune(async_session: AsyncSession, mock_settings, timestamp_generator):
+    """Test batched inserts skip pruning until prune_vertex_builds runs."""
+    flow_id = uuid4()
+    vertex_id = str(uuid4())
+    builds = [
+        VertexBuildBase(id=vertex_id, flow_id=flow_id, timestamp=timestamp_generator(i), artifacts={}, valid=True)
+        for i in range(mock_settings.max_vertex_builds_per_vertex + 2)
+    ]
+    with patch("langflow.services.database.models.vertex_builds.crud.get_settings_service") as mock_settings_service:
+        mock_settings_service.return_value.settings = mock_settings
+
+        await log_vertex_builds(async_session, builds)
+        count = await async_session.scalar(select(func.count()).select_from(VertexBuildTable))
+        assert count == len(builds)
+
+        await prune_vertex_builds(async_session, {(flow_id, vertex_id)})
+        remaining = (await async_session.execute(select(VertexBuildTable.timestamp))).scalars().all()
+
+    assert len(remaining) == mock_settings.max_vertex_builds_per_vertex
+    newest = sorted(build.timestamp for build in builds)[-mock_settings.max_vertex_builds_per_vertex :]
+    assert sorted(ts.replace(tzinfo=timezone.utc) for ts in remaining) == newest
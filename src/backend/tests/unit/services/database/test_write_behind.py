@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+from langflow.services.database.write_behind import WriteBehindBuffer
+
+
+@pytest.mark.asyncio
+async def test_flushes_in_batches_on_interval():
+    batches: list[list[int]] = []
+
+    async def flush(items):
+        batches.append(list(items))
+
+    buffer = WriteBehindBuffer("test", flush, flush_interval=0.01, max_batch_size=3)
+    for i in range(7):
+        buffer.submit(i)
+    await asyncio.sleep(0.1)
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [item for batch in batches for item in batch] == list(range(7))
+    assert buffer.stats()["flushed"] == 7
+    await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_pending_and_prunes_once():
+    flushed: list[int] = []
+    prunes = 0
+
+    async def flush(items):
+        flushed.extend(items)
+
+    async def prune():
+        nonlocal prunes
+        prunes += 1
+
+    buffer = WriteBehindBuffer("test", flush, prune=prune, flush_interval=60, max_batch_size=100, prune_interval=60)
+    buffer.submit(1)
+    buffer.submit(2)
+    await buffer.stop()
+
+    assert flushed == [1, 2]
+    assert prunes == 1
+    # Nothing new since the last prune, so stopping again does not prune
+    await buffer.stop()
+    assert prunes == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_counted_and_does_not_block():
+    async def flush(items):
+        if 0 in items:
+            msg = "boom"
+            raise RuntimeError(msg)
+
+    buffer = WriteBehindBuffer("test", flush, flush_interval=60, max_batch_size=1, max_pending=2)
+    buffer.submit(0)
+    buffer.submit(1)
+    buffer.submit(2)
+    await buffer.stop()
+
+    assert buffer.stats() == {"pending": 0, "flushed": 1, "batches": 1, "dropped": 1, "failed": 1}
@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+from langflow.services.job_queue.bounded import BoundedEventQueue
+from langflow.services.job_queue.service import JobQueueService
+
+
+def _token(i):
+    return (f"token-{i}", f"t{i}".encode(), time.time())
+
+
+def _event(name):
+    return (f"{name}-id", name.encode(), time.time())
+
+
+def _drain(queue):
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def test_drop_tokens_keeps_lifecycle_events():
+    queue = BoundedEventQueue(2, policy="drop_tokens")
+    queue.put_nowait(_token(0))
+    queue.put_nowait(_token(1))
+    queue.put_nowait(_token(2))
+    queue.put_nowait(_event("end_vertex"))
+    queue.put_nowait((None, None, time.time()))
+
+    assert [item[0] for item in _drain(queue)] == ["token-0", "token-1", "end_vertex-id", None]
+    stats = queue.stats()
+    assert stats["dropped"] == 1
+    assert stats["max_depth"] == 4
+
+
+async def test_spill_preserves_order_and_payloads():
+    queue = BoundedEventQueue(2, policy="spill")
+    for i in range(5):
+        queue.put_nowait(_token(i))
+    await queue.put((None, None, time.time()))
+    assert queue.stats()["spilled"] == 4
+
+    assert (await queue.get())[1] == b"t0"
+    queue.put_nowait(_token(5))
+    items = _drain(queue)
+    assert [item[1] for item in items] == [b"t1", b"t2", b"t3", b"t4", None, b"t5"]
+    assert queue.stats()["spilled"] == 0
+    queue.close()
+
+
+async def test_block_waits_for_consumer_then_falls_back_to_dropping():
+    queue = BoundedEventQueue(1, policy="block", block_timeout=0.05)
+    queue.put_nowait(_token(0))
+    waiter = asyncio.create_task(queue.wait_for_capacity())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    await queue.get()
+    await asyncio.wait_for(waiter, timeout=1)
+
+    queue.put_nowait(_token(1))
+    await queue.wait_for_capacity()  # times out, nobody is consuming
+    queue.put_nowait(_token(2))
+    assert queue.stats()["dropped"] == 1
+
+    await queue.get()
+    queue.put_nowait(_token(3))
+    queue.put_nowait(_token(4))
+    assert queue.qsize() == 2  # producer is no longer considered stalled once space frees up
+
+
+async def test_service_creates_bounded_queues_and_reports_stats():
+    service = JobQueueService(max_events=1, overflow_policy="drop_tokens")
+    queue, event_manager = service.create_queue("job")
+    assert isinstance(queue, BoundedEventQueue)
+    event_manager.send_token(chunk="a", message_id="m")
+    event_manager.send_token(chunk="b", message_id="m")
+    event_manager.on_end(data={})
+
+    assert service.stats() == {"jobs": 1, "depth": 2, "dropped": 1, "spilled": 0}
+    await service.cleanup_job("job")
+    assert service.stats() == {"jobs": 0, "depth": 0, "dropped": 1, "spilled": 0}
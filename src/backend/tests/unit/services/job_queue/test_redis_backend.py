@@ -0,0 +1,233 @@
+import asyncio
+import time
+from unittest.mock import Mock
+
+import pytest
+from langflow.api.build import create_flow_response
+from langflow.services.job_queue.redis_backend import RedisEventStream, RemoteJobTask
+from langflow.services.job_queue.service import JobQueueNotFoundError, JobQueueService
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self._client = client
+        self._calls = []
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return record
+
+    async def execute(self):
+        return [await getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in self._calls]
+
+
+class FakeRedis:
+    """Minimal async stand-in for the redis commands the job queue uses (bytes keys, like the real client)."""
+
+    def __init__(self):
+        self.streams: dict[str, list[tuple[bytes, dict]]] = {}
+        self.values: dict[str, bytes] = {}
+        self.hashes: dict[str, dict[bytes, bytes]] = {}
+        self.expires: dict[str, int] = {}
+        self._seq = 0
+
+    @staticmethod
+    def _bytes(value):
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    def pipeline(self, *, transaction=True):  # noqa: ARG002
+        return FakePipeline(self)
+
+    async def xadd(self, name, fields, maxlen=None, *, approximate=True):  # noqa: ARG002
+        self._seq += 1
+        entry_id = f"{self._seq}-0".encode()
+        entries = self.streams.setdefault(name, [])
+        entries.append((entry_id, {self._bytes(k): self._bytes(v) for k, v in fields.items()}))
+        if maxlen is not None:
+            del entries[:-maxlen]
+        return entry_id
+
+    async def xread(self, streams, count=None, block=None):
+        deadline = time.monotonic() + (block or 0) / 1000
+        while True:
+            result = []
+            for name, cursor in streams.items():
+                seq = int(str(cursor).split("-")[0])
+                entries = [e for e in self.streams.get(name, []) if int(e[0].split(b"-")[0]) > seq][:count]
+                if entries:
+                    result.append((name.encode(), entries))
+            if result or time.monotonic() >= deadline:
+                return result
+            await asyncio.sleep(0.005)
+
+    async def expire(self, name, seconds):
+        self.expires[name] = seconds
+
+    async def set(self, name, value, ex=None):
+        self.values[name] = self._bytes(value)
+        if ex is not None:
+            self.expires[name] = ex
+
+    async def get(self, name):
+        return self.values.get(name)
+
+    async def hset(self, name, mapping):
+        self.hashes.setdefault(name, {}).update({self._bytes(k): self._bytes(v) for k, v in mapping.items()})
+
+    async def hget(self, name, key):
+        return self.hashes.get(name, {}).get(self._bytes(key))
+
+    async def aclose(self):
+        pass
+
+
+async def test_stream_round_trip_and_shared_cursor():
+    client = FakeRedis()
+    producer = RedisEventStream(client, "job", block_ms=10)
+    for i in range(5):
+        producer.put_nowait((f"e{i}", f"payload{i}".encode(), time.time()))
+    producer.put_nowait((None, None, time.time()))
+    await producer.flush()
+
+    first_reader = RedisEventStream(client, "job", read_count=3, block_ms=10)
+    event_id, payload, _ = await first_reader.get()
+    assert (event_id, payload) == ("e0", b"payload0")
+    assert first_reader.qsize() == 2
+
+    # A reader on another worker resumes after the batch the first reader fetched
+    second_reader = RedisEventStream(client, "job", block_ms=10)
+    items = [await second_reader.get()]
+    while not second_reader.empty():
+        items.append(second_reader.get_nowait())
+    assert [item[1] for item in items] == [b"payload3", b"payload4", None]
+    assert client.expires["langflow:job:job:events"] == 3600
+
+
+async def test_stream_put_applies_backpressure():
+    client = FakeRedis()
+    gate = asyncio.Event()
+    original_xadd = client.xadd
+
+    async def slow_xadd(*args, **kwargs):
+        await gate.wait()
+        return await original_xadd(*args, **kwargs)
+
+    client.xadd = slow_xadd
+    stream = RedisEventStream(client, "job", max_pending=2)
+    stream.put_nowait(("a", b"1", time.time()))
+    await asyncio.sleep(0)  # writer takes "a" and blocks on the gate
+    stream.put_nowait(("b", b"2", time.time()))
+    stream.put_nowait(("c", b"3", time.time()))
+
+    blocked = asyncio.create_task(stream.put(("d", b"4", time.time())))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    gate.set()
+    await asyncio.wait_for(blocked, timeout=1)
+    await stream.flush()
+    assert [fields[b"id"] for _, fields in client.streams["langflow:job:job:events"]] == [b"a", b"b", b"c", b"d"]
+
+
+async def test_stream_put_nowait_from_worker_thread():
+    client = FakeRedis()
+    stream = RedisEventStream(client, "job")
+
+    def send_from_thread():
+        stream.put_nowait(("a", b"1", time.time()))
+        stream.put_nowait(("b", b"2", time.time()))
+
+    await asyncio.to_thread(send_from_thread)
+    stream.put_nowait(("c", b"3", time.time()))
+    await stream.flush()
+    assert [fields[b"id"] for _, fields in client.streams["langflow:job:job:events"]] == [b"a", b"b", b"c"]
+
+
+def test_stream_put_nowait_off_loop_requires_bound_loop():
+    stream = RedisEventStream(FakeRedis(), "job")
+    with pytest.raises(RuntimeError, match="not bound to an event loop"):
+        stream.put_nowait(("a", b"1", time.time()))
+
+
+async def test_service_serves_remote_jobs_and_forwards_cancel():
+    client = FakeRedis()
+    owner = JobQueueService(client)
+    other = JobQueueService(client)
+    started = asyncio.Event()
+
+    async def job(queue):
+        queue.put_nowait(("e1", b"hello", time.time()))
+        started.set()
+        await asyncio.sleep(10)
+
+    queue, _ = owner.create_queue("job-1")
+    await owner.register_job("job-1")
+    owner.start_job("job-1", job(queue))
+    await started.wait()
+
+    with pytest.raises(JobQueueNotFoundError):
+        other.get_queue_data("job-1")
+    remote_queue, _, remote_task, _ = await other.aget_queue_data("job-1")
+    assert isinstance(remote_task, RemoteJobTask)
+    assert not remote_task.done()
+    remote_queue.block_ms = 10
+    assert (await remote_queue.get())[1] == b"hello"
+
+    assert await remote_task.request_cancel()
+    owner.start()
+    try:
+        _, _, local_task, _ = owner.get_queue_data("job-1")
+        await asyncio.wait_for(asyncio.wait([local_task]), timeout=3)
+        assert local_task.cancelled()
+        assert await owner._registry.status("job-1") == "cancelled"
+        # The owner appends an end marker so consumers on other workers stop waiting
+        assert (await remote_queue.get())[1] is None
+    finally:
+        await owner.stop()
+
+    with pytest.raises(JobQueueNotFoundError):
+        await other.aget_queue_data("unknown")
+
+
+async def test_fast_job_final_status_is_not_overwritten_by_registration():
+    client = FakeRedis()
+    service = JobQueueService(client)
+
+    async def job(queue):
+        queue.put_nowait(("e1", b"done", time.time()))
+
+    queue, _ = service.create_queue("job-1")
+    await service.register_job("job-1")
+    service.start_job("job-1", job(queue))
+    _, _, task, _ = service.get_queue_data("job-1")
+    await task
+
+    assert await service._registry.status("job-1") == "done"
+
+
+async def test_disconnect_from_remote_job_stream_does_not_cancel_job():
+    client = FakeRedis()
+    service = JobQueueService(client)
+    await service._registry.register("job-1", "other-worker")
+    stream, event_manager, remote_task, _ = await service.aget_queue_data("job-1")
+    event_manager.on_end = Mock()
+
+    response = await create_flow_response(queue=stream, event_manager=event_manager, event_task=remote_task)
+    response.on_disconnect()
+    await asyncio.sleep(0)
+
+    assert not remote_task.cancelled()
+    assert client.hashes["langflow:job:job-1"].get(b"cancel") is None
+    event_manager.on_end.assert_not_called()
+
+
+async def test_memory_backend_is_unchanged():
+    service = JobQueueService()
+    queue, _ = service.create_queue("job")
+    assert isinstance(queue, asyncio.Queue)
+    await service.register_job("job")
+    with pytest.raises(JobQueueNotFoundError):
+        await service.aget_queue_data("missing")
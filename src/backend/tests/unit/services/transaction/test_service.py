@@ -186,3 +186,41 @@ class TestTransactionService:
                 outputs={"result": "output"},
                 status="success",
             )
+
+    @pytest.mark.asyncio
+    async def test_should_batch_transactions_when_write_behind_enabled(self, mock_settings_service: MagicMock) -> None:
+        """Verify write-behind mode buffers transactions and writes them in one batch."""
+        mock_settings_service.settings.db_write_behind = True
+        mock_settings_service.settings.db_write_behind_flush_interval = 60
+        mock_settings_service.settings.db_write_behind_batch_size = 100
+        mock_settings_service.settings.db_write_behind_prune_interval = 60
+        service = TransactionService(mock_settings_service)
+        mock_batch = AsyncMock()
+        mock_prune = AsyncMock()
+
+        with (
+            patch("langflow.services.transaction.service.session_scope") as mock_session_scope,
+            patch("langflow.services.transaction.service.crud_log_transaction") as mock_single,
+            patch("langflow.services.transaction.service.crud_log_transactions", mock_batch),
+            patch("langflow.services.transaction.service.crud_prune_transactions", mock_prune),
+        ):
+            mock_session_scope.return_value.__aenter__ = AsyncMock(return_value=AsyncMock())
+            mock_session_scope.return_value.__aexit__ = AsyncMock(return_value=None)
+
+            for vertex_id in ("a", "b", "c"):
+                await service.log_transaction(
+                    flow_id="550e8400-e29b-41d4-a716-446655440000",
+                    vertex_id=vertex_id,
+                    inputs=None,
+                    outputs=None,
+                    status="success",
+                )
+            mock_batch.assert_not_called()
+
+            await service.teardown()
+
+        mock_single.assert_not_called()
+        mock_batch.assert_called_once()
+        assert [transaction.vertex_id for transaction in mock_batch.call_args[0][1]] == ["a", "b", "c"]
+        mock_prune.assert_called_once()
+        assert set(mock_prune.call_args[0][1]) == {UUID("550e8400-e29b-41d4-a716-446655440000")}
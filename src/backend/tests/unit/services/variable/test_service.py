@@ -240,3 +240,33 @@ async def test_create_variable(service, session: AsyncSession):
     assert result.type == CREDENTIAL_TYPE
     assert isinstance(result.created_at, datetime)
     assert result.updated_at is None  # Should be None on creation
+
+
+async def test_get_variables_by_names__single_query_and_skips_missing(service, session: AsyncSession):
+    user_id = uuid4()
+    await service.create_variable(user_id, "A", "value-a", session=session)
+    await service.create_variable(user_id, "B", "value-b", session=session)
+
+    result = await service.get_variables_by_names(user_id, ["A", "B", "MISSING", "A"], session=session)
+
+    assert result == {"A": (CREDENTIAL_TYPE, "value-a"), "B": (CREDENTIAL_TYPE, "value-b")}
+
+
+async def test_variable_cache_ttl__hits_and_invalidates_on_update(service, session: AsyncSession):
+    user_id = uuid4()
+    service.cache_ttl = 60
+    variable = await service.create_variable(user_id, "A", "old", session=session)
+    assert await service.get_variable(user_id, "A", "", session=session) == "old"
+
+    # Removing the row behind the service's back shows that the next read is served from the cache.
+    await session.delete(variable)
+    await session.flush()
+    assert await service.get_variable(user_id, "A", "", session=session) == "old"
+    assert await service.get_variables_by_names(user_id, ["A"], session=session) == {"A": (CREDENTIAL_TYPE, "old")}
+    with pytest.raises(TypeError):
+        await service.get_variable(user_id, "A", "session_id", session=session)
+
+    await service.create_variable(user_id, "A", "new", session=session)
+    assert await service.get_variable(user_id, "A", "", session=session) == "new"
+    await service.update_variable(user_id, "A", "newer", session=session)
+    assert await service.get_variable(user_id, "A", "", session=session) == "newer"
@@ -47,3 +47,61 @@ async def test_delete_api_key(client, logged_in_headers, api_key):
     data = response.json()
     assert data["detail"] == "API Key deleted"
     # Optionally, add a follow-up check to ensure that the key is actually removed from the database
+
+
+async def test_check_key_cache_and_batched_usage(active_user, monkeypatch):
+    from langflow.services.database.models.api_key import cache as api_key_cache
+    from langflow.services.database.models.api_key.crud import check_key, create_api_key, delete_api_key
+    from langflow.services.database.models.api_key.model import ApiKey, ApiKeyCreate
+    from langflow.services.deps import session_scope
+
+    cache = api_key_cache.ApiKeyCache(ttl=60)
+    tracker = api_key_cache.ApiKeyUsageTracker(flush_interval=3600)
+    monkeypatch.setattr(api_key_cache, "_api_key_cache", cache)
+    monkeypatch.setattr(api_key_cache, "_api_key_usage_tracker", tracker)
+    async with session_scope() as session:
+        api_key = await create_api_key(session, ApiKeyCreate(name="cached-key"), active_user.id)
+    try:
+        async with session_scope() as session:
+            user = await check_key(session, api_key.api_key)
+        async with session_scope() as session:
+            cached_user = await check_key(session, api_key.api_key)
+
+        assert cached_user.id == user.id
+        assert cached_user is not user
+        assert cache.stats()["hits"] == 1
+        assert tracker.stats()["pending_uses"] == 2
+
+        assert await tracker.flush() == 2
+        async with session_scope() as session:
+            row = await session.get(ApiKey, api_key.id)
+            assert row.total_uses == 2
+            assert row.last_used_at is not None
+
+        async with session_scope() as session:
+            await delete_api_key(session, api_key.id, active_user.id)
+        async with session_scope() as session:
+            assert await check_key(session, api_key.api_key) is None
+    finally:
+        await tracker.stop()
+
+
+def test_api_key_cache_expires_and_invalidates_by_user():
+    from uuid import uuid4
+
+    from langflow.services.database.models.api_key.cache import ApiKeyCache
+    from langflow.services.database.models.user.model import User
+
+    user = User(id=uuid4(), username="cache-user", password="x")  # noqa: S106
+    cache = ApiKeyCache(ttl=60)
+    cache.set("sk-a", uuid4(), user)
+    cache.set("sk-b", uuid4(), user)
+    assert cache.get("sk-a")[1].username == "cache-user"
+
+    cache.invalidate_user(user.id)
+    assert cache.get("sk-a") is None
+    assert cache.get("sk-b") is None
+
+    expired = ApiKeyCache(ttl=-1)
+    expired.set("sk-c", uuid4(), user)
+    assert expired.get("sk-c") is None
@@ -180,16 +180,14 @@ class TestRunUntilComplete:
         result = asyncio.run(main_test())
         assert result == "timeout_occurred"
 
-    def test_original_behavior_preserved_no_loop(self):
-        """Test that original behavior is preserved when no loop is running."""
+    def test_no_loop_runs_on_bridge_thread(self):
+        """Without a running loop the coroutine still runs on the shared bridge loop."""
 
         async def test_coro():
-            return "original_behavior"
+            return threading.current_thread().name
 
-        # Mock asyncio.run to verify it's called when no loop exists
-        with patch("asyncio.run", return_value="mocked_result") as mock_run:
+        with patch("asyncio.run") as mock_run:
             result = run_until_complete(test_coro())
 
-            # Should have called asyncio.run (original behavior)
-            mock_run.assert_called_once()
-            assert result == "mocked_result"
+        mock_run.assert_not_called()
+        assert result == "lfx-async-bridge"
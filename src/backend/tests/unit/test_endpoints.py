@@ -149,6 +149,72 @@ async def test_get_all(client: AsyncClient, logged_in_headers):
     assert "ChatOutput" in json_response["input_output"]
 
 
+async def test_get_all_supports_etag_revalidation(client: AsyncClient, logged_in_headers):
+    from lfx.interface.components import component_cache
+
+    response = await client.get("api/v1/all", headers=logged_in_headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    cached = await client.get("api/v1/all", headers={**logged_in_headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+
+    # In-place changes to the component cache are picked up once marked
+    component_cache.all_types_dict["etag_test"] = {"EtagTestComponent": {}}
+    component_cache.mark_modified()
+    try:
+        refreshed = await client.get("api/v1/all", headers={**logged_in_headers, "If-None-Match": etag})
+    finally:
+        del component_cache.all_types_dict["etag_test"]
+        component_cache.mark_modified()
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+    assert "etag_test" in refreshed.json()
+
+
+ETAG_RELOAD_COMPONENT = """
+from lfx.custom.custom_component.component import Component
+from lfx.io import Output
+from lfx.schema.message import Message
+
+
+class EtagReloadComponent(Component):
+    display_name = "ETag Reload"
+    outputs = [Output(display_name="Text", name="text", method="build_text")]
+
+    def build_text(self) -> Message:
+        return Message(text="reloaded")
+"""
+
+
+async def test_get_all_etag_changes_after_custom_components_reload(client: AsyncClient, logged_in_headers, tmp_path):
+    from lfx.interface.components import component_cache
+    from lfx.services.deps import get_settings_service
+    from lfx.utils.util import update_settings
+
+    category_dir = tmp_path / "etag_reload"
+    category_dir.mkdir()
+    (category_dir / "etag_reload_component.py").write_text(ETAG_RELOAD_COMPONENT)
+
+    response = await client.get("api/v1/all", headers=logged_in_headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert "etag_reload" not in response.json()
+
+    settings = get_settings_service().settings
+    original_paths = list(settings.components_path)
+    try:
+        await update_settings(components_path=tmp_path)
+        refreshed = await client.get("api/v1/all", headers={**logged_in_headers, "If-None-Match": etag})
+    finally:
+        settings.components_path = original_paths
+        component_cache.invalidate()
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+    assert "EtagReloadComponent" in refreshed.json()["etag_reload"]
+
+
 @pytest.mark.usefixtures("active_user")
 async def test_post_validate_code(client: AsyncClient, logged_in_headers):
     # Test case with a valid import and function
@@ -296,6 +362,52 @@ async def test_build_vertex_invalid_vertex_id(client, added_flow_webhook_test, l
     assert response.status_code == 500
 
 
+async def test_build_vertices_in_delta_checkpoint_mode(client, simple_api_test, logged_in_headers, monkeypatch):
+    from langflow.services.deps import get_chat_service
+    from lfx.graph.graph.checkpoint import checkpoint_key
+    from lfx.services.cache.utils import CacheMiss
+    from lfx.services.deps import get_settings_service
+
+    monkeypatch.setattr(get_settings_service().settings, "graph_checkpoint_mode", "delta")
+    chat_service = get_chat_service()
+    flow_id = simple_api_test["id"]
+    written_keys = []
+    original_set_cache = chat_service.set_cache
+
+    async def set_cache(key, data, lock=None):
+        written_keys.append(str(key))
+        return await original_set_cache(key, data, lock=lock)
+
+    monkeypatch.setattr(chat_service, "set_cache", set_cache)
+
+    response = await client.post(f"/api/v1/build/{flow_id}/vertices", headers=logged_in_headers)
+    assert response.status_code == 200
+    to_build = list(response.json()["ids"])
+    base = (await chat_service.get_cache(flow_id))["result"]
+    written_keys.clear()
+
+    built = 0
+    while to_build:
+        vertex_id = to_build.pop(0)
+        response = await client.post(f"/api/v1/build/{flow_id}/vertices/{vertex_id}", headers=logged_in_headers)
+        assert response.status_code == 200
+        assert response.json()["valid"], response.json()
+        to_build.extend(v for v in response.json()["next_vertices_ids"] if v not in to_build)
+        built += 1
+        if built == 1:
+            await base.wait_for_checkpoints()
+            assert not isinstance(await chat_service.get_cache(checkpoint_key(flow_id, 1)), CacheMiss)
+
+    assert built == len(base.vertices)
+    # Vertex builds do not rewrite the base graph; each adds a delta that the next request replays
+    assert flow_id not in written_keys
+    assert written_keys.count(checkpoint_key(flow_id, built)) == 1
+    assert all(vertex.built for vertex in base.vertices)
+    # The run finished, so its checkpoints are deleted
+    for seq in range(1, built + 1):
+        assert isinstance(await chat_service.get_cache(checkpoint_key(flow_id, seq)), CacheMiss)
+
+
 async def test_successful_run_no_payload(client, simple_api_test, created_api_key):
     headers = {"x-api-key": created_api_key.api_key}
     flow_id = simple_api_test["id"]
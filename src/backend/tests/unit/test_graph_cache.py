@@ -0,0 +1,82 @@
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from langflow.processing import graph_cache
+from langflow.processing.graph_cache import CompiledFlowCache, build_graph_for_run, invalidate_compiled_flow
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    cache = CompiledFlowCache(max_size=2)
+    monkeypatch.setattr(graph_cache, "_compiled_flow_cache", cache)
+    return cache
+
+
+def _make_flow(json_flow: str, updated_at: datetime | None = None):
+    data = json.loads(json_flow)["data"]
+    return SimpleNamespace(
+        id=uuid4(),
+        name="cached flow",
+        data=data,
+        updated_at=updated_at or datetime.now(timezone.utc),
+    )
+
+
+def test_hit_returns_independent_graph_without_recompiling(fresh_cache, json_simple_api_test, monkeypatch):
+    flow = _make_flow(json_simple_api_test)
+    first = build_graph_for_run(flow, {}, user_id="user")
+    assert fresh_cache.stats()["size"] == 1
+
+    def _fail_eval(code):  # noqa: ARG001
+        msg = "component code should not be compiled on a cache hit"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr("lfx.interface.initialize.loading.eval_custom_component_code", _fail_eval)
+    second = build_graph_for_run(flow, {}, user_id="user")
+
+    assert fresh_cache.stats()["hits"] == 1
+    assert second is not first
+    assert [v.id for v in second.vertices] == [v.id for v in first.vertices]
+    for vertex in second.vertices:
+        assert vertex.custom_component is not first.get_vertex(vertex.id).custom_component
+        assert type(vertex.custom_component) is type(first.get_vertex(vertex.id).custom_component)
+
+
+@pytest.mark.usefixtures("fresh_cache")
+def test_key_tracks_tweaks_stream_and_version(json_simple_api_test):
+    flow = _make_flow(json_simple_api_test)
+    base = CompiledFlowCache.make_key(flow, {}, stream=False)
+
+    assert CompiledFlowCache.make_key(flow, {}, stream=True) != base
+    assert CompiledFlowCache.make_key(flow, {"ChatInput-1": {"input_value": "x"}}, stream=False) != base
+    flow.updated_at += timedelta(seconds=1)
+    assert CompiledFlowCache.make_key(flow, {}, stream=False) != base
+    flow.updated_at = None
+    assert CompiledFlowCache.make_key(flow, {}, stream=False) is None
+
+
+def test_lru_eviction_and_invalidation(fresh_cache, json_simple_api_test):
+    flows = [_make_flow(json_simple_api_test) for _ in range(3)]
+    for flow in flows:
+        build_graph_for_run(flow, {})
+
+    stats = fresh_cache.stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+
+    invalidate_compiled_flow(flows[-1].id)
+    assert fresh_cache.stats()["size"] == 1
+
+
+def test_disabled_cache_always_rebuilds(monkeypatch, json_simple_api_test):
+    cache = CompiledFlowCache(max_size=0)
+    monkeypatch.setattr(graph_cache, "_compiled_flow_cache", cache)
+    flow = _make_flow(json_simple_api_test)
+
+    build_graph_for_run(flow, {})
+    build_graph_for_run(flow, {})
+
+    assert cache.stats() == {"hits": 0, "misses": 0, "evictions": 0, "size": 0, "max_size": 0}
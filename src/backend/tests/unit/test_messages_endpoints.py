@@ -262,3 +262,76 @@ async def test_get_messages_empty_result_with_encoded_nonexistent_session(client
     assert response.status_code == 200, response.text
     messages = response.json()
     assert len(messages) == 0
+
+
+@pytest.mark.api_key_required
+async def test_get_messages_keyset_pagination(client: AsyncClient, created_messages, logged_in_headers):
+    params = {"session_id": "session_id2", "limit": 2}
+    response = await client.get("api/v1/monitor/messages", params=params, headers=logged_in_headers)
+    assert response.status_code == 200, response.text
+    first_page = response.json()
+    cursor = response.headers["X-Next-Cursor"]
+    assert len(first_page) == 2
+
+    response = await client.get(
+        "api/v1/monitor/messages", params={**params, "cursor": cursor}, headers=logged_in_headers
+    )
+    assert response.status_code == 200, response.text
+    second_page = response.json()
+    assert "X-Next-Cursor" not in response.headers
+    assert len(second_page) == 1
+
+    paged_ids = [message["id"] for message in first_page + second_page]
+    ordered = sorted(created_messages, key=lambda message: (message.timestamp, str(message.id)))
+    assert sorted(paged_ids) == sorted(str(message.id) for message in created_messages)
+    assert len(set(paged_ids)) == len(ordered)
+
+
+@pytest.mark.api_key_required
+async def test_get_messages_pagination_rejects_bad_cursor(client: AsyncClient, logged_in_headers):
+    response = await client.get("api/v1/monitor/messages", params={"cursor": "not-a-cursor"}, headers=logged_in_headers)
+    assert response.status_code == 400
+
+    response = await client.get(
+        "api/v1/monitor/messages", params={"limit": 1, "order_by": "sender"}, headers=logged_in_headers
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.api_key_required
+async def test_get_message_sessions_pagination(client: AsyncClient, created_messages, logged_in_headers):
+    async with session_scope() as session:
+        flow_id = created_messages[0].flow_id
+        for session_id in ("session_a", "session_b"):
+            message = MessageCreate(text="x", sender="User", sender_name="User", session_id=session_id)
+            messagetable = MessageTable.model_validate(message, from_attributes=True)
+            messagetable.flow_id = flow_id
+            await aadd_messagetables([messagetable], session)
+
+    response = await client.get("api/v1/monitor/messages/sessions", params={"limit": 2}, headers=logged_in_headers)
+    assert response.status_code == 200, response.text
+    assert response.json() == ["session_a", "session_b"]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = await client.get(
+        "api/v1/monitor/messages/sessions", params={"limit": 2, "cursor": cursor}, headers=logged_in_headers
+    )
+    assert response.json() == ["session_id2"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+async def test_aget_messages_page_walks_history(created_messages):
+    from langflow.memory import aget_messages_page
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        page, cursor = await aget_messages_page(session_id="session_id2", limit=2, cursor=cursor)
+        seen.extend(page)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 2
+    assert sorted(str(message.id) for message in seen) == sorted(str(message.id) for message in created_messages)
@@ -1,7 +1,10 @@
-from unittest.mock import Mock, patch
+import asyncio
+import contextvars
+import threading
+from unittest.mock import patch
 
 import pytest
-from lfx.utils.async_helpers import run_until_complete, timeout_context
+from lfx.utils.async_helpers import run_until_complete, shutdown_bridge, timeout_context
 
 
 class TestTimeoutContext:
@@ -63,150 +66,85 @@ class TestRunUntilComplete:
             assert result == expected_value
             assert isinstance(result, expected_type)
 
-    @patch("asyncio.get_running_loop")
-    def test_run_until_complete_no_running_loop(self, mock_get_running_loop):
-        """Test run_until_complete when no event loop is running."""
-        # Mock no running loop (raises RuntimeError)
-        mock_get_running_loop.side_effect = RuntimeError("No running event loop")
+    def test_run_until_complete_no_running_loop_uses_bridge_loop(self):
+        """Coroutines run on the persistent bridge loop, which is reused across calls."""
 
-        async def simple_coro():
-            return "no_loop"
-
-        with patch("asyncio.run") as mock_run:
-            mock_run.return_value = "no_loop"
-
-            coro = simple_coro()
-            try:
-                result = run_until_complete(coro)
-            finally:
-                # Close the coroutine to avoid "coroutine was never awaited" warning
-                # since the mocked asyncio.run doesn't actually run it
-                coro.close()
-
-            mock_run.assert_called_once()
-            assert result == "no_loop"
-
-    @patch("asyncio.get_running_loop")
-    @patch("concurrent.futures.ThreadPoolExecutor")
-    def test_run_until_complete_with_running_loop_path(self, mock_executor_class, mock_get_running_loop):
-        """Test run_until_complete when event loop is already running."""
-        # Mock that there is a running loop
-        mock_get_running_loop.return_value = Mock()
-
-        # Mock the ThreadPoolExecutor and future
-        mock_executor = Mock()
-        mock_future = Mock()
-        mock_future.result.return_value = "thread_result"
-        mock_executor.submit.return_value = mock_future
-        mock_executor_class.return_value.__enter__.return_value = mock_executor
+        async def current_loop_and_thread():
+            return asyncio.get_running_loop(), threading.current_thread().name
+
+        first_loop, thread_name = run_until_complete(current_loop_and_thread())
+        second_loop, _ = run_until_complete(current_loop_and_thread())
+
+        assert thread_name == "lfx-async-bridge"
+        assert first_loop is second_loop
+        assert first_loop.is_running()
+
+    def test_run_until_complete_with_running_loop_does_not_create_executor(self):
+        """Calling from a running loop submits to the bridge instead of spawning a thread pool."""
 
         async def simple_coro():
-            return "thread_result"
+            return "bridge_result"
 
-        coro = simple_coro()
-        try:
-            result = run_until_complete(coro)
-        finally:
-            # Close the coroutine to avoid "coroutine was never awaited" warning
-            # since the mocked executor doesn't actually run it
-            coro.close()
+        async def main_test():
+            return run_until_complete(simple_coro())
+
+        with patch("concurrent.futures.ThreadPoolExecutor") as mock_executor_class:
+            result = asyncio.run(main_test())
 
-        # Verify ThreadPoolExecutor was used
-        mock_executor_class.assert_called_once()
-        mock_executor.submit.assert_called_once()
-        assert result == "thread_result"
+        mock_executor_class.assert_not_called()
+        assert result == "bridge_result"
 
-    @patch("asyncio.get_running_loop")
-    @patch("concurrent.futures.ThreadPoolExecutor")
-    def test_run_until_complete_thread_pool_exception(self, mock_executor_class, mock_get_running_loop):
-        """Test run_until_complete handles thread pool exceptions."""
-        mock_get_running_loop.return_value = Mock()
+    def test_run_until_complete_propagates_exception_from_bridge(self):
+        """Exceptions raised on the bridge loop reach the caller unchanged."""
 
         async def failing_coro():
-            msg = "Thread pool test error"
+            msg = "Bridge test error"
             raise ValueError(msg)
 
-        # Mock executor to raise exception
-        mock_executor = Mock()
-        mock_future = Mock()
-        mock_future.result.side_effect = ValueError("Thread pool test error")
-        mock_executor.submit.return_value = mock_future
-        mock_executor_class.return_value.__enter__.return_value = mock_executor
+        async def main_test():
+            return run_until_complete(failing_coro())
 
-        coro = failing_coro()
-        try:
-            with pytest.raises(ValueError, match="Thread pool test error"):
-                run_until_complete(coro)
-        finally:
-            # Close the coroutine to avoid "coroutine was never awaited" warning
-            # since the mocked executor doesn't actually run it
-            coro.close()
-
-    @patch("asyncio.get_running_loop")
-    @patch("concurrent.futures.ThreadPoolExecutor")
-    @patch("asyncio.new_event_loop")
-    def test_run_until_complete_new_loop_cleanup(self, mock_new_loop, mock_executor_class, mock_get_running_loop):
-        """Test that new event loop is properly cleaned up."""
-        mock_get_running_loop.return_value = Mock()
-        # Event loop setup for thread execution
-
-        mock_loop_instance = Mock()
-        mock_loop_instance.run_until_complete.return_value = "cleanup_test"
-        mock_new_loop.return_value = mock_loop_instance
-
-        mock_executor = Mock()
-        mock_future = Mock()
-        mock_future.result.return_value = "cleanup_test"
-        mock_executor.submit.return_value = mock_future
-        mock_executor_class.return_value.__enter__.return_value = mock_executor
+        with pytest.raises(ValueError, match="Bridge test error"):
+            asyncio.run(main_test())
 
-        async def simple_coro():
-            return "cleanup_test"
+    def test_run_until_complete_nested_call_from_bridge_falls_back_to_new_loop(self):
+        """A nested call on the bridge thread must not wait on the bridge loop itself."""
 
-        coro = simple_coro()
-        try:
-            result = run_until_complete(coro)
-        finally:
-            # Close the coroutine to avoid "coroutine was never awaited" warning
-            # since the mocked executor doesn't actually run it
-            coro.close()
-
-        # Verify the loop operations happened in the thread
-        assert result == "cleanup_test"
-        mock_executor.submit.assert_called_once()
-
-    @patch("asyncio.get_running_loop")
-    @patch("concurrent.futures.ThreadPoolExecutor")
-    @patch("asyncio.new_event_loop")
-    def test_run_until_complete_new_loop_exception_cleanup(
-        self, mock_new_loop, mock_executor_class, mock_get_running_loop
-    ):
-        """Test that event loop is cleaned up even when exception occurs."""
-        mock_get_running_loop.return_value = Mock()
-        # Event loop setup for thread execution
+        async def inner():
+            return asyncio.get_running_loop()
 
-        async def failing_coro():
-            msg = "Loop exception test"
-            raise RuntimeError(msg)
+        async def outer():
+            bridge_loop = asyncio.get_running_loop()
+            inner_loop = run_until_complete(inner())
+            return bridge_loop, inner_loop
+
+        bridge_loop, inner_loop = run_until_complete(outer())
 
-        mock_loop_instance = Mock()
-        mock_loop_instance.run_until_complete.side_effect = RuntimeError("Loop exception test")
-        mock_new_loop.return_value = mock_loop_instance
+        assert inner_loop is not bridge_loop
+        assert inner_loop.is_closed()
 
-        mock_executor = Mock()
-        mock_future = Mock()
-        mock_future.result.side_effect = RuntimeError("Loop exception test")
-        mock_executor.submit.return_value = mock_future
-        mock_executor_class.return_value.__enter__.return_value = mock_executor
+    def test_run_until_complete_propagates_context_variables(self):
+        """The coroutine sees the caller's context variables."""
+        request_id = contextvars.ContextVar("request_id", default=None)
 
-        coro = failing_coro()
+        async def read_var():
+            return request_id.get()
+
+        token = request_id.set("abc")
         try:
-            with pytest.raises(RuntimeError, match="Loop exception test"):
-                run_until_complete(coro)
+            assert run_until_complete(read_var()) == "abc"
         finally:
-            # Close the coroutine to avoid "coroutine was never awaited" warning
-            # since the mocked executor doesn't actually run it
-            coro.close()
+            request_id.reset(token)
+
+    def test_shutdown_bridge_restarts_on_next_call(self):
+        """After shutdown the next call starts a fresh bridge loop."""
+
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        old_loop = run_until_complete(current_loop())
+        shutdown_bridge()
+        new_loop = run_until_complete(current_loop())
 
-        # Verify executor was still called
-        mock_executor.submit.assert_called_once()
+        assert new_loop is not old_loop
+        assert new_loop.is_running()
@@ -4,7 +4,8 @@ from datetime import date, datetime, timezone
 from unittest.mock import patch
 
 from fastapi import Response
-from langflow.utils.compression import compress_response
+from langflow.utils.compression import compress_response, precompress_json, precompressed_response
+from starlette.requests import Request
 
 
 class TestCompressResponse:
@@ -286,3 +287,53 @@ class TestCompressResponse:
         except (TypeError, ValueError):
             # Expected behavior if jsonable_encoder can't handle the object
             pass
+
+
+def _request(**headers: str) -> Request:
+    raw_headers = [(name.replace("_", "-").lower().encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers})
+
+
+class TestPrecompressedResponse:
+    """Test cases for precompress_json and precompressed_response."""
+
+    def test_gzip_is_default_and_round_trips(self):
+        data = {"components": {"a": [1, 2, 3]}}
+        payload = precompress_json(data)
+
+        response = precompressed_response(payload, _request())
+
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["ETag"] == f'"{payload.digest}-gzip"'
+        assert json.loads(gzip.decompress(response.body)) == data
+
+    def test_prefers_zstd_when_accepted(self):
+        payload = precompress_json({"value": "x" * 1000})
+        if "zstd" not in payload.bodies:
+            return
+
+        response = precompressed_response(payload, _request(accept_encoding="gzip, zstd"))
+        rejected = precompressed_response(payload, _request(accept_encoding="gzip, zstd;q=0"))
+
+        assert response.headers["Content-Encoding"] == "zstd"
+        assert rejected.headers["Content-Encoding"] == "gzip"
+
+    def test_if_none_match_returns_304(self):
+        payload = precompress_json({"value": 1})
+        etag = precompressed_response(payload, _request()).headers["ETag"]
+
+        response = precompressed_response(payload, _request(if_none_match=f"W/{etag}"), cache_control="no-cache")
+
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["ETag"] == etag
+        assert response.headers["Cache-Control"] == "no-cache"
+
+    def test_etag_changes_with_content(self):
+        first = precompress_json({"value": 1})
+        second = precompress_json({"value": 2})
+
+        assert first.digest != second.digest
+        assert not second.matches(first.etag("gzip"))
+        assert second.matches("*")
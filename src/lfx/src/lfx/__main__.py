@@ -47,6 +47,12 @@ def serve_command_wrapper(
         "--check-variables/--no-check-variables",
         help="Check global variables for environment compatibility",
     ),
+    graph_pool_size: int = typer.Option(
+        4,
+        "--graph-pool-size",
+        min=0,
+        help="Idle graph instances kept for reuse between requests (0 copies the graph for every request)",
+    ),
 ) -> None:
     """Serve LFX flows as a web API (lazy-loaded)."""
     from pathlib import Path
@@ -66,6 +72,7 @@ def serve_command_wrapper(
         flow_json=flow_json,
         stdin=stdin,
         check_variables=check_variables,
+        graph_pool_size=graph_pool_size,
     )
 
 
@@ -69,6 +69,7 @@ class LCAgentComponent(Component):
     排障入口：日志关键字 "Handle Parse Errors"、"Max Iterations"。
     """
     trace_type = "agent"
+    resource_class = "llm"
     # 注意：`_base_inputs` 定义了代理的基本输入参数
     _base_inputs: list[InputTypes] = [
         MessageInput(
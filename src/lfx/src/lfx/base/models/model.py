@@ -56,6 +56,7 @@ class LCModelComponent(Component):
     display_name: str = "Model Name"
     description: str = "Model Description"
     trace_type = "llm"
+    resource_class = "llm"
     metadata = {
         "keywords": [
             "model",
@@ -241,7 +241,18 @@ def get_api_key_for_provider(user_id: UUID | str | None, provider: str, api_key:
 
     契约：优先使用显式传入的 `api_key`；否则按用户变量查找。
     失败语义：查不到返回 `None`。
+    注意：同步入口经桥接循环执行；异步调用方使用 `aget_api_key_for_provider`。
     """
+    # 优先使用显式传入的 API key，避免无谓的桥接调用
+    if api_key:
+        return api_key
+    return run_until_complete(aget_api_key_for_provider(user_id, provider))
+
+
+async def aget_api_key_for_provider(
+    user_id: UUID | str | None, provider: str, api_key: str | None = None
+) -> str | None:
+    """`get_api_key_for_provider` 的异步版本，语义一致。"""
     # 优先使用显式传入的 API key
     if api_key:
         return api_key
@@ -263,19 +274,16 @@ def get_api_key_for_provider(user_id: UUID | str | None, provider: str, api_key:
         return None
 
     # 从全局变量中读取
-    async def _get_variable():
-        async with session_scope() as session:
-            variable_service = get_variable_service()
-            if variable_service is None:
-                return None
-            return await variable_service.get_variable(
-                user_id=UUID(user_id) if isinstance(user_id, str) else user_id,
-                name=variable_name,
-                field="",
-                session=session,
-            )
-
-    return run_until_complete(_get_variable())
+    async with session_scope() as session:
+        variable_service = get_variable_service()
+        if variable_service is None:
+            return None
+        return await variable_service.get_variable(
+            user_id=UUID(user_id) if isinstance(user_id, str) else user_id,
+            name=variable_name,
+            field="",
+            session=session,
+        )
 
 
 def validate_model_provider_key(variable_name: str, api_key: str) -> None:
@@ -839,6 +847,27 @@ def normalize_model_names_to_dicts(model_names: list[str] | str) -> list[dict[st
     return result
 
 
+def _select_llm_model(model) -> Any:
+    """返回已实例化的模型，或选中的模型配置字典；未选择模型时抛 `ValueError`。"""
+    # 若已是 BaseLanguageModel 实例则直接返回
+    try:
+        from langchain_core.language_models import BaseLanguageModel
+
+        if isinstance(model, BaseLanguageModel):
+            # 已实例化，直接返回
+            return model
+    except ImportError:
+        pass
+
+    # 解析模型选择
+    if not model or not isinstance(model, list) or len(model) == 0:
+        msg = "A model selection is required"
+        raise ValueError(msg)
+
+    # 仅使用第一个模型（当前只支持单选）
+    return model[0]
+
+
 def get_llm(
     model,
     user_id: UUID | str | None,
@@ -859,25 +888,62 @@ def get_llm(
     3) 实例化模型类并返回
     异常流：缺失 API key 或必要参数会抛 `ValueError`。
     排障入口：关注提供方变量名与模型元数据字段映射。
+    注意：全局 API key 经桥接循环同步查找；异步调用方使用 `aget_llm`。
     """
-    # 若已是 BaseLanguageModel 实例则直接返回
-    try:
-        from langchain_core.language_models import BaseLanguageModel
+    selection = _select_llm_model(model)
+    if not isinstance(selection, dict):
+        return selection
+    # 获取 API key（用户输入或全局变量）
+    api_key = get_api_key_for_provider(user_id, selection.get("provider"), api_key)
+    return _build_llm(
+        selection,
+        api_key,
+        temperature,
+        stream=stream,
+        watsonx_url=watsonx_url,
+        watsonx_project_id=watsonx_project_id,
+        ollama_base_url=ollama_base_url,
+    )
 
-        if isinstance(model, BaseLanguageModel):
-            # 已实例化，直接返回
-            return model
-    except ImportError:
-        pass
 
-    # 解析模型选择
-    if not model or not isinstance(model, list) or len(model) == 0:
-        msg = "A model selection is required"
-        raise ValueError(msg)
+async def aget_llm(
+    model,
+    user_id: UUID | str | None,
+    api_key=None,
+    temperature=None,
+    *,
+    stream=False,
+    watsonx_url=None,
+    watsonx_project_id=None,
+    ollama_base_url=None,
+) -> Any:
+    """`get_llm` 的异步版本：在调用方事件循环内查找全局 API key，不阻塞该循环。"""
+    selection = _select_llm_model(model)
+    if not isinstance(selection, dict):
+        return selection
+    api_key = await aget_api_key_for_provider(user_id, selection.get("provider"), api_key)
+    return _build_llm(
+        selection,
+        api_key,
+        temperature,
+        stream=stream,
+        watsonx_url=watsonx_url,
+        watsonx_project_id=watsonx_project_id,
+        ollama_base_url=ollama_base_url,
+    )
 
-    # 仅使用第一个模型（当前只支持单选）
-    model = model[0]
 
+def _build_llm(
+    model: dict,
+    api_key,
+    temperature=None,
+    *,
+    stream=False,
+    watsonx_url=None,
+    watsonx_project_id=None,
+    ollama_base_url=None,
+) -> Any:
+    """按已解析的 API key 实例化模型类（`get_llm`/`aget_llm` 共用）。"""
     # 读取模型元数据
     model_name = model.get("name")
     provider = model.get("provider")
@@ -886,9 +952,6 @@ def get_llm(
     # 读取模型类与参数名
     api_key_param = metadata.get("api_key_param", "api_key")
 
-    # 获取 API key（用户输入或全局变量）
-    api_key = get_api_key_for_provider(user_id, provider, api_key)
-
     # 校验 API key（Ollama 不需要）
     if not api_key and provider != "Ollama":
         # 获取提供方变量名用于提示
@@ -99,6 +99,7 @@ class LCVectorStoreComponent(Component):
                 raise TypeError(msg)
 
     trace_type = "retriever"
+    resource_class = "embedding"
 
     inputs = [
         HandleInput(
@@ -83,6 +83,12 @@ async def serve_command(
         "--check-variables/--no-check-variables",
         help="Check global variables for environment compatibility",
     ),
+    graph_pool_size: int = typer.Option(
+        4,
+        "--graph-pool-size",
+        min=0,
+        help="Idle graph instances kept for reuse between requests (0 copies the graph for every request)",
+    ),
 ) -> None:
     """以 HTTP API 形式运行单个 LFX flow。
 
@@ -267,6 +273,7 @@ async def serve_command(
             graphs=graphs,
             metas=metas,
             verbose_print=verbose_print,
+            graph_pool_size=graph_pool_size,
         )
 
         verbose_print("🚀 Starting single-flow server...")
@@ -30,7 +30,6 @@ import sys
 import tempfile
 import uuid
 import zipfile
-from io import StringIO
 from pathlib import Path
 from shutil import which
 from typing import TYPE_CHECKING
@@ -45,6 +44,7 @@ from lfx.cli.script_loader import (
     load_graph_from_script,
 )
 from lfx.load import load_flow_from_json
+from lfx.log.capture import capture_output
 from lfx.schema.schema import InputValueRequest
 
 if TYPE_CHECKING:
@@ -321,40 +321,35 @@ def prepare_graph(graph, verbose_print):
 async def execute_graph_with_capture(graph, input_value: str | None):
     """执行图并捕获 stdout/stderr。
 
-    契约：返回 `(results, captured_logs)`；`captured_logs` 由 stdout+stderr 拼接。
+    契约：返回 `(results, captured_logs)`；`captured_logs` 由 stdout+stderr 拼接，包含执行期间的 structlog 输出。
     失败语义：执行异常会原样抛出，且异常消息可能包含捕获的 stderr。
-    副作用：临时替换 `sys.stdout` 与 `sys.stderr`。
+    副作用：首次调用时把 `sys.stdout`/`sys.stderr` 替换为按上下文路由的代理（见 `lfx.log.capture`）。
 
     关键路径（三步）：
     1) 组装 `InputValueRequest`
-    2) 重定向 stdout/stderr 并执行 `graph.async_start`
-    3) 恢复标准输出并返回结果与日志
+    2) 在 `capture_output` 上下文内执行 `graph.async_start`
+    3) 返回结果与当前请求的捕获内容
+
+    决策：捕获范围绑定 `ContextVar` 而非替换全局流
+    问题：`lfx serve` 在同一事件循环上并发执行请求，逐请求替换全局流会使输出互相串入，
+    且先结束的请求会把标准输出恢复为其他请求的缓冲区
+    方案：流代理与 structlog 处理器按当前上下文写入各自的缓冲区
+    代价：自行创建、未复制上下文的线程输出不会被捕获
+    重评：当执行日志全部改走事件流时移除标准输出捕获
     """
     inputs = InputValueRequest(input_value=input_value) if input_value else None
 
-    captured_stdout = StringIO()
-    captured_stderr = StringIO()
-
-    original_stdout = sys.stdout
-    original_stderr = sys.stderr
-
-    try:
-        sys.stdout = captured_stdout
-        sys.stderr = captured_stderr
-        results = [result async for result in graph.async_start(inputs)]
-    except Exception as exc:
-        error_output = captured_stderr.getvalue()
-        if error_output:
-            # 注意：将 stderr 内容拼接到异常信息中，便于 CLI 排障
-            exc.args = (f"{exc.args[0] if exc.args else str(exc)}\n\nCaptured stderr:\n{error_output}",)
-        raise
-    finally:
-        sys.stdout = original_stdout
-        sys.stderr = original_stderr
-
-    captured_logs = captured_stdout.getvalue() + captured_stderr.getvalue()
-
-    return results, captured_logs
+    with capture_output() as capture:
+        try:
+            results = [result async for result in graph.async_start(inputs)]
+        except Exception as exc:
+            error_output = capture.stderr.getvalue()
+            if error_output:
+                # 注意：将 stderr 内容拼接到异常信息中，便于 CLI 排障
+                exc.args = (f"{exc.args[0] if exc.args else str(exc)}\n\nCaptured stderr:\n{error_output}",)
+            raise
+
+    return results, capture.getvalue()
 
 
 def extract_result_data(results, captured_logs: str) -> dict:
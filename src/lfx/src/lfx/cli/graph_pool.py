@@ -0,0 +1,149 @@
+"""
+模块名称：`lfx serve` 图实例池
+
+本模块为每个托管的 flow 维护一组可复用的图实例，请求结束后调用 `Graph.reset_run_state` 归还，
+替代每个请求 `deepcopy(graph)`。
+主要功能包括：
+- 预热 `min_idle` 个实例；空闲实例不足时按需复制，负载回落后按空闲时长收缩
+- 运行失败或被取消的实例直接丢弃，不归还池中
+- `stats()` 暴露创建、复用、丢弃与并发峰值等计数
+
+关键组件：`GraphPool`
+设计背景：`Graph.__deepcopy__` 会复制节点数据并重建全部顶点与组件，是 `lfx serve` 单次请求的主要开销。
+使用场景：`lfx.cli.serve_app.create_multi_serve_app` 的 `/run` 与 `/stream` 路由。
+注意事项：池仅在单个事件循环内使用，不做线程同步；同一实例同一时刻只分配给一个请求。
+"""
+
+from __future__ import annotations
+
+import copy
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any
+
+from lfx.log.logger import logger
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from lfx.graph import Graph
+
+
+class GraphPool:
+    """单个 flow 的图实例池。
+
+    契约：
+    - `acquire()` 为异步上下文管理器，产出一个独占的图实例；正常退出时重置并归还，异常或取消时丢弃。
+    - 模板图只用于复制，从不执行。
+    - `max_idle=0` 时退化为每个请求复制一次（与不使用池的行为一致）。
+
+    关键路径（三步）：
+    1) 取出最近归还的空闲实例（LIFO），没有则从模板复制
+    2) 请求结束后 `reset_run_state` 并恢复复制时的 `context`，空闲数未达 `max_idle` 时归还
+    3) 取出与归还时丢弃空闲超过 `idle_timeout` 的实例，至少保留 `min_idle` 个
+
+    决策：并发超过 `max_idle` 时不排队，直接复制临时实例
+    问题：排队会把池容量变成并发上限，突发流量下请求延迟不可控
+    方案：超出部分按旧方式复制，用完丢弃
+    代价：突发期间仍有复制开销
+    重评：当需要限制单 flow 并发时改为有界池并排队
+    """
+
+    def __init__(
+        self,
+        graph: Graph,
+        *,
+        max_idle: int = 4,
+        min_idle: int = 1,
+        idle_timeout: float = 300.0,
+    ) -> None:
+        self._template = graph
+        self.max_idle = max(max_idle, 0)
+        self.min_idle = min(max(min_idle, 0), self.max_idle)
+        self.idle_timeout = idle_timeout
+        self._idle: deque[tuple[Graph, float]] = deque()
+        self._context: dict[str, Any] | None = None
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._created = 0
+        self._reused = 0
+        self._discarded = 0
+        self._reset_failures = 0
+
+    def warm(self) -> None:
+        """预先复制 `min_idle` 个实例。"""
+        now = time.monotonic()
+        while len(self._idle) < self.min_idle:
+            self._idle.append((self._create(), now))
+
+    def _create(self) -> Graph:
+        graph = copy.deepcopy(self._template)
+        if self._context is None:
+            # 注意：记录复制出的实例的 `context`，归还时恢复为同一初始值。
+            self._context = copy.deepcopy(dict(getattr(graph, "context", None) or {}))
+        self._created += 1
+        return graph
+
+    def _trim(self, now: float) -> None:
+        # 注意：左端为最早归还的实例。
+        while len(self._idle) > self.min_idle and now - self._idle[0][1] > self.idle_timeout:
+            self._idle.popleft()
+            self._discarded += 1
+
+    def _checkout(self) -> Graph:
+        self._trim(time.monotonic())
+        if self._idle:
+            graph, _ = self._idle.pop()
+            self._reused += 1
+        else:
+            graph = self._create()
+        self._in_use += 1
+        self._peak_in_use = max(self._peak_in_use, self._in_use)
+        return graph
+
+    def _checkin(self, graph: Graph, *, reusable: bool) -> None:
+        self._in_use -= 1
+        now = time.monotonic()
+        if reusable and len(self._idle) < self.max_idle:
+            try:
+                graph.reset_run_state()
+                graph.context = copy.deepcopy(self._context or {})
+            except Exception as exc:  # noqa: BLE001
+                self._reset_failures += 1
+                logger.warning(f"Discarding pooled graph after reset failure: {exc!r}")
+            else:
+                self._idle.append((graph, now))
+                self._trim(now)
+                return
+        self._discarded += 1
+        self._trim(now)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Graph]:
+        """借出一个图实例，退出上下文时归还或丢弃。"""
+        graph = self._checkout()
+        reusable = False
+        try:
+            yield graph
+            reusable = True
+        finally:
+            self._checkin(graph, reusable=reusable)
+
+    def stats(self) -> dict[str, int]:
+        """返回池计数。
+
+        排障：`created` 持续增长而 `reused` 很低说明并发长期高于 `max_idle`；
+        `reset_failures` 非零说明有组件无法重置，需查看对应告警日志。
+        """
+        return {
+            "idle": len(self._idle),
+            "in_use": self._in_use,
+            "peak_in_use": self._peak_in_use,
+            "created": self._created,
+            "reused": self._reused,
+            "discarded": self._discarded,
+            "reset_failures": self._reset_failures,
+            "min_idle": self.min_idle,
+            "max_idle": self.max_idle,
+        }
@@ -3,13 +3,14 @@
 
 本模块提供多 `flow` 的 FastAPI 应用工厂，主要用于将文件夹内的多个 `*.json` flow 统一暴露为 API。主要功能包括：
 - 生成 `/flows/{flow_id}/run` 与 `/flows/{flow_id}/info` 等路由
-- 提供 `/flows` 全局列表与健康检查
+- 提供 `/flows` 全局列表、健康检查与 `/pools` 图实例池指标
 - 支持执行与流式输出的结果返回
 
 关键组件：
 - `create_multi_serve_app`：应用工厂入口
 - `verify_api_key`：请求鉴权
 - `consume_and_yield`：流式事件消费器
+- `GraphPool`：每个 flow 的可复用图实例池（见 `lfx.cli.graph_pool`）
 
 设计背景：CLI 需要一次性托管多个 flow 并提供统一的发现与调用入口。
 注意事项：所有执行相关路由均要求 `x-api-key`（Header 或 Query），未配置将返回 401。
@@ -19,7 +20,6 @@ from __future__ import annotations
 
 import asyncio
 import time
-from copy import deepcopy
 from typing import TYPE_CHECKING, Annotated, Any
 
 from fastapi import APIRouter, Depends, FastAPI, HTTPException, Security
@@ -28,6 +28,7 @@ from fastapi.security import APIKeyHeader, APIKeyQuery
 from pydantic import BaseModel, Field
 
 from lfx.cli.common import execute_graph_with_capture, extract_result_data, get_api_key
+from lfx.cli.graph_pool import GraphPool
 from lfx.log.logger import logger
 
 if TYPE_CHECKING:
@@ -312,7 +313,7 @@ async def consume_and_yield(queue: asyncio.Queue, client_consumed_queue: asyncio
 
 
 async def run_flow_generator_for_serve(
-    graph: Graph,
+    graph: Graph | GraphPool,
     input_request: StreamRequest,
     flow_id: str,
     event_manager,
@@ -320,7 +321,8 @@ async def run_flow_generator_for_serve(
 ) -> None:
     """异步执行 flow 并驱动事件流。
 
-    契约：成功时发送 `end` 事件，失败时发送 `error` 事件，并以 None 事件结束。
+    契约：成功时发送 `end` 事件，失败时发送 `error` 事件，并以 None 事件结束；
+    传入 `GraphPool` 时在池中借出独占实例执行。
     失败语义：内部异常会记录日志并通过事件返回，不抛出给上层。
     副作用：执行图、写日志、向事件队列写入数据。
 
@@ -332,8 +334,14 @@ async def run_flow_generator_for_serve(
     3) 推送结束事件并通知客户端消费
     """
     try:
-        results, logs = await execute_graph_with_capture(graph, input_request.input_value)
-        result_data = extract_result_data(results, logs)
+        if isinstance(graph, GraphPool):
+            # 注意：结果引用顶点与组件对象，须在归还（`reset_run_state`）前提取。
+            async with graph.acquire() as pooled_graph:
+                results, logs = await execute_graph_with_capture(pooled_graph, input_request.input_value)
+                result_data = extract_result_data(results, logs)
+        else:
+            results, logs = await execute_graph_with_capture(graph, input_request.input_value)
+            result_data = extract_result_data(results, logs)
 
         event_manager.on_end(data={"result": result_data})
         await client_consumed_queue.get()
@@ -355,10 +363,13 @@ def create_multi_serve_app(
     graphs: dict[str, Graph],
     metas: dict[str, FlowMeta],
     verbose_print: Callable[[str], None],  # noqa: ARG001
+    graph_pool_size: int = 4,
+    graph_pool_min_idle: int = 1,
 ) -> FastAPI:
     """创建多 `flow` FastAPI 应用。
 
-    契约：`graphs` 与 `metas` 必须包含相同的 flow_id 集合。
+    契约：`graphs` 与 `metas` 必须包含相同的 flow_id 集合；每个 flow 的执行请求从各自的 `GraphPool`
+    借出图实例，`graph_pool_size` 为保留的空闲实例上限（`0` 表示每个请求复制一次图）。
     失败语义：键不一致时抛 `ValueError`。
     副作用：构建并返回 FastAPI 应用对象。
 
@@ -380,6 +391,13 @@ def create_multi_serve_app(
         version="1.0.0",
     )
 
+    pools = {
+        flow_id: GraphPool(graph, max_idle=graph_pool_size, min_idle=graph_pool_min_idle)
+        for flow_id, graph in graphs.items()
+    }
+    for pool in pools.values():
+        pool.warm()
+
     # ------------------------------------------------------------------
     # 全局端点
     # ------------------------------------------------------------------
@@ -393,11 +411,16 @@ def create_multi_serve_app(
     async def global_health():
         return {"status": "healthy", "flow_count": len(graphs)}
 
+    @app.get("/pools", tags=["info"], summary="Graph pool metrics")
+    async def pool_metrics():
+        """返回各 flow 图实例池的计数（见 `GraphPool.stats`）。"""
+        return {flow_id: pool.stats() for flow_id, pool in pools.items()}
+
     # ------------------------------------------------------------------
     # `flow` 路由
     # ------------------------------------------------------------------
 
-    def create_flow_router(flow_id: str, graph: Graph, meta: FlowMeta) -> APIRouter:
+    def create_flow_router(flow_id: str, graph: Graph, meta: FlowMeta, pool: GraphPool) -> APIRouter:
         """为单个 flow 创建路由。
 
         契约：每个 flow 使用独立 Router，避免闭包捕获问题。
@@ -430,14 +453,15 @@ def create_multi_serve_app(
             副作用：执行图并生成日志。
 
             关键路径（三步）：
-            1) 深拷贝图并执行获取结果/日志
+            1) 从池中借出图实例并执行获取结果/日志
             2) 构造成功响应或错误响应
             3) 返回统一结构的 `RunResponse`
             """
             try:
-                graph_copy = deepcopy(graph)
-                results, logs = await execute_graph_with_capture(graph_copy, request.input_value)
-                result_data = extract_result_data(results, logs)
+                # 注意：结果引用顶点与组件对象，须在归还（`reset_run_state`）前提取。
+                async with pool.acquire() as pooled_graph:
+                    results, logs = await execute_graph_with_capture(pooled_graph, request.input_value)
+                    result_data = extract_result_data(results, logs)
 
                 logger.debug(f"Flow {flow_id} execution completed: {len(results)} results, {len(logs)} log chars")
                 logger.debug(f"Flow {flow_id} result data: {result_data}")
@@ -513,7 +537,7 @@ def create_multi_serve_app(
 
                 main_task = asyncio.create_task(
                     run_flow_generator_for_serve(
-                        graph=graph,
+                        graph=pool,
                         input_request=request,
                         flow_id=flow_id,
                         event_manager=event_manager,
@@ -558,7 +582,7 @@ def create_multi_serve_app(
 
     for flow_id, graph in graphs.items():
         meta = metas[flow_id]
-        router = create_flow_router(flow_id, graph, meta)
+        router = create_flow_router(flow_id, graph, meta, pools[flow_id])
         app.include_router(router)
 
     return app
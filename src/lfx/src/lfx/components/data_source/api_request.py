@@ -72,6 +72,7 @@ class APIRequestComponent(Component):
     documentation: str = "https://docs.langflow.org/api-request"
     icon = "Globe"
     name = "APIRequest"
+    resource_class = "http"
 
     inputs = [
         MessageTextInput(
@@ -27,9 +27,9 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-import pandas as pd
 from cryptography.fernet import InvalidToken
 from langchain_chroma import Chroma
+from langchain_core.embeddings import Embeddings
 from langflow.services.auth.utils import decrypt_api_key, encrypt_api_key
 from langflow.services.database.models.user.crud import get_user_by_id
 
@@ -57,6 +57,8 @@ from lfx.services.deps import (
 from lfx.utils.validate_cloud import raise_error_if_astra_cloud_disable_component
 
 if TYPE_CHECKING:
+    import pandas as pd
+
     from lfx.schema.dataframe import DataFrame
 
 HUGGINGFACE_MODEL_NAMES = [
@@ -87,6 +89,30 @@ def _get_knowledge_bases_root_path() -> Path:
     return _KNOWLEDGE_BASES_ROOT_PATH
 
 
+class _BatchEmbeddings(Embeddings):
+    """向量存储写入用的嵌入适配：返回当前批次在锁外预先计算好的向量。
+
+    契约：调用方持有写锁，先 `load` 本批向量，再以同一批文本调用 `Chroma.add_texts`。
+    """
+
+    def __init__(self) -> None:
+        self._vectors: list[list[float]] = []
+
+    def load(self, vectors: list[list[float]]) -> None:
+        self._vectors = vectors
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        vectors, self._vectors = self._vectors, []
+        if len(vectors) != len(texts):
+            msg = f"Expected {len(texts)} precomputed embeddings, got {len(vectors)}"
+            raise ValueError(msg)
+        return vectors
+
+    def embed_query(self, text: str) -> list[float]:
+        msg = "Precomputed batch embeddings only support document writes"
+        raise NotImplementedError(msg)
+
+
 class KnowledgeIngestionComponent(Component):
     """知识库写入组件。
 
@@ -217,6 +243,13 @@ class KnowledgeIngestionComponent(Component):
             advanced=True,
             value=1000,
         ),
+        IntInput(
+            name="embedding_concurrency",
+            display_name="Embedding Concurrency",
+            info="Maximum number of embedding batches sent to the provider at the same time.",
+            advanced=True,
+            value=4,
+        ),
         SecretStrInput(
             name="api_key",
             display_name="Embedding Provider API Key",
@@ -401,7 +434,14 @@ class KnowledgeIngestionComponent(Component):
         embedding_model: str,
         api_key: str,
     ) -> None:
-        """创建向量存储并写入文档。"""
+        """按批流式写入向量存储。
+
+        关键路径（三步）：
+        1) 按 `chunk_size` 行切分 DataFrame，逐批转换为文档并按 `_id` 去重
+        2) 每批在线程中计算嵌入，最多 `embedding_concurrency` 批同时进行；写入集合经 `write_lock` 串行
+        3) 在途批次达到上限时先等任一批完成，再提交下一批
+        性能：内存只保留在途批次的文档，不随总行数增长；不再整表读取已有集合。
+        """
         try:
             # 初始化向量存储目录
             vector_store_dir = await self._kb_path()
@@ -413,50 +453,131 @@ class KnowledgeIngestionComponent(Component):
             # 创建嵌入模型
             embedding_function = self._build_embeddings(embedding_model, api_key)
 
-            # 将 DataFrame 转为 Data 列表
-            data_objects = await self._convert_df_to_data_objects(df_source, config_list)
-
-            # 创建向量存储
+            # 创建向量存储；写入时使用锁外并发算好的向量
+            batch_embeddings = _BatchEmbeddings()
             chroma = Chroma(
                 persist_directory=str(vector_store_dir),
-                embedding_function=embedding_function,
+                embedding_function=batch_embeddings,
                 collection_name=self.knowledge_base,
             )
 
-            # 转为 LangChain 文档
-            documents = []
-            for data_obj in data_objects:
-                doc = data_obj.to_lc_document()
-                documents.append(doc)
+            batch_size = max(self.chunk_size or 1000, 1)
+            concurrency = max(self.embedding_concurrency or 1, 1)
+            seen_ids: set[str] = set()
+            write_lock = asyncio.Lock()
+            pending: set[asyncio.Task] = set()
+            added = 0
+            try:
+                for start in range(0, len(df_source), batch_size):
+                    data_objects = await self._convert_df_to_data_objects(
+                        df_source.iloc[start : start + batch_size], config_list, chroma=chroma, seen_ids=seen_ids
+                    )
+                    documents = [data_obj.to_lc_document() for data_obj in data_objects]
+                    if not documents:
+                        continue
+                    if len(pending) >= concurrency:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        added += sum(task.result() for task in done)
+                    pending.add(
+                        asyncio.create_task(
+                            self._add_documents_batch(
+                                chroma, embedding_function, batch_embeddings, documents, write_lock
+                            )
+                        )
+                    )
+                added += sum(await asyncio.gather(*pending))
+            except BaseException:
+                for task in pending:
+                    task.cancel()
+                raise
 
-            # 写入向量存储
-            if documents:
-                chroma.add_documents(documents)
-                self.log(f"Added {len(documents)} documents to vector store '{self.knowledge_base}'")
+            if added:
+                self.log(f"Added {added} documents to vector store '{self.knowledge_base}'")
 
         except (OSError, ValueError, RuntimeError) as e:
             self.log(f"Error creating vector store: {e}")
 
-    async def _convert_df_to_data_objects(
-        self, df_source: pd.DataFrame, config_list: list[dict[str, Any]]
-    ) -> list[Data]:
-        """将 DataFrame 转换为向量存储所需的 Data 列表。"""
-        data_objects: list[Data] = []
+    @staticmethod
+    async def _add_documents_batch(
+        chroma: Chroma,
+        embedding_function: Embeddings,
+        batch_embeddings: _BatchEmbeddings,
+        documents: list,
+        write_lock: asyncio.Lock,
+    ) -> int:
+        """计算一批文档的嵌入并写入集合，返回写入条数。
+
+        决策：嵌入多批并发，集合写入串行
+        问题：本地持久化的 Chroma 集合不保证多线程并发写入安全，`add_texts` 又把嵌入与写入绑在一起
+        方案：嵌入在线程中并发计算；持有 `write_lock` 时把本批向量交给 `_BatchEmbeddings`，再调用 `add_texts`
+        代价：`_BatchEmbeddings` 只服务写入，该 `Chroma` 实例不能用于查询
+        重评：当 `langchain_chroma` 提供写入预计算嵌入的公开接口时改用该接口
+        """
+        texts = [doc.page_content for doc in documents]
+        embeddings = await asyncio.to_thread(embedding_function.embed_documents, texts)
+        async with write_lock:
+            batch_embeddings.load(embeddings)
+            await asyncio.to_thread(
+                chroma.add_texts,
+                texts,
+                metadatas=[doc.metadata for doc in documents],
+                ids=[doc.id or str(uuid.uuid4()) for doc in documents],
+            )
+        return len(documents)
 
-        # 向量存储目录
-        kb_path = await self._kb_path()
+    @staticmethod
+    def _column_strings(df_source: pd.DataFrame) -> dict[str, list[str | None]]:
+        """各列转为字符串列表，缺失值为 `None`（不构造逐行 Series）。
 
-        # 若不允许重复，则读取已有哈希
-        chroma = Chroma(
-            persist_directory=str(kb_path),
-            collection_name=self.knowledge_base,
-        )
+        注意：取值经 `to_numpy()` 的公共 dtype，与原逐行 `iterrows` 一致（全数值表中整数列按浮点输出，如 `1.0`），
+        `_id` 哈希与元数据文本因此与已有知识库保持一致。
+        """
+        values = df_source.to_numpy()
+        present = df_source.notna().to_numpy()
+        return {
+            column: [str(value) if ok else None for value, ok in zip(values[:, i], present[:, i], strict=True)]
+            for i, column in enumerate(df_source.columns)
+        }
 
-        # 获取已有文档元数据
-        all_docs = chroma.get()
+    @staticmethod
+    def _join_columns(column_strings: dict[str, list[str | None]], columns: list[str], rows: int) -> list[str]:
+        """按行以空格拼接多列的非缺失值。"""
+        column_values = [column_strings[column] for column in columns if column in column_strings]
+        if not column_values:
+            return [""] * rows
+        return [" ".join(value for value in row if value is not None) for row in zip(*column_values, strict=True)]
+
+    @staticmethod
+    def _existing_ids(chroma: Chroma, ids: list[str]) -> set[str]:
+        """只查询本批哈希在集合中已存在的部分（按 `_id` 元数据过滤），避免整表读取。"""
+        if not ids:
+            return set()
+        existing = chroma.get(where={"_id": {"$in": list(dict.fromkeys(ids))}}, include=["metadatas"])
+        return {metadata.get("_id") for metadata in existing.get("metadatas") or [] if metadata and metadata.get("_id")}
 
-        # 提取已有 `_id`
-        id_list = [metadata.get("_id") for metadata in all_docs["metadatas"] if metadata.get("_id")]
+    async def _convert_df_to_data_objects(
+        self,
+        df_source: pd.DataFrame,
+        config_list: list[dict[str, Any]],
+        *,
+        chroma: Chroma | None = None,
+        seen_ids: set[str] | None = None,
+    ) -> list[Data]:
+        """将 DataFrame 转换为向量存储所需的 Data 列表。
+
+        契约：`text` 为向量化列按行拼接；`_id` 为标识列（未配置时为 `text`）拼接后的 sha256；
+        不允许重复时，跳过集合中已存在或本次运行已出现（`seen_ids`）的 `_id`。
+        性能：按列取值与拼接，去重只按本批 `_id` 做索引查询。
+        """
+        data_objects: list[Data] = []
+
+        if chroma is None:
+            # 向量存储目录
+            kb_path = await self._kb_path()
+            chroma = Chroma(
+                persist_directory=str(kb_path),
+                collection_name=self.knowledge_base,
+            )
 
         # 按配置区分列角色
         content_cols = []
@@ -472,34 +593,38 @@ class KnowledgeIngestionComponent(Component):
             elif identifier:
                 identifier_cols.append(col_name)
 
-        # 逐行转换为 Data
-        for _, row in df_source.iterrows():
-            identifier_parts = [str(row[col]) for col in content_cols if col in row and pd.notna(row[col])]
-
-            page_content = " ".join(identifier_parts)
-
-            data_dict = {
-                "text": page_content,
-            }
-
-            if identifier_cols:
-                identifier_parts = [str(row[col]) for col in identifier_cols if col in row and pd.notna(row[col])]
-                page_content = " ".join(identifier_parts)
-
-            for col in df_source.columns:
-                if col not in content_cols and col in row and pd.notna(row[col]):
-                    value = row[col]
-                    data_dict[col] = str(value)
-
-            page_content_hash = hashlib.sha256(page_content.encode()).hexdigest()
+        column_strings = self._column_strings(df_source)
+        page_contents = self._join_columns(column_strings, content_cols, len(df_source))
+        identifiers = (
+            self._join_columns(column_strings, identifier_cols, len(df_source)) if identifier_cols else page_contents
+        )
+        hashes = [hashlib.sha256(identifier.encode()).hexdigest() for identifier in identifiers]
+
+        existing_ids: set[str] = set()
+        if not self.allow_duplicates:
+            existing_ids = self._existing_ids(chroma, hashes)
+            if seen_ids is None:
+                seen_ids = set()
+
+        metadata_columns = {col: values for col, values in column_strings.items() if col not in content_cols}
+
+        skipped = 0
+        for index, page_content_hash in enumerate(hashes):
+            if not self.allow_duplicates:
+                if page_content_hash in existing_ids or page_content_hash in seen_ids:
+                    skipped += 1
+                    continue
+                seen_ids.add(page_content_hash)
+
+            data_dict = {"text": page_contents[index]}
+            for col, values in metadata_columns.items():
+                if values[index] is not None:
+                    data_dict[col] = values[index]
             data_dict["_id"] = page_content_hash
+            data_objects.append(Data(data=data_dict))
 
-            if not self.allow_duplicates and page_content_hash in id_list:
-                self.log(f"Skipping duplicate row with hash {page_content_hash}")
-                continue
-
-            data_obj = Data(data=data_dict)
-            data_objects.append(data_obj)
+        if skipped:
+            self.log(f"Skipped {skipped} duplicate rows")
 
         return data_objects
 
@@ -6,6 +6,7 @@
 - 输入 DataFrame/Data/Message 列表并逐项输出
 - 维护上下文索引与聚合列表
 - 在循环结束时输出聚合结果
+- 并行模式：按 `parallel_width` 并发运行循环体子图，按输入顺序聚合
 
 关键组件：
 - `LoopComponent`：循环组件
@@ -14,9 +15,12 @@
 注意事项：Message 会被自动转换为 Data 以保持类型一致。
 """
 
+import asyncio
+
 from lfx.components.processing.converter import convert_to_data
 from lfx.custom.custom_component.component import Component
-from lfx.inputs.inputs import HandleInput
+from lfx.graph.graph.loop_body import build_loop_body_graph, extract_loop_body, run_loop_body
+from lfx.inputs.inputs import HandleInput, IntInput
 from lfx.schema.data import Data
 from lfx.schema.dataframe import DataFrame
 from lfx.schema.message import Message
@@ -46,6 +50,17 @@ class LoopComponent(Component):
             info="The initial DataFrame to iterate over.",
             input_types=["DataFrame"],
         ),
+        IntInput(
+            name="parallel_width",
+            display_name="Parallel Width",
+            info=(
+                "Number of items whose loop body runs concurrently. "
+                "1 iterates one item per cycle; larger values run the body for up to this many items at once "
+                "and still aggregate results in input order."
+            ),
+            value=1,
+            advanced=True,
+        ),
     ]
 
     outputs = [
@@ -123,6 +138,11 @@ class LoopComponent(Component):
         self.initialize_data()
         current_item = Data(text="")
 
+        if self._is_parallel():
+            # 注意：并行模式由 `done_output` 一次性扇出执行循环体，`item` 分支不再逐项驱动。
+            self.stop("item")
+            return current_item
+
         if self.evaluate_stop_loop():
             self.stop("item")
         else:
@@ -143,19 +163,24 @@ class LoopComponent(Component):
 
     def update_dependency(self):
         item_dependency_id = self.get_incoming_edge_by_target_param("item")
-        if item_dependency_id not in self.graph.run_manager.run_predecessors[self._id]:
-            self.graph.run_manager.run_predecessors[self._id].append(item_dependency_id)
-            # 注意：同步更新 run_map 以确保 remove_from_predecessors() 正常工作
-            if self._id not in self.graph.run_manager.run_map[item_dependency_id]:
-                self.graph.run_manager.run_map[item_dependency_id].append(self._id)
+        self.graph.run_manager.run_predecessors[self._id].add(item_dependency_id)
+        # 注意：同步更新 run_map 以确保 remove_from_predecessors() 正常工作
+        self.graph.run_manager.run_map[item_dependency_id].add(self._id)
 
-    def done_output(self) -> DataFrame:
+    async def done_output(self) -> DataFrame:
         """在迭代完成后输出聚合结果。
 
         关键路径：检查停止条件 → 输出聚合 DataFrame → 停止/启动分支。
+        并行模式下直接扇出执行全部项后输出。
         """
         self.initialize_data()
 
+        if self._is_parallel():
+            aggregated = await self._run_parallel()
+            self.stop("item")
+            self.start("done")
+            return DataFrame(aggregated)
+
         if self.evaluate_stop_loop():
             self.stop("item")
             self.start("done")
@@ -197,3 +222,44 @@ class LoopComponent(Component):
             aggregated.append(loop_input)
             self.update_ctx({f"{self._id}_aggregated": aggregated})
         return aggregated
+
+    def _is_parallel(self) -> bool:
+        return (self.parallel_width or 1) > 1 and self._vertex is not None
+
+    async def _run_parallel(self) -> list[Data]:
+        """按 `parallel_width` 并发运行循环体，结果按输入顺序返回。
+
+        关键路径（三步）：
+        1) 从图中提取循环体（`item` 输出到回流 `item` 输入之间的顶点）
+        2) 起 `min(parallel_width, 项数)` 条通道，每条通道持有一份子图并依次领取下一项
+        3) 收集回流结果，`Message` 转为 `Data`，跳过未产出结果的项
+        失败语义：任一项失败即取消其余通道并抛出原异常。
+        性能：循环体外的前驱在父图中已构建时直接复用结果，每条通道只重跑循环体。
+        """
+        data_list = self.ctx.get(f"{self._id}_data", [])
+        if not data_list:
+            return []
+        body = extract_loop_body(self.graph, self._id)
+        results: list = [None] * len(data_list)
+        next_index = iter(range(len(data_list)))
+
+        async def lane() -> None:
+            subgraph = build_loop_body_graph(self.graph, body)
+            for index in next_index:
+                results[index] = await run_loop_body(subgraph, body, data_list[index])
+
+        lanes = [asyncio.create_task(lane()) for _ in range(min(self.parallel_width, len(data_list)))]
+        try:
+            await asyncio.gather(*lanes)
+        except BaseException:
+            for task in lanes:
+                task.cancel()
+            raise
+
+        aggregated = []
+        for result in results:
+            if result is None or isinstance(result, str):
+                continue
+            aggregated.append(self._convert_message_to_data(result) if isinstance(result, Message) else result)
+        self.update_ctx({f"{self._id}_aggregated": aggregated, f"{self._id}_index": len(data_list) + 1})
+        return aggregated
@@ -21,6 +21,7 @@ from typing import TYPE_CHECKING, Any, cast
 import toml  # type: ignore[import-untyped]
 
 from lfx.base.models.unified_models import (
+    aget_api_key_for_provider,
     get_language_model_options,
     get_model_classes,
     update_model_options_in_build_config,
@@ -202,10 +203,8 @@ class BatchRunComponent(Component):
             api_key_param = metadata.get("api_key_param", "api_key")
             model_name_param = metadata.get("model_name_param", "model")
 
-            # 注意：优先读取全局配置的 `api_key`。
-            from lfx.base.models.unified_models import get_api_key_for_provider
-
-            api_key = get_api_key_for_provider(self.user_id, provider, self.api_key)
+            # 注意：优先读取全局配置的 `api_key`；在事件循环内 await 查询，避免阻塞其他任务。
+            api_key = await aget_api_key_for_provider(self.user_id, provider, self.api_key)
 
             if not api_key and provider != "Ollama":
                 msg = f"{provider} API key is required. Please configure it globally."
@@ -24,8 +24,8 @@ from collections.abc import Callable  # noqa: TC003 - 运行期动态执行需
 from typing import Any
 
 from lfx.base.models.unified_models import (
+    aget_llm,
     get_language_model_options,
-    get_llm,
     update_model_options_in_build_config,
 )
 from lfx.custom.custom_component.component import Component
@@ -279,8 +279,8 @@ class LambdaFilterComponent(Component):
             msg = f"Invalid lambda format: {lambda_text}"
             raise ValueError(msg)
 
-        # 安全：执行模型生成的 `lambda`，仅在受控环境使用。 # noqa: S307
-        return eval(lambda_text)
+        # 安全：执行模型生成的 `lambda`，仅在受控环境使用。
+        return eval(lambda_text)  # noqa: S307
 
     async def _execute_lambda(self) -> Any:
         """生成并执行 `lambda`，返回原始结果。
@@ -298,7 +298,7 @@ class LambdaFilterComponent(Component):
             data = self._extract_structured_data()
             prompt = self._build_data_prompt(data)
 
-        llm = get_llm(model=self.model, user_id=self.user_id, api_key=self.api_key)
+        llm = await aget_llm(model=self.model, user_id=self.user_id, api_key=self.api_key)
         response = await llm.ainvoke(prompt)
         response_text = response.content if hasattr(response, "content") else str(response)
 
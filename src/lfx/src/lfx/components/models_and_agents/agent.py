@@ -30,8 +30,8 @@ if TYPE_CHECKING:
 from lfx.base.agents.agent import LCToolsAgentComponent
 from lfx.base.agents.events import ExceptionWithMessageError
 from lfx.base.models.unified_models import (
+    aget_llm,
     get_language_model_options,
-    get_llm,
     update_model_options_in_build_config,
 )
 from lfx.components.helpers import CurrentDateComponent
@@ -204,7 +204,7 @@ class AgentComponent(ToolCallingAgentComponent):
         """
         from langchain_core.tools import StructuredTool
 
-        llm_model = get_llm(
+        llm_model = await aget_llm(
             model=self.model,
             user_id=self.user_id,
             api_key=self.api_key,
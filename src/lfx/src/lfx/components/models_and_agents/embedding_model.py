@@ -18,7 +18,7 @@ from typing import Any
 
 from lfx.base.embeddings.model import LCEmbeddingsModel
 from lfx.base.models.unified_models import (
-    get_api_key_for_provider,
+    aget_api_key_for_provider,
     get_embedding_classes,
     get_embedding_model_options,
     update_model_options_in_build_config,
@@ -185,10 +185,10 @@ class EmbeddingModelComponent(LCEmbeddingsModel):
         ),
     ]
 
-    def build_embeddings(self) -> Embeddings:
+    async def build_embeddings(self) -> Embeddings:
         """构建 Embeddings 实例
 
-        契约：`self.model` 必须为非空 list，成功返回 Embeddings 实例。
+        契约：`self.model` 必须为非空 list，成功返回 Embeddings 实例；API Key 只查询一次并在事件循环内 await。
         关键路径：1) 接收直接传入的 Embeddings 2) 校验模型/元数据 3) 组装 kwargs 并实例化。
         异常流：缺少 API Key / 模型名 / embedding_class 时抛 `ValueError`。
         决策：允许直接传入 Embeddings 实例以复用外部构建
@@ -217,7 +217,7 @@ class EmbeddingModelComponent(LCEmbeddingsModel):
         metadata = model.get("metadata", {})
 
         # 实现：优先使用组件输入，其次读取全局 API Key。
-        api_key = get_api_key_for_provider(self.user_id, provider, self.api_key)
+        api_key = await aget_api_key_for_provider(self.user_id, provider, self.api_key)
 
         # 注意：Ollama 允许无 API Key，其余 provider 需校验。
         if not api_key and provider != "Ollama":
@@ -244,14 +244,15 @@ class EmbeddingModelComponent(LCEmbeddingsModel):
             raise ValueError(msg)
 
         # 实现：使用参数映射构建初始化参数。
-        kwargs = self._build_kwargs(model, metadata)
+        kwargs = self._build_kwargs(model, metadata, api_key)
 
         return embedding_class(**kwargs)
 
-    def _build_kwargs(self, model: dict[str, Any], metadata: dict[str, Any]) -> dict[str, Any]:
+    def _build_kwargs(self, model: dict[str, Any], metadata: dict[str, Any], api_key: str | None) -> dict[str, Any]:
         """根据参数映射构建 kwargs
 
-        契约：`metadata` 必须包含 `param_mapping`；返回供 embedding_class 使用的参数字典。
+        契约：`metadata` 必须包含 `param_mapping`；`api_key` 为调用方已解析的密钥；
+        返回供 embedding_class 使用的参数字典。
         关键路径：1) 处理必填参数映射 2) 补齐可选参数 3) 处理厂商特殊参数。
         异常流：缺少映射时抛 `ValueError`。
         决策：对厂商差异做最小化分支处理
@@ -273,11 +274,7 @@ class EmbeddingModelComponent(LCEmbeddingsModel):
         elif "model_id" in param_mapping:
             kwargs[param_mapping["model_id"]] = model.get("name")
         if "api_key" in param_mapping:
-            kwargs[param_mapping["api_key"]] = get_api_key_for_provider(
-                self.user_id,
-                model.get("provider"),
-                self.api_key,
-            )
+            kwargs[param_mapping["api_key"]] = api_key
 
         # 实现：整理可选参数。
         provider = model.get("provider")
@@ -6,6 +6,7 @@
 """
 
 from lfx.custom.custom_component.component import Component
+from lfx.helpers.data import format_dataframe_rows
 from lfx.io import DataFrameInput, MultilineInput, Output, StrInput
 from lfx.schema.message import Message
 
@@ -68,17 +69,12 @@ class ParseDataFrameComponent(Component):
 
         关键路径（三步）：
         1) 整理模板与分隔符；
-        2) 逐行渲染并收集文本；
+        2) 按列渲染每行文本（见 `format_dataframe_rows`）；
         3) 合并并写入状态。
         """
         dataframe, template, sep = self._clean_args()
 
-        lines = []
-        # 实现：逐行格式化
-        for _, row in dataframe.iterrows():
-            row_dict = row.to_dict()
-            text_line = template.format(**row_dict)
-            lines.append(text_line)
+        lines = format_dataframe_rows(template, dataframe)
 
         result_string = sep.join(lines)
         self.status = result_string
@@ -9,7 +9,7 @@
 """
 
 from lfx.custom.custom_component.component import Component
-from lfx.helpers.data import safe_convert
+from lfx.helpers.data import format_dataframe_rows, safe_convert
 from lfx.inputs.inputs import BoolInput, HandleInput, MessageTextInput, MultilineInput, TabInput
 from lfx.schema.data import Data
 from lfx.schema.dataframe import DataFrame
@@ -139,9 +139,7 @@ class ParserComponent(Component):
 
         lines = []
         if df is not None:
-            for _, row in df.iterrows():
-                formatted_text = self.pattern.format(**row.to_dict())
-                lines.append(formatted_text)
+            lines.extend(format_dataframe_rows(self.pattern, df))
         elif data is not None:
             # 实现：缺失键使用默认值回退
             class DefaultDict(dict):
@@ -139,6 +139,10 @@ class Component(CustomComponent):
     outputs: list[Output] = []
     selected_output: str | None = None
     code_class_base_inheritance: ClassVar[str] = "Component"
+    resource_class: ClassVar[str | None] = None
+    """准入控制的资源类别（如 `llm`/`embedding`/`http`/`cpu`）；`None` 表示不受并发上限约束。"""
+    resource_weight: ClassVar[int] = 1
+    """每次执行占用的配额数，超过类别上限时按上限计。"""
 
     def __init__(self, **kwargs) -> None:
         # 先初始化实例级属性
@@ -402,6 +406,13 @@ class Component(CustomComponent):
             for output in self._outputs_map.values():
                 output.value = UNDEFINED
 
+    def reset_run_state(self) -> None:
+        """在基类清理之外重置输出值、当前输出名与事件管理器。"""
+        super().reset_run_state()
+        self.reset_all_output_values()
+        self._current_output = ""
+        self._event_manager = None
+
     def _build_state_model(self):
         """构建状态模型类（惰性）。
 
@@ -1976,20 +1987,25 @@ class Component(CustomComponent):
             msg = "Message must have an ID to stream. Messages only have IDs after being stored in the database."
             raise ValueError(msg)
 
-        if isinstance(iterator, AsyncIterator):
-            return await self._handle_async_iterator(iterator, message_id, message)
         try:
-            complete_message = ""
-            first_chunk = True
-            for chunk in iterator:
-                complete_message = await self._process_chunk(
-                    chunk.content, complete_message, message_id, message, first_chunk=first_chunk
-                )
-                first_chunk = False
-        except Exception as e:
-            raise StreamingError(cause=e, source=message.properties.source) from e
-        else:
-            return complete_message
+            if isinstance(iterator, AsyncIterator):
+                return await self._handle_async_iterator(iterator, message_id, message)
+            try:
+                complete_message = ""
+                first_chunk = True
+                for chunk in iterator:
+                    complete_message = await self._process_chunk(
+                        chunk.content, complete_message, message_id, message, first_chunk=first_chunk
+                    )
+                    first_chunk = False
+            except Exception as e:
+                raise StreamingError(cause=e, source=message.properties.source) from e
+            else:
+                return complete_message
+        finally:
+            # 注意：流结束（含异常）时发出仍在合并缓冲中的 token。
+            if self._event_manager:
+                self._event_manager.flush_tokens(str(message_id))
 
     async def _handle_async_iterator(self, iterator: AsyncIterator, message_id: str, message: Message) -> str:
         complete_message = ""
@@ -2011,13 +2027,8 @@ class Component(CustomComponent):
                 msg_copy = message.model_copy()
                 msg_copy.text = complete_message
                 await self._send_message_event(msg_copy, id_=message_id)
-            await asyncio.to_thread(
-                self._event_manager.on_token,
-                data={
-                    "chunk": chunk,
-                    "id": str(message_id),
-                },
-            )
+            self._event_manager.send_token(chunk=chunk, message_id=str(message_id))
+            await self._event_manager.wait_for_capacity()
         return complete_message
 
     async def send_error(
@@ -34,7 +34,7 @@ from lfx.helpers import (
 )
 from lfx.log.logger import logger
 from lfx.schema.data import Data
-from lfx.services.deps import get_storage_service, get_variable_service, session_scope
+from lfx.services.deps import get_settings_service, get_storage_service, get_variable_service, session_scope
 from lfx.services.storage.service import StorageService
 from lfx.template.utils import update_frontend_node_with_template_values
 from lfx.type_extraction import post_process_type
@@ -147,6 +147,17 @@ class CustomComponent(BaseComponent):
     def set_artifacts(self, artifacts: dict):
         self._artifacts = artifacts
 
+    def reset_run_state(self) -> None:
+        """清空上一次运行的结果、工件、日志与状态；参数与属性在下次构建时重新设置。"""
+        self.status = None
+        self.repr_value = ""
+        self._results = {}
+        self._artifacts = {}
+        self._logs = []
+        self._output_logs = {}
+        self._outputs = []
+        self.cache.clear()
+
     @property
     def trace_name(self) -> str:
         if hasattr(self, "_id") and self._id is None:
@@ -602,8 +613,21 @@ class CustomComponent(BaseComponent):
         else:
             msg = f"Invalid user id: {self.user_id}"
             raise TypeError(msg)
+        variable_cache = self._get_run_variable_cache()
+        if variable_cache is not None:
+            return await variable_cache.get(variable_service, user_id=user_id, name=name, field=field, session=session)
         return await variable_service.get_variable(user_id=user_id, name=name, field=field, session=session)
 
+    def _get_run_variable_cache(self):
+        """开启 `variable_prefetch` 且组件挂在图上时返回该图当前 run 的变量缓存。"""
+        graph = getattr(self, "graph", None)
+        if graph is None or not hasattr(graph, "get_variable_cache"):
+            return None
+        settings_service = get_settings_service()
+        if settings_service is None or settings_service.settings.variable_prefetch is not True:
+            return None
+        return graph.get_variable_cache()
+
     async def list_key_names(self):
         """列出当前用户的变量名。
 
@@ -4,12 +4,17 @@
 本模块提供组件代码的解析与类构造入口，供上层动态加载自定义组件。
 主要功能：
 - 提取组件类名；
-- 构造组件类并返回类型对象。
+- 构造组件类并返回类型对象；
+- 按代码内容哈希缓存已构造的类，同一份代码每进程只编译一次。
 
 设计背景：集中管理动态代码执行入口，便于统一校验与错误处理。
-注意事项：调用方需保证代码可信并已通过校验。
+注意事项：调用方需保证代码可信并已通过校验；缓存命中返回同一个类对象，
+类属性（如 `inputs` 列表）与直接 import 的内置组件一样在实例间共享。
 """
 
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import TYPE_CHECKING
 
 from lfx.custom import validate
@@ -17,12 +22,60 @@ from lfx.custom import validate
 if TYPE_CHECKING:
     from lfx.custom.custom_component.custom_component import CustomComponent
 
+COMPONENT_CLASS_CACHE_SIZE = 512
+"""组件类缓存条目上限；内置组件库约 400 个组件，留出自定义组件余量。"""
+
+_class_cache: "OrderedDict[str, type[CustomComponent]]" = OrderedDict()
+_class_cache_lock = threading.Lock()
+_class_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def _code_digest(code: str) -> str:
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
 
 def eval_custom_component_code(code: str) -> type["CustomComponent"]:
     """解析并构造自定义组件类
 
-    契约：返回自定义组件类对象；失败抛出校验异常。
-    关键路径：1) 提取类名 2) 动态创建类。
+    契约：返回自定义组件类对象；失败抛出校验异常（失败结果不缓存，下次调用会重试）。
+    关键路径：1) 按代码哈希查缓存 2) 未命中时提取类名并动态创建类 3) 写入 LRU。
+    性能：命中时跳过 `ast.parse`/`prepare_global_scope`/`compile`/`exec`，仅剩一次 sha256。
+    决策：锁只保护字典读写，编译在锁外进行；并发未命中同一代码时可能重复编译一次，
+    以最后写入者为准，换取编译期间不阻塞其他线程。
     """
+    digest = _code_digest(code)
+    with _class_cache_lock:
+        cached = _class_cache.get(digest)
+        if cached is not None:
+            _class_cache.move_to_end(digest)
+            _class_cache_stats["hits"] += 1
+            return cached
+        _class_cache_stats["misses"] += 1
+
     class_name = validate.extract_class_name(code)
-    return validate.create_class(code, class_name)
+    class_object = validate.create_class(code, class_name)
+
+    with _class_cache_lock:
+        _class_cache[digest] = class_object
+        _class_cache.move_to_end(digest)
+        while len(_class_cache) > COMPONENT_CLASS_CACHE_SIZE:
+            _class_cache.popitem(last=False)
+            _class_cache_stats["evictions"] += 1
+    return class_object
+
+
+def get_component_class_cache_stats() -> dict[str, int]:
+    """返回组件类缓存计数。
+
+    排障：`misses` 持续增长而 `size` 已到上限时，说明组件版本数超过 `COMPONENT_CLASS_CACHE_SIZE`。
+    """
+    with _class_cache_lock:
+        return {**_class_cache_stats, "size": len(_class_cache), "max_size": COMPONENT_CLASS_CACHE_SIZE}
+
+
+def clear_component_class_cache() -> None:
+    """清空组件类缓存与计数（开发模式热重载或测试隔离时使用）。"""
+    with _class_cache_lock:
+        _class_cache.clear()
+        for key in _class_cache_stats:
+            _class_cache_stats[key] = 0
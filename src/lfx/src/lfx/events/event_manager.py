@@ -4,6 +4,7 @@
 主要功能包括：
 - 注册事件并绑定回调
 - 将事件序列化后推送到队列
+- 按消息合并流式 token，按时间间隔或字节数批量发送
 - 提供默认事件管理器工厂
 
 注意事项：回调签名必须包含 `manager`、`event_type`、`data` 三个参数。
@@ -11,6 +12,9 @@
 
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import contextlib
 import inspect
 import json
 import time
@@ -18,6 +22,7 @@ import uuid
 from functools import partial
 from typing import TYPE_CHECKING
 
+import orjson
 from fastapi.encoders import jsonable_encoder
 from typing_extensions import Protocol
 
@@ -42,11 +47,23 @@ class EventManager:
     契约：注册事件后可通过属性访问回调；`send_event` 输出到队列。
     副作用：写入队列并更新日志。
     失败语义：回调签名不合法抛 `ValueError`。
+
+    token 合并：`send_token` 按消息 ID 缓冲 chunk，距首个未发送 chunk 超过 `token_flush_interval` 秒
+    或缓冲达到 `token_flush_bytes` 字节时合并为一条 `token` 事件（载荷结构不变，`chunk` 为拼接结果）。
+    两者均为 `0` 时每个 chunk 立即发送。发送其他事件前先发出全部缓冲的 token，保证事件顺序。
+    token 缓冲只在事件循环线程上改动；`send_event` 从工作线程调用时把冲刷转交给缓冲所属的循环并等待完成。
     """
 
-    def __init__(self, queue):
+    def __init__(self, queue, *, token_flush_interval: float = 0.0, token_flush_bytes: int = 0):
         self.queue = queue
         self.events: dict[str, PartialEventCallback] = {}
+        self.token_flush_interval = token_flush_interval
+        self.token_flush_bytes = token_flush_bytes
+        self._token_event_type: str | None = None
+        self._token_chunks: dict[str, list[str]] = {}
+        self._token_sizes: dict[str, int] = {}
+        self._token_timers: dict[str, asyncio.TimerHandle] = {}
+        self._token_loop: asyncio.AbstractEventLoop | None = None
 
     @staticmethod
     def _validate_callback(callback: EventCallback) -> None:
@@ -87,6 +104,9 @@ class EventManager:
             callback_ = partial(self.send_event, event_type=event_type)
         else:
             callback_ = partial(callback, manager=self, event_type=event_type)
+        if name == "on_token":
+            # 注意：自定义 token 回调不走合并路径，由 `send_token` 逐个 chunk 调用。
+            self._token_event_type = event_type if callback is None else None
         self.events[name] = callback_
 
     def send_event(self, *, event_type: str, data: LoggableType):
@@ -97,6 +117,8 @@ class EventManager:
         2) 序列化为 JSON 字符串；
         3) 写入队列（如可用）。
         """
+        if self._token_chunks:
+            self._flush_tokens_on_loop()
         try:
             # 注意：避免引入重依赖，仅做轻量处理
             if isinstance(data, dict) and event_type in {"message", "error", "warning", "info", "token"}:
@@ -114,6 +136,89 @@ class EventManager:
             except Exception:  # noqa: BLE001
                 logger.debug("Queue not available for event")
 
+    def send_token(self, *, chunk: str, message_id: str) -> None:
+        """发送一个流式 token chunk，按合并配置缓冲或立即发送。
+
+        契约：需在事件循环线程调用（与队列的 `put_nowait` 同线程），不做线程切换。
+        性能：载荷为纯字符串，跳过 `jsonable_encoder`，直接用 `orjson` 编码。
+        """
+        if self._token_event_type is None:
+            self.on_token(data={"chunk": chunk, "id": message_id})
+            return
+        if not self.token_flush_interval and not self.token_flush_bytes:
+            self._put_token(message_id, chunk)
+            return
+        if self._token_loop is None:
+            with contextlib.suppress(RuntimeError):
+                self._token_loop = asyncio.get_running_loop()
+        chunks = self._token_chunks.setdefault(message_id, [])
+        chunks.append(chunk)
+        size = self._token_sizes.get(message_id, 0) + len(chunk)
+        self._token_sizes[message_id] = size
+        if self.token_flush_bytes and size >= self.token_flush_bytes:
+            self.flush_tokens(message_id)
+        elif self.token_flush_interval and message_id not in self._token_timers:
+            loop = asyncio.get_running_loop()
+            self._token_timers[message_id] = loop.call_later(self.token_flush_interval, self.flush_tokens, message_id)
+
+    def flush_tokens(self, message_id: str | None = None) -> None:
+        """立即发送缓冲的 token（`message_id` 为空时发送全部消息的缓冲）。"""
+        message_ids = list(self._token_chunks) if message_id is None else [message_id]
+        for id_ in message_ids:
+            timer = self._token_timers.pop(id_, None)
+            if timer is not None:
+                timer.cancel()
+            chunks = self._token_chunks.pop(id_, None)
+            self._token_sizes.pop(id_, None)
+            if chunks:
+                self._put_token(id_, "".join(chunks))
+
+    def _flush_tokens_on_loop(self) -> None:
+        """在缓冲所属的事件循环上冲刷 token。
+
+        注意：组件经 `asyncio.to_thread` 发送消息事件；工作线程中直接冲刷会与循环上的
+        `send_token` 和定时器竞争。这里阻塞工作线程直到循环完成冲刷，保证 token 先于本事件入队。
+        """
+        loop = self._token_loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop is None or running is loop:
+            self.flush_tokens()
+            return
+        done: concurrent.futures.Future[None] = concurrent.futures.Future()
+
+        def flush() -> None:
+            try:
+                self.flush_tokens()
+            finally:
+                done.set_result(None)
+
+        try:
+            loop.call_soon_threadsafe(flush)
+        except RuntimeError:
+            # 注意：循环已关闭时不会再有定时器或 `send_token` 竞争，直接在当前线程冲刷。
+            self.flush_tokens()
+            return
+        done.result()
+
+    async def wait_for_capacity(self) -> None:
+        """队列支持背压（提供 `wait_for_capacity`）时等待其腾出空间，否则立即返回。"""
+        wait = getattr(self.queue, "wait_for_capacity", None)
+        if wait is not None:
+            await wait()
+
+    def _put_token(self, message_id: str, chunk: str) -> None:
+        if not self.queue:
+            return
+        event_type = self._token_event_type
+        payload = orjson.dumps({"event": event_type, "data": {"chunk": chunk, "id": message_id}}) + b"\n\n"
+        try:
+            self.queue.put_nowait((f"{event_type}-{uuid.uuid4()}", payload, time.time()))
+        except Exception:  # noqa: BLE001
+            logger.debug("Queue not available for event")
+
     def noop(self, *, data: LoggableType) -> None:
         """空操作回调，用作缺省事件处理。"""
         pass
@@ -123,9 +228,17 @@ class EventManager:
         return self.events.get(name, self.noop)
 
 
-def create_default_event_manager(queue=None):
-    """创建包含默认事件的 EventManager。"""
-    manager = EventManager(queue)
+def token_flush_options(settings) -> dict[str, float | int]:
+    """把 `event_token_flush_*` 设置转换为 `EventManager` 的 token 合并参数。"""
+    return {
+        "token_flush_interval": settings.event_token_flush_interval_ms / 1000,
+        "token_flush_bytes": settings.event_token_flush_bytes,
+    }
+
+
+def create_default_event_manager(queue=None, **kwargs):
+    """创建包含默认事件的 EventManager；`kwargs` 透传 token 合并配置。"""
+    manager = EventManager(queue, **kwargs)
     manager.register_event("on_token", "token")
     manager.register_event("on_vertices_sorted", "vertices_sorted")
     manager.register_event("on_error", "error")
@@ -138,9 +251,9 @@ def create_default_event_manager(queue=None):
     return manager
 
 
-def create_stream_tokens_event_manager(queue=None):
-    """创建仅用于流式 token 的 EventManager。"""
-    manager = EventManager(queue)
+def create_stream_tokens_event_manager(queue=None, **kwargs):
+    """创建仅用于流式 token 的 EventManager；`kwargs` 透传 token 合并配置。"""
+    manager = EventManager(queue, **kwargs)
     manager.register_event("on_message", "add_message")
     manager.register_event("on_token", "token")
     manager.register_event("on_end", "end")
@@ -0,0 +1,235 @@
+"""模块名称：顶点执行准入控制
+
+本模块按资源类别（如 `llm`/`embedding`/`http`/`cpu`）限制顶点的并发执行数。
+使用场景：大扇出流程中同时触发过多模型或外部请求，导致供应商限流与集中重试。
+主要功能包括：
+- `ResourceLimiter`：加权、FIFO 的并发上限，可跨事件循环与线程共享
+- `AdmissionController`：按资源类别聚合多个限流器并输出排队指标
+- `admit_component`：`Vertex` 构建组件时按“单次运行 → 进程级”顺序申请配额
+
+关键组件：组件类通过 `resource_class`/`resource_weight` 声明资源类别与权重；
+上限来自设置 `vertex_run_resource_limits`（每个图实例）与 `vertex_resource_limits`（整个进程）。
+注意事项：未声明类别或类别未配置上限的组件不受限制；权重大于上限时按上限计，避免永远无法准入。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from lfx.log.logger import logger
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Mapping
+
+    from lfx.graph.graph.base import Graph
+
+
+@dataclass(eq=False, slots=True)
+class _Waiter:
+    weight: int
+    future: asyncio.Future
+    granted: bool = False
+
+
+class ResourceLimiter:
+    """单个资源类别的加权并发上限。
+
+    契约：`acquire(weight)` 返回实际占用的权重，调用方必须以同一权重调用 `release`。
+    决策：以 `threading.Lock` + 每个等待者一个 Future 实现，而非 `asyncio.Semaphore`
+    问题：进程级限流器会被多个事件循环（如工作线程中的 `run_until_complete`）共享，
+    `asyncio` 原语绑定首次使用的事件循环
+    方案：唤醒时通过 `call_soon_threadsafe` 投递到等待者所在事件循环
+    代价：每次准入多一次线程锁
+    重评：当所有执行统一到单一事件循环时可改回 `asyncio.Semaphore`
+    """
+
+    def __init__(self, name: str, limit: int) -> None:
+        self.name = name
+        self.limit = limit
+        self._in_use = 0
+        self._waiters: deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._peak_waiting = 0
+        self._wait_seconds = 0.0
+
+    async def acquire(self, weight: int = 1) -> int:
+        """申请配额，必要时按 FIFO 排队等待。
+
+        失败语义：等待期间被取消时移出队列；若已被授予配额则立即归还，不泄漏。
+        注意：队列非空时新请求一律排队，避免高权重请求被低权重请求持续插队而饿死。
+        """
+        weight = min(max(weight, 1), self.limit)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if not self._waiters and self._in_use + weight <= self.limit:
+                self._in_use += weight
+                self._admitted += 1
+                return weight
+            waiter = _Waiter(weight, loop.create_future())
+            self._waiters.append(waiter)
+            self._peak_waiting = max(self._peak_waiting, len(self._waiters))
+
+        started = time.perf_counter()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    # 注意：取消与授予发生竞争时配额已记入 `_in_use`，此处归还。
+                    self._in_use -= weight
+                elif waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                # 注意：被取消的可能是队首，其后已能放行的等待者需要在此唤醒。
+                self._wake_waiters()
+            raise
+        with self._lock:
+            self._wait_seconds += time.perf_counter() - started
+        return weight
+
+    def release(self, weight: int) -> None:
+        with self._lock:
+            self._in_use -= weight
+            self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        # 注意：调用方需持有 `_lock`；只按队首顺序授予，保持 FIFO。
+        while self._waiters and self._in_use + self._waiters[0].weight <= self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.future.done():
+                # 注意：已取消的等待者由其自身的取消处理收尾，不占用配额。
+                continue
+            try:
+                waiter.future.get_loop().call_soon_threadsafe(_resolve_future, waiter.future)
+            except RuntimeError:
+                # 注意：等待者所在事件循环已关闭，无法再被唤醒；跳过它，配额留给后续等待者。
+                continue
+            waiter.granted = True
+            self._in_use += waiter.weight
+            self._admitted += 1
+
+    @contextlib.asynccontextmanager
+    async def slot(self, weight: int = 1) -> AsyncIterator[None]:
+        acquired = await self.acquire(weight)
+        try:
+            yield
+        finally:
+            self.release(acquired)
+
+    def stats(self) -> dict[str, Any]:
+        """返回当前占用与排队指标。
+
+        排障：`waiting` 持续大于 0 且 `wait_seconds` 快速增长，说明该类别上限成为瓶颈。
+        """
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_use": self._in_use,
+                "waiting": len(self._waiters),
+                "peak_waiting": self._peak_waiting,
+                "admitted": self._admitted,
+                "wait_seconds": self._wait_seconds,
+            }
+
+
+def _resolve_future(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class AdmissionController:
+    """按资源类别管理 `ResourceLimiter`。
+
+    契约：`limits` 中值 `<= 0` 的类别视为不限制，不创建限流器。
+    """
+
+    def __init__(self, limits: Mapping[str, int] | None = None) -> None:
+        self._limiters = {
+            name: ResourceLimiter(name, int(limit)) for name, limit in (limits or {}).items() if int(limit) > 0
+        }
+
+    def limiter(self, resource_class: str | None) -> ResourceLimiter | None:
+        if resource_class is None:
+            return None
+        return self._limiters.get(resource_class)
+
+    @contextlib.asynccontextmanager
+    async def admit(self, resource_class: str | None, weight: int = 1) -> AsyncIterator[None]:
+        limiter = self.limiter(resource_class)
+        if limiter is None:
+            yield
+            return
+        async with limiter.slot(weight):
+            yield
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {name: limiter.stats() for name, limiter in self._limiters.items()}
+
+
+_process_controller: AdmissionController | None = None
+_process_limits: dict[str, int] | None = None
+_process_controller_lock = threading.Lock()
+
+
+def _configured_limits(field: str) -> dict[str, int]:
+    from lfx.services.deps import get_settings_service
+
+    settings_service = get_settings_service()
+    if settings_service is None:
+        return {}
+    return dict(getattr(settings_service.settings, field, None) or {})
+
+
+def get_process_admission_controller() -> AdmissionController:
+    """返回进程级准入控制器。
+
+    注意：设置中的上限变化后（如测试或热更新）重建控制器；已在等待的请求仍由旧控制器放行。
+    """
+    global _process_controller, _process_limits  # noqa: PLW0603
+    limits = _configured_limits("vertex_resource_limits")
+    with _process_controller_lock:
+        if _process_controller is None or limits != _process_limits:
+            _process_controller = AdmissionController(limits)
+            _process_limits = limits
+        return _process_controller
+
+
+def create_run_admission_controller() -> AdmissionController:
+    """按 `vertex_run_resource_limits` 创建单个图实例使用的准入控制器。"""
+    return AdmissionController(_configured_limits("vertex_run_resource_limits"))
+
+
+@contextlib.asynccontextmanager
+async def admit_component(graph: Graph | None, component: Any) -> AsyncIterator[None]:
+    """按组件声明的资源类别申请单次运行与进程级配额。
+
+    关键路径：1) 读取组件类的 `resource_class`/`resource_weight` 2) 申请图实例配额 3) 申请进程级配额。
+    决策：固定按“单次运行 → 进程级”顺序申请，顶点同时只持有一个类别，避免交叉等待导致死锁。
+    """
+    resource_class = getattr(component, "resource_class", None)
+    if resource_class is None:
+        yield
+        return
+    weight = getattr(component, "resource_weight", 1)
+    run_controller = graph.admission_controller if graph is not None else None
+    process_controller = get_process_admission_controller()
+    if (run_controller is None or run_controller.limiter(resource_class) is None) and process_controller.limiter(
+        resource_class
+    ) is None:
+        yield
+        return
+    started = time.perf_counter()
+    async with contextlib.AsyncExitStack() as stack:
+        if run_controller is not None:
+            await stack.enter_async_context(run_controller.admit(resource_class, weight))
+        await stack.enter_async_context(process_controller.admit(resource_class, weight))
+        waited = time.perf_counter() - started
+        if waited > 0.01:  # noqa: PLR2004
+            await logger.adebug(f"Admitted {resource_class} component after waiting {waited:.3f}s")
+        yield
@@ -35,7 +35,15 @@ from ag_ui.core import RunFinishedEvent, RunStartedEvent
 
 from lfx.events.observability.lifecycle_events import observable
 from lfx.exceptions.component import ComponentBuildError
+from lfx.graph.admission import AdmissionController, create_run_admission_controller
 from lfx.graph.edge.base import CycleEdge, Edge
+from lfx.graph.graph.checkpoint import (
+    GraphCheckpoint,
+    capture_checkpoint,
+    checkpoint_key,
+    delete_checkpoints,
+    restore_checkpoints,
+)
 from lfx.graph.graph.constants import Finish, lazy_load_vertex_dict
 from lfx.graph.graph.runnable_vertices_manager import RunnableVerticesManager
 from lfx.graph.graph.schema import GraphData, GraphDump, StartConfigDict, VertexBuildResult
@@ -48,6 +56,7 @@ from lfx.graph.graph.utils import (
     process_flow,
     should_continue,
 )
+from lfx.graph.graph.variable_cache import RunVariableCache, collect_variable_names
 from lfx.graph.schema import InterfaceComponentTypes, RunOutputs
 from lfx.graph.utils import log_vertex_build
 from lfx.graph.vertex.base import Vertex, VertexStates
@@ -57,7 +66,7 @@ from lfx.log.logger import LogConfig, configure, logger
 from lfx.schema.dotdict import dotdict
 from lfx.schema.schema import INPUT_FIELD_NAME, InputType, OutputValue
 from lfx.services.cache.utils import CacheMiss
-from lfx.services.deps import get_chat_service, get_tracing_service
+from lfx.services.deps import get_chat_service, get_settings_service, get_tracing_service
 from lfx.utils.async_helpers import run_until_complete
 
 if TYPE_CHECKING:
@@ -153,6 +162,15 @@ class Graph:
         self._call_order: list[str] = []
         self._snapshots: list[dict[str, Any]] = []
         self._end_trace_tasks: set[asyncio.Task] = set()
+        # 注意：增量检查点状态，仅 `graph_checkpoint_mode="delta"` 时使用。
+        self._checkpoint_seq = 0
+        self._checkpoint_pending_vertices: set[str] = set()
+        self._checkpoint_tasks: set[asyncio.Task] = set()
+        self._admission_controller: AdmissionController | None = None
+        # 注意：预编译组件类（由编译图缓存注入），仅在实例化组件时读取。
+        self.component_classes: dict[str, type] = {}
+        # 注意：单次运行的变量预取缓存（含明文），不参与序列化。
+        self._variable_cache: RunVariableCache | None = None
 
         if context and not isinstance(context, dict):
             msg = "Context must be a dictionary"
@@ -428,6 +446,52 @@ class Graph:
                 continue
             vertex.custom_component.reset_all_output_values()
 
+    def reset_run_state(self) -> None:
+        """清空上一次运行留下的状态，使同一图实例可以再次执行。
+
+        契约：保留节点数据、顶点对象与已实例化的组件；清空 run_id/会话、调度、准入与检查点状态
+        （取消未完成的检查点写入）、变量预取缓存、各顶点构建结果与组件输出值，输入顶点被覆盖的参数按节点数据重建。
+        下一次 `prepare`/`async_start` 会重新排序并构建边。
+        决策：复用顶点与组件对象，而非 `deepcopy` 整图
+        问题：`deepcopy` 需要复制节点数据并重建全部顶点与组件，是 `lfx serve` 每个请求的主要开销
+        方案：逐项清理运行期字段，由调用方（如 `GraphPool`）保证同一实例不被并发执行
+        代价：组件在运行中自行添加的其他实例属性不会被清理
+        重评：当组件运行状态统一收敛到上下文对象后改为丢弃上下文
+        """
+        self._run_id = ""
+        self._session_id = ""
+        self._prepared = False
+        self._start_time = datetime.now(timezone.utc)
+        self.run_manager = RunnableVerticesManager()
+        self._run_queue = deque()
+        self._first_layer = []
+        self.vertices_layers = []
+        self._sorted_vertices_layers = []
+        self.vertices_to_run = set()
+        self.stop_vertex = None
+        self.inactivated_vertices = set()
+        self.inactive_vertices = set()
+        self.activated_vertices = []
+        self.conditionally_excluded_vertices = set()
+        self.conditional_exclusion_sources = {}
+        self._call_order = []
+        self._snapshots = []
+        self._checkpoint_seq = 0
+        self._checkpoint_pending_vertices = set()
+        # 注意：上一次运行未写完的增量检查点已无恢复价值，取消而非等待，保持本方法同步。
+        for task in self._checkpoint_tasks:
+            task.cancel()
+        self._checkpoint_tasks = set()
+        self._admission_controller = None
+        self._variable_cache = None
+        # 注意：`define_vertices_lists` 在每次 `initialize` 时追加，需清空以免重复。
+        self._is_input_vertices = []
+        self._is_output_vertices = []
+        self.has_session_id_vertices = []
+        self._is_state_vertices = None
+        for vertex in self.vertices:
+            vertex.reset_run_state()
+
     def start(
         self,
         inputs: list[dict] | None = None,
@@ -618,6 +682,12 @@ class Graph:
 
         self._run_id = str(run_id)
 
+    def get_variable_cache(self) -> RunVariableCache:
+        """返回当前 run 的变量预取缓存；`run_id` 变化时按当前顶点参数重建。"""
+        if self._variable_cache is None or self._variable_cache.run_id != self._run_id:
+            self._variable_cache = RunVariableCache(self._run_id, collect_variable_names(self))
+        return self._variable_cache
+
     async def initialize_run(self) -> None:
         if not self._run_id:
             self.set_run_id()
@@ -972,6 +1042,7 @@ class Graph:
             "inactivated_vertices": self.inactivated_vertices,
             "run_manager": self.run_manager.to_dict(),
             "_run_id": self._run_id,
+            "_checkpoint_seq": self._checkpoint_seq,
             "in_degree_map": self.in_degree_map,
             "parent_child_map": self.parent_child_map,
             "predecessor_map": self.predecessor_map,
@@ -1031,6 +1102,14 @@ class Graph:
             state["run_manager"] = RunnableVerticesManager.from_dict(run_manager)
         self.__dict__.update(state)
         self.vertex_map = {vertex.id: vertex for vertex in self.vertices}
+        # 注意：基线图记录已包含的检查点序号，回放时从下一个序号开始，避免旧增量覆盖新状态。
+        self._checkpoint_seq = state.get("_checkpoint_seq", 0)
+        self._checkpoint_pending_vertices = set()
+        self._checkpoint_tasks = set()
+        self._admission_controller = None
+        # 注意：动态生成的组件类不可 pickle，反序列化后的图一律重新编译。
+        self.component_classes = {}
+        self._variable_cache = None
         # 注意：追踪服务通过属性惰性初始化。
         self.set_run_id(self._run_id)
 
@@ -1042,14 +1121,21 @@ class Graph:
         flow_name: str | None = None,
         user_id: str | None = None,
         context: dict | None = None,
+        component_classes: dict[str, type] | None = None,
     ) -> Graph:
-        """从 payload 构建图实例。"""
+        """从 payload 构建图实例。
+
+        契约：`component_classes` 为 `vertex_id -> 组件类` 映射，命中的顶点跳过组件代码编译；
+        调用方需保证映射来自同一份 payload（`code` 字段一致），否则会实例化错误的组件类。
+        """
         if "data" in payload:
             payload = payload["data"]
         try:
             vertices = payload["nodes"]
             edges = payload["edges"]
             graph = cls(flow_id=flow_id, flow_name=flow_name, user_id=user_id, context=context)
+            if component_classes:
+                graph.component_classes = component_classes
             graph.add_nodes_and_edges(vertices, edges)
         except KeyError as exc:
             logger.exception(exc)
@@ -1280,6 +1366,8 @@ class Graph:
             raise ValueError(msg)
         if not self._run_queue:
             self._end_all_traces_async()
+            if self._checkpoint_seq:
+                await self.clear_checkpoints()
             return Finish()
         vertex_id = self.get_next_in_queue()
         if not vertex_id:
@@ -1319,7 +1407,10 @@ class Graph:
         self.reset_activated_vertices()
 
         if chat_service is not None:
-            await chat_service.set_cache(str(self.flow_id or self._run_id), self)
+            if self.checkpoint_mode == "delta":
+                self._schedule_checkpoint_write(self._capture_checkpoint(vertex_build_result.vertex.id))
+            else:
+                await chat_service.set_cache(str(self.flow_id or self._run_id), self)
         self._record_snapshot(vertex_id)
         return vertex_build_result
 
@@ -1383,7 +1474,8 @@ class Graph:
                     cached_result = await get_cache(key=vertex.id)
                 else:
                     cached_result = CacheMiss()
-                if isinstance(cached_result, CacheMiss):
+                # 注意：无 chat 服务时的空实现缓存函数返回 None，同样视为未命中。
+                if cached_result is None or isinstance(cached_result, CacheMiss):
                     should_build = True
                 else:
                     try:
@@ -1486,6 +1578,7 @@ class Graph:
         1) 获取首层并初始化缓存函数
         2) 并行执行当前层任务
         3) 计算下一层并迭代
+        注意：`scheduler_mode == "dataflow"` 时改由 `_process_dataflow` 按完成顺序调度。
         """
         has_webhook_component = "webhook" in start_component_id.lower() if start_component_id else False
         first_layer = self.sort_vertices(start_component_id=start_component_id)
@@ -1508,6 +1601,22 @@ class Graph:
 
         await self.initialize_run()
         lock = asyncio.Lock()
+        if self.scheduler_mode == "dataflow":
+            await self._process_dataflow(
+                first_layer,
+                lock=lock,
+                build_kwargs={
+                    "user_id": self.user_id,
+                    "inputs_dict": {},
+                    "fallback_to_env_vars": fallback_to_env_vars,
+                    "get_cache": get_cache_func,
+                    "set_cache": set_cache_func,
+                    "event_manager": event_manager,
+                },
+                has_webhook_component=has_webhook_component,
+            )
+            await logger.adebug("Graph processing complete")
+            return self
         while to_process:
             current_batch = list(to_process)  # 注意：复制当前批次。
             to_process.clear()  # 注意：清空队列等待下一批。
@@ -1545,10 +1654,135 @@ class Graph:
         await logger.adebug("Graph processing complete")
         return self
 
+    @property
+    def admission_controller(self) -> AdmissionController:
+        """单次运行的资源准入控制器，首次访问时按 `vertex_run_resource_limits` 创建。
+
+        注意：不参与序列化；反序列化后的图重新创建，配额不跨进程共享。
+        """
+        if self._admission_controller is None:
+            self._admission_controller = create_run_admission_controller()
+        return self._admission_controller
+
+    def admission_stats(self) -> dict[str, dict[str, Any]]:
+        """返回本次运行各资源类别的占用与排队指标。"""
+        return self.admission_controller.stats()
+
+    @property
+    def scheduler_mode(self) -> str:
+        """`process` 的调度模式，取自 `graph_scheduler_mode`；无 settings 服务时为 `layered`。"""
+        settings_service = get_settings_service()
+        if settings_service is None:
+            return "layered"
+        return getattr(settings_service.settings, "graph_scheduler_mode", "layered")
+
+    @property
+    def max_concurrency(self) -> int:
+        """`dataflow` 模式下同时构建的顶点上限，取自 `graph_max_concurrency`；`<=0` 不限制。"""
+        settings_service = get_settings_service()
+        if settings_service is None:
+            return 0
+        return getattr(settings_service.settings, "graph_max_concurrency", 0)
+
+    async def _process_dataflow(
+        self,
+        first_layer: list[str],
+        *,
+        lock: asyncio.Lock,
+        build_kwargs: dict[str, Any],
+        has_webhook_component: bool = False,
+    ) -> None:
+        """按完成顺序调度：任一顶点完成即计算并启动其可运行后继，不等待同批其他顶点。
+
+        关键路径（三步）：
+        1) 启动首层顶点任务（受 `max_concurrency` 信号量约束）
+        2) `asyncio.wait(FIRST_COMPLETED)` 取出已完成任务，逐个记录构建结果
+        3) 对每个完成顶点调用 `get_next_runnable_vertices` 并立即启动新可运行顶点
+        失败语义：任一任务异常时取消并等待其余在途任务，再原样抛出；被取消的任务按 `CancelledError` 抛出。
+        注意：同一顶点（循环）在途时再次变为可运行，会等当前任务完成后再启动，避免并发构建同一顶点。
+        """
+        limit = self.max_concurrency
+        semaphore = asyncio.Semaphore(limit) if limit > 0 else None
+        run_counts: dict[str, int] = defaultdict(int)
+        in_flight: dict[asyncio.Task, str] = {}
+        deferred: set[str] = set()
+
+        async def build(vertex_id: str) -> VertexBuildResult:
+            if semaphore is None:
+                return await self.build_vertex(vertex_id=vertex_id, **build_kwargs)
+            async with semaphore:
+                return await self.build_vertex(vertex_id=vertex_id, **build_kwargs)
+
+        def launch(vertex_id: str) -> None:
+            if vertex_id in in_flight.values():
+                deferred.add(vertex_id)
+                return
+            task = asyncio.create_task(build(vertex_id), name=f"{vertex_id} Run {run_counts[vertex_id]}")
+            run_counts[vertex_id] += 1
+            in_flight[task] = vertex_id
+
+        for vertex_id in first_layer:
+            launch(vertex_id)
+
+        try:
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    vertex_id = in_flight.pop(task)
+                    try:
+                        if task.cancelled():
+                            msg = f"Task {task.get_name()} was cancelled"
+                            raise asyncio.CancelledError(msg)
+                        # 注意：异常作为结果交给处理函数，以便记录错误日志与 webhook 构建日志后再抛出。
+                        result = task.exception() or task.result()
+                        vertex = await self._handle_vertex_task_result(
+                            task.get_name(), vertex_id, result, has_webhook_component=has_webhook_component
+                        )
+                    except BaseException:
+                        await logger.aexception(f"Error executing vertex {vertex_id} in dataflow mode")
+                        raise
+                    self.run_manager.remove_vertex_from_runnables(vertex.id)
+                    next_runnable_vertices = await self.get_next_runnable_vertices(lock, vertex=vertex, cache=False)
+                    if vertex_id in deferred:
+                        deferred.discard(vertex_id)
+                        launch(vertex_id)
+                    for next_vertex_id in dict.fromkeys(next_runnable_vertices):
+                        launch(next_vertex_id)
+        finally:
+            # 注意：失败或外层取消时取消其余在途任务并等待其退出，避免任务在本次运行结束后继续改写图状态。
+            if in_flight:
+                for pending_task in in_flight:
+                    pending_task.cancel()
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def _handle_vertex_task_result(
+        self, task_name: str, vertex_id: str, result: Any, *, has_webhook_component: bool
+    ) -> Vertex:
+        """校验单个构建任务结果并记录构建日志；异常结果原样抛出。"""
+        if isinstance(result, Exception):
+            await logger.aerror(f"Task {task_name} failed with exception: {result}")
+            if has_webhook_component:
+                await self._log_vertex_build_from_exception(vertex_id, result)
+            raise result
+        if not isinstance(result, VertexBuildResult):
+            msg = f"Invalid result from task {task_name}: {result}"
+            raise TypeError(msg)
+        if self.flow_id is not None:
+            await log_vertex_build(
+                flow_id=self.flow_id,
+                vertex_id=result.vertex.id,
+                valid=result.valid,
+                params=result.params,
+                data=result.result_dict,
+                artifacts=result.artifacts,
+            )
+        return result.vertex
+
     def find_next_runnable_vertices(self, vertex_successors_ids: list[str]) -> list[str]:
         """根据后继列表推导下一批可运行顶点。"""
         next_runnable_vertices = set()
-        for v_id in sorted(vertex_successors_ids):
+        # 性能：结果集合最终排序，遍历顺序不影响输出，无需预先排序。
+        for v_id in vertex_successors_ids:
             if not self.is_vertex_runnable(v_id):
                 next_runnable_vertices.update(self.find_runnable_predecessors_for_successor(v_id))
             else:
@@ -1561,6 +1795,7 @@ class Graph:
         v_id = vertex.id
         v_successors_ids = vertex.successors_ids
         self.run_manager.ran_at_least_once.add(v_id)
+        checkpoint: GraphCheckpoint | None = None
         async with lock:
             self.run_manager.remove_vertex_from_runnables(v_id)
             next_runnable_vertices = self.find_next_runnable_vertices(v_successors_ids)
@@ -1571,12 +1806,92 @@ class Graph:
                 else:
                     self.run_manager.add_to_vertices_being_run(next_v_id)
             if cache and self.flow_id is not None:
-                set_cache_coro = partial(get_chat_service().set_cache, key=self.flow_id)
-                await set_cache_coro(data=self, lock=lock)
+                if self.checkpoint_mode == "delta":
+                    # 性能：锁内只复制调度集合，序列化与写缓存放到锁外的后台任务。
+                    checkpoint = self._capture_checkpoint(v_id)
+                else:
+                    set_cache_coro = partial(get_chat_service().set_cache, key=self.flow_id)
+                    await set_cache_coro(data=self, lock=lock)
+        if checkpoint is not None:
+            self._schedule_checkpoint_write(checkpoint)
         if vertex.is_state:
             next_runnable_vertices.extend(self.activated_vertices)
         return next_runnable_vertices
 
+    @property
+    def checkpoint_mode(self) -> str:
+        """增量检查点写入路径的检查点模式，取自 `graph_checkpoint_mode`。"""
+        settings_service = get_settings_service()
+        if settings_service is None:
+            return "full"
+        return getattr(settings_service.settings, "graph_checkpoint_mode", "full")
+
+    @property
+    def _checkpoint_base_key(self) -> str:
+        # 注意：与 `astep` 整图写入使用同一键基，读取端可按键基回放增量。
+        return str(self.flow_id or self._run_id)
+
+    def _capture_checkpoint(self, vertex_id: str) -> GraphCheckpoint:
+        self._checkpoint_pending_vertices.add(vertex_id)
+        self._checkpoint_seq += 1
+        checkpoint = capture_checkpoint(self, self._checkpoint_seq, self._checkpoint_pending_vertices)
+        self._checkpoint_pending_vertices = set()
+        return checkpoint
+
+    def checkpoint_vertex(self, vertex_id: str) -> bool:
+        """逐顶点构建接口在顶点完成后调用：`delta` 模式下调度一条增量检查点。
+
+        契约：返回 `True` 表示已调度增量，调用方无需再整图写缓存；`full` 模式或 chat 服务不可用时返回 `False`。
+        注意：增量叠加在 `flow_id` 键的整图基线上，基线缺失（如缓存未命中后重建、出错清缓存）时调用方应改为整图写入。
+        """
+        if self.checkpoint_mode != "delta" or get_chat_service() is None:
+            return False
+        self._schedule_checkpoint_write(self._capture_checkpoint(vertex_id))
+        return True
+
+    def _schedule_checkpoint_write(self, checkpoint: GraphCheckpoint) -> None:
+        """在后台写入增量检查点；任务引用保存在 `_checkpoint_tasks` 防止被 GC。"""
+        chat_service = get_chat_service()
+        if chat_service is None:
+            return
+        key = checkpoint_key(self._checkpoint_base_key, checkpoint.seq)
+        task = asyncio.create_task(chat_service.set_cache(key, checkpoint), name=f"checkpoint {key}")
+        self._checkpoint_tasks.add(task)
+        task.add_done_callback(self._on_checkpoint_written)
+
+    def _on_checkpoint_written(self, task: asyncio.Task) -> None:
+        self._checkpoint_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            # 排障：写失败只影响恢复粒度（回放停在断档前），不影响本次运行。
+            logger.warning(f"Failed to write graph checkpoint {task.get_name()}: {task.exception()}")
+
+    async def wait_for_checkpoints(self) -> None:
+        """等待已调度的增量检查点写完（运行结束或测试时调用）。"""
+        if self._checkpoint_tasks:
+            await asyncio.gather(*self._checkpoint_tasks, return_exceptions=True)
+
+    async def clear_checkpoints(self) -> None:
+        """等待在途写入后删除本次运行写入的增量检查点，并把序号归零。
+
+        契约：运行结束（`astep` 返回 `Finish`）时调用；增量只对未完成的运行有意义，
+        不删除会让每次运行的 `{base}:checkpoint:{seq}` 键一直留在缓存中。
+        失败语义：删除失败只记录告警，残留键在下次同键基运行时被覆盖或因 `run_id` 不符而被忽略。
+        """
+        await self.wait_for_checkpoints()
+        chat_service = get_chat_service()
+        last_seq, self._checkpoint_seq = self._checkpoint_seq, 0
+        if chat_service is None or not last_seq:
+            return
+        failures = await delete_checkpoints(chat_service.clear_cache, self._checkpoint_base_key, last_seq)
+        if failures:
+            await logger.awarning(f"Failed to delete {failures} graph checkpoints for {self._checkpoint_base_key}")
+
+    async def restore_checkpoints(self, get_cache) -> int:
+        """从缓存回放本图之后的增量检查点，返回回放条数；`full` 模式下不访问缓存直接返回 0。"""
+        if self.checkpoint_mode != "delta":
+            return 0
+        return await restore_checkpoints(self, get_cache, self._checkpoint_base_key)
+
     async def _log_vertex_build_from_exception(self, vertex_id: str, result: Exception) -> None:
         """记录顶点构建异常并写入日志事件。"""
         if isinstance(result, ComponentBuildError):
@@ -1626,29 +1941,14 @@ class Graph:
             vertex_id = tasks[i].get_name().split(" ")[0]
 
             if isinstance(result, Exception):
-                await logger.aerror(f"Task {task_name} failed with exception: {result}")
-                if has_webhook_component:
-                    await self._log_vertex_build_from_exception(vertex_id, result)
-
                 # 注意：出现异常时取消剩余任务。
                 for t in tasks[i + 1 :]:
                     t.cancel()
-                raise result
-            if isinstance(result, VertexBuildResult):
-                if self.flow_id is not None:
-                    await log_vertex_build(
-                        flow_id=self.flow_id,
-                        vertex_id=result.vertex.id,
-                        valid=result.valid,
-                        params=result.params,
-                        data=result.result_dict,
-                        artifacts=result.artifacts,
-                    )
-
-                vertices.append(result.vertex)
-            else:
-                msg = f"Invalid result from task {task_name}: {result}"
-                raise TypeError(msg)
+            vertices.append(
+                await self._handle_vertex_task_result(
+                    task_name, vertex_id, result, has_webhook_component=has_webhook_component
+                )
+            )
 
         for v in vertices:
             # 注意：执行过的顶点移出可运行集合，避免并行重复调度。
@@ -0,0 +1,148 @@
+"""模块名称：图增量检查点
+
+本模块定义图运行的增量检查点（delta checkpoint）结构与读写辅助函数。
+使用场景：`graph_checkpoint_mode="delta"` 时，`get_next_runnable_vertices` 不再整图写入 chat 缓存，
+而是只写入调度状态与自上次检查点以来完成的顶点结果。
+主要功能包括：
+- 在调度锁内同步捕获增量（复制调度集合与本次完成顶点的构建产出）
+- 以 `{flow_id 或 run_id}:checkpoint:{seq}` 为键顺序写入，避免对累积状态做读改写
+- 读取端按序号回放增量，恢复到最近一次检查点；运行结束后删除本次运行写入的增量
+
+注意事项：增量必须叠加在一份完整图之上（如 `/build` 启动时写入的 `set_cache(flow_id, graph)`）；
+回放遇到第一个缺失序号即停止，缓存淘汰导致的断档会使恢复停在断档之前。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from lfx.services.cache.utils import CacheMiss
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from lfx.graph.graph.base import Graph
+    from lfx.graph.vertex.base import Vertex
+
+# 注意：仅包含构建产出与状态字段；参数、边与组件实例属于图结构，由完整图提供。
+CHECKPOINT_VERTEX_FIELDS = (
+    "built",
+    "built_object",
+    "built_result",
+    "artifacts",
+    "artifacts_raw",
+    "artifacts_type",
+    "results",
+    "outputs_logs",
+    "logs",
+    "result",
+    "state",
+)
+
+
+def checkpoint_key(flow_id: str, seq: int) -> str:
+    return f"{flow_id}:checkpoint:{seq}"
+
+
+@dataclass
+class GraphCheckpoint:
+    """一次增量检查点。
+
+    契约：`seq` 从 1 递增；`vertices` 只含自上次检查点以来完成的顶点。
+    """
+
+    seq: int
+    run_id: str
+    run_manager: dict[str, Any]
+    run_queue: list[str]
+    vertices: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+
+def _snapshot(value: Any) -> Any:
+    try:
+        return copy.deepcopy(value)
+    except Exception:  # noqa: BLE001
+        # 注意：无法复制的对象（如持有连接的 `built_object`）按引用保存，缓存后端同样无法序列化其内部状态。
+        return value
+
+
+def capture_vertex_state(vertex: Vertex) -> dict[str, Any]:
+    """同步复制顶点构建产出。
+
+    决策：捕获时深复制，而非按引用交给后台写入任务
+    问题：写入在锁外的后台任务中序列化，期间顶点可能被再次构建或修改，检查点不再是一致快照
+    方案：在调度锁内逐字段 `deepcopy`，写入任务只持有副本
+    代价：每个完成顶点多一次产出复制
+    重评：当缓存写入改为同步序列化为字节时去掉复制
+    """
+    state = vertex.__getstate__()
+    return {name: _snapshot(state.get(name)) for name in CHECKPOINT_VERTEX_FIELDS}
+
+
+def apply_vertex_state(vertex: Vertex, state: dict[str, Any]) -> None:
+    restored = vertex.__getstate__()
+    restored.update(state)
+    vertex.__setstate__(restored)
+
+
+def capture_checkpoint(graph: Graph, seq: int, vertex_ids: set[str]) -> GraphCheckpoint:
+    """在调度锁内调用：复制调度状态，避免写入期间被并发完成的顶点改写。"""
+    return GraphCheckpoint(
+        seq=seq,
+        run_id=graph._run_id,  # noqa: SLF001
+        run_manager=copy.deepcopy(graph.run_manager.to_dict()),
+        run_queue=list(graph._run_queue),  # noqa: SLF001
+        vertices={
+            vertex_id: capture_vertex_state(graph.vertex_map[vertex_id])
+            for vertex_id in vertex_ids
+            if vertex_id in graph.vertex_map
+        },
+    )
+
+
+def apply_checkpoint(graph: Graph, checkpoint: GraphCheckpoint) -> None:
+    """把单个增量叠加到图上；未知顶点（图结构已变化）直接跳过。"""
+    from lfx.graph.graph.runnable_vertices_manager import RunnableVerticesManager
+
+    graph.run_manager = RunnableVerticesManager.from_dict(checkpoint.run_manager)
+    graph.vertices_to_run = set(graph.run_manager.vertices_to_run)
+    graph._run_queue.clear()  # noqa: SLF001
+    graph._run_queue.extend(checkpoint.run_queue)  # noqa: SLF001
+    for vertex_id, state in checkpoint.vertices.items():
+        vertex = graph.vertex_map.get(vertex_id)
+        if vertex is not None:
+            apply_vertex_state(vertex, state)
+    graph._checkpoint_seq = checkpoint.seq  # noqa: SLF001
+
+
+async def restore_checkpoints(graph: Graph, get_cache: Callable[[str], Awaitable[Any]], base_key: str) -> int:
+    """从 `graph._checkpoint_seq + 1` 起按序回放缓存中的增量，返回回放条数。
+
+    契约：`get_cache` 与 `ChatService.get_cache` 同签名（返回 `{"result": ...}` 或 `CacheMiss`/`None`）。
+    失败语义：`run_id` 与图不一致的增量视为其他运行的残留，停止回放。
+    """
+    applied = 0
+    while True:
+        cached = await get_cache(checkpoint_key(base_key, graph._checkpoint_seq + 1))  # noqa: SLF001
+        if cached is None or isinstance(cached, CacheMiss):
+            return applied
+        checkpoint = cached.get("result") if isinstance(cached, dict) else cached
+        run_id = graph._run_id  # noqa: SLF001
+        if not isinstance(checkpoint, GraphCheckpoint) or (run_id and checkpoint.run_id != run_id):
+            return applied
+        apply_checkpoint(graph, checkpoint)
+        applied += 1
+
+
+async def delete_checkpoints(clear_cache: Callable[[str], Awaitable[Any]], base_key: str, last_seq: int) -> int:
+    """删除 `1..last_seq` 的增量检查点，返回删除失败的条数。
+
+    契约：`clear_cache` 与 `ChatService.clear_cache` 同签名；缺失的键视为已删除。
+    """
+    results = await asyncio.gather(
+        *(clear_cache(checkpoint_key(base_key, seq)) for seq in range(1, last_seq + 1)), return_exceptions=True
+    )
+    return sum(isinstance(result, Exception) for result in results)
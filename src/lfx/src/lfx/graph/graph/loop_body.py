@@ -0,0 +1,154 @@
+"""模块名称：Loop 循环体子图
+
+本模块识别 Loop 组件的循环体并把它构造成可独立运行的子图，供 Loop 并行模式按项扇出执行。
+使用场景：`LoopComponent.parallel_width > 1` 时，不再让每一项都绕调度器一圈，
+而是为每条并发通道构造一份循环体子图，按项注入输入、运行并读取回流到 Loop 的结果。
+主要功能包括：
+- `extract_loop_body`：从 `item` 输出出发、到回流 `item` 输入为止，求出循环体顶点与入口/出口
+- `build_loop_body_graph`：用父图的节点/边数据构造子图，并复用父图中已构建的外部前驱结果
+- `run_loop_body`：向子图入口注入单项数据，运行子图并返回出口结果
+
+注意事项：只有既能从 `item` 输出到达、又能到达回流边的顶点属于循环体；
+循环体中不回流到 Loop 的旁支（如逐项 ChatOutput）在并行模式下不会执行。
+"""
+
+from __future__ import annotations
+
+import copy
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from lfx.graph.graph.checkpoint import apply_vertex_state, capture_vertex_state
+from lfx.graph.vertex.base import VertexStates
+
+if TYPE_CHECKING:
+    from lfx.graph.graph.base import Graph
+
+LOOP_ITEM_OUTPUT = "item"
+
+
+@dataclass
+class LoopBody:
+    """循环体结构。
+
+    契约：`entries` 为 `(目标顶点, 目标参数)`，接收当前项；`exit` 为 `(源顶点, 输出名)`，其结果回流到 Loop。
+    `external_ids` 为循环体依赖的、位于循环体之外的前驱（不含 Loop 自身）。
+    """
+
+    loop_id: str
+    vertex_ids: set[str]
+    entries: list[tuple[str, str]]
+    exit: tuple[str, str]
+    external_ids: set[str] = field(default_factory=set)
+
+
+def _reachable(start: list[str], neighbors: dict[str, list[str]], blocked: str) -> set[str]:
+    seen: set[str] = set()
+    queue = deque(start)
+    while queue:
+        vertex_id = queue.popleft()
+        if vertex_id in seen or vertex_id == blocked:
+            continue
+        seen.add(vertex_id)
+        queue.extend(neighbors.get(vertex_id, []))
+    return seen
+
+
+def extract_loop_body(graph: Graph, loop_id: str) -> LoopBody:
+    """求出 Loop 顶点的循环体。
+
+    失败语义：`item` 输出未连接、缺少回流边或两者不连通时抛 `ValueError`。
+    """
+    entries = [
+        (edge.target_id, edge.target_param)
+        for edge in graph.edges
+        if edge.source_id == loop_id and edge.source_handle.name == LOOP_ITEM_OUTPUT
+    ]
+    feedback = next(
+        (
+            (edge.source_id, edge.source_handle.name)
+            for edge in graph.edges
+            if edge.target_id == loop_id and edge.target_param == LOOP_ITEM_OUTPUT
+        ),
+        None,
+    )
+    if not entries or feedback is None:
+        msg = f"Loop {loop_id} needs both its 'item' output and 'item' input connected to run in parallel"
+        raise ValueError(msg)
+
+    forward = _reachable([target_id for target_id, _ in entries], graph.successor_map, loop_id)
+    backward = _reachable([feedback[0]], graph.predecessor_map, loop_id)
+    vertex_ids = forward & backward
+    if feedback[0] not in vertex_ids:
+        msg = f"Loop {loop_id} feedback source {feedback[0]} is not reachable from its 'item' output"
+        raise ValueError(msg)
+
+    predecessors = [
+        predecessor_id for vertex_id in vertex_ids for predecessor_id in graph.predecessor_map.get(vertex_id, [])
+    ]
+    external_ids = _reachable(predecessors, graph.predecessor_map, loop_id) - vertex_ids
+    return LoopBody(
+        loop_id=loop_id,
+        vertex_ids=vertex_ids,
+        entries=[entry for entry in entries if entry[0] in vertex_ids],
+        exit=feedback,
+        external_ids=external_ids,
+    )
+
+
+def build_loop_body_graph(graph: Graph, body: LoopBody) -> Graph:
+    """用父图数据构造一份循环体子图。
+
+    关键路径（三步）：
+    1) 复制循环体与外部前驱的节点数据，保留两端都在子图内的边（Loop 的入边/出边随之去掉）
+    2) 继承父图的 flow/user/session、预编译组件类与单次运行准入控制器
+    3) 父图中已构建的外部前驱直接复制构建结果并冻结，子图运行时不再重复执行
+    注意：子图不启用追踪，避免每一项都开启一组 tracer。
+    """
+    from lfx.graph.graph.base import Graph
+
+    vertex_ids = body.vertex_ids | body.external_ids
+    nodes = [copy.deepcopy(node) for node in graph._vertices if node["id"] in vertex_ids]  # noqa: SLF001
+    edges = [
+        copy.deepcopy(edge)
+        for edge in graph._edges  # noqa: SLF001
+        if edge["source"] in vertex_ids and edge["target"] in vertex_ids
+    ]
+    subgraph = Graph(flow_id=graph.flow_id, flow_name=graph.flow_name, user_id=graph.user_id, context=graph.context)
+    subgraph.component_classes = graph.component_classes
+    subgraph.add_nodes_and_edges(nodes, edges)
+    subgraph.session_id = graph.session_id
+    subgraph.set_run_id(graph._run_id or None)  # noqa: SLF001
+    subgraph._admission_controller = graph.admission_controller  # noqa: SLF001
+    subgraph._tracing_service = None  # noqa: SLF001
+    subgraph._tracing_service_initialized = True  # noqa: SLF001
+
+    for vertex_id in body.external_ids:
+        parent_vertex = graph.get_vertex(vertex_id)
+        if parent_vertex.built:
+            vertex = subgraph.get_vertex(vertex_id)
+            apply_vertex_state(vertex, capture_vertex_state(parent_vertex))
+            vertex.frozen = True
+    return subgraph
+
+
+async def run_loop_body(subgraph: Graph, body: LoopBody, item: Any, *, fallback_to_env_vars: bool = False) -> Any:
+    """向子图入口注入 `item`，运行一次并返回出口结果。
+
+    契约：出口顶点未运行或被停用（如被条件路由排除）时返回 `None`。
+    注意：首次运行后把外部前驱冻结，同一子图处理后续项时只重跑循环体。
+    """
+    # 注意：组件实例跨项复用，先清掉上一项缓存在输出上的值，否则会直接返回旧结果。
+    subgraph._reset_all_output_values()  # noqa: SLF001
+    for vertex_id, param in body.entries:
+        subgraph.get_vertex(vertex_id).update_raw_params({param: item}, overwrite=True)
+    await subgraph.process(fallback_to_env_vars=fallback_to_env_vars)
+    for vertex_id in body.external_ids:
+        subgraph.get_vertex(vertex_id).frozen = True
+
+    exit_id, output_name = body.exit
+    exit_vertex = subgraph.get_vertex(exit_id)
+    if not exit_vertex.built or exit_vertex.state == VertexStates.INACTIVE:
+        return None
+    return exit_vertex.results.get(output_name)
@@ -6,9 +6,29 @@
 - 维护前驱/后继关系
 - 标记可运行、运行中与已运行的顶点
 - 处理循环顶点的可运行判定
+
+性能：前驱/后继均为集合邻接表，顶点完成时 `remove_from_predecessors` 只遍历其后继，
+成本 O(出度)；待完成前驱数即集合长度，判定可运行为 O(1)。
 """
 
 from collections import defaultdict
+from collections.abc import Iterable, Mapping
+
+
+class VertexIdSet(set):
+    """顶点 ID 集合，额外提供 list 风格的 `append`。
+
+    兼容：已保存 flow 内嵌的旧版 `LoopComponent` 代码以 `run_predecessors[id].append(...)`
+    改写依赖；该代码随 flow 持久化，无法随本模块升级，故保留 `append` 作为 `add` 的别名。
+    """
+
+    def append(self, vertex_id: str) -> None:
+        self.add(vertex_id)
+
+
+def _to_set_map(mapping: Mapping[str, Iterable[str]]) -> defaultdict[str, VertexIdSet]:
+    """复制为 `defaultdict(VertexIdSet)`；兼容旧版以 list 保存的序列化状态。"""
+    return defaultdict(VertexIdSet, {key: VertexIdSet(values) for key, values in mapping.items()})
 
 
 class RunnableVerticesManager:
@@ -16,9 +36,9 @@ class RunnableVerticesManager:
 
     def __init__(self) -> None:
         # 注意：run_map 记录“前驱 -> 可解锁的后继”，用于快速移除依赖。
-        self.run_map: dict[str, list[str]] = defaultdict(list)
-        # 注意：run_predecessors 记录“顶点 -> 未完成的前驱”，用于判定可运行。
-        self.run_predecessors: dict[str, list[str]] = defaultdict(list)
+        self.run_map: dict[str, VertexIdSet] = defaultdict(VertexIdSet)
+        # 注意：run_predecessors 记录“顶点 -> 未完成的前驱”，集合长度即待完成前驱数。
+        self.run_predecessors: dict[str, VertexIdSet] = defaultdict(VertexIdSet)
         # 注意：vertices_to_run 表示已满足前驱条件、待执行的顶点。
         self.vertices_to_run: set[str] = set()
         # 注意：vertices_being_run 表示当前执行中的顶点，避免重复调度。
@@ -42,8 +62,8 @@ class RunnableVerticesManager:
     def from_dict(cls, data: dict) -> "RunnableVerticesManager":
         """从 dict 反序列化运行状态。"""
         instance = cls()
-        instance.run_map = data["run_map"]
-        instance.run_predecessors = data["run_predecessors"]
+        instance.run_map = _to_set_map(data["run_map"])
+        instance.run_predecessors = _to_set_map(data["run_predecessors"])
         instance.vertices_to_run = data["vertices_to_run"]
         instance.vertices_being_run = data["vertices_being_run"]
         instance.ran_at_least_once = data.get("ran_at_least_once", set())
@@ -61,8 +81,8 @@ class RunnableVerticesManager:
 
     def __setstate__(self, state: dict) -> None:
         """pickle 反序列化入口。"""
-        self.run_map = state["run_map"]
-        self.run_predecessors = state["run_predecessors"]
+        self.run_map = _to_set_map(state["run_map"])
+        self.run_predecessors = _to_set_map(state["run_predecessors"])
         self.vertices_to_run = state["vertices_to_run"]
         self.vertices_being_run = state["vertices_being_run"]
         self.ran_at_least_once = state["ran_at_least_once"]
@@ -71,9 +91,9 @@ class RunnableVerticesManager:
         """判断是否所有顶点都无未完成前驱。"""
         return all(not value for value in self.run_predecessors.values())
 
-    def update_run_state(self, run_predecessors: dict, vertices_to_run: set) -> None:
+    def update_run_state(self, run_predecessors: Mapping[str, Iterable[str]], vertices_to_run: set) -> None:
         """更新前驱映射与可运行集合，并重建 run_map。"""
-        self.run_predecessors.update(run_predecessors)
+        self.run_predecessors.update(_to_set_map(run_predecessors))
         self.vertices_to_run.update(vertices_to_run)
         self.build_run_map(self.run_predecessors, self.vertices_to_run)
 
@@ -95,37 +115,36 @@ class RunnableVerticesManager:
         失败语义：前驱未满足时返回 False
         """
         # 注意：无待处理前驱时直接可运行。
-        pending = self.run_predecessors.get(vertex_id, [])
+        pending = self.run_predecessors.get(vertex_id)
         if not pending:
             return True
 
-        # 注意：循环顶点需避免互相等待造成死锁。
+        # 注意：循环顶点需避免互相等待造成死锁；已执行过一次时需等待所有前驱清空（此处 pending 非空）。
         if vertex_id in self.cycle_vertices:
-            pending_set = set(pending)
-            running_predecessors = pending_set & self.vertices_being_run
-
-            # 注意：循环顶点已执行过一次时，需等待所有前驱清空。
             if vertex_id in self.ran_at_least_once:
-                return not (pending_set or running_predecessors)
+                return False
 
             # 注意：首次执行的循环顶点，仅在 loop 且前驱均为循环顶点时放行。
-            return is_loop and pending_set <= self.cycle_vertices
+            return is_loop and pending <= self.cycle_vertices
         return False
 
     def remove_from_predecessors(self, vertex_id: str) -> None:
-        """从所有后继的前驱列表中移除当前顶点。"""
-        predecessors = self.run_map.get(vertex_id, [])
-        for predecessor in predecessors:
-            if vertex_id in self.run_predecessors[predecessor]:
-                self.run_predecessors[predecessor].remove(vertex_id)
-
-    def build_run_map(self, predecessor_map, vertices_to_run) -> None:
-        """构建“前驱 -> 后继”的可运行映射。"""
-        self.run_map = defaultdict(list)
+        """从所有后继的待完成前驱集合中移除当前顶点，成本 O(出度)。"""
+        for successor in self.run_map.get(vertex_id, ()):
+            pending = self.run_predecessors.get(successor)
+            if pending:
+                pending.discard(vertex_id)
+
+    def build_run_map(self, predecessor_map: Mapping[str, Iterable[str]], vertices_to_run) -> None:
+        """构建“前驱 -> 后继”的可运行映射。
+
+        注意：`run_predecessors` 为独立副本，运行期移除前驱不会改写图上的 `predecessor_map`。
+        """
+        self.run_map = defaultdict(VertexIdSet)
         for vertex_id, predecessors in predecessor_map.items():
             for predecessor in predecessors:
-                self.run_map[predecessor].append(vertex_id)
-        self.run_predecessors = predecessor_map.copy()
+                self.run_map[predecessor].add(vertex_id)
+        self.run_predecessors = _to_set_map(predecessor_map)
         self.vertices_to_run = vertices_to_run
 
     def update_vertex_run_state(self, vertex_id: str, *, is_runnable: bool) -> None:
@@ -0,0 +1,106 @@
+"""
+模块名称：单次运行的变量预取缓存
+
+本模块为一次图运行批量解析 `load_from_db` 变量，并在运行内复用解析结果。
+主要功能包括：
+- `collect_variable_names`：汇总图中所有顶点引用的变量名（普通字段与表格列）
+- `RunVariableCache`：首次取值时用一次批量查询加载全部变量，之后运行内直接命中
+
+关键组件：`RunVariableCache.get`
+设计背景：每个顶点、每个字段/表格单元各发一次 `SELECT` 并做一次 Fernet 解密，
+同一变量被多个组件引用时重复查询与解密。
+注意事项：缓存持有解密后的明文，只挂在图实例上且不参与序列化；新的 `run_id` 会重建缓存。
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+from lfx.log.logger import logger
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from lfx.graph.graph.base import Graph
+
+# 注意：与 `langflow.services.variable.constants.CREDENTIAL_TYPE` 保持一致。
+CREDENTIAL_TYPE = "Credential"
+
+
+def collect_variable_names(graph: Graph) -> set[str]:
+    """返回图中 `load_from_db` 字段与表格列引用的变量名，排除请求上下文已覆盖的变量。"""
+    names: set[str] = set()
+    for vertex in graph.vertices:
+        params = vertex.params or {}
+        for field in vertex.load_from_db_fields:
+            if field.startswith("table:"):
+                table_field_name = field[6:]
+                columns = params.get(f"{table_field_name}_load_from_db_columns") or []
+                for row in params.get(table_field_name) or []:
+                    if isinstance(row, dict):
+                        names.update(row[column] for column in columns if isinstance(row.get(column), str))
+            elif isinstance(params.get(field), str):
+                names.add(params[field])
+    names.discard("")
+    request_variables = graph.context.get("request_variables") or {}
+    return names - set(request_variables)
+
+
+class RunVariableCache:
+    """单次运行内的变量解析缓存。
+
+    契约：
+    - `get` 的返回值与异常与 `variable_service.get_variable` 一致（凭据用于 `session_id` 字段抛 `TypeError`）。
+    - 变量服务不提供 `get_variables_by_names`、用户不一致、变量名不在预取集合内或批量结果缺失该变量时，
+      回退逐个查询。
+
+    关键路径（三步）：
+    1) 首次 `get` 加锁，调用一次 `get_variables_by_names` 取回全部变量（类型 + 解密值）
+    2) 并发构建的顶点等待同一次加载
+    3) 之后的 `get` 只查字典
+    """
+
+    def __init__(self, run_id: str, names: set[str]) -> None:
+        self.run_id = run_id
+        self.names = names
+        self._values: dict[str, tuple[str | None, str]] = {}
+        self._user_id: UUID | None = None
+        self._loaded = False
+        self._lock: asyncio.Lock | None = None
+        self.hits = 0
+        self.fallbacks = 0
+
+    async def _load(self, variable_service: Any, user_id: UUID, session: Any) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._loaded:
+                return
+            self._values = await variable_service.get_variables_by_names(
+                user_id=user_id, names=sorted(self.names), session=session
+            )
+            self._user_id = user_id
+            self._loaded = True
+            logger.debug(f"Prefetched {len(self._values)}/{len(self.names)} variables for run {self.run_id}")
+
+    async def get(self, variable_service: Any, *, user_id: UUID, name: str, field: str, session: Any) -> str:
+        bulk = getattr(variable_service, "get_variables_by_names", None)
+        if bulk is None or name not in self.names or (self._loaded and self._user_id != user_id):
+            self.fallbacks += 1
+            return await variable_service.get_variable(user_id=user_id, name=name, field=field, session=session)
+        if not self._loaded:
+            await self._load(variable_service, user_id, session)
+        if name not in self._values:
+            # 注意：批量结果只含成功解析的变量；缺失或解密失败的变量逐个查询，以保留原有异常。
+            self.fallbacks += 1
+            return await variable_service.get_variable(user_id=user_id, name=name, field=field, session=session)
+        self.hits += 1
+        variable_type, value = self._values[name]
+        if variable_type == CREDENTIAL_TYPE and field == "session_id":
+            msg = (
+                f"variable {name} of type 'Credential' cannot be used in a Session ID field "
+                "because its purpose is to prevent the exposure of values."
+            )
+            raise TypeError(msg)
+        return value
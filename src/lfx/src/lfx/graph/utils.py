@@ -262,6 +262,10 @@ async def log_vertex_build(
             if db_service is None:
                 return
 
+            # 注意：开启 `db_write_behind` 时交由后写缓冲批量写入与周期裁剪。
+            if db_service.enqueue_vertex_build(vertex_build):
+                return
+
             async with db_service._with_session() as session:  # noqa: SLF001
                 await crud_log_vertex_build(session, vertex_build)
 
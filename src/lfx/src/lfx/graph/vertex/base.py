@@ -31,6 +31,7 @@ from ag_ui.core import StepFinishedEvent, StepStartedEvent
 
 from lfx.events.observability.lifecycle_events import observable
 from lfx.exceptions.component import ComponentBuildError
+from lfx.graph.admission import admit_component
 from lfx.graph.schema import INPUT_COMPONENTS, OUTPUT_COMPONENTS, InterfaceComponentTypes, ResultData
 from lfx.graph.utils import UnbuiltObject, UnbuiltResult, log_transaction
 from lfx.graph.vertex.param_handler import ParameterHandler
@@ -440,8 +441,15 @@ class Vertex:
             self.custom_component, _ = initialize.loading.instantiate_class(
                 user_id=user_id,
                 vertex=self,
+                class_object=self._precompiled_component_class(),
             )
 
+    def _precompiled_component_class(self) -> type | None:
+        """返回图上注入的预编译组件类；未注入时返回 None，由调用方编译 `code`。"""
+        if self.graph is None:
+            return None
+        return self.graph.component_classes.get(self.id)
+
     @observable
     async def _build(
         self,
@@ -467,7 +475,10 @@ class Vertex:
 
         if not self.custom_component:
             custom_component, custom_params = initialize.loading.instantiate_class(
-                user_id=user_id, vertex=self, event_manager=event_manager
+                user_id=user_id,
+                vertex=self,
+                event_manager=event_manager,
+                class_object=self._precompiled_component_class(),
             )
         else:
             custom_component = self.custom_component
@@ -475,12 +486,14 @@ class Vertex:
                 self.custom_component.set_event_manager(event_manager)
             custom_params = initialize.loading.get_params(self.params)
 
-        await self._build_results(
-            custom_component=custom_component,
-            custom_params=custom_params,
-            fallback_to_env_vars=fallback_to_env_vars,
-            base_type=self.base_type,
-        )
+        # 注意：依赖已在上方构建完成，只对组件自身执行申请配额，递归构建不会占用槽位。
+        async with admit_component(self.graph, custom_component):
+            await self._build_results(
+                custom_component=custom_component,
+                custom_params=custom_params,
+                fallback_to_env_vars=fallback_to_env_vars,
+                base_type=self.base_type,
+            )
 
         self._validate_built_object()
 
@@ -741,6 +754,24 @@ class Vertex:
         self.steps_ran = []
         self.build_params()
 
+    def reset_run_state(self) -> None:
+        """清空运行结果、日志与输入覆盖，并按节点数据重建参数（供 `Graph.reset_run_state` 使用）。"""
+        # 注意：输入覆盖会令 `build_params` 直接返回，需先清除标记。
+        self.updated_raw_params = False
+        self._reset()
+        self.state = VertexStates.ACTIVE
+        self.result = None
+        self.results = {}
+        self.outputs_logs = {}
+        self.logs = {}
+        self.artifacts_raw = {}
+        self.artifacts_type = {}
+        self.build_times = []
+        self.layer = None
+        self.task_id = None
+        if self.custom_component is not None and hasattr(self.custom_component, "reset_run_state"):
+            self.custom_component.reset_run_state()
+
     def _is_chat_input(self) -> bool:
         """是否为聊天输入节点（基类默认 False）。"""
         return False
@@ -0,0 +1,213 @@
+"""
+模块名称：内存映射组件索引
+
+本模块提供可按组件懒解码的二进制组件索引格式（`.lfxi`），主要用于降低启动耗时与每个 worker 的常驻内存。
+主要功能包括：
+- 把 `{类别: {组件名: 模板}}` 写为“紧凑头部 + 逐组件 JSON 块”的索引文件
+- 以 `mmap` 打开索引，启动时只解析头部（类别 → 组件 → 偏移表）
+- `LazyComponentCategory`：按组件首次访问时才解码模板的类别映射
+
+关键组件：`write_packed_index` / `PackedComponentIndex` / `LazyComponentCategory`
+设计背景：JSON 索引约 4 MB，每个 worker 启动时都要整体 `orjson.loads` 并重新序列化校验 SHA，
+解码后的模板常驻约 13 MB 的 Python 对象，而多数组件在进程生命周期内从未被访问。
+使用场景：`lazy_component_index=True` 时由 `lfx.interface.components` 使用。
+注意事项：文件布局为 `MAGIC | u64 头部长度 | 32 字节 SHA256 | 头部 JSON | 组件块`，
+SHA256 覆盖头部与全部组件块；映射为只读共享页，fork 出的 worker 共享页缓存。
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import mmap
+import os
+import struct
+from collections.abc import Iterator, MutableMapping
+from typing import TYPE_CHECKING, Any
+
+import orjson
+
+from lfx.log.logger import logger
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+MAGIC = b"LFXIDX1\0"
+_HEADER_LENGTH = struct.Struct("<Q")
+_DIGEST_SIZE = 32
+_PREAMBLE_SIZE = len(MAGIC) + _HEADER_LENGTH.size + _DIGEST_SIZE
+
+
+def write_packed_index(
+    modules_dict: dict[str, Any],
+    path: Path,
+    *,
+    version: str,
+    fingerprint: str | None = None,
+    metadata: dict[str, Any] | None = None,
+) -> None:
+    """把组件字典写为 `.lfxi` 索引。
+
+    契约：原子写入（临时文件 + `os.replace`）；`fingerprint` 标识索引来源，读取端据此判断缓存是否过期。
+    失败语义：写入失败抛 `OSError`，由调用方决定是否忽略。
+    """
+    blobs = bytearray()
+    categories: dict[str, dict[str, list[int]]] = {}
+    for category, components in modules_dict.items():
+        offsets = categories.setdefault(category, {})
+        for name in components:
+            blob = orjson.dumps(components[name])
+            offsets[name] = [len(blobs), len(blob)]
+            blobs += blob
+    header = orjson.dumps(
+        {
+            "version": version,
+            "fingerprint": fingerprint,
+            "metadata": {
+                "num_modules": len(categories),
+                "num_components": sum(len(offsets) for offsets in categories.values()),
+                **(metadata or {}),
+            },
+            "categories": categories,
+        }
+    )
+    digest = hashlib.sha256(header)
+    digest.update(blobs)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("wb") as handle:
+        handle.write(MAGIC)
+        handle.write(_HEADER_LENGTH.pack(len(header)))
+        handle.write(digest.digest())
+        handle.write(header)
+        handle.write(blobs)
+    tmp_path.replace(path)
+
+
+class PackedComponentIndex:
+    """只读映射的组件索引。
+
+    契约：`open` 校验魔数与 SHA256，失败返回 `None`；`load(category, name)` 每次调用都重新解码
+    （缓存由 `LazyComponentCategory` 负责）。
+    决策：校验时对映射区域直接做 SHA256，而非解码后重新序列化
+    问题：JSON 索引的校验需要完整解码再按排序键重新序列化，成本与解码相当
+    方案：哈希原始字节，启动期只解码头部
+    代价：索引与 JSON 索引的哈希不可互相验证
+    重评：当索引改为签名校验时替换为签名验证
+    """
+
+    def __init__(self, path: Path, mapped: mmap.mmap, header: dict[str, Any], blobs_start: int) -> None:
+        self.path = path
+        self._mmap = mapped
+        self._blobs_start = blobs_start
+        self.version: str | None = header.get("version")
+        self.fingerprint: str | None = header.get("fingerprint")
+        self.metadata: dict[str, Any] = header.get("metadata") or {}
+        self.categories: dict[str, dict[str, list[int]]] = header.get("categories") or {}
+
+    @classmethod
+    def open(cls, path: Path) -> PackedComponentIndex | None:
+        """打开并校验索引文件；文件不存在、格式不符或校验失败时返回 `None`。"""
+        try:
+            with path.open("rb") as handle:
+                mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as exc:
+            # 注意：空文件无法映射（`ValueError`）。
+            logger.debug(f"Cannot map component index {path}: {exc}")
+            return None
+        try:
+            if len(mapped) < _PREAMBLE_SIZE or mapped[: len(MAGIC)] != MAGIC:
+                logger.warning(f"Component index {path} has an unknown format")
+                mapped.close()
+                return None
+            (header_length,) = _HEADER_LENGTH.unpack_from(mapped, len(MAGIC))
+            expected = mapped[len(MAGIC) + _HEADER_LENGTH.size : _PREAMBLE_SIZE]
+            blobs_start = _PREAMBLE_SIZE + header_length
+            view = memoryview(mapped)
+            try:
+                actual = hashlib.sha256(view[_PREAMBLE_SIZE:]).digest()
+            finally:
+                view.release()
+            if actual != expected or blobs_start > len(mapped):
+                logger.warning(f"Component index {path} integrity check failed - SHA256 mismatch")
+                mapped.close()
+                return None
+            header = orjson.loads(mapped[_PREAMBLE_SIZE:blobs_start])
+        except (orjson.JSONDecodeError, struct.error) as exc:
+            logger.warning(f"Component index {path} is corrupted: {exc}")
+            mapped.close()
+            return None
+        return cls(path, mapped, header, blobs_start)
+
+    def __contains__(self, category: object) -> bool:
+        return category in self.categories
+
+    def load(self, category: str, name: str) -> dict[str, Any]:
+        """解码单个组件模板。"""
+        offset, length = self.categories[category][name]
+        start = self._blobs_start + offset
+        return orjson.loads(self._mmap[start : start + length])
+
+    def lazy_modules(self) -> dict[str, LazyComponentCategory]:
+        """返回 `{类别: LazyComponentCategory}`，模板在首次访问时解码。"""
+        return {category: LazyComponentCategory(self, category) for category in self.categories}
+
+
+class LazyComponentCategory(MutableMapping):
+    """单个类别下按需解码的组件模板映射。
+
+    契约：键集合来自索引头部；`[name]`/`get`/`items` 首次访问某组件时解码并缓存；
+    写入与删除只影响本进程内的覆盖层，不修改索引文件。
+    注意：不是 `dict` 子类；需要 `dict` 的调用方应使用 `Mapping` 判断或 `dict(category)` 物化。
+    """
+
+    def __init__(self, index: PackedComponentIndex, category: str) -> None:
+        self._index = index
+        self._category = category
+        # 注意：以 `dict` 作为有序集合保存当前键，写入/删除后与索引头部脱钩。
+        self._names: dict[str, None] = dict.fromkeys(index.categories.get(category, {}))
+        self._decoded: dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self._decoded:
+            return self._decoded[name]
+        if name not in self._names:
+            raise KeyError(name)
+        value = self._decoded[name] = self._index.load(self._category, name)
+        return value
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        self._names[name] = None
+        self._decoded[name] = value
+
+    def __delitem__(self, name: str) -> None:
+        del self._names[name]
+        self._decoded.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._names))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        return f"LazyComponentCategory({self._category!r}, {len(self._names)} components, {len(self._decoded)} decoded)"
+
+    @property
+    def decoded_count(self) -> int:
+        """已解码的组件数（排障用）。"""
+        return len(self._decoded)
+
+    def __copy__(self) -> dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        return {name: copy.deepcopy(value, memo) for name, value in self.items()}
+
+    def __reduce__(self):
+        # 注意：`mmap` 不可序列化，跨进程传递时物化为普通 `dict`。
+        return (dict, (dict(self),))
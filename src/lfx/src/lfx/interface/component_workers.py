@@ -0,0 +1,306 @@
+"""
+模块名称：组件模块进程池加载
+
+本模块在子进程中导入组件模块并构建模板，主要用于加速开发模式（`LFX_DEV`）与无索引时的动态加载。
+主要功能包括：
+- 把模块名分片到多个子进程，子进程返回序列化后的模板字典
+- 按模块记录文件 `mtime`/大小/内容哈希，以及所在组件包（含其引用的其他组件包）的指纹，
+  未变化的模块在下次启动时直接复用缓存模板
+
+关键组件：`ModuleTemplateCache` / `load_modules_in_processes`
+设计背景：导入模块与实例化组件受 GIL 约束，`asyncio.to_thread` 并发几乎没有实际并行度，
+全量动态加载数百个组件模块耗时较长。
+使用场景：`component_loader_workers > 0` 时由 `lfx.interface.components._load_components_dynamically` 使用。
+注意事项：子进程以 `spawn` 方式启动，避免在已有线程与事件循环的进程中 `fork`；
+模板经 JSON 序列化传回，无法序列化的模块在父进程中回退为线程内加载。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from lfx.log.logger import logger
+
+# 注意：每个 worker 分到的平均分片数；分片更小时慢模块对整体耗时的影响更小。
+SHARDS_PER_WORKER = 4
+CACHE_FORMAT_VERSION = 2
+COMPONENTS_PREFIX = "lfx.components."
+_PACKAGE_REFERENCE = re.compile(rb"lfx\.components\.(\w+)")
+
+
+def _file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _components_root() -> Path:
+    import lfx
+
+    return Path(lfx.__file__).parent / "components"
+
+
+def _package_files(package_dir: Path) -> list[Path]:
+    return sorted(path for path in package_dir.rglob("*.py") if "__pycache__" not in path.parts)
+
+
+def shared_fingerprint() -> str:
+    """返回组件包之外 `lfx` 源码的指纹。
+
+    契约：包含解释器版本与 `lfx` 包内除 `lfx/components/*/` 组件包外全部 `.py` 文件的路径、大小与 `mtime`
+    （`lfx/components` 下的顶层文件如 `_importing.py` 计入）。
+    决策：基类、输入与模板构建代码变化时整体作废模块缓存
+    问题：组件模板依赖 `lfx.base`/`lfx.inputs`/`lfx.template` 等模块，仅比较组件文件本身会复用过期模板
+    方案：对共享源码做一次 `stat` 汇总（不读取内容）
+    代价：修改任一共享模块都会触发全量重建
+    重评：当能够追踪模块级导入依赖时改为按依赖作废
+    """
+    import lfx
+
+    root = Path(lfx.__file__).parent
+    components_dir = root / "components"
+    digest = hashlib.sha256(f"{CACHE_FORMAT_VERSION}:{sys.version}".encode())
+    for dirpath, dirnames, filenames in os.walk(root):
+        current = Path(dirpath)
+        if current == components_dir:
+            # 注意：组件包按包单独记录指纹（见 `ModuleTemplateCache`），此处只计入顶层文件。
+            dirnames.clear()
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if not filename.endswith(".py"):
+                continue
+            try:
+                stat = (current / filename).stat()
+            except OSError:
+                continue
+            digest.update(f"{current / filename}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+class ModuleTemplateCache:
+    """按模块缓存的组件模板。
+
+    契约：
+    - `get(modname, path)` 在文件未变化时返回缓存的 `(top_level, components)`，否则返回 `None`。
+    - `put` 记录模块结果；`save` 在有变更时原子写回缓存文件。
+    - 失败语义：缓存文件缺失、损坏或指纹不符时视为空缓存；写入失败仅记录日志。
+
+    决策：先比较 `mtime_ns` 与大小，不一致时再比较内容哈希
+    问题：切换分支或重新检出会更新 `mtime`，但多数文件内容不变
+    方案：`mtime`/大小命中直接复用；否则读取文件计算 SHA256，哈希一致仍复用并更新 `mtime`
+    代价：`mtime` 变化的文件需要一次完整读取
+    重评：当缓存文件过大影响启动时改为按模块分文件存储
+
+    决策：`lfx.components.<pkg>` 下的模块同时以组件包指纹为键
+    问题：组件常从同包或其他组件包的辅助模块导入代码，只比较模块自身文件会在辅助模块修改后复用过期模板
+    方案：`put` 时扫描组件包源码中的 `lfx.components.<pkg>` 引用并求传递闭包，记录闭包内每个包的指纹；
+    包指纹同样先比较 `stat` 汇总，不一致时再比较内容哈希
+    代价：修改辅助模块会使引用该包的全部模块重建；以 `from lfx.components import pkg` 形式的引用不会被识别
+    """
+
+    def __init__(self, path: Path, fingerprint: str, components_root: Path | None = None) -> None:
+        self.path = path
+        self.fingerprint = fingerprint
+        self.components_root = components_root if components_root is not None else _components_root()
+        self._modules: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+        self.hits = 0
+        # 注意：包的 `stat` 汇总、内容哈希与引用关系在一次加载内不变，按包记忆。
+        self._package_stats: dict[str, str] = {}
+        self._package_digests: dict[str, str] = {}
+        self._package_references: dict[str, set[str]] = {}
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: str, components_root: Path | None = None) -> ModuleTemplateCache:
+        cache = cls(path, fingerprint, components_root)
+        try:
+            data = orjson.loads(path.read_bytes())
+        except FileNotFoundError:
+            return cache
+        except (OSError, orjson.JSONDecodeError) as exc:
+            logger.debug(f"Ignoring unreadable component module cache {path}: {exc}")
+            return cache
+        if isinstance(data, dict) and data.get("fingerprint") == fingerprint:
+            cache._modules = data.get("modules") or {}
+        return cache
+
+    def get(self, modname: str, path: Path | None) -> tuple[str, dict] | None:
+        entry = self._modules.get(modname)
+        if entry is None or path is None:
+            return None
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        if entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            if entry["size"] != stat.st_size or entry["sha256"] != _file_digest(path):
+                return None
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self._dirty = True
+        for package, (stat_digest, content_digest) in entry["packages"].items():
+            current = self._package_stat(package)
+            if current == stat_digest:
+                continue
+            if current is None or self._package_digest(package) != content_digest:
+                return None
+            entry["packages"][package] = [current, content_digest]
+            self._dirty = True
+        self.hits += 1
+        return entry["top_level"], entry["components"]
+
+    def put(self, modname: str, path: Path | None, result: tuple[str, dict]) -> None:
+        if path is None:
+            return
+        try:
+            stat = path.stat()
+            sha256 = _file_digest(path)
+        except OSError:
+            return
+        packages = {}
+        for package in self._package_closure(modname):
+            stat_digest = self._package_stat(package)
+            if stat_digest is None:
+                continue
+            packages[package] = [stat_digest, self._package_digest(package)]
+        top_level, components = result
+        self._modules[modname] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": sha256,
+            "packages": packages,
+            "top_level": top_level,
+            "components": components,
+        }
+        self._dirty = True
+
+    def _package_stat(self, package: str) -> str | None:
+        """返回组件包内 `.py` 文件路径、大小与 `mtime` 的汇总；包不存在时返回 None。"""
+        if package not in self._package_stats:
+            package_dir = self.components_root / package
+            if not package_dir.is_dir():
+                return None
+            digest = hashlib.sha256()
+            for file in _package_files(package_dir):
+                try:
+                    stat = file.stat()
+                except OSError:
+                    continue
+                digest.update(f"{file}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+            self._package_stats[package] = digest.hexdigest()
+        return self._package_stats[package]
+
+    def _read_package(self, package: str) -> None:
+        digest = hashlib.sha256()
+        references: set[str] = set()
+        package_dir = self.components_root / package
+        for file in _package_files(package_dir):
+            try:
+                content = file.read_bytes()
+            except OSError:
+                continue
+            digest.update(f"{file.relative_to(package_dir)}\n".encode())
+            digest.update(hashlib.sha256(content).digest())
+            references.update(name.decode() for name in _PACKAGE_REFERENCE.findall(content))
+        self._package_digests[package] = digest.hexdigest()
+        self._package_references[package] = references
+
+    def _package_digest(self, package: str) -> str:
+        if package not in self._package_digests:
+            self._read_package(package)
+        return self._package_digests[package]
+
+    def _package_closure(self, modname: str) -> set[str]:
+        """返回模块所在组件包及其直接或间接引用的组件包。"""
+        if not modname.startswith(COMPONENTS_PREFIX):
+            return set()
+        closure: set[str] = set()
+        stack = [modname[len(COMPONENTS_PREFIX) :].partition(".")[0]]
+        while stack:
+            package = stack.pop()
+            if package in closure or self._package_stat(package) is None:
+                continue
+            closure.add(package)
+            if package not in self._package_references:
+                self._read_package(package)
+            stack.extend(self._package_references[package] - closure)
+        return closure
+
+    def prune(self, modnames: set[str]) -> None:
+        """删除已不存在的模块（仅在全量加载后调用）。"""
+        for modname in set(self._modules) - modnames:
+            del self._modules[modname]
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(orjson.dumps({"fingerprint": self.fingerprint, "modules": self._modules}))
+            tmp_path.replace(self.path)
+            self._dirty = False
+        except (OSError, TypeError) as exc:
+            logger.debug(f"Failed to save component module cache: {exc}")
+
+
+def _process_module_shard(modnames: list[str]) -> list[tuple[str, bytes | None]]:
+    """子进程入口：处理一组模块，返回 `(modname, JSON 序列化的结果)`。
+
+    失败语义：导入失败的模块返回 `b"null"`；结果无法序列化时返回 `None`，由父进程回退处理。
+    """
+    # 注意：延迟导入，`lfx.interface.components` 依赖本模块。
+    from lfx.interface.components import _process_single_module
+
+    results: list[tuple[str, bytes | None]] = []
+    for modname in modnames:
+        result = _process_single_module(modname)
+        try:
+            results.append((modname, orjson.dumps(result)))
+        except TypeError:
+            results.append((modname, None))
+    return results
+
+
+def _shard(modnames: list[str], shards: int) -> list[list[str]]:
+    # 注意：轮转分配，使同一目录（通常依赖相同第三方库）的模块分散到不同分片。
+    return [modnames[i::shards] for i in range(shards) if modnames[i::shards]]
+
+
+async def load_modules_in_processes(modnames: list[str], workers: int) -> dict[str, tuple[str, dict] | None]:
+    """在进程池中处理模块，返回 `{modname: (top_level, components) | None}`。
+
+    契约：返回值缺少的模块（序列化失败或进程池异常）由调用方在本进程内回退处理。
+    失败语义：分片失败或进程池崩溃（`BrokenProcessPool`）时记录告警并返回已完成部分，不抛异常。
+    """
+    results: dict[str, tuple[str, dict] | None] = {}
+    if not modnames:
+        return results
+    workers = min(workers, len(modnames))
+    shards = _shard(modnames, workers * SHARDS_PER_WORKER)
+    loop = asyncio.get_running_loop()
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+    try:
+        futures = [loop.run_in_executor(executor, _process_module_shard, shard) for shard in shards]
+        for outcome in await asyncio.gather(*futures, return_exceptions=True):
+            if isinstance(outcome, BaseException):
+                if not isinstance(outcome, Exception):
+                    raise outcome
+                await logger.awarning(f"Component loader shard failed, falling back to threads: {outcome!r}")
+                continue
+            for modname, payload in outcome:
+                if payload is None:
+                    continue
+                result = orjson.loads(payload)
+                results[modname] = tuple(result) if result else None
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
@@ -3,7 +3,8 @@
 
 本模块提供组件索引读取、动态扫描加载、缓存与遥测上报等能力，主要用于提升启动速度并支持开发模式热更新。主要功能包括：
 - 读取预构建组件索引并进行完整性校验
-- 在开发模式下按模块动态加载组件
+- 可选读取内存映射的 `.lfxi` 索引，组件模板在首次访问时才解码
+- 在开发模式下按模块动态加载组件（可选进程池并按模块缓存模板）
 - 管理组件缓存并按需加载元数据或完整模板
 - 发送组件加载指标到遥测服务
 
@@ -15,7 +16,8 @@
 
 设计背景：组件数量较多，需在生产环境优先使用索引以降低启动耗时。
 使用场景：服务启动、组件索引更新、开发调试与自定义组件加载。
-注意事项：索引需通过 SHA256 校验；开发模式会绕过索引以反映实时代码变化。
+注意事项：索引需通过 SHA256 校验；开发模式会绕过索引以反映实时代码变化；
+`lazy_component_index=True` 时组件字典的类别值为 `LazyComponentCategory`（`Mapping`，非 `dict`）。
 """
 
 import asyncio
@@ -33,6 +35,8 @@ import orjson
 
 from lfx.constants import BASE_COMPONENTS_PATH
 from lfx.custom.utils import abuild_custom_components, create_component_template
+from lfx.interface.component_index import PackedComponentIndex, write_packed_index
+from lfx.interface.component_workers import ModuleTemplateCache, load_modules_in_processes, shared_fingerprint
 from lfx.log.logger import logger
 from lfx.utils.validate_cloud import (
     filter_disabled_components_from_dict,
@@ -70,6 +74,21 @@ class ComponentCache:
         """
         self.all_types_dict: dict[str, Any] | None = None
         self.fully_loaded_components: dict[str, bool] = {}
+        # 注意：组件字典重建或原地修改时递增，派生缓存（如 `/api/v1/all` 的预压缩响应）据此判断是否过期。
+        self.version = 0
+
+    def mark_modified(self) -> None:
+        """标记组件字典已变化（重建或原地替换组件模板后调用）。"""
+        self.version += 1
+
+    def invalidate(self) -> None:
+        """丢弃组件字典，下次 `get_and_cache_all_types_dict` 时重新加载。
+
+        契约：自定义组件目录或 bundle 变化后调用；派生缓存随 `version` 递增一并失效。
+        """
+        self.all_types_dict = None
+        self.fully_loaded_components.clear()
+        self.mark_modified()
 
 
 # 注意：单例缓存实例。
@@ -123,8 +142,6 @@ def _read_component_index(custom_path: str | None = None) -> dict | None:
     重评：当索引引入签名机制或更严格校验时替换。
     """
     try:
-        import lfx
-
         # 实现：优先使用自定义索引路径或 URL。
         if custom_path:
             # 注意：仅支持 http/https 远程索引。
@@ -155,8 +172,7 @@ def _read_component_index(custom_path: str | None = None) -> dict | None:
                     return None
         else:
             # 实现：默认使用内置索引文件。
-            pkg_dir = Path(inspect.getfile(lfx)).parent
-            index_path = pkg_dir / "_assets" / "component_index.json"
+            index_path = _builtin_index_path()
 
             if not index_path.exists():
                 return None
@@ -267,6 +283,88 @@ def _save_generated_index(modules_dict: dict) -> None:
         logger.debug(f"Failed to save generated index to cache: {e}")
 
 
+def _builtin_index_path(suffix: str = ".json") -> Path:
+    """返回内置组件索引路径（`suffix` 为 `.json` 或 `.lfxi`）。"""
+    import lfx
+
+    return Path(inspect.getfile(lfx)).parent / "_assets" / f"component_index{suffix}"
+
+
+def _lazy_index_enabled(settings_service: Optional["SettingsService"]) -> bool:
+    return settings_service is not None and settings_service.settings.lazy_component_index
+
+
+def _index_fingerprint(custom_path: str | None) -> str:
+    """标识 `.lfxi` 缓存的来源：JSON 索引的路径、大小与修改时间；没有 JSON 索引时为 `dynamic`。"""
+    if custom_path and custom_path.startswith(("http://", "https://")):
+        return custom_path
+    source = Path(custom_path) if custom_path else _builtin_index_path()
+    try:
+        stat = source.stat()
+    except OSError:
+        return "dynamic"
+    return f"{source.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _load_packed_index(custom_path: str | None = None) -> PackedComponentIndex | None:
+    """按顺序查找可用的 `.lfxi` 索引：自定义路径 → 内置 → 用户缓存。
+
+    契约：版本需与已安装 langflow 一致；用户缓存还需 `fingerprint` 与当前 JSON 索引来源一致。
+    失败语义：全部不可用时返回 `None`，由调用方回退到 JSON 索引。
+    决策：缓存以来源文件的大小与修改时间判断过期，而非内容哈希
+    问题：读取 JSON 索引计算哈希会抵消懒加载的收益
+    方案：只 `stat` 来源文件
+    代价：内容变化但大小与时间不变时不会重建（例如回滚到同尺寸文件并保留时间戳）
+    重评：当索引构建流水线直接产出 `.lfxi` 时移除用户缓存
+    """
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        installed_version = version("langflow")
+    except PackageNotFoundError:
+        return None
+
+    candidates: list[tuple[Path, str | None]] = []
+    if custom_path:
+        if custom_path.endswith(".lfxi"):
+            candidates.append((Path(custom_path), None))
+    else:
+        candidates.append((_builtin_index_path(".lfxi"), None))
+    try:
+        candidates.append((_get_cache_path().with_suffix(".lfxi"), _index_fingerprint(custom_path)))
+    except Exception as e:  # noqa: BLE001
+        logger.debug(f"Packed index cache unavailable: {e}")
+
+    for path, fingerprint in candidates:
+        if not path.exists():
+            continue
+        index = PackedComponentIndex.open(path)
+        if index is None:
+            continue
+        if index.version != installed_version or (fingerprint is not None and index.fingerprint != fingerprint):
+            logger.debug(f"Packed component index {path} is stale, ignoring")
+            continue
+        return index
+    return None
+
+
+def _save_packed_index(modules_dict: dict, custom_path: str | None = None) -> None:
+    """把已加载的组件字典写入用户缓存的 `.lfxi` 索引，供下次启动懒加载。
+
+    失败语义：写入失败仅记录日志，不影响主流程。
+    """
+    try:
+        from importlib.metadata import version
+
+        cache_path = _get_cache_path().with_suffix(".lfxi")
+        write_packed_index(
+            modules_dict, cache_path, version=version("langflow"), fingerprint=_index_fingerprint(custom_path)
+        )
+        logger.debug(f"Saved packed component index to cache: {cache_path}")
+    except Exception as e:  # noqa: BLE001
+        logger.debug(f"Failed to save packed component index: {e}")
+
+
 async def _send_telemetry(
     telemetry_service: Any,
     index_source: str,
@@ -320,7 +418,7 @@ async def _load_from_index_or_cache(
 ) -> tuple[dict[str, Any], str | None]:
     """从预构建索引或缓存加载组件字典。
 
-    契约：返回 `(modules_dict, index_source)`；`index_source` 为 `builtin`/`cache`/`None`。
+    契约：返回 `(modules_dict, index_source)`；`index_source` 为 `packed`/`builtin`/`cache`/`None`。
     副作用：可能读取文件或远程索引。
     关键路径（三步）：1) 读取内置/自定义索引 2) 失败则尝试缓存 3) 过滤禁用组件。
     失败语义：无法加载时返回空字典与 None。
@@ -338,6 +436,15 @@ async def _load_from_index_or_cache(
         custom_index_path = settings_service.settings.components_index_path
         await logger.adebug(f"Using custom component index: {custom_index_path}")
 
+    # 性能：开启懒加载时优先使用内存映射索引，只解码头部，模板在首次访问时解码。
+    lazy_index = _lazy_index_enabled(settings_service)
+    if lazy_index:
+        packed = _load_packed_index(custom_index_path)
+        if packed is not None:
+            await logger.adebug(f"Loading components lazily from packed index {packed.path}")
+            modules_dict = filter_disabled_components_from_dict(packed.lazy_modules())
+            return modules_dict, "packed"
+
     index = _read_component_index(custom_index_path)
     if index and "entries" in index:
         source = custom_index_path or "built-in index"
@@ -347,6 +454,8 @@ async def _load_from_index_or_cache(
             if top_level not in modules_dict:
                 modules_dict[top_level] = {}
             modules_dict[top_level].update(components)
+        if lazy_index:
+            _save_packed_index(modules_dict, custom_index_path)
         # 注意：过滤 Astra Cloud 禁用组件。
         modules_dict = filter_disabled_components_from_dict(modules_dict)
         await logger.adebug(f"Loaded {len(modules_dict)} component categories from index")
@@ -368,6 +477,8 @@ async def _load_from_index_or_cache(
                     if top_level not in modules_dict:
                         modules_dict[top_level] = {}
                     modules_dict[top_level].update(components)
+                if lazy_index:
+                    _save_packed_index(modules_dict, custom_index_path)
                 # 注意：过滤 Astra Cloud 禁用组件。
                 modules_dict = filter_disabled_components_from_dict(modules_dict)
                 await logger.adebug(f"Loaded {len(modules_dict)} component categories from cache")
@@ -376,20 +487,94 @@ async def _load_from_index_or_cache(
     return modules_dict, None
 
 
+def _loader_workers(settings_service: Optional["SettingsService"]) -> int:
+    """返回动态加载使用的子进程数（`0` 表示在线程中加载）。"""
+    if settings_service is None:
+        return 0
+    return max(settings_service.settings.component_loader_workers, 0)
+
+
+def _module_file(module_finder: Any, modname: str, *, ispkg: bool) -> Path | None:
+    """返回 `walk_packages` 条目对应的源文件路径（无法定位时返回 None）。"""
+    finder_path = getattr(module_finder, "path", None)
+    if not finder_path:
+        return None
+    leaf = modname.rpartition(".")[2]
+    return Path(finder_path) / leaf / "__init__.py" if ispkg else Path(finder_path) / f"{leaf}.py"
+
+
+async def _process_modules_in_workers(
+    module_names: list[str],
+    module_files: dict[str, Path | None],
+    workers: int,
+    *,
+    full_scan: bool,
+) -> list[tuple[str, dict] | None]:
+    """用模块缓存与进程池处理模块，返回与 `module_names` 顺序一致的结果。
+
+    契约：未变化的模块直接取缓存；其余在子进程中构建，子进程未返回的模块在本进程线程内回退处理。
+    副作用：读写用户缓存目录下的 `component_modules.json`。
+    失败语义：缓存读写失败视为无缓存；单个模块失败结果为 None。
+    """
+    cache_path = _get_cache_path().with_name("component_modules.json")
+    cache = await asyncio.to_thread(lambda: ModuleTemplateCache.load(cache_path, shared_fingerprint()))
+
+    results: dict[str, tuple[str, dict] | None] = {}
+    pending = []
+    for modname in module_names:
+        cached = cache.get(modname, module_files.get(modname))
+        if cached is None:
+            pending.append(modname)
+        else:
+            results[modname] = cached
+
+    loaded = await load_modules_in_processes(pending, workers)
+    fallback = [modname for modname in pending if modname not in loaded]
+    for modname, result in loaded.items():
+        results[modname] = result
+        if result:
+            cache.put(modname, module_files.get(modname), result)
+    if fallback:
+        await logger.adebug(f"Processing {len(fallback)} module(s) in threads after worker fallback")
+        fallback_results = await asyncio.gather(
+            *(asyncio.to_thread(_process_single_module, modname) for modname in fallback), return_exceptions=True
+        )
+        for modname, result in zip(fallback, fallback_results, strict=True):
+            results[modname] = result
+            if isinstance(result, tuple) and result:
+                # 注意：仅缓存可 JSON 序列化的结果，缓存文件需整体可序列化。
+                try:
+                    cache.put(modname, module_files.get(modname), orjson.loads(orjson.dumps(result)))
+                except TypeError:
+                    continue
+
+    if full_scan:
+        cache.prune(set(module_names))
+    await asyncio.to_thread(cache.save)
+    await logger.adebug(
+        f"Component modules: {cache.hits} from cache, {len(loaded)} built in {workers} worker(s), "
+        f"{len(fallback)} in threads"
+    )
+    return [results.get(modname) for modname in module_names]
+
+
 async def _load_components_dynamically(
     target_modules: list[str] | None = None,
+    *,
+    workers: int = 0,
 ) -> dict[str, Any]:
     """动态扫描并加载组件模块。
 
-    契约：可选 `target_modules` 仅加载指定模块；返回按顶层分类的组件字典。
+    契约：可选 `target_modules` 仅加载指定模块；`workers > 0` 时使用进程池与模块缓存；
+    返回按顶层分类的组件字典。
     副作用：动态导入模块并实例化组件。
     关键路径（三步）：1) 枚举模块名 2) 并行处理模块 3) 合并结果。
     失败语义：单个模块失败会记录日志并跳过。
-    决策：并行处理模块以降低总耗时。
-    问题：组件模块数量多，串行加载耗时过长。
-    方案：使用 `asyncio.to_thread` 并发导入解析。
-    代价：并发导入可能增加瞬时资源占用。
-    重评：当引入更强的并发控制或进程池时调整。
+    决策：默认使用线程并发，`component_loader_workers` 开启时改用进程池
+    问题：导入与模板构建受 GIL 约束，线程几乎没有实际并行度
+    方案：模块名分片到 `spawn` 子进程构建模板，结果以 JSON 传回并按文件 `mtime`/哈希缓存
+    代价：子进程需各自导入 `lfx` 与组件依赖，模块较少时启动开销可能超过收益
+    重评：当组件导入改为纯声明式（无需实例化）时移除进程池
     """
     modules_dict: dict[str, Any] = {}
 
@@ -401,7 +586,10 @@ async def _load_components_dynamically(
 
     # 实现：收集需要处理的模块名列表。
     module_names = []
-    for _, modname, _ in pkgutil.walk_packages(components_pkg.__path__, prefix=components_pkg.__name__ + "."):
+    module_files: dict[str, Path | None] = {}
+    for module_finder, modname, ispkg in pkgutil.walk_packages(
+        components_pkg.__path__, prefix=components_pkg.__name__ + "."
+    ):
         # 注意：跳过 deactivated 目录。
         if "deactivated" in modname:
             continue
@@ -422,6 +610,7 @@ async def _load_components_dynamically(
                 continue
 
         module_names.append(modname)
+        module_files[modname] = _module_file(module_finder, modname, ispkg=ispkg)
 
     if target_modules:
         await logger.adebug(f"Found {len(module_names)} modules matching filter")
@@ -430,11 +619,14 @@ async def _load_components_dynamically(
         return modules_dict
 
     # 实现：并行处理模块以加速加载。
-    tasks = [asyncio.to_thread(_process_single_module, modname) for modname in module_names]
-
-    # 实现：等待所有模块处理完成。
     try:
-        module_results = await asyncio.gather(*tasks, return_exceptions=True)
+        if workers > 0:
+            module_results = await _process_modules_in_workers(
+                module_names, module_files, workers, full_scan=not target_modules
+            )
+        else:
+            tasks = [asyncio.to_thread(_process_single_module, modname) for modname in module_names]
+            module_results = await asyncio.gather(*tasks, return_exceptions=True)
     except Exception as e:  # noqa: BLE001
         await logger.aerror(f"Error during parallel module processing: {e}", exc_info=True)
         return modules_dict
@@ -455,7 +647,9 @@ async def _load_components_dynamically(
     return modules_dict
 
 
-async def _load_full_dev_mode() -> tuple[dict[str, Any], str]:
+async def _load_full_dev_mode(
+    settings_service: Optional["SettingsService"] = None,
+) -> tuple[dict[str, Any], str]:
     """开发模式下全量动态加载组件。
 
     契约：返回 `(modules_dict, "dynamic")`。
@@ -468,7 +662,7 @@ async def _load_full_dev_mode() -> tuple[dict[str, Any], str]:
     重评：当支持热更新索引时减少全量加载。
     """
     await logger.adebug("LFX_DEV full mode: loading all modules dynamically")
-    modules_dict = await _load_components_dynamically(target_modules=None)
+    modules_dict = await _load_components_dynamically(target_modules=None, workers=_loader_workers(settings_service))
     return modules_dict, "dynamic"
 
 
@@ -492,7 +686,9 @@ async def _load_selective_dev_mode(
     modules_dict, _ = await _load_from_index_or_cache(settings_service)
 
     # 实现：动态重载指定模块。
-    dynamic_modules = await _load_components_dynamically(target_modules=target_modules)
+    dynamic_modules = await _load_components_dynamically(
+        target_modules=target_modules, workers=_loader_workers(settings_service)
+    )
 
     # 实现：合并并覆盖目标模块组件。
     for top_level, components in dynamic_modules.items():
@@ -524,13 +720,18 @@ async def _load_production_mode(
     if not index_source:
         # 注意：无索引或缓存时回退动态加载。
         await logger.adebug("Falling back to dynamic loading")
-        modules_dict = await _load_components_dynamically(target_modules=None)
+        modules_dict = await _load_components_dynamically(
+            target_modules=None, workers=_loader_workers(settings_service)
+        )
         index_source = "dynamic"
 
         # 注意：将动态结果写入缓存以加速下次启动。
         if modules_dict:
             await logger.adebug("Saving generated component index to cache")
             _save_generated_index(modules_dict)
+            if _lazy_index_enabled(settings_service):
+                custom_index_path = settings_service.settings.components_index_path if settings_service else None
+                _save_packed_index(modules_dict, custom_index_path)
 
     return modules_dict, index_source
 
@@ -556,7 +757,7 @@ async def import_langflow_components(
 
     # 实现：根据开发模式选择加载策略。
     if dev_mode_enabled and not target_modules:
-        modules_dict, index_source = await _load_full_dev_mode()
+        modules_dict, index_source = await _load_full_dev_mode(settings_service)
     elif dev_mode_enabled and target_modules:
         modules_dict, index_source = await _load_selective_dev_mode(settings_service, target_modules)
     else:
@@ -705,6 +906,7 @@ async def get_and_cache_all_types_dict(
             **langflow_components["components"],
             **custom_flat,
         }
+        component_cache.mark_modified()
         component_count = sum(len(comps) for comps in component_cache.all_types_dict.values())
         await logger.adebug(f"Loaded {component_count} components")
     return component_cache.all_types_dict
@@ -933,6 +1135,7 @@ async def ensure_component_loaded(component_type: str, component_name: str, sett
 
             # 实现：记录已完全加载状态。
             component_cache.fully_loaded_components[component_key] = True
+            component_cache.mark_modified()
             await logger.adebug(f"Component {component_type}:{component_name} fully loaded")
         else:
             await logger.awarning(f"Failed to fully load component {component_type}:{component_name}")
@@ -1,21 +1,3 @@
-"""
-模块名称：组件初始化与构建
-
-本模块负责组件实例化、参数加载与构建结果产出，支持从数据库或环境变量加载敏感字段。
-主要功能包括：
-- 动态实例化自定义组件
-- 处理 `load_from_db` 字段并回退环境变量
-- 构建组件结果与产物信息
-
-关键组件：
-- `instantiate_class`：实例化组件
-- `update_params_with_load_from_db_fields`：参数加载与回退
-- `build_component`/`build_custom_component`：构建执行结果
-
-设计背景：统一组件构建流程，支持多环境下的变量加载策略。
-注意事项：数据库不可用时会回退到环境变量读取。
-"""
-
 """
 模块名称：组件实例化与加载流程
 
@@ -66,10 +48,12 @@ def instantiate_class(
     vertex: Vertex,
     user_id=None,
     event_manager: EventManager | None = None,
+    class_object: type[CustomComponent | Component] | None = None,
 ) -> Any:
     """根据 Vertex 配置实例化组件类。
 
     契约：返回 `(component_instance, custom_params)`；`vertex.params` 必须包含 `code`。
+    传入 `class_object` 时跳过代码编译，直接使用该类（编译图缓存命中路径）。
     副作用：执行动态代码并创建组件实例。
     关键路径（三步）：1) 解析参数 2) 执行代码获取类 3) 实例化并注入事件管理器。
     失败语义：缺少 `base_type` 或代码执行失败会抛异常。
@@ -89,7 +73,8 @@ def instantiate_class(
 
     custom_params = get_params(vertex.params)
     code = custom_params.pop("code")
-    class_object: type[CustomComponent | Component] = eval_custom_component_code(code)
+    if class_object is None:
+        class_object = eval_custom_component_code(code)
     custom_component: CustomComponent | Component = class_object(
         _user_id=user_id,
         _parameters=custom_params,
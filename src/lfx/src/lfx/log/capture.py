@@ -0,0 +1,122 @@
+"""
+模块名称：按上下文隔离的输出捕获
+
+本模块用 `contextvars` 标记当前请求的捕获缓冲区，使同一事件循环内并发执行的多个 flow 各自捕获输出。
+主要功能包括：
+- `capture_output`：在当前上下文内把 stdout/stderr 写入路由到独立缓冲区
+- `ContextRoutedStream`：进程级 stdout/stderr 代理，按上下文选择缓冲区或原始流
+- `route_logs_to_capture`：structlog 处理器，捕获期间把渲染后的日志写入当前缓冲区
+
+关键组件：`OutputCapture` / `ContextRoutedStream` / `capture_output`
+设计背景：逐请求替换 `sys.stdout`/`sys.stderr` 在并发请求下会串写输出并恢复成错误的流。
+使用场景：`lfx.cli.common.execute_graph_with_capture`（`lfx serve` 的 `/run` 与 `/stream`）。
+注意事项：代理在首次捕获时安装且不再卸载，无捕获的上下文写入原始流；
+`asyncio` 任务与 `asyncio.to_thread` 会复制创建时的上下文，自行创建的线程不继承上下文，其输出写入原始流。
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from io import StringIO
+from typing import TYPE_CHECKING, Any, Literal
+
+import structlog
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class OutputCapture:
+    """单次捕获的 stdout/stderr 缓冲区。"""
+
+    __slots__ = ("stderr", "stdout")
+
+    def __init__(self) -> None:
+        self.stdout = StringIO()
+        self.stderr = StringIO()
+
+    def getvalue(self) -> str:
+        """返回 stdout 与 stderr 的拼接内容。"""
+        return self.stdout.getvalue() + self.stderr.getvalue()
+
+
+_active_capture: ContextVar[OutputCapture | None] = ContextVar("lfx_output_capture", default=None)
+_install_lock = threading.Lock()
+
+
+class ContextRoutedStream:
+    """按当前上下文路由写入的文本流代理。
+
+    契约：当前上下文存在捕获时写入对应缓冲区，否则写入被代理的原始流；其余属性透传原始流。
+    决策：替换一次进程级 `sys.stdout`/`sys.stderr`，按上下文分流
+    问题：每个请求临时替换 `sys.stdout` 时，并发请求会相互覆盖并在恢复时还原成错误的流
+    方案：代理对象常驻，捕获范围由 `ContextVar` 决定
+    代价：每次写入多一次 `ContextVar.get`
+    重评：当输出全部改为结构化事件、不再依赖标准输出时移除
+    """
+
+    def __init__(self, target: Any, name: Literal["stdout", "stderr"]) -> None:
+        self._target = target
+        self._name = name
+
+    def _current(self) -> Any:
+        capture = _active_capture.get()
+        return self._target if capture is None else getattr(capture, self._name)
+
+    def write(self, text: str) -> int:
+        return self._current().write(text)
+
+    def writelines(self, lines) -> None:
+        self._current().writelines(lines)
+
+    def flush(self) -> None:
+        self._current().flush()
+
+    def isatty(self) -> bool:
+        return _active_capture.get() is None and self._target.isatty()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target, name)
+
+
+def install_stream_proxies() -> None:
+    """把 `sys.stdout`/`sys.stderr` 替换为上下文路由代理（已安装时跳过）。"""
+    with _install_lock:
+        if not isinstance(sys.stdout, ContextRoutedStream):
+            sys.stdout = ContextRoutedStream(sys.stdout, "stdout")
+        if not isinstance(sys.stderr, ContextRoutedStream):
+            sys.stderr = ContextRoutedStream(sys.stderr, "stderr")
+
+
+@contextmanager
+def capture_output() -> Iterator[OutputCapture]:
+    """在当前上下文内捕获 stdout/stderr 与 structlog 输出。
+
+    契约：退出时恢复进入前的捕获状态（支持嵌套）；不修改其他上下文的输出。
+    """
+    install_stream_proxies()
+    capture = OutputCapture()
+    token = _active_capture.set(capture)
+    try:
+        yield capture
+    finally:
+        _active_capture.reset(token)
+
+
+def route_logs_to_capture(stream: Literal["stdout", "stderr"]):
+    """返回 structlog 处理器：捕获期间把渲染后的日志写入当前缓冲区的 `stream` 并丢弃原事件。
+
+    注意：必须位于渲染器之后；`PrintLogger` 在配置时绑定输出流，流代理无法拦截其写入。
+    """
+
+    def processor(_logger: Any, _method_name: str, event: Any) -> Any:
+        capture = _active_capture.get()
+        if capture is None or not isinstance(event, str):
+            return event
+        getattr(capture, stream).write(event + "\n")
+        raise structlog.DropEvent
+
+    return processor
@@ -23,6 +23,7 @@ import structlog
 from platformdirs import user_cache_dir
 from typing_extensions import NotRequired
 
+from lfx.log.capture import route_logs_to_capture
 from lfx.settings import DEV
 
 VALID_LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
@@ -317,6 +318,9 @@ def configure(
 
     # 配置 structlog（默认 stdout）
     log_output_file = output_file if output_file is not None else sys.stdout
+    if not log_file and log_output_file in (sys.stdout, sys.stderr):
+        # 注意：`PrintLogger` 绑定配置时的流对象，需由处理器把捕获期间的日志路由到当前请求
+        processors.append(route_logs_to_capture("stderr" if log_output_file is sys.stderr else "stdout"))
 
     structlog.configure(
         processors=processors,
@@ -146,6 +146,7 @@ async def aget_messages(
     order: str | None = "DESC",  # noqa: ARG001
     flow_id: UUID | None = None,  # noqa: ARG001
     limit: int | None = None,  # noqa: ARG001
+    cursor: str | None = None,  # noqa: ARG001
 ) -> list[Message]:
     """检索消息列表（异步）
 
@@ -172,6 +173,7 @@ def get_messages(
     order: str | None = "DESC",
     flow_id: UUID | None = None,
     limit: int | None = None,
+    cursor: str | None = None,
 ) -> list[Message]:
     """同步检索消息（已弃用）
 
@@ -187,6 +189,7 @@ def get_messages(
             order,
             flow_id,
             limit,
+            cursor,
         )
     )
 
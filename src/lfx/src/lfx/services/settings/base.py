@@ -166,8 +166,36 @@ class Settings(BaseSettings):
     """缓存类型：`async`/`redis`/`memory`/`disk`。"""
     cache_expire: int = 3600
     """缓存过期时间（秒）。"""
+    cache_max_bytes: int = 0
+    """`async`/`memory` 缓存的估算字节预算，超出后按 LRU 淘汰；`0` 不限制。"""
+    cache_sweep_interval: float = 60.0
+    """`async`/`memory` 缓存后台清理过期项的间隔（秒）；`0` 关闭后台清理，仅在读取时判断过期。"""
+    cache_compression: Literal["auto", "zstd", "lz4", "none"] = "auto"
+    """`redis`/`disk` 缓存的压缩算法；`auto` 依次选择已安装的 zstd、lz4。"""
+    cache_compression_threshold: int = 65536
+    """`redis`/`disk` 缓存值序列化后达到该字节数才压缩。"""
+    graph_scheduler_mode: Literal["layered", "dataflow"] = "layered"
+    """图执行调度模式：`layered` 按批 `gather` 后再算后继；`dataflow` 任一顶点完成即启动其可运行后继。"""
+    graph_max_concurrency: int = 0
+    """`dataflow` 模式下单次运行同时构建的顶点上限；`0` 不限制。"""
+    vertex_run_resource_limits: dict[str, int] = {}
+    """单次运行内各资源类别（组件 `resource_class`）的并发上限，如 `{"llm": 4}`；未列出的类别不限制。"""
+    vertex_resource_limits: dict[str, int] = {}
+    """整个进程内各资源类别的并发上限，如 `{"embedding": 50}`；与单次运行上限同时生效。"""
+    graph_checkpoint_mode: Literal["full", "delta"] = "full"
+    """调度检查点模式：`full` 每步整图写入 chat 缓存；`delta` 仅在后台写入调度状态与新完成顶点的结果。"""
+    event_token_flush_interval_ms: int = 0
+    """流式 token 合并发送的间隔（毫秒）：同一消息的 chunk 缓冲至多该时长后合并为一条事件；`0` 不按时间合并。"""
+    event_token_flush_bytes: int = 0
+    """流式 token 合并发送的字节阈值：同一消息缓冲达到该长度立即发送；与间隔均为 `0` 时每个 chunk 单独发送。"""
+    flow_graph_cache_size: int = 128
+    """`/api/v1/run` 编译图模板缓存条目上限（按 flow 版本 + tweaks 计）；`0` 关闭缓存。"""
     variable_store: str = "db"
     """变量存储后端，可选 `db` 或 `kubernetes`。"""
+    variable_prefetch: bool = False
+    """单次运行首次解析 `load_from_db` 变量时批量预取整图所需变量并缓存到运行结束；`False` 逐字段查询。"""
+    variable_cache_ttl: float = 0.0
+    """数据库变量服务按用户缓存解密后变量值的时长（秒）；`0` 关闭缓存。"""
 
     prometheus_enabled: bool = False
     """是否暴露 Prometheus 指标。"""
@@ -175,6 +203,10 @@ class Settings(BaseSettings):
     """Prometheus 指标端口，默认 9090。"""
 
     disable_track_apikey_usage: bool = False
+    api_key_cache_ttl: float = 0.0
+    """`API Key` 鉴权结果的进程内缓存时长（秒）；`0` 关闭缓存，每次请求都查询数据库。"""
+    api_key_usage_flush_interval: float = 0.0
+    """`API Key` 使用次数在内存聚合后批量写回的间隔（秒）；`0` 每次请求立即写回。"""
     remove_api_keys: bool = False
     components_path: list[str] = []
     components_index_path: str | None = None
@@ -192,6 +224,18 @@ class Settings(BaseSettings):
     redis_db: int = 0
     redis_url: str | None = None
     redis_cache_expire: int = 3600
+    job_queue_max_events: int = 0
+    """`memory` 作业队列每个作业积压事件的上限；`0` 不限制。"""
+    job_queue_overflow_policy: Literal["block", "drop_tokens", "spill"] = "drop_tokens"
+    """积压达到上限时的策略：`block` 让 token 生产端等待，`drop_tokens` 丢弃 token 保留生命周期事件，`spill` 落盘。"""
+    job_queue_block_timeout: float = 30.0
+    """`block` 策略下生产端等待消费的最长时间（秒），超时后改为丢弃 token。"""
+    job_queue_backend: Literal["memory", "redis"] = "memory"
+    """构建作业队列后端：`memory` 为进程内队列；`redis` 以 Redis Stream 承载事件，多 worker 部署无需粘性会话。"""
+    job_queue_stream_maxlen: int = 10000
+    """`redis` 作业队列每个作业事件流的近似长度上限，超出后裁剪最早的事件。"""
+    job_queue_ttl: int = 3600
+    """`redis` 作业队列中作业状态、事件流与消费位置的过期时间（秒）。"""
 
     # Sentry 配置
     sentry_dsn: str | None = None
@@ -286,6 +330,18 @@ class Settings(BaseSettings):
     """数据库中保留的最大 vertex 构建数。"""
     max_vertex_builds_per_vertex: int = 2
     """每个 vertex 保留的最大构建数（超出将删除旧记录）。"""
+    db_write_behind: bool = False
+    """是否以后台缓冲批量写入事务与 vertex 构建记录；开启后保留裁剪改为周期任务。"""
+    db_write_behind_flush_interval: float = 1.0
+    """后写缓冲的刷写间隔（秒）。"""
+    db_write_behind_batch_size: int = 200
+    """后写缓冲单次多行插入的最大条数；积压达到该值时立即刷写。"""
+    db_write_behind_prune_interval: float = 30.0
+    """后写模式下保留裁剪的执行间隔（秒）。"""
+    message_write_coalesce_interval: float = 0.0
+    """聊天消息合并写入的等待窗口（秒）：窗口内并发会话的消息合并为一次多行插入与一次提交；`0` 每次调用单独写入。"""
+    message_write_coalesce_batch_size: int = 200
+    """合并写入单个事务的最大消息数；积压达到该值时立即写入。"""
     webhook_polling_interval: int = 5000
     """Webhook 轮询间隔（毫秒）。"""
     fs_flows_polling_interval: int = 10000
@@ -331,6 +387,10 @@ class Settings(BaseSettings):
     """构建事件投递方式：`polling`/`streaming`/`direct`。"""
     lazy_load_components: bool = False
     """是否延迟加载组件（启动更快，但首次使用会有延迟）。"""
+    lazy_component_index: bool = False
+    """是否使用内存映射的 `.lfxi` 组件索引：启动时只解析头部，模板在首次访问时解码；首次启动从 JSON 索引生成。"""
+    component_loader_workers: int = 0
+    """动态加载组件（`LFX_DEV` 或无索引时）的子进程数；`0` 在线程中加载，开启后未变化的模块复用缓存模板。"""
 
     # Starter 项目
     create_starter_projects: bool = True
@@ -3,14 +3,17 @@
 模块目的：为不同 Python 版本提供一致的 asyncio 超时与同步入口。
 主要功能：
 - 超时上下文：优先使用 `asyncio.timeout`，否则回退 `wait_for`
-- 同步桥接：在已有事件循环时改用新线程执行协程
+- 同步桥接：把协程提交到常驻的后台事件循环执行
 使用场景：同步调用链中运行协程并统一超时语义。
 关键组件：`timeout_context`、`run_until_complete`
-设计背景：旧版本缺少 `asyncio.timeout`，需要兼容处理。
-注意事项：`run_until_complete` 会创建线程与事件循环，避免在热路径频繁调用。
+设计背景：旧版本缺少 `asyncio.timeout`，需要兼容处理；同步入口原先每次调用新建线程与事件循环。
+注意事项：在事件循环线程内调用 `run_until_complete` 仍会阻塞该循环，异步调用方应直接 `await` 协程。
 """
 
 import asyncio
+import concurrent.futures
+import os
+import threading
 from contextlib import asynccontextmanager
 
 if hasattr(asyncio, "timeout"):
@@ -40,20 +43,65 @@ else:
             raise TimeoutError(msg) from e
 
 
-def run_until_complete(coro):
-    """在同步代码中运行协程。
+class _BridgeLoop:
+    """常驻后台线程上的事件循环。
 
-    契约：若当前线程已有运行中的事件循环，则新建线程与事件循环执行。
-    副作用：创建线程与新事件循环；异常原样向上抛出。
+    契约：`submit` 线程安全，返回 `concurrent.futures.Future`；协程在提交方 `contextvars` 的副本中运行。
+    决策：所有同步入口共用一个常驻循环，而非每次调用新建线程与循环
+    问题：每次调用都要创建/销毁线程池与事件循环，循环内创建的连接、客户端无法跨调用复用
+    方案：首次使用时启动守护线程运行 `loop.run_forever()`，以 `run_coroutine_threadsafe` 提交
+    代价：所有桥接协程共享一个线程，协程内的同步阻塞会拖慢其他桥接调用
+    重评：当同步入口全部迁移为异步调用时移除
     """
-    try:
-        asyncio.get_running_loop()
-    except RuntimeError:
-        # 注意：无事件循环时直接创建新循环执行协程。
-        return asyncio.run(coro)
-    # 注意：已有运行中的事件循环时，不能在同一线程阻塞执行，改用新线程+新事件循环。
-    import concurrent.futures
 
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        # 注意：fork 出的子进程没有父进程的桥接线程，按 pid 判断后重新启动。
+        if self._loop is not None and self._pid == os.getpid() and self._loop.is_running():
+            return self._loop
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid() and self._loop.is_running():
+                return self._loop
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def _run() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=_run, name="lfx-async-bridge", daemon=True)
+            thread.start()
+            started.wait()
+            self._loop, self._thread, self._pid = loop, thread, os.getpid()
+            return loop
+
+    def in_bridge_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_started())
+
+    def shutdown(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = self._pid = None
+        if loop is None or not loop.is_running():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+
+
+_bridge = _BridgeLoop()
+
+
+def _run_in_new_loop(coro):
     def run_in_new_loop():
         new_loop = asyncio.new_event_loop()
         asyncio.set_event_loop(new_loop)
@@ -65,3 +113,20 @@ def run_until_complete(coro):
     with concurrent.futures.ThreadPoolExecutor() as executor:
         future = executor.submit(run_in_new_loop)
         return future.result()
+
+
+def run_until_complete(coro):
+    """在同步代码中运行协程。
+
+    契约：协程提交到常驻桥接循环执行，调用方线程阻塞等待结果；异常原样向上抛出。
+    副作用：首次调用启动桥接线程。
+    失败语义：在桥接线程内嵌套调用时退回“新线程 + 新事件循环”，避免桥接循环等待自身而死锁。
+    """
+    if _bridge.in_bridge_thread():
+        return _run_in_new_loop(coro)
+    return _bridge.submit(coro).result()
+
+
+def shutdown_bridge() -> None:
+    """停止桥接循环（进程退出或测试清理时调用）；之后的调用会重新启动。"""
+    _bridge.shutdown()
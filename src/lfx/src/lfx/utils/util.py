@@ -555,6 +555,7 @@ async def update_settings(
         msg = "Settings service not found"
         raise RuntimeError(msg)
 
+    previous_components_path = list(settings_service.settings.components_path)
     if config:
         await logger.adebug(f"Loading settings from {config}")
         await settings_service.settings.update_from_yaml(config, dev=dev)
@@ -567,6 +568,11 @@ async def update_settings(
     if components_path:
         await logger.adebug(f"Adding component path {components_path}")
         settings_service.settings.update_settings(components_path=components_path)
+    if settings_service.settings.components_path != previous_components_path:
+        from lfx.interface.components import component_cache
+
+        # 注意：自定义组件目录变化后丢弃组件字典，下次读取时重新加载（派生缓存随版本号失效）。
+        component_cache.invalidate()
     if not store:
         logger.debug("Setting store to False")
         settings_service.settings.update_settings(store=False)
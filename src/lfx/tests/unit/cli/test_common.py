@@ -1,5 +1,6 @@
 """Unit tests for LFX CLI common utilities."""
 
+import asyncio
 import os
 import socket
 import sys
@@ -8,6 +9,7 @@ from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
+import structlog
 import typer
 from lfx.cli.common import (
     create_verbose_printer,
@@ -20,6 +22,7 @@ from lfx.cli.common import (
     is_port_in_use,
     load_graph_from_path,
 )
+from lfx.log.capture import capture_output, route_logs_to_capture
 
 
 class TestVerbosePrinter:
@@ -255,6 +258,54 @@ class TestGraphExecution:
         with pytest.raises(RuntimeError, match="Execution failed"):
             await execute_graph_with_capture(mock_graph, "test input")
 
+    async def test_execute_graph_with_capture_appends_stderr_to_error(self):
+        """Test that stderr written before a failure is attached to the exception."""
+
+        async def mock_async_start_error(inputs):  # noqa: ARG001
+            print("component warning", file=sys.stderr)  # noqa: T201
+            msg = "Execution failed"
+            raise RuntimeError(msg)
+            yield
+
+        mock_graph = MagicMock()
+        mock_graph.async_start = mock_async_start_error
+
+        with pytest.raises(RuntimeError, match="Captured stderr:\ncomponent warning"):
+            await execute_graph_with_capture(mock_graph, "test input")
+
+    async def test_concurrent_executions_capture_their_own_output(self):
+        """Test that interleaved runs on one event loop do not share captured output."""
+
+        def make_graph(name):
+            async def mock_async_start(inputs):  # noqa: ARG001
+                for step in range(3):
+                    print(f"{name}-out-{step}")  # noqa: T201
+                    print(f"{name}-err-{step}", file=sys.stderr)  # noqa: T201
+                    await asyncio.sleep(0.01)
+                yield MagicMock(results={"text": name})
+
+            mock_graph = MagicMock()
+            mock_graph.async_start = mock_async_start
+            return mock_graph
+
+        (_, logs_a), (_, logs_b) = await asyncio.gather(
+            execute_graph_with_capture(make_graph("a"), None),
+            execute_graph_with_capture(make_graph("b"), None),
+        )
+
+        assert logs_a == "a-out-0\na-out-1\na-out-2\na-err-0\na-err-1\na-err-2\n"
+        assert logs_b == "b-out-0\nb-out-1\nb-out-2\nb-err-0\nb-err-1\nb-err-2\n"
+
+    def test_log_routing_processor(self):
+        """Test that rendered log lines are routed into the active capture only."""
+        processor = route_logs_to_capture("stderr")
+
+        assert processor(None, "info", "outside") == "outside"
+        with capture_output() as capture, pytest.raises(structlog.DropEvent):
+            processor(None, "info", "inside")
+        assert capture.stderr.getvalue() == "inside\n"
+        assert capture.stdout.getvalue() == ""
+
 
 class TestResultExtraction:
     """Test result data extraction."""
@@ -0,0 +1,97 @@
+"""Unit tests for the lfx serve graph pool."""
+
+import asyncio
+import copy
+import json
+from pathlib import Path
+
+import pytest
+from lfx.cli.common import execute_graph_with_capture, extract_result_data
+from lfx.cli.graph_pool import GraphPool
+from lfx.graph import Graph
+
+
+@pytest.fixture
+def chat_graph():
+    json_path = Path(__file__).parent.parent.parent / "data" / "simple_chat_no_llm.json"
+    return Graph.from_payload(json.loads(json_path.read_text()), flow_id="test-flow-id")
+
+
+async def _run(graph, input_value):
+    results, logs = await execute_graph_with_capture(graph, input_value)
+    return extract_result_data(results, logs).get("result")
+
+
+class TestGraphPool:
+    async def test_reused_graph_does_not_leak_previous_run(self, chat_graph):
+        pool = GraphPool(chat_graph, max_idle=2, min_idle=1)
+        pool.warm()
+
+        async with pool.acquire() as graph:
+            first_graph = graph
+            assert await _run(graph, "hello") == "hello"
+        async with pool.acquire() as graph:
+            assert graph is first_graph
+            # Without an input the reset graph must behave like a fresh copy
+            assert await _run(graph, None) == await _run(copy.deepcopy(chat_graph), None)
+
+        stats = pool.stats()
+        assert stats["created"] == 1
+        assert stats["reused"] == 2
+        assert stats["idle"] == 1
+
+    async def test_concurrent_requests_get_distinct_graphs(self, chat_graph):
+        pool = GraphPool(chat_graph, max_idle=1, min_idle=0)
+        seen = []
+
+        async def borrow():
+            async with pool.acquire() as graph:
+                seen.append(graph)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(borrow(), borrow(), borrow())
+
+        assert len({id(graph) for graph in seen}) == 3
+        stats = pool.stats()
+        assert stats["peak_in_use"] == 3
+        # Only max_idle graphs are kept once the burst is over
+        assert stats["idle"] == 1
+        assert stats["discarded"] == 2
+
+    async def test_failed_run_discards_graph(self, chat_graph):
+        pool = GraphPool(chat_graph, max_idle=2, min_idle=0)
+
+        async def failing_run():
+            async with pool.acquire():
+                msg = "boom"
+                raise RuntimeError(msg)
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await failing_run()
+
+        assert pool.stats()["idle"] == 0
+        assert pool.stats()["discarded"] == 1
+
+    async def test_idle_graphs_shrink_to_min_idle(self, chat_graph):
+        pool = GraphPool(chat_graph, max_idle=3, min_idle=1, idle_timeout=0)
+        async with pool.acquire(), pool.acquire():
+            pass
+
+        async with pool.acquire():
+            pass
+
+        assert pool.stats()["idle"] == 1
+
+    async def test_reset_drops_admission_controller_and_pending_checkpoint_writes(self, chat_graph):
+        graph = copy.deepcopy(chat_graph)
+        assert await _run(graph, "hello") == "hello"
+        controller = graph.admission_controller
+        pending_write = asyncio.create_task(asyncio.Event().wait())
+        graph._checkpoint_tasks.add(pending_write)
+
+        graph.reset_run_state()
+        await asyncio.sleep(0)
+
+        assert pending_write.cancelled()
+        assert not graph._checkpoint_tasks
+        assert graph.admission_controller is not controller
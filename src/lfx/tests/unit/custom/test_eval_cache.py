@@ -0,0 +1,67 @@
+from textwrap import dedent
+from unittest.mock import patch
+
+import pytest
+from lfx.custom import eval as custom_eval
+from lfx.custom.eval import (
+    clear_component_class_cache,
+    eval_custom_component_code,
+    get_component_class_cache_stats,
+)
+
+CODE = dedent("""
+from lfx.custom import Component
+
+class CachedComponent(Component):
+    display_name = "Cached"
+""")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache():
+    clear_component_class_cache()
+    yield
+    clear_component_class_cache()
+
+
+def test_identical_code_is_compiled_once():
+    with patch.object(custom_eval.validate, "create_class", wraps=custom_eval.validate.create_class) as create_class:
+        first = eval_custom_component_code(CODE)
+        second = eval_custom_component_code(CODE)
+
+    assert first is second
+    assert create_class.call_count == 1
+    stats = get_component_class_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+
+def test_different_code_gets_its_own_class():
+    other = CODE.replace('"Cached"', '"Other"')
+
+    assert eval_custom_component_code(CODE) is not eval_custom_component_code(other)
+    assert get_component_class_cache_stats()["size"] == 2
+
+
+def test_failures_are_not_cached():
+    broken = "class Broken(Component):\n    def"
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="invalid syntax"):
+            eval_custom_component_code(broken)
+
+    stats = get_component_class_cache_stats()
+    assert stats["misses"] == 2
+    assert stats["size"] == 0
+
+
+def test_lru_eviction(monkeypatch):
+    monkeypatch.setattr(custom_eval, "COMPONENT_CLASS_CACHE_SIZE", 1)
+
+    eval_custom_component_code(CODE)
+    eval_custom_component_code(CODE.replace('"Cached"', '"Other"'))
+
+    stats = get_component_class_cache_stats()
+    assert stats["size"] == 1
+    assert stats["evictions"] == 1
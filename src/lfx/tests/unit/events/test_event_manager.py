@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+import threading
 from unittest.mock import MagicMock
 
 import pytest
@@ -368,3 +369,89 @@ class TestEventManagerAsync:
         for sent, received in zip(events_to_send, received_events, strict=False):
             assert sent[0] == received[0]  # event type
             assert sent[1] == received[1]  # data
+
+    @staticmethod
+    def _drain(queue):
+        events = []
+        while not queue.empty():
+            _, data_bytes, _ = queue.get_nowait()
+            parsed = json.loads(data_bytes.decode("utf-8").strip())
+            events.append((parsed["event"], parsed["data"]))
+        return events
+
+    @pytest.mark.asyncio
+    async def test_send_token_without_coalescing_sends_each_chunk(self):
+        """Test that tokens are sent immediately when coalescing is disabled."""
+        queue = asyncio.Queue()
+        manager = create_default_event_manager(queue)
+
+        manager.send_token(chunk="Hel", message_id="m1")
+        manager.send_token(chunk="lo", message_id="m1")
+
+        assert self._drain(queue) == [
+            ("token", {"chunk": "Hel", "id": "m1"}),
+            ("token", {"chunk": "lo", "id": "m1"}),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_send_token_coalesces_by_bytes_and_interval(self):
+        """Test that tokens are merged per message and flushed by size or timer."""
+        queue = asyncio.Queue()
+        manager = create_default_event_manager(queue, token_flush_interval=0.01, token_flush_bytes=6)
+
+        manager.send_token(chunk="abc", message_id="m1")
+        manager.send_token(chunk="x", message_id="m2")
+        manager.send_token(chunk="def", message_id="m1")
+        assert self._drain(queue) == [("token", {"chunk": "abcdef", "id": "m1"})]
+
+        manager.send_token(chunk="y", message_id="m2")
+        await asyncio.sleep(0.05)
+        assert self._drain(queue) == [("token", {"chunk": "xy", "id": "m2"})]
+
+    @pytest.mark.asyncio
+    async def test_other_events_flush_pending_tokens_first(self):
+        """Test that buffered tokens are emitted before any later event."""
+        queue = asyncio.Queue()
+        manager = create_default_event_manager(queue, token_flush_interval=10)
+
+        manager.send_token(chunk="partial", message_id="m1")
+        manager.on_end(data={})
+
+        assert self._drain(queue) == [("token", {"chunk": "partial", "id": "m1"}), ("end", {})]
+        assert not manager._token_timers
+
+    @pytest.mark.asyncio
+    async def test_events_from_worker_thread_flush_tokens_on_loop(self):
+        """Test that an event sent from a worker thread flushes buffered tokens on the loop thread first."""
+        queue = asyncio.Queue()
+        manager = create_default_event_manager(queue, token_flush_interval=10)
+        flush_threads = []
+        original_flush = manager.flush_tokens
+
+        def flush_tokens(message_id=None):
+            flush_threads.append(threading.get_ident())
+            original_flush(message_id)
+
+        manager.flush_tokens = flush_tokens
+        manager.send_token(chunk="partial", message_id="m1")
+        await asyncio.to_thread(manager.on_message, data={"text": "done"})
+
+        assert flush_threads == [threading.get_ident()]
+        assert self._drain(queue) == [("token", {"chunk": "partial", "id": "m1"}), ("add_message", {"text": "done"})]
+        assert not manager._token_timers
+
+    @pytest.mark.asyncio
+    async def test_send_token_uses_custom_token_callback(self):
+        """Test that a custom on_token callback still receives every chunk."""
+        received = []
+
+        def callback(*, manager, event_type, data):  # noqa: ARG001
+            received.append(data)
+
+        manager = EventManager(asyncio.Queue(), token_flush_interval=10)
+        manager.register_event("on_token", "token", callback)
+
+        manager.send_token(chunk="a", message_id="m1")
+        manager.send_token(chunk="b", message_id="m1")
+
+        assert received == [{"chunk": "a", "id": "m1"}, {"chunk": "b", "id": "m1"}]
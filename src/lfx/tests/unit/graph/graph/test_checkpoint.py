@@ -0,0 +1,145 @@
+import asyncio
+import pickle
+
+import pytest
+from lfx.components.input_output import ChatInput, ChatOutput
+from lfx.graph import Graph
+from lfx.graph.graph import base as graph_base
+from lfx.graph.graph.checkpoint import GraphCheckpoint, checkpoint_key
+from lfx.graph.graph.constants import Finish
+from lfx.services.cache.utils import CACHE_MISS
+
+
+class FakeChatService:
+    def __init__(self):
+        self.cache = {}
+
+    async def set_cache(self, key, data, lock=None):  # noqa: ARG002
+        self.cache[key] = {"result": data, "type": type(data)}
+        return True
+
+    async def get_cache(self, key, lock=None):  # noqa: ARG002
+        return self.cache.get(key, CACHE_MISS)
+
+    async def clear_cache(self, key, lock=None):  # noqa: ARG002
+        self.cache.pop(key, None)
+
+
+@pytest.fixture
+def chat_service(monkeypatch):
+    service = FakeChatService()
+    monkeypatch.setattr(graph_base, "get_chat_service", lambda: service)
+    monkeypatch.setattr(Graph, "checkpoint_mode", property(lambda _self: "delta"))
+    return service
+
+
+def _make_graph():
+    chat_input = ChatInput(_id="chat_input")
+    chat_input.set(should_store_message=False)
+    chat_output = ChatOutput(input_value="test", _id="chat_output", should_store_message=False)
+    chat_output.set(sender_name=chat_input.message_response)
+    graph = Graph(chat_input, chat_output, flow_id="flow")
+    graph.set_run_id("run")
+    return graph
+
+
+async def test_delta_mode_writes_only_changed_vertices(chat_service):
+    graph = _make_graph()
+
+    await graph.astep()
+    await graph.wait_for_checkpoints()
+
+    assert "flow" not in chat_service.cache
+    checkpoint = chat_service.cache[checkpoint_key("flow", 1)]["result"]
+    assert isinstance(checkpoint, GraphCheckpoint)
+    assert set(checkpoint.vertices) == {"chat_input"}
+    assert checkpoint.vertices["chat_input"]["built"] is True
+    assert checkpoint.run_queue == ["chat_output"]
+
+
+async def test_restore_replays_checkpoints_onto_base(chat_service):
+    graph = _make_graph()
+    base = pickle.loads(pickle.dumps(graph))  # noqa: S301
+
+    await graph.astep()
+    await graph.wait_for_checkpoints()
+
+    assert await base.restore_checkpoints(chat_service.get_cache) == 1
+    assert base.get_vertex("chat_input").built is True
+    assert list(base._run_queue) == ["chat_output"]
+    assert base.run_manager.run_predecessors == graph.run_manager.run_predecessors
+    # Already-applied sequence numbers are not replayed again.
+    assert await base.restore_checkpoints(chat_service.get_cache) == 0
+
+
+async def test_restore_ignores_checkpoints_from_other_runs(chat_service):
+    graph = _make_graph()
+    base = pickle.loads(pickle.dumps(graph))  # noqa: S301
+    base.set_run_id("another-run")
+
+    await graph.astep()
+    await graph.wait_for_checkpoints()
+
+    assert await base.restore_checkpoints(chat_service.get_cache) == 0
+
+
+async def test_checkpoint_is_a_snapshot_of_the_vertex(chat_service):
+    graph = _make_graph()
+
+    await graph.astep()
+    # Mutating the vertex after it finished must not change the checkpoint being written
+    graph.get_vertex("chat_input").artifacts["late"] = True
+    await graph.wait_for_checkpoints()
+
+    checkpoint = chat_service.cache[checkpoint_key("flow", 1)]["result"]
+    assert "late" not in checkpoint.vertices["chat_input"]["artifacts"]
+
+
+async def test_checkpoints_are_deleted_when_the_run_finishes(chat_service):
+    graph = _make_graph()
+
+    await graph.astep()
+    await graph.astep()
+    await graph.wait_for_checkpoints()
+    assert {checkpoint_key("flow", 1), checkpoint_key("flow", 2)} <= set(chat_service.cache)
+
+    assert isinstance(await graph.astep(), Finish)
+    assert not [key for key in chat_service.cache if ":checkpoint:" in key]
+
+
+async def test_per_vertex_builds_write_deltas_onto_the_cached_base(chat_service):
+    graph = _make_graph()
+    graph.prepare()
+    await chat_service.set_cache("flow", graph)
+
+    assert await graph.restore_checkpoints(chat_service.get_cache) == 0
+    await graph.build_vertex("chat_input")
+    next_ids = await graph.get_next_runnable_vertices(
+        asyncio.Lock(), vertex=graph.get_vertex("chat_input"), cache=False
+    )
+    assert next_ids == ["chat_output"]
+    assert graph.checkpoint_vertex("chat_input")
+    await graph.wait_for_checkpoints()
+
+    # Another worker starts from an equivalent base graph, replays the delta and builds the next vertex
+    other = _make_graph()
+    other.prepare()
+    assert await other.restore_checkpoints(chat_service.get_cache) == 1
+    assert other.get_vertex("chat_input").built is True
+    assert list(other._run_queue) == list(graph._run_queue)
+    result = await other.build_vertex("chat_output")
+    assert result.valid
+    assert other.checkpoint_vertex("chat_output")
+    await other.wait_for_checkpoints()
+
+    assert checkpoint_key("flow", 2) in chat_service.cache
+    # The base graph key is written once; per-vertex builds only add deltas.
+    assert chat_service.cache["flow"]["result"] is graph
+
+
+async def test_checkpoint_vertex_is_a_no_op_in_full_mode(chat_service, monkeypatch):
+    monkeypatch.setattr(Graph, "checkpoint_mode", property(lambda _self: "full"))
+    graph = _make_graph()
+
+    assert not graph.checkpoint_vertex("chat_input")
+    assert not chat_service.cache
@@ -0,0 +1,152 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from lfx.components.input_output import ChatInput, ChatOutput
+from lfx.graph import Graph
+from lfx.graph.graph.schema import VertexBuildResult
+
+
+def _make_two_chain_graph():
+    graph = Graph()
+    for suffix in ("fast", "slow"):
+        chat_input = ChatInput(_id=f"input_{suffix}")
+        chat_output = ChatOutput(_id=f"output_{suffix}")
+        input_id = graph.add_component(chat_input)
+        output_id = graph.add_component(chat_output)
+        graph.add_component_edge(input_id, (chat_input.outputs[0].name, chat_input.inputs[0].name), output_id)
+    graph.prepare()
+    return graph
+
+
+def _fake_builder(graph, events, delays):
+    running = {"now": 0, "peak": 0}
+
+    async def build_vertex(vertex_id, **kwargs):  # noqa: ARG001
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        events.append(("start", vertex_id))
+        await asyncio.sleep(delays.get(vertex_id, 0))
+        events.append(("end", vertex_id))
+        running["now"] -= 1
+        vertex = graph.get_vertex(vertex_id)
+        vertex.built = True
+        return VertexBuildResult(result_dict=None, params="", valid=True, artifacts={}, vertex=vertex)
+
+    graph.build_vertex = build_vertex
+    return running
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    def set_mode(mode, max_concurrency=0):
+        monkeypatch.setattr(Graph, "scheduler_mode", property(lambda _self: mode))
+        monkeypatch.setattr(Graph, "max_concurrency", property(lambda _self: max_concurrency))
+
+    return set_mode
+
+
+async def test_dataflow_starts_successor_before_slow_sibling_finishes(scheduler):
+    scheduler("dataflow")
+    graph = _make_two_chain_graph()
+    events = []
+    _fake_builder(graph, events, {"input_slow": 0.2})
+
+    await graph.process(fallback_to_env_vars=False)
+
+    assert events.index(("start", "output_fast")) < events.index(("end", "input_slow"))
+    assert {vertex_id for kind, vertex_id in events if kind == "end"} == {
+        "input_fast",
+        "input_slow",
+        "output_fast",
+        "output_slow",
+    }
+
+
+async def test_layered_waits_for_whole_batch(scheduler):
+    scheduler("layered")
+    graph = _make_two_chain_graph()
+    events = []
+    _fake_builder(graph, events, {"input_slow": 0.2})
+
+    await graph.process(fallback_to_env_vars=False)
+
+    assert events.index(("start", "output_fast")) > events.index(("end", "input_slow"))
+
+
+async def test_dataflow_respects_max_concurrency(scheduler):
+    scheduler("dataflow", max_concurrency=1)
+    graph = _make_two_chain_graph()
+    events = []
+    running = _fake_builder(graph, events, {"input_slow": 0.05, "input_fast": 0.05})
+
+    await graph.process(fallback_to_env_vars=False)
+
+    assert running["peak"] == 1
+    assert len([event for event in events if event[0] == "end"]) == 4
+
+
+async def test_dataflow_propagates_errors_and_cancels_pending(scheduler):
+    scheduler("dataflow")
+    graph = _make_two_chain_graph()
+    cancelled = []
+
+    async def build_vertex(vertex_id, **kwargs):  # noqa: ARG001
+        if vertex_id == "input_fast":
+            msg = "boom"
+            raise ValueError(msg)
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(vertex_id)
+            raise
+
+    graph.build_vertex = build_vertex
+
+    with pytest.raises(ValueError, match="boom"):
+        await graph.process(fallback_to_env_vars=False)
+    # Pending tasks are awaited after being cancelled, not just cancelled
+    assert cancelled == ["input_slow"]
+
+
+async def test_dataflow_raises_for_cancelled_vertex_tasks(scheduler):
+    scheduler("dataflow")
+    graph = _make_two_chain_graph()
+    slow_tasks = []
+
+    async def build_vertex(vertex_id, **kwargs):  # noqa: ARG001
+        if vertex_id == "input_fast":
+            asyncio.current_task().cancel()
+            await asyncio.sleep(0)
+        slow_tasks.append(asyncio.current_task())
+        await asyncio.sleep(1)
+
+    graph.build_vertex = build_vertex
+
+    with pytest.raises(asyncio.CancelledError, match="input_fast Run 0 was cancelled"):
+        await graph.process(fallback_to_env_vars=False)
+    assert [task.cancelled() for task in slow_tasks] == [True]
+
+
+@pytest.mark.parametrize("mode", ["dataflow", "layered"])
+async def test_vertex_failure_is_reported_before_raising(scheduler, monkeypatch, mode):
+    scheduler(mode)
+    graph = _make_two_chain_graph()
+    aerror = AsyncMock()
+    monkeypatch.setattr("lfx.graph.graph.base.logger.aerror", aerror)
+
+    async def build_vertex(vertex_id, **kwargs):  # noqa: ARG001
+        if vertex_id == "input_fast":
+            msg = "boom"
+            raise ValueError(msg)
+        await asyncio.sleep(0.05)
+        return VertexBuildResult(
+            result_dict=None, params="", valid=True, artifacts={}, vertex=graph.get_vertex(vertex_id)
+        )
+
+    graph.build_vertex = build_vertex
+
+    with pytest.raises(ValueError, match="boom"):
+        await graph.process(fallback_to_env_vars=False)
+
+    aerror.assert_any_await("Task input_fast Run 0 failed with exception: boom")
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from lfx.components.flow_controls import LoopComponent
+from lfx.components.flow_controls import loop as loop_module
+from lfx.components.input_output import TextInputComponent
+from lfx.components.processing import ParserComponent
+from lfx.components.processing.message_to_data import MessageToDataComponent
+from lfx.graph import Graph
+from lfx.graph.graph.constants import Finish
+from lfx.graph.graph.loop_body import extract_loop_body
+from lfx.schema.data import Data
+from lfx.schema.dataframe import DataFrame
+
+
+def _make_loop_graph(parallel_width=1, rows=("a", "b", "c")):
+    loop = LoopComponent(_id="loop")
+    loop.set(data=DataFrame([Data(text=text) for text in rows]), parallel_width=parallel_width)
+    separator = TextInputComponent(_id="separator")
+    separator.set(input_value="\n")
+    parser = ParserComponent(_id="parser")
+    parser.set(input_data=loop.item_output, pattern="{text}!", sep=separator.text_response)
+    to_data = MessageToDataComponent(_id="to_data")
+    to_data.set(message=parser.parse_combined_text)
+    loop.set(item=to_data.convert_message_to_data)
+    summary = ParserComponent(_id="summary")
+    summary.set(input_data=loop.done_output, pattern="{text}", sep=",")
+    return Graph(loop, summary)
+
+
+async def _done_texts(graph):
+    # Graph(start, end) is already prepared from the loop; step it directly so the loop stays the entry point.
+    while not isinstance(await graph.astep(), Finish):
+        pass
+    done = graph.get_vertex("loop").results["done"]
+    return [row["text"] for row in done.to_dict(orient="records")]
+
+
+def test_extract_loop_body():
+    graph = _make_loop_graph()
+
+    body = extract_loop_body(graph, "loop")
+
+    assert body.vertex_ids == {"parser", "to_data"}
+    assert body.entries == [("parser", "input_data")]
+    assert body.exit == ("to_data", "data")
+    assert body.external_ids == {"separator"}
+
+
+def test_extract_loop_body_requires_feedback_edge():
+    loop = LoopComponent(_id="loop")
+    loop.set(data=DataFrame([Data(text="a")]))
+    parser = ParserComponent(_id="parser")
+    parser.set(input_data=loop.item_output, pattern="{text}", sep="\n")
+    graph = Graph(loop, parser)
+
+    with pytest.raises(ValueError, match="'item' input connected"):
+        extract_loop_body(graph, "loop")
+
+
+async def test_parallel_loop_matches_sequential_order():
+    sequential = await _done_texts(_make_loop_graph(parallel_width=1))
+    parallel = await _done_texts(_make_loop_graph(parallel_width=2))
+
+    assert sequential == ["a!", "b!", "c!"]
+    assert parallel == sequential
+
+
+async def test_parallel_loop_bounds_concurrency(monkeypatch):
+    running = {"now": 0, "peak": 0}
+
+    async def fake_run_loop_body(subgraph, body, item):  # noqa: ARG001
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        return Data(text=item.text.upper())
+
+    monkeypatch.setattr(loop_module, "run_loop_body", fake_run_loop_body)
+    rows = [str(i) for i in range(10)]
+
+    texts = await _done_texts(_make_loop_graph(parallel_width=3, rows=rows))
+
+    assert running["peak"] == 3
+    assert texts == rows
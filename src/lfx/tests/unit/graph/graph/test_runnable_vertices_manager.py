@@ -206,3 +206,39 @@ def test_add_to_vertices_being_run(data):
     manager.add_to_vertices_being_run(vertex_id)
 
     assert vertex_id in manager.vertices_being_run
+
+
+def test_from_dict_normalizes_lists_to_sets(data):
+    manager = RunnableVerticesManager.from_dict(data)
+
+    assert manager.run_map["A"] == {"B", "C"}
+    assert all(isinstance(predecessors, set) for predecessors in manager.run_predecessors.values())
+
+
+def test_remove_from_predecessors_only_touches_successors(data):
+    manager = RunnableVerticesManager.from_dict(data)
+
+    manager.remove_from_predecessors("B")
+
+    assert manager.run_predecessors["D"] == {"C"}
+    assert manager.run_predecessors["B"] == {"A"}
+
+
+def test_build_run_map_does_not_alias_predecessor_map(data):
+    manager = RunnableVerticesManager.from_dict(data)
+    predecessor_map = {"X": ["Z"], "Z": []}
+
+    manager.build_run_map(predecessor_map, {"X", "Z"})
+    manager.remove_from_predecessors("Z")
+
+    assert manager.run_predecessors["X"] == set()
+    assert predecessor_map["X"] == ["Z"]
+
+
+def test_legacy_append_on_pending_predecessors(data):
+    manager = RunnableVerticesManager.from_dict(data)
+
+    manager.run_predecessors["A"].append("D")
+    manager.run_predecessors["A"].append("D")
+
+    assert manager.run_predecessors["A"] == {"D"}
@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from lfx.graph.graph.variable_cache import RunVariableCache, collect_variable_names
+
+
+class FakeVariableService:
+    def __init__(self, variables):
+        self.variables = variables
+        self.bulk_calls = []
+        self.single_calls = []
+
+    async def get_variables_by_names(self, user_id, names, session):  # noqa: ARG002
+        self.bulk_calls.append(list(names))
+        return {name: self.variables[name] for name in names if name in self.variables}
+
+    async def get_variable(self, user_id, name, field, session):  # noqa: ARG002
+        self.single_calls.append(name)
+        if name not in self.variables:
+            msg = f"{name} variable not found."
+            raise ValueError(msg)
+        return self.variables[name][1]
+
+
+def _vertex(params, load_from_db_fields):
+    return SimpleNamespace(params=params, load_from_db_fields=load_from_db_fields)
+
+
+def test_collect_variable_names_covers_fields_and_table_cells():
+    graph = SimpleNamespace(
+        vertices=[
+            _vertex({"api_key": "OPENAI_API_KEY", "model": "gpt"}, ["api_key"]),
+            _vertex({"api_key": "OPENAI_API_KEY"}, ["api_key"]),
+            _vertex(
+                {
+                    "headers": [{"key": "x", "value": "HEADER_TOKEN"}, {"key": "y", "value": ""}],
+                    "headers_load_from_db_columns": ["value"],
+                },
+                ["table:headers"],
+            ),
+            _vertex({"token": "OVERRIDDEN"}, ["token"]),
+        ],
+        context={"request_variables": {"OVERRIDDEN": "from-request"}},
+    )
+
+    assert collect_variable_names(graph) == {"OPENAI_API_KEY", "HEADER_TOKEN"}
+
+
+async def test_run_variable_cache_prefetches_once():
+    user_id = uuid4()
+    service = FakeVariableService({"A": ("Credential", "a"), "B": ("Generic", "b")})
+    cache = RunVariableCache("run-1", {"A", "B", "MISSING"})
+
+    values = [await cache.get(service, user_id=user_id, name=name, field="api_key", session=None) for name in "ABAB"]
+
+    assert values == ["a", "b", "a", "b"]
+    assert service.bulk_calls == [["A", "B", "MISSING"]]
+    assert service.single_calls == []
+    assert cache.hits == 4
+
+
+async def test_run_variable_cache_keeps_single_lookup_errors():
+    user_id = uuid4()
+    service = FakeVariableService({"A": ("Credential", "a")})
+    cache = RunVariableCache("run-1", {"A", "MISSING"})
+
+    with pytest.raises(ValueError, match="MISSING variable not found"):
+        await cache.get(service, user_id=user_id, name="MISSING", field="api_key", session=None)
+    with pytest.raises(TypeError, match="Session ID"):
+        await cache.get(service, user_id=user_id, name="A", field="session_id", session=None)
+    assert service.single_calls == ["MISSING"]
+
+
+async def test_run_variable_cache_falls_back_without_bulk_support():
+    service = FakeVariableService({"A": ("Credential", "a")})
+    cache = RunVariableCache("run-1", {"A"})
+
+    assert await cache.get(_SingleOnly(service), user_id=uuid4(), name="A", field="api_key", session=None) == "a"
+    assert service.single_calls == ["A"]
+    assert cache.fallbacks == 1
+
+
+class _SingleOnly:
+    def __init__(self, service):
+        self.get_variable = service.get_variable
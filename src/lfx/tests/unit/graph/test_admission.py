@@ -0,0 +1,159 @@
+import asyncio
+
+import pytest
+from lfx.components.input_output import ChatInput, ChatOutput
+from lfx.graph import Graph, admission
+from lfx.graph.admission import AdmissionController, ResourceLimiter, admit_component
+
+
+async def test_limiter_caps_concurrency_and_reports_queue_depth():
+    limiter = ResourceLimiter("llm", 2)
+    running = {"now": 0, "peak": 0}
+
+    async def work():
+        async with limiter.slot():
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+
+    await asyncio.gather(*(work() for _ in range(6)))
+
+    stats = limiter.stats()
+    assert running["peak"] == 2
+    assert stats["in_use"] == 0
+    assert stats["waiting"] == 0
+    assert stats["admitted"] == 6
+    assert stats["peak_waiting"] == 4
+
+
+async def test_limiter_weights_are_clamped_and_fifo():
+    limiter = ResourceLimiter("cpu", 3)
+    order = []
+
+    first = await limiter.acquire(2)
+    heavy = asyncio.create_task(limiter.acquire(10))
+    await asyncio.sleep(0)
+    light = asyncio.create_task(limiter.acquire(1))
+    heavy.add_done_callback(lambda _: order.append("heavy"))
+    light.add_done_callback(lambda _: order.append("light"))
+    await asyncio.sleep(0)
+    # The light request fits, but it must queue behind the heavy one.
+    assert not light.done()
+
+    limiter.release(first)
+    assert await heavy == 3
+    limiter.release(3)
+    assert await light == 1
+    limiter.release(1)
+    assert order == ["heavy", "light"]
+    assert limiter.stats()["in_use"] == 0
+
+
+async def test_cancelled_waiter_does_not_leak_capacity():
+    limiter = ResourceLimiter("http", 1)
+    held = await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    limiter.release(held)
+
+    stats = limiter.stats()
+    assert stats["in_use"] == 0
+    assert stats["waiting"] == 0
+    assert await asyncio.wait_for(limiter.acquire(), timeout=1) == 1
+
+
+async def test_cancelling_head_waiter_admits_waiters_behind_it():
+    limiter = ResourceLimiter("llm", 2)
+    held = await limiter.acquire()
+    head = asyncio.create_task(limiter.acquire(2))
+    await asyncio.sleep(0)
+    behind = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.stats()["waiting"] == 2
+
+    head.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await head
+
+    # Capacity for the second waiter was free all along; it must not wait for a release
+    assert await asyncio.wait_for(behind, timeout=1) == 1
+    assert limiter.stats()["in_use"] == 2
+    limiter.release(held)
+
+
+async def test_release_skips_waiters_that_cannot_be_woken():
+    limiter = ResourceLimiter("llm", 1)
+    held = await limiter.acquire()
+    head = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    behind = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    # The head waiter's task is cancelled but has not run its cancellation handler yet
+    head.cancel()
+    limiter.release(held)
+    with pytest.raises(asyncio.CancelledError):
+        await head
+    assert await asyncio.wait_for(behind, timeout=1) == 1
+    assert limiter.stats()["in_use"] == 1
+    limiter.release(1)
+
+    # A waiter whose event loop has been closed is dropped without keeping its quota
+    closed_loop = asyncio.new_event_loop()
+    held = await limiter.acquire()
+    limiter._waiters.append(admission._Waiter(1, closed_loop.create_future()))
+    closed_loop.close()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    limiter.release(held)
+    assert await asyncio.wait_for(waiter, timeout=1) == 1
+    assert limiter.stats() | {"wait_seconds": 0} == {
+        "limit": 1,
+        "in_use": 1,
+        "waiting": 0,
+        "peak_waiting": 2,
+        "admitted": 4,
+        "wait_seconds": 0,
+    }
+
+
+async def test_unconfigured_classes_are_not_limited():
+    controller = AdmissionController({"llm": 1, "http": 0})
+
+    assert controller.limiter("http") is None
+    assert controller.limiter(None) is None
+    async with controller.admit("embedding"), controller.admit("embedding"):
+        pass
+    assert set(controller.stats()) == {"llm"}
+
+
+async def test_admit_component_applies_run_and_process_limits(monkeypatch):
+    process_controller = AdmissionController({"llm": 5})
+    monkeypatch.setattr(admission, "get_process_admission_controller", lambda: process_controller)
+
+    class FakeLLM:
+        resource_class = "llm"
+        resource_weight = 1
+
+    graph = Graph(ChatInput(_id="chat_input"), ChatOutput(_id="chat_output"))
+    graph._admission_controller = AdmissionController({"llm": 1})
+    running = {"now": 0, "peak": 0}
+
+    async def build():
+        async with admit_component(graph, FakeLLM()):
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            assert process_controller.stats()["llm"]["in_use"] == 1
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+
+    await asyncio.gather(build(), build(), build())
+
+    assert running["peak"] == 1
+    assert graph.admission_stats()["llm"]["admitted"] == 3
+    assert process_controller.stats()["llm"]["admitted"] == 3
@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+from lfx.helpers.data import compile_row_template, format_dataframe_rows
+from lfx.schema.dataframe import DataFrame
+
+
+def _iterrows_reference(template, dataframe):
+    return [template.format(**row.to_dict()) for _, row in dataframe.iterrows()]
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        "{name} is {age} years old",
+        "{name}: {name}",
+        "{score:.2f} / {name!r} {{literal}}",
+        "{meta[id]}-{name}",
+        "no fields",
+    ],
+)
+def test_format_dataframe_rows_matches_iterrows(template):
+    dataframe = DataFrame(
+        {
+            "name": ["Alice", "Bob", None],
+            "age": ["25", "30", "n/a"],
+            "score": [1.5, 2.25, float("nan")],
+            "meta": [{"id": 1}, {"id": 2}, {"id": 3}],
+        }
+    )
+
+    assert format_dataframe_rows(template, dataframe) == _iterrows_reference(template, dataframe)
+
+
+def test_format_dataframe_rows_missing_column_raises_key_error():
+    with pytest.raises(KeyError, match="missing"):
+        format_dataframe_rows("{text} {missing}", DataFrame({"text": ["a"]}))
+
+
+def test_format_dataframe_rows_keeps_column_dtypes():
+    dataframe = DataFrame({"count": [1, 2], "ratio": [0.5, 1.0]})
+
+    assert format_dataframe_rows("{count}", dataframe) == ["1", "2"]
+
+
+def test_format_dataframe_rows_falls_back_for_positional_fields():
+    with pytest.raises(IndexError):
+        format_dataframe_rows("{0}", DataFrame({"text": ["a"]}))
+
+
+def test_format_dataframe_rows_handles_datetimes_and_empty_frames():
+    dataframe = DataFrame({"when": pd.to_datetime(["2023-01-01"])})
+
+    assert format_dataframe_rows("{when}", dataframe) == _iterrows_reference("{when}", dataframe)
+    assert format_dataframe_rows("{missing}", DataFrame({"text": []})) == []
+
+
+def test_compile_row_template():
+    assert compile_row_template("{a}-{b:>3}-{a.real}") == ("{0}-{1:>3}-{0.real}", ("a", "b"))
+    assert compile_row_template("{}") is None
+    assert compile_row_template("{a:{width}}") is None
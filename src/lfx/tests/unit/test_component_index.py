@@ -1,13 +1,19 @@
 """Unit tests for component index system."""
 
+import copy
 import hashlib
+import os
+import pickle
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 import orjson
 import pytest
+from lfx.interface.component_index import LazyComponentCategory, PackedComponentIndex, write_packed_index
+from lfx.interface.component_workers import ModuleTemplateCache, _process_module_shard
 from lfx.interface.components import (
     _get_cache_path,
+    _load_components_dynamically,
     _parse_dev_mode,
     _read_component_index,
     _save_generated_index,
@@ -383,6 +389,8 @@ class TestImportLangflowComponents:
 
         mock_settings = Mock()
         mock_settings.settings.components_index_path = str(custom_file)
+        mock_settings.settings.lazy_component_index = False
+        mock_settings.settings.component_loader_workers = 0
 
         with (
             patch("lfx.interface.components._read_component_index") as mock_read,
@@ -413,3 +421,209 @@ class TestImportLangflowComponents:
         # Should return empty dict, not raise
         assert "components" in result
         assert len(result["components"]) == 0
+
+
+class TestPackedComponentIndex:
+    """Tests for the memory-mapped .lfxi component index."""
+
+    modules_dict = {
+        "category1": {"comp1": {"template": {"a": 1}}, "comp2": {"template": {"b": 2}}},
+        "category2": {"comp3": {"display_name": "Component 3"}},
+    }
+
+    def test_round_trip_decodes_lazily(self, tmp_path):
+        path = tmp_path / "component_index.lfxi"
+        write_packed_index(self.modules_dict, path, version="0.1.12", fingerprint="src")
+
+        index = PackedComponentIndex.open(path)
+        assert index is not None
+        assert index.version == "0.1.12"
+        assert index.fingerprint == "src"
+        assert index.metadata == {"num_modules": 2, "num_components": 3}
+
+        modules = index.lazy_modules()
+        category = modules["category1"]
+        assert isinstance(category, LazyComponentCategory)
+        assert list(category) == ["comp1", "comp2"]
+        assert category.decoded_count == 0
+        assert category["comp2"] == {"template": {"b": 2}}
+        assert category.decoded_count == 1
+        assert {name: dict(components) for name, components in modules.items()} == self.modules_dict
+
+    def test_open_rejects_corrupted_file(self, tmp_path):
+        path = tmp_path / "component_index.lfxi"
+        write_packed_index(self.modules_dict, path, version="0.1.12")
+        data = bytearray(path.read_bytes())
+        data[-2] ^= 0xFF
+        path.write_bytes(bytes(data))
+
+        assert PackedComponentIndex.open(path) is None
+
+    def test_open_rejects_other_formats(self, tmp_path):
+        path = tmp_path / "component_index.lfxi"
+        path.write_bytes(orjson.dumps({"entries": []}))
+
+        assert PackedComponentIndex.open(path) is None
+        assert PackedComponentIndex.open(tmp_path / "missing.lfxi") is None
+
+    def test_lazy_category_overrides_and_copies(self, tmp_path):
+        path = tmp_path / "component_index.lfxi"
+        write_packed_index(self.modules_dict, path, version="0.1.12")
+        category = PackedComponentIndex.open(path).lazy_modules()["category1"]
+
+        category["comp1"] = {"template": {"a": 10}}
+        category["new"] = {"template": {}}
+        del category["comp2"]
+
+        assert list(category) == ["comp1", "new"]
+        assert "comp2" not in category
+        with pytest.raises(KeyError):
+            category["comp2"]
+        assert copy.deepcopy(category) == {"comp1": {"template": {"a": 10}}, "new": {"template": {}}}
+        assert pickle.loads(pickle.dumps(category)) == dict(category)  # noqa: S301
+
+
+@pytest.mark.asyncio
+class TestLazyComponentIndexLoading:
+    """Tests for loading components through the packed index."""
+
+    async def test_json_index_is_repacked_then_loaded_lazily(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("LFX_DEV", raising=False)
+        monkeypatch.setattr("lfx.interface.components._get_cache_path", lambda: tmp_path / "component_index.json")
+        monkeypatch.setattr(
+            "lfx.interface.components._builtin_index_path", lambda suffix=".json": tmp_path / f"builtin{suffix}"
+        )
+        index = {"version": "0.1.12", "entries": [["category1", {"comp1": {"template": {}}}]]}
+
+        mock_settings = Mock()
+        mock_settings.settings.components_index_path = None
+        mock_settings.settings.lazy_component_index = True
+        mock_settings.settings.component_loader_workers = 0
+
+        with (
+            patch("lfx.interface.components._read_component_index", return_value=index),
+            patch("importlib.metadata.version", return_value="0.1.12"),
+        ):
+            first = await import_langflow_components(mock_settings)
+        assert (tmp_path / "component_index.lfxi").exists()
+        assert first["components"] == {"category1": {"comp1": {"template": {}}}}
+
+        with (
+            patch("lfx.interface.components._read_component_index") as mock_read,
+            patch("importlib.metadata.version", return_value="0.1.12"),
+        ):
+            second = await import_langflow_components(mock_settings)
+        mock_read.assert_not_called()
+        assert isinstance(second["components"]["category1"], LazyComponentCategory)
+        assert second["components"]["category1"]["comp1"] == {"template": {}}
+
+        # A different langflow version invalidates the packed cache
+        with (
+            patch("lfx.interface.components._read_component_index", return_value=None) as mock_read,
+            patch("lfx.interface.components._load_components_dynamically", return_value={}),
+            patch("importlib.metadata.version", return_value="0.1.13"),
+        ):
+            await import_langflow_components(mock_settings)
+        mock_read.assert_called()
+
+
+class TestModuleTemplateCache:
+    """Tests for the per-module template cache used by the process-pool loader."""
+
+    def test_hit_after_touch_and_miss_after_edit(self, tmp_path):
+        source = tmp_path / "module.py"
+        source.write_text("class A: ...\n")
+        cache_path = tmp_path / "modules.json"
+
+        cache = ModuleTemplateCache.load(cache_path, "fp")
+        cache.put("lfx.components.cat.module", source, ("cat", {"A": {"template": {}}}))
+        cache.save()
+
+        # Same content with a new mtime is still a hit
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+        reloaded = ModuleTemplateCache.load(cache_path, "fp")
+        assert reloaded.get("lfx.components.cat.module", source) == ("cat", {"A": {"template": {}}})
+
+        source.write_text("class B: ...\n")
+        assert reloaded.get("lfx.components.cat.module", source) is None
+
+    def test_miss_after_helper_edit_in_same_or_referenced_package(self, tmp_path):
+        root = tmp_path / "components"
+        (root / "cat").mkdir(parents=True)
+        (root / "shared").mkdir()
+        source = root / "cat" / "module.py"
+        source.write_text("from lfx.components.cat.helper import x\n")
+        helper = root / "cat" / "helper.py"
+        helper.write_text("from lfx.components.shared.util import y\nx = 1\n")
+        util = root / "shared" / "util.py"
+        util.write_text("y = 1\n")
+        cache_path = tmp_path / "modules.json"
+
+        cache = ModuleTemplateCache.load(cache_path, "fp", root)
+        cache.put("lfx.components.cat.module", source, ("cat", {"A": {}}))
+        cache.save()
+
+        # Touching a helper without changing it is still a hit
+        stat = helper.stat()
+        os.utime(helper, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+        assert ModuleTemplateCache.load(cache_path, "fp", root).get("lfx.components.cat.module", source) is not None
+
+        helper.write_text("from lfx.components.shared.util import y\nx = 2\n")
+        assert ModuleTemplateCache.load(cache_path, "fp", root).get("lfx.components.cat.module", source) is None
+
+        cache = ModuleTemplateCache.load(cache_path, "fp", root)
+        cache.put("lfx.components.cat.module", source, ("cat", {"A": {}}))
+        cache.save()
+        util.write_text("y = 2\n")
+        assert ModuleTemplateCache.load(cache_path, "fp", root).get("lfx.components.cat.module", source) is None
+
+    def test_fingerprint_change_discards_cache(self, tmp_path):
+        source = tmp_path / "module.py"
+        source.write_text("x = 1\n")
+        cache = ModuleTemplateCache.load(tmp_path / "modules.json", "old")
+        cache.put("mod", source, ("cat", {}))
+        cache.save()
+
+        assert ModuleTemplateCache.load(tmp_path / "modules.json", "new").get("mod", source) is None
+
+    def test_shard_serializes_results(self):
+        results = {"ok": ("cat", {"A": {"template": {}}}), "broken": None, "opaque": ("cat", {"A": object()})}
+        with patch("lfx.interface.components._process_single_module", side_effect=results.get):
+            shard = dict(_process_module_shard(["ok", "broken", "opaque"]))
+
+        assert orjson.loads(shard["ok"]) == ["cat", {"A": {"template": {}}}]
+        assert shard["broken"] == b"null"
+        assert shard["opaque"] is None
+
+
+@pytest.mark.asyncio
+class TestWorkerDynamicLoading:
+    """Tests for _load_components_dynamically with component_loader_workers enabled."""
+
+    async def test_unchanged_modules_skip_rebuild(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("lfx.interface.components._get_cache_path", lambda: tmp_path / "component_index.json")
+        monkeypatch.setattr("lfx.interface.components.shared_fingerprint", lambda: "fp")
+        finder = Mock(path=str(tmp_path))
+        (tmp_path / "first.py").write_text("a = 1\n")
+        (tmp_path / "second.py").write_text("b = 1\n")
+        walk = [(finder, "lfx.components.first", False), (finder, "lfx.components.second", False)]
+
+        async def fake_pool(modnames, workers):
+            assert workers == 2
+            # The second module is not returned, as if its result could not be serialized
+            return {name: ("first", {"one": {}}) for name in modnames if name.endswith("first")}
+
+        with (
+            patch("lfx.interface.components.pkgutil.walk_packages", return_value=walk),
+            patch("lfx.interface.components.load_modules_in_processes", side_effect=fake_pool) as pool,
+            patch("lfx.interface.components._process_single_module", return_value=("second", {"two": {}})) as local,
+        ):
+            first = await _load_components_dynamically(workers=2)
+            second = await _load_components_dynamically(workers=2)
+
+        assert first == second == {"first": {"one": {}}, "second": {"two": {}}}
+        assert pool.call_args_list[0].args[0] == ["lfx.components.first", "lfx.components.second"]
+        # Both results were cached, so the second run builds nothing
+        assert pool.call_args_list[1].args[0] == []
+        local.assert_called_once_with("lfx.components.second")